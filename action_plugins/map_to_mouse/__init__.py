@@ -376,7 +376,7 @@ class MapToMouseFunctor(AbstractFunctor):
         dy = delta_motion if self.config.direction != 90 else None
         (is_local, is_remote) = input_devices.remote_state.state
         if is_local:
-            self.mouse_controller.set_absolute_motion(dx, dy)
+            self.mouse_controller.set_absolute_motion(dx, dy, source="map_to_mouse")
         if is_remote:
             input_devices.remote_client.send_mouse_motion(dx, dy)
 
@@ -388,14 +388,15 @@ class MapToMouseFunctor(AbstractFunctor):
                     self.config.direction,
                     self.config.min_speed,
                     self.config.max_speed,
-                    self.config.time_to_max_speed
+                    self.config.time_to_max_speed,
+                    source="map_to_mouse"
                 )
             if is_remote:
                 input_devices.remote_client.send_mouse_acceleration(self.config.direction, self.config.min_speed, self.config.max_speed, self.config.time_to_max_speed)
      
         else:
             if is_local:
-                self.mouse_controller.set_absolute_motion(0, 0)
+                self.mouse_controller.set_absolute_motion(0, 0, source="map_to_mouse")
             if is_remote:
                 input_devices.remote_client.send_mouse_motion(0, 0)
 
@@ -409,7 +410,7 @@ class MapToMouseFunctor(AbstractFunctor):
         is_remote = input_devices.remote_client.is_remote
         if value.current == (0, 0):
             if is_local:
-                self.mouse_controller.set_absolute_motion(0, 0)
+                self.mouse_controller.set_absolute_motion(0, 0, source="map_to_mouse")
             if is_remote:
                 input_devices.remote_client.send_mouse_motion(0, 0)
 
@@ -420,7 +421,8 @@ class MapToMouseFunctor(AbstractFunctor):
                     a,
                     self.config.min_speed,
                     self.config.max_speed,
-                    self.config.time_to_max_speed
+                    self.config.time_to_max_speed,
+                    source="map_to_mouse"
                 )
             if is_remote:
                 input_devices.remote_client.send_mouse_acceleration(a, self.config.min_speed, self.config.max_speed, self.config.time_to_max_speed)
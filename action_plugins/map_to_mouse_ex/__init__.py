@@ -713,7 +713,7 @@ class MapToMouseExFunctor(AbstractFunctor):
         dy = delta_motion if self.action.direction != 90 else None
         (is_local, is_remote) = self.get_state()
         if is_local:
-            MapToMouseExFunctor._mouse_controller.set_absolute_motion(dx, dy)
+            MapToMouseExFunctor._mouse_controller.set_absolute_motion(dx, dy, source="map_to_mouse_ex")
         if is_remote:
             input_devices.remote_client.send_mouse_motion(dx, dy)
 
@@ -725,14 +725,15 @@ class MapToMouseExFunctor(AbstractFunctor):
                     self.action.direction,
                     self.action.min_speed,
                     self.action.max_speed,
-                    self.action.time_to_max_speed
+                    self.action.time_to_max_speed,
+                    source="map_to_mouse_ex"
                 )
             if is_remote:
                 input_devices.remote_client.send_mouse_acceleration(self.action.direction, self.action.min_speed, self.action.max_speed, self.action.time_to_max_speed)
      
         else:
             if is_local:
-                MapToMouseExFunctor._mouse_controller.set_absolute_motion(0, 0)
+                MapToMouseExFunctor._mouse_controller.set_absolute_motion(0, 0, source="map_to_mouse_ex")
             if is_remote:
                 input_devices.remote_client.send_mouse_motion(0, 0)
 
@@ -745,7 +746,7 @@ class MapToMouseExFunctor(AbstractFunctor):
         (is_local, is_remote) = self.get_state()
         if value.current == (0, 0):
             if is_local:
-                MapToMouseExFunctor._mouse_controller.set_absolute_motion(0, 0)
+                MapToMouseExFunctor._mouse_controller.set_absolute_motion(0, 0, source="map_to_mouse_ex")
             if is_remote:
                 input_devices.remote_client.send_mouse_motion(0, 0)
 
@@ -756,7 +757,8 @@ class MapToMouseExFunctor(AbstractFunctor):
                     a,
                     self.action.min_speed,
                     self.action.max_speed,
-                    self.action.time_to_max_speed
+                    self.action.time_to_max_speed,
+                    source="map_to_mouse_ex"
                 )
             if is_remote:
                 input_devices.remote_client.send_mouse_acceleration(a, self.action.min_speed, self.action.max_speed, self.action.time_to_max_speed)
@@ -805,11 +807,11 @@ class MapToMouseExFunctor(AbstractFunctor):
         while not MapToMouseExFunctor._wiggle_local_stop_requested:
             if time.time() >= t_wait:
                 syslog.debug("wiggling local...")
-                MapToMouseExFunctor._mouse_controller.set_absolute_motion(1, 1)
+                MapToMouseExFunctor._mouse_controller.set_absolute_motion(1, 1, source="map_to_mouse_ex")
                 time.sleep(1)
-                MapToMouseExFunctor._mouse_controller.set_absolute_motion(-1, -1)
+                MapToMouseExFunctor._mouse_controller.set_absolute_motion(-1, -1, source="map_to_mouse_ex")
                 time.sleep(0.5)
-                MapToMouseExFunctor._mouse_controller.set_absolute_motion(0, 0)
+                MapToMouseExFunctor._mouse_controller.set_absolute_motion(0, 0, source="map_to_mouse_ex")
                 t_wait = time.time() + random.uniform(10,40)
             time.sleep(0.5)
             
@@ -18,7 +18,6 @@
 
 import logging
 import threading
-import time
 from xml.etree import ElementTree
 
 from PySide6 import QtWidgets, QtCore, QtGui
@@ -26,7 +25,7 @@ from gremlin.common import load_icon
 
 from gremlin.base_classes import InputActionCondition
 from gremlin.common import InputType
-from gremlin import input_devices, joystick_handling, util
+from gremlin import input_devices, joystick_handling, relative_axis, scheduler, util
 from gremlin.error import ProfileError
 from gremlin.profile import safe_format, safe_read, Profile, parse_guid, write_guid
 import gremlin.ui.common
@@ -1648,12 +1647,6 @@ class VJoyRemapFunctor(gremlin.base_classes.AbstractFunctor):
         self.paired = action.paired
 
         self.needs_auto_release = self._check_for_auto_release(action)
-        self.thread_running = False
-        self.should_stop_thread = False
-        self.thread_last_update = time.time()
-        self.thread = None
-        self.axis_delta_value = 0.0
-        self.axis_value = 0.0
         self.axis_start_value = action.axis_start_value
 
         self.remote_client = input_devices.remote_client
@@ -1693,22 +1686,25 @@ class VJoyRemapFunctor(gremlin.base_classes.AbstractFunctor):
             self.remote_client.send_axis(self.vjoy_device_id, self.vjoy_input_id, self.axis_start_value)
 
 	
-    # async routine to pulse a button
-    def _fire_pulse(self, *args):
-
-        self.lock.acquire()
-        vjoy_device_id, vjoy_input_id, duration = args
-        # vjoy_device_id = args]
-        # vjoy_input_id = args[2]
-        # duration = args[3]
-
-        button = joystick_handling.VJoyProxy()[vjoy_device_id].button(vjoy_input_id)
-        button.is_pressed = True
-        self.remote_client.send_button(vjoy_device_id, vjoy_input_id, True)
-        time.sleep(duration)
-        button.is_pressed = False
-        self.remote_client.send_button(vjoy_device_id, vjoy_input_id, False)
-        self.lock.release()
+    # timer wheel callbacks pulsing a button, the lock is held for the duration of the pulse
+    # and both run when the profile stops so the button is never left pressed
+    def _fire_pulse(self, vjoy_device_id, vjoy_input_id, duration):
+        try:
+            button = joystick_handling.VJoyProxy()[vjoy_device_id].button(vjoy_input_id)
+            button.is_pressed = True
+            self.remote_client.send_button(vjoy_device_id, vjoy_input_id, True)
+        except:
+            self.lock.release()
+            raise
+        scheduler.TimerWheel().schedule(duration, self._release_pulse, vjoy_device_id, vjoy_input_id, stop_policy=scheduler.StopPolicy.Run)
+
+    def _release_pulse(self, vjoy_device_id, vjoy_input_id):
+        try:
+            button = joystick_handling.VJoyProxy()[vjoy_device_id].button(vjoy_input_id)
+            button.is_pressed = False
+            self.remote_client.send_button(vjoy_device_id, vjoy_input_id, False)
+        finally:
+            self.lock.release()
 
     # def smooth(self, value, reverse = False, power = 3):
     #     '''
@@ -1785,15 +1781,14 @@ class VJoyRemapFunctor(gremlin.base_classes.AbstractFunctor):
                     self.remote_client.send_axis(self.vjoy_device_id, self.vjoy_input_id, value)
             else:
                 value = -target if self.reverse else target
-                self.should_stop_thread = abs(event.value) < 0.05
-                self.axis_delta_value = \
-                    value * (self.axis_scaling / 1000.0)
-                self.thread_last_update = time.time()
-                if self.thread_running is False:
-                    if isinstance(self.thread, threading.Thread):
-                        self.thread.join()
-                    self.thread = threading.Thread(target=self.relative_axis_thread)
-                    self.thread.start()
+                relative_axis.RelativeAxisIntegrator().update(
+                    self.vjoy_device_id,
+                    self.vjoy_input_id,
+                    value * (self.axis_scaling / 1000.0),
+                    abs(event.value) < 0.05,
+                    is_local,
+                    is_remote
+                )
 
         elif self.input_type == InputType.JoystickButton:
 
@@ -1857,8 +1852,8 @@ class VJoyRemapFunctor(gremlin.base_classes.AbstractFunctor):
                 
                 # pulse action
                 if fire_event:
-                    if not self.lock.locked():
-                        threading.Timer(0.01, self._fire_pulse, [self.vjoy_device_id, self.vjoy_input_id, self.pulse_delay/1000]).start()
+                    if self.lock.acquire(blocking=False):
+                        scheduler.TimerWheel().schedule(0.01, self._fire_pulse, self.vjoy_device_id, self.vjoy_input_id, self.pulse_delay/1000, stop_policy=scheduler.StopPolicy.Run)
             elif self.action_mode == VjoyAction.VJoyInvertAxis:
                 # invert the specified axis
                 if fire_event:
@@ -1902,38 +1897,6 @@ class VJoyRemapFunctor(gremlin.base_classes.AbstractFunctor):
 
         return True
 
-    def relative_axis_thread(self):
-        self.thread_running = True
-        vjoy_dev = joystick_handling.VJoyProxy()[self.vjoy_device_id]
-        self.axis_value = vjoy_dev.axis(self.vjoy_input_id).value
-        (is_local, is_remote) = input_devices.remote_state.state
-        while self.thread_running:
-            try:
-                # If the vjoy value has was changed from what we set it to
-                # in the last iteration, terminate the thread
-                change = vjoy_dev.axis(self.vjoy_input_id).value - self.axis_value
-                if abs(change) > 0.0001:
-                    self.thread_running = False
-                    self.should_stop_thread = True
-                    return
-
-                self.axis_value = max(
-                    -1.0,
-                    min(1.0, self.axis_value + self.axis_delta_value)
-                )
-                
-                if is_local:
-                    vjoy_dev.axis(self.vjoy_input_id).value = self.axis_value
-                if is_remote:
-                    self.remote_client.send_axis(self.vjoy_device_id, self.vjoy_input_id, self.axis_value)
-
-                if self.should_stop_thread and \
-                        self.thread_last_update + 1.0 < time.time():
-                    self.thread_running = False
-                time.sleep(0.01)
-            except gremlin.error.VJoyError:
-                self.thread_running = False
-
     def _check_for_auto_release(self, action):
         activation_condition = None
         if action.parent.activation_condition:
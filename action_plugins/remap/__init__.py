@@ -17,8 +17,6 @@
 
 
 import logging
-import threading
-import time
 from xml.etree import ElementTree
 
 from gremlin.common import load_icon
@@ -26,7 +24,7 @@ from PySide6 import QtWidgets
 
 from gremlin.base_classes import InputActionCondition
 from gremlin.common import InputType
-from gremlin import input_devices, joystick_handling, util
+from gremlin import input_devices, joystick_handling, relative_axis, util
 from gremlin.error import ProfileError
 import gremlin.plugin_manager
 from gremlin.profile import safe_format, safe_read
@@ -216,12 +214,6 @@ class RemapFunctor(gremlin.base_classes.AbstractFunctor):
         self.axis_scaling = action.axis_scaling
 
         self.needs_auto_release = self._check_for_auto_release(action)
-        self.thread_running = False
-        self.should_stop_thread = False
-        self.thread_last_update = time.time()
-        self.thread = None
-        self.axis_delta_value = 0.0
-        self.axis_value = 0.0
 
     def process_event(self, event, value):
         if self.input_type == InputType.JoystickAxis:
@@ -229,17 +221,12 @@ class RemapFunctor(gremlin.base_classes.AbstractFunctor):
                 joystick_handling.VJoyProxy()[self.vjoy_device_id] \
                     .axis(self.vjoy_input_id).value = value.current
             else:
-                self.should_stop_thread = abs(event.value) < 0.05
-                self.axis_delta_value = \
-                    value.current * (self.axis_scaling / 1000.0)
-                self.thread_last_update = time.time()
-                if self.thread_running is False:
-                    if isinstance(self.thread, threading.Thread):
-                        self.thread.join()
-                    self.thread = threading.Thread(
-                        target=self.relative_axis_thread
-                    )
-                    self.thread.start()
+                relative_axis.RelativeAxisIntegrator().update(
+                    self.vjoy_device_id,
+                    self.vjoy_input_id,
+                    value.current * (self.axis_scaling / 1000.0),
+                    abs(event.value) < 0.05
+                )
 
         elif self.input_type == InputType.JoystickButton:
             if event.event_type in [InputType.JoystickButton, InputType.Keyboard] \
@@ -259,33 +246,6 @@ class RemapFunctor(gremlin.base_classes.AbstractFunctor):
 
         return True
 
-    def relative_axis_thread(self):
-        self.thread_running = True
-        vjoy_dev = joystick_handling.VJoyProxy()[self.vjoy_device_id]
-        self.axis_value = vjoy_dev.axis(self.vjoy_input_id).value
-        while self.thread_running:
-            try:
-                # If the vjoy value has was changed from what we set it to
-                # in the last iteration, terminate the thread
-                change = vjoy_dev.axis(self.vjoy_input_id).value - self.axis_value
-                if abs(change) > 0.0001:
-                    self.thread_running = False
-                    self.should_stop_thread = True
-                    return
-
-                self.axis_value = max(
-                    -1.0,
-                    min(1.0, self.axis_value + self.axis_delta_value)
-                )
-                vjoy_dev.axis(self.vjoy_input_id).value = self.axis_value
-
-                if self.should_stop_thread and \
-                        self.thread_last_update + 1.0 < time.time():
-                    self.thread_running = False
-                time.sleep(0.01)
-            except gremlin.error.VJoyError:
-                self.thread_running = False
-
     def _check_for_auto_release(self, action):
         activation_condition = None
         if action.parent.activation_condition:
@@ -186,6 +186,7 @@ class AbstractCurveModel(QtCore.QObject):
         super().__init__(parent)
         self._control_points = []
         self._profile_data = profile_data
+        self._curve_table = None
         self._init_from_profile_data()
 
         self.symmetry_mode = SymmetryMode.NoSymmetry
@@ -195,6 +196,7 @@ class AbstractCurveModel(QtCore.QObject):
             cp.center.y = -cp.center.y
             for handle in cp.handles:
                 handle.y = -handle.y
+        self._curve_table = None
         self.save_to_profile()
         self.content_modified.emit()
 
@@ -203,6 +205,7 @@ class AbstractCurveModel(QtCore.QObject):
         # any changes
         if self.symmetry_mode == SymmetryMode.Diagonal:
             self._enforce_symmetry()
+        self._curve_table = None
         self.save_to_profile()
         self.content_modified.emit()
 
@@ -215,6 +218,25 @@ class AbstractCurveModel(QtCore.QObject):
             "AbstractCurveModel::get_curve_function not implemented"
         )
 
+    def get_curve_table(self, resolution=None):
+        """Returns the lookup table of the model's curve.
+
+        The table is only rebuilt after the model has been modified.
+
+        :param resolution number of samples of the table
+        :return curve table of the model or None if the model does not
+            describe a valid curve
+        """
+        if resolution is None:
+            resolution = gremlin.spline.CurveTable.default_resolution
+        if self._curve_table is None or \
+                self._curve_table.resolution != resolution:
+            curve_fn = self.get_curve_function()
+            if curve_fn is None:
+                return None
+            self._curve_table = gremlin.spline.CurveTable(curve_fn, resolution)
+        return self._curve_table
+
     def get_control_points(self):
         """Returns the list of control points.
 
@@ -236,6 +258,7 @@ class AbstractCurveModel(QtCore.QObject):
                 Point2D(-point.x, -point.y),
                 handles
             ))
+        self._curve_table = None
         self.save_to_profile()
         self.content_added.emit()
 
@@ -258,6 +281,7 @@ class AbstractCurveModel(QtCore.QObject):
         idx = self._control_points.index(control_point)
         if idx:
             del self._control_points[idx]
+            self._curve_table = None
             self.save_to_profile()
             self.content_added.emit()
 
@@ -319,6 +343,7 @@ class AbstractCurveModel(QtCore.QObject):
 
         self._enforce_symmetry()
         self.symmetry_mode = mode
+        self._curve_table = None
         self.content_added.emit()
 
 
@@ -774,8 +799,8 @@ class CurveView(QtWidgets.QGraphicsScene):
             ]:
                 item.redraw()
 
-        # Redraw response curve
-        curve_fn = self.model.get_curve_function()
+        # Redraw response curve, sampling the table at its sample positions
+        curve_fn = self.model.get_curve_table(int(g_scene_size) + 1)
         if curve_fn:
             path = QtGui.QPainterPath(
                 QtCore.QPointF(int(-g_scene_size),int(-g_scene_size*curve_fn(-1)))
@@ -1224,23 +1249,18 @@ class ResponseCurveFunctor(AbstractFunctor):
 
     def __init__(self, action):
         super().__init__(action)
-        self.deadzone_fn = lambda value: gremlin.input_devices.deadzone(
-            value,
-            action.deadzone[0],
-            action.deadzone[1],
-            action.deadzone[2],
-            action.deadzone[3]
-        )
-        if action.mapping_type == "cubic-spline":
-            self.response_fn = gremlin.spline.CubicSpline(action.control_points)
-        elif action.mapping_type == "cubic-bezier-spline":
-            self.response_fn = \
-                gremlin.spline.CubicBezierSpline(action.control_points)
-        else:
+        if action.mapping_type not in ["cubic-spline", "cubic-bezier-spline"]:
             raise gremlin.error.GremlinError("Invalid curve type")
 
+        # Deadzone and response curve baked into a single lookup table
+        self.response_fn = gremlin.spline.create_curve_table(
+            action.mapping_type,
+            action.control_points,
+            action.deadzone
+        )
+
     def process_event(self, event, value):
-        value.current = self.response_fn(self.deadzone_fn(value.current))
+        value.current = self.response_fn(value.current)
         return True
 
 
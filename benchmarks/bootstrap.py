@@ -0,0 +1,52 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Prepares running a benchmark from a source checkout.
+
+Has to be imported by every benchmark before any gremlin module. Makes the
+repository importable and, as Gremlin locates its resources relative to
+the started script, points the script path at the repository so that the
+benchmarks work from any working directory.
+"""
+
+import os
+import sys
+
+
+# Root folder of the repository
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Name of the benchmark script that was started
+script_name = os.path.basename(sys.argv[0])
+
+sys.path.insert(0, root_path)
+sys.argv[0] = os.path.join(root_path, "joystick_gremlin.py")
+
+
+def run(main):
+    """Runs the main function of a benchmark.
+
+    Gremlin's event listener thread is started on import and keeps the
+    process alive, hence it is stopped however the benchmark exits.
+
+    :param main the main function of the benchmark
+    """
+    try:
+        main()
+    finally:
+        import gremlin.event_handler
+        gremlin.event_handler.EventListener().terminate()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Micro-benchmark of the cost of evaluating a response curve per sample.
+
+Compares evaluating the deadzone and spline functions directly with the
+baked curve tables, for both spline types, and reports the largest
+deviation of the table from the exact curve.
+
+Usage: python benchmarks/curve_evaluation.py [samples] [resolution]
+"""
+
+import random
+import sys
+import time
+
+import bootstrap
+
+import gremlin.spline
+from vjoy.vjoy import deadzone
+
+
+curves = {
+    "cubic-spline": [
+        (-1.0, -1.0), (-0.5, -0.2), (0.0, 0.0), (0.5, 0.2), (1.0, 1.0)
+    ],
+    "cubic-bezier-spline": [
+        (-1.0, -1.0), (-0.8, -0.4), (-0.2, -0.1),
+        (0.0, 0.0),
+        (0.2, 0.1), (0.8, 0.4), (1.0, 1.0)
+    ]
+}
+
+deadzone_limits = (-0.95, -0.05, 0.05, 0.95)
+
+
+def time_per_sample(curve_fn, samples):
+    """Returns the average evaluation time of a curve in microseconds.
+
+    :param curve_fn the curve to evaluate
+    :param samples the positions at which to evaluate the curve
+    :return microseconds per evaluation
+    """
+    start = time.perf_counter()
+    for x in samples:
+        curve_fn(x)
+    return (time.perf_counter() - start) / len(samples) * 1e6
+
+
+def main():
+    sample_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    resolution = int(sys.argv[2]) if len(sys.argv) > 2 \
+        else gremlin.spline.CurveTable.default_resolution
+
+    random.seed(0)
+    samples = [random.uniform(-1.0, 1.0) for _ in range(sample_count)]
+
+    print(f"{sample_count} samples, table resolution {resolution}")
+    for spline_type, points in curves.items():
+        spline = gremlin.spline.create_spline(spline_type, points)
+        exact = lambda x: spline(deadzone(x, *deadzone_limits))
+
+        start = time.perf_counter()
+        table = gremlin.spline.create_curve_table(
+            spline_type, points, deadzone_limits, resolution
+        )
+        bake_time = (time.perf_counter() - start) * 1e3
+
+        error = max(abs(exact(x) - table(x)) for x in samples[:20000])
+        print(
+            f"{spline_type:>20}: exact {time_per_sample(exact, samples):6.2f} us"
+            f"  table {time_per_sample(table, samples):6.2f} us"
+            f"  bake {bake_time:6.1f} ms  max error {error:.2e}"
+        )
+
+
+if __name__ == "__main__":
+    bootstrap.run(main)
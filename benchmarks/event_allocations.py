@@ -0,0 +1,159 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Micro-benchmark of the memory allocated while dispatching an axis event.
+
+Compares the previous container callback implementation, which created and
+deep copied a Value for every event and walked a dictionary of transitions,
+with the current one using a pooled Value and jump arrays.
+
+Usage: python benchmarks/event_allocations.py [containers] [events]
+"""
+
+import copy
+import sys
+import time
+import tracemalloc
+
+import bootstrap
+
+import gremlin.common
+import gremlin.event_handler
+import gremlin.execution_graph
+from gremlin import actions
+
+import dinput
+
+
+class _Node:
+
+    """Execution graph node which does nothing but report success."""
+
+    def process_event(self, event, value):
+        value.current = value.raw
+        return True
+
+
+class _Graph(gremlin.execution_graph.AbstractExecutionGraph):
+
+    """Execution graph made of a condition followed by an action."""
+
+    def _build_graph(self, instance):
+        self.functors = [_Node(), _Node()]
+        self._create_transitions(["Condition", "Action"])
+
+
+class _LegacyCallback:
+
+    """Replica of the callback implementation prior to the jump arrays."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.transitions = {}
+        for i in range(len(graph.functors)):
+            if graph.next_on_success[i] >= 0:
+                self.transitions[(i, True)] = graph.next_on_success[i]
+            if graph.next_on_failure[i] >= 0:
+                self.transitions[(i, False)] = graph.next_on_failure[i]
+        self.current_index = 0
+
+    def __call__(self, event):
+        if event.event_type in [
+            gremlin.common.InputType.JoystickAxis,
+            gremlin.common.InputType.JoystickHat
+        ]:
+            value = actions.Value(event.value)
+        else:
+            value = actions.Value(event.is_pressed)
+        shared_value = copy.deepcopy(value)
+
+        while self.current_index is not None and len(self.graph.functors) > 0:
+            functor = self.graph.functors[self.current_index]
+            result = functor.process_event(event, shared_value)
+            self.current_index = self.transitions.get(
+                (self.current_index, result),
+                None
+            )
+        self.current_index = 0
+
+
+def _create_callback():
+    """Returns a container callback without requiring profile data."""
+    callback = gremlin.execution_graph.ContainerCallback.__new__(
+        gremlin.execution_graph.ContainerCallback
+    )
+    callback.execution_graph = _Graph(None)
+    callback._value = actions.Value(None)
+    callback._value_lock = gremlin.execution_graph.threading.Lock()
+    return callback
+
+
+def measure(callbacks, events):
+    """Dispatches the events to all callbacks and reports the cost.
+
+    :param callbacks the callbacks to execute for each event
+    :param events the events to dispatch
+    :return tuple of bytes allocated per event and microseconds per event
+    """
+    # The peak memory use during a single callback invocation is the
+    # memory allocated by it, as nothing allocated survives the call
+    tracemalloc.start()
+    allocated = 0
+    for event in events:
+        for callback in callbacks:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            callback(event)
+            allocated += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for event in events:
+        for callback in callbacks:
+            callback(event)
+    duration = time.perf_counter() - start
+
+    return allocated / len(events), duration / len(events) * 1e6
+
+
+def main():
+    container_count = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    event_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    events = [
+        gremlin.event_handler.Event(
+            event_type=gremlin.common.InputType.JoystickAxis,
+            identifier=1,
+            device_guid=dinput.GUID_Virtual,
+            value=(i % 200) / 100.0 - 1.0
+        ) for i in range(event_count)
+    ]
+
+    current = [_create_callback() for _ in range(container_count)]
+    legacy = [_LegacyCallback(_Graph(None)) for _ in range(container_count)]
+
+    print(f"{container_count} containers, {event_count} axis events")
+    for name, callbacks in [("legacy", legacy), ("current", current)]:
+        allocated, duration = measure(callbacks, events)
+        print(
+            f"{name:>8}: {allocated:10.1f} bytes allocated / event "
+            f"{duration:10.2f} us / event"
+        )
+
+
+if __name__ == "__main__":
+    bootstrap.run(main)
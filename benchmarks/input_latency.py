@@ -0,0 +1,633 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""End-to-end benchmark of the input to vJoy output path.
+
+Simulated devices generate input at a fixed rate per device which passes
+through DILL, the EventListener, the EventHandler, and the callbacks
+created from a profile into a simulated vJoy driver recording every
+change. For each profile and input rate this measures:
+
+ - latency from the injection of an event to the last vJoy change it
+   caused (p50, p99, max)
+ - throughput when injecting events back to back
+ - memory allocated while processing a single event
+
+The results are written to a JSON file. When a baseline file from a
+previous run is given, the run fails if the p99 latency or the throughput
+of any scenario regressed by more than the tolerance.
+
+Usage: python benchmarks/input_latency.py [-h] [options]
+"""
+
+import argparse
+import bisect
+import datetime
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import bootstrap
+
+import gremlin.code_runner
+import gremlin.common
+import gremlin.event_handler
+import gremlin.execution_engine
+import gremlin.plugin_manager
+import gremlin.profile
+from gremlin.common import InputType
+
+import dinput
+import dinput.simulated
+import vjoy.simulated
+import vjoy.vjoy
+
+
+mode_name = "Default"
+
+# Number of axes and buttons of each simulated device used by the profiles
+axis_inputs = 4
+button_inputs = 4
+
+
+class LatencyBackend(dinput.simulated.SimulatedBackend):
+
+    """Simulated backend recording the time each event is injected at."""
+
+    def __init__(self, devices):
+        """Creates a new backend.
+
+        :param devices the simulated devices connected to the backend
+        """
+        super().__init__(devices)
+        self.inject_times = []
+
+    def inject(self, device_guid, input_type, input_index, value):
+        self.inject_times.append(time.perf_counter())
+        super().inject(device_guid, input_type, input_index, value)
+
+
+# Profile creation
+
+def _input_item(profile, device, input_type, input_id):
+    """Returns the input item of a device, adding the device if needed.
+
+    :param profile the profile to which the input belongs
+    :param device the simulated device owning the input
+    :param input_type type of the input
+    :param input_id index of the input
+    :return profile item of the input
+    """
+    if device.guid not in profile.devices:
+        profile.initialize_joystick_device(
+            dinput.DeviceSummary(device.summary()),
+            [mode_name]
+        )
+    mode = profile.devices[device.guid].modes[mode_name]
+    return mode.get_data(input_type, input_id)
+
+
+def _container(profile, device, input_type, input_id, tag):
+    """Adds a new container to an input.
+
+    :param profile the profile to which the input belongs
+    :param device the simulated device owning the input
+    :param input_type type of the input
+    :param input_id index of the input
+    :param tag tag of the container type to create
+    :return the new container
+    """
+    item = _input_item(profile, device, input_type, input_id)
+    container_plugins = gremlin.plugin_manager.ContainerPlugins()
+    container = container_plugins.tag_map[tag](item)
+    item.containers.append(container)
+    if hasattr(container, "action_model"):
+        container.action_model = item.containers
+    return container
+
+
+def _action(container, tag, **properties):
+    """Returns a new action with the given properties.
+
+    :param container the container the action belongs to
+    :param tag tag of the action type to create
+    :param properties values of the action's attributes to set
+    :return the new action
+    """
+    action = gremlin.plugin_manager.ActionPlugins().tag_map[tag](container)
+    for name, value in properties.items():
+        setattr(action, name, value)
+    return action
+
+
+def _remap(container, input_type, vjoy_id, input_id):
+    """Returns a new remap action.
+
+    :param container the container the action belongs to
+    :param input_type type of the vJoy input to remap to
+    :param vjoy_id index of the vJoy device to remap to
+    :param input_id index of the vJoy input to remap to
+    :return the new action
+    """
+    return _action(
+        container,
+        "remap",
+        input_type=input_type,
+        vjoy_device_id=vjoy_id,
+        vjoy_input_id=input_id
+    )
+
+
+def build_axis_remap(profile, devices):
+    """Remaps the axes of each device to the vJoy device of the same index."""
+    for vjoy_id, device in enumerate(devices, 1):
+        for axis in range(1, axis_inputs + 1):
+            container = _container(
+                profile, device, InputType.JoystickAxis, axis, "basic"
+            )
+            container.add_action(
+                _remap(container, InputType.JoystickAxis, vjoy_id, axis)
+            )
+
+
+def build_response_curve(profile, devices):
+    """Applies a response curve before remapping each axis."""
+    for vjoy_id, device in enumerate(devices, 1):
+        for axis in range(1, axis_inputs + 1):
+            container = _container(
+                profile, device, InputType.JoystickAxis, axis, "basic"
+            )
+            container.add_action(_action(
+                container,
+                "response-curve",
+                mapping_type="cubic-bezier-spline",
+                deadzone=[-0.95, -0.05, 0.05, 0.95],
+                control_points=[
+                    (-1.0, -1.0), (-0.8, -0.4), (-0.2, -0.1),
+                    (0.0, 0.0),
+                    (0.2, 0.1), (0.8, 0.4), (1.0, 1.0)
+                ]
+            ))
+            container.add_action(
+                _remap(container, InputType.JoystickAxis, vjoy_id, axis),
+                0
+            )
+
+
+def build_tempo(profile, devices):
+    """Maps short and long presses of each button to two vJoy buttons."""
+    for vjoy_id, device in enumerate(devices, 1):
+        for button in range(1, button_inputs + 1):
+            container = _container(
+                profile, device, InputType.JoystickButton, button, "tempo"
+            )
+            container.activate_on = "press"
+            container.add_action(_remap(
+                container, InputType.JoystickButton, vjoy_id, 2 * button - 1
+            ), 0)
+            container.add_action(_remap(
+                container, InputType.JoystickButton, vjoy_id, 2 * button
+            ), 1)
+
+
+def build_range(profile, devices):
+    """Splits the first axis of each device into four ranges."""
+    bounds = [-1.0, -0.5, 0.0, 0.5, 1.0]
+    for vjoy_id, device in enumerate(devices, 1):
+        for i in range(len(bounds) - 1):
+            container = _container(
+                profile, device, InputType.JoystickAxis, 1, "range"
+            )
+            container.range_min = bounds[i]
+            container.range_max = bounds[i + 1]
+            container.add_action(
+                _remap(container, InputType.JoystickAxis, vjoy_id, i + 1)
+            )
+
+
+def build_merge_axis(profile, devices):
+    """Merges the first two axes of each device into a single vJoy axis."""
+    for vjoy_id, device in enumerate(devices, 1):
+        # Ensure the device is part of the profile
+        _input_item(profile, device, InputType.JoystickAxis, 1)
+        profile.merge_axes.append({
+            "mode": mode_name,
+            "operation": gremlin.common.MergeAxisOperation.Average,
+            "vjoy": {"vjoy_id": vjoy_id, "axis_id": 1},
+            "lower": {"device_guid": device.guid, "axis_id": 1},
+            "upper": {"device_guid": device.guid, "axis_id": 2}
+        })
+
+
+# Input generation
+
+def _axis_value(phase):
+    """Returns the raw value of an axis following a sine wave.
+
+    :param phase position along the wave in periods
+    :return raw DILL axis value
+    """
+    return int(round(math.sin(2.0 * math.pi * phase) * 32767))
+
+
+def device_stream(device, inputs, rate, duration, offset):
+    """Returns the events generated by a single device.
+
+    The device reports at the given rate, each report changing the next
+    input in round robin order. Axes follow sine waves with a period of one
+    second and buttons alternate between pressed and released.
+
+    :param device the simulated device generating the events
+    :param inputs list of (input type, index) tuples changed by the device
+    :param rate number of events per second
+    :param duration length of the stream in seconds
+    :param offset time of the first event in seconds
+    :return list of SimulatedEvent instances ordered by time
+    """
+    events = []
+    pressed = {}
+    for i in range(int(rate * duration)):
+        t = i / rate
+        input_type, index = inputs[i % len(inputs)]
+        if input_type == dinput.InputType.Axis:
+            value = _axis_value(t + index / 8.0)
+        else:
+            pressed[index] = not pressed.get(index, False)
+            value = 1 if pressed[index] else 0
+        events.append(dinput.simulated.SimulatedEvent(
+            offset + t, device.guid, input_type, index, value
+        ))
+    return events
+
+
+axis_input_list = [(dinput.InputType.Axis, i) for i in range(1, axis_inputs + 1)]
+button_input_list = \
+    [(dinput.InputType.Button, i) for i in range(1, button_inputs + 1)]
+
+# Benchmarked scenarios, each a function adding content to a profile and
+# the inputs changed by each device
+scenarios = {
+    "axis-remap": (build_axis_remap, axis_input_list),
+    "response-curve": (build_response_curve, axis_input_list),
+    "tempo": (build_tempo, button_input_list),
+    "range": (build_range, [(dinput.InputType.Axis, 1)]),
+    "merge-axis": (build_merge_axis, axis_input_list[:2]),
+}
+
+
+# Measurement
+
+def percentile(values, fraction):
+    """Returns the given percentile of a list of values.
+
+    :param values sorted list of values
+    :param fraction the percentile as a fraction in [0, 1]
+    :return value at the percentile, None if there are no values
+    """
+    if len(values) == 0:
+        return None
+    index = min(len(values) - 1, int(math.ceil(fraction * len(values))) - 1)
+    return values[max(0, index)]
+
+
+def event_latencies(inject_times, records):
+    """Returns the latency of every event that resulted in vJoy output.
+
+    Every vJoy change is attributed to the most recent event injected
+    before it, the latency of an event is the time from its injection to
+    the last change attributed to it.
+
+    :param inject_times the times at which events were injected
+    :param records the OutputRecord instances of the vJoy driver
+    :return list of latencies in seconds
+    """
+    last_output = {}
+    for record in records:
+        index = bisect.bisect_right(inject_times, record.time) - 1
+        if index >= 0:
+            last_output[index] = record.time
+    return [t - inject_times[i] for i, t in last_output.items()]
+
+
+class Benchmark:
+
+    """Runs scenarios through the complete input processing path."""
+
+    def __init__(self, device_count, threaded, batched):
+        """Sets up simulated input and output devices.
+
+        :param device_count number of simulated input devices
+        :param threaded if True events are processed by the dedicated input
+            thread, otherwise on the thread that generates them
+        :param batched if True vJoy changes are sent as a single report
+            per event
+        """
+        self.devices = [
+            dinput.simulated.SimulatedDevice(f"Benchmark Device {i:d}")
+            for i in range(1, device_count + 1)
+        ]
+        self.backend = LatencyBackend(self.devices)
+        self.driver = vjoy.simulated.SimulatedDriver(device_count=device_count)
+        self.driver.install()
+        dinput.DILL.set_backend(self.backend)
+        dinput.DILL.init()
+        vjoy.vjoy.report_batcher.configure(batched)
+
+        self.handler = gremlin.event_handler.EventHandler()
+        self.engine = None
+        listener = gremlin.event_handler.EventListener()
+        if threaded:
+            self.engine = gremlin.execution_engine.ExecutionEngine()
+            self.engine.start(self.handler.process_event)
+            listener.set_event_sink(self.engine.enqueue)
+        else:
+            listener.set_event_sink(self.handler.process_event)
+
+        # The listener registers its callbacks from its own thread
+        while self.backend._input_callback is None:
+            time.sleep(0.01)
+
+    def load(self, build_fn):
+        """Replaces the active callbacks with the ones of a new profile.
+
+        :param build_fn function adding the profile's content
+        """
+        profile = gremlin.profile.Profile()
+        build_fn(profile, self.devices)
+
+        self.handler.clear()
+        gremlin.plugin_manager.ContainerPlugins().reset_functors()
+        gremlin.code_runner.create_profile_callbacks(self.handler, profile)
+        self.handler.build_event_lookup({mode_name: {}})
+        # Activate the mode without persisting it in the user configuration
+        self.handler._active_mode = mode_name
+        self.handler.compile_dispatch_table()
+        self.handler.resume()
+
+    def run_timed(self, events):
+        """Plays back events in real time and measures their latency.
+
+        :param events SimulatedEvent instances ordered by time
+        :return list of latencies in seconds
+        """
+        self._reset()
+        self.backend.play(events, wait=True)
+        self._wait_for_engine()
+        return event_latencies(self.backend.inject_times, self.driver.records)
+
+    def run_throughput(self, events):
+        """Injects events back to back.
+
+        :param events SimulatedEvent instances to inject
+        :return number of events processed per second
+        """
+        self._reset()
+        start = time.perf_counter()
+        for evt in events:
+            self.backend.inject(
+                evt.device_guid, evt.input_type, evt.input_index, evt.value
+            )
+        self._wait_for_engine()
+        return len(events) / (time.perf_counter() - start)
+
+    def run_allocations(self, events):
+        """Measures the memory allocated while processing single events.
+
+        :param events SimulatedEvent instances to inject
+        :return average number of bytes allocated per event
+        """
+        self._reset()
+        tracemalloc.start()
+        allocated = 0
+        for evt in events:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            self.backend.inject(
+                evt.device_guid, evt.input_type, evt.input_index, evt.value
+            )
+            self._wait_for_engine()
+            allocated += tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+        return allocated / len(events)
+
+    def stop(self):
+        """Stops the threads used for processing."""
+        if self.engine is not None:
+            self.engine.stop()
+        vjoy.vjoy.report_batcher.configure(False)
+        gremlin.event_handler.EventListener().terminate()
+
+    def _reset(self):
+        """Removes the results of previous runs."""
+        self._wait_for_engine()
+        self.backend.inject_times = []
+        self.driver.clear()
+
+    def _wait_for_engine(self):
+        """Waits until the input processing thread is idle."""
+        if self.engine is None:
+            return
+        while self.engine.statistics()["depth"] > 0:
+            time.sleep(0.0005)
+
+
+def run_scenarios(benchmark, names, rates, duration, allocation_events):
+    """Runs every scenario at every rate.
+
+    :param benchmark the Benchmark instance to use
+    :param names names of the scenarios to run
+    :param rates input rates per device in Hz
+    :param duration length of each timed run in seconds
+    :param allocation_events number of events used to measure allocations
+    :return list of result dictionaries
+    """
+    results = []
+    for name in names:
+        build_fn, inputs = scenarios[name]
+        benchmark.load(build_fn)
+
+        for rate in rates:
+            device_count = len(benchmark.devices)
+            events = dinput.simulated.merge_streams(*[
+                device_stream(
+                    device,
+                    inputs,
+                    rate,
+                    duration,
+                    i / (rate * device_count)
+                ) for i, device in enumerate(benchmark.devices)
+            ])
+
+            latencies = sorted(benchmark.run_timed(events))
+            throughput = benchmark.run_throughput(events)
+            allocated = benchmark.run_allocations(events[:allocation_events])
+
+            result = {
+                "scenario": name,
+                "rate_hz": rate,
+                "devices": device_count,
+                "events": len(events),
+                "events_with_output": len(latencies),
+                "latency_p50_us": _to_us(percentile(latencies, 0.5)),
+                "latency_p99_us": _to_us(percentile(latencies, 0.99)),
+                "latency_max_us": _to_us(latencies[-1] if latencies else None),
+                "throughput_events_per_s": round(throughput, 1),
+                "allocated_bytes_per_event": round(allocated, 1),
+            }
+            results.append(result)
+            print(
+                f"{name:>15} {rate:5d} Hz: "
+                f"p50 {_format_us(result['latency_p50_us'])} "
+                f"p99 {_format_us(result['latency_p99_us'])} "
+                f"max {_format_us(result['latency_max_us'])}  "
+                f"{throughput:9.0f} events/s  "
+                f"{allocated:8.0f} bytes/event"
+            )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Returns the regressions of results relative to a baseline.
+
+    :param results list of result dictionaries of this run
+    :param baseline list of result dictionaries of a previous run
+    :param tolerance allowed relative regression
+    :return list of messages describing each regression
+    """
+    reference = {(r["scenario"], r["rate_hz"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        ref = reference.get((result["scenario"], result["rate_hz"]))
+        if ref is None:
+            continue
+        label = f"{result['scenario']} @ {result['rate_hz']} Hz"
+        if result["latency_p99_us"] is not None \
+                and ref["latency_p99_us"] is not None \
+                and result["latency_p99_us"] > \
+                    ref["latency_p99_us"] * (1.0 + tolerance):
+            regressions.append(
+                f"{label}: p99 latency {ref['latency_p99_us']} us -> "
+                f"{result['latency_p99_us']} us"
+            )
+        if result["throughput_events_per_s"] < \
+                ref["throughput_events_per_s"] * (1.0 - tolerance):
+            regressions.append(
+                f"{label}: throughput {ref['throughput_events_per_s']} -> "
+                f"{result['throughput_events_per_s']} events/s"
+            )
+    return regressions
+
+
+def _to_us(seconds):
+    return None if seconds is None else round(seconds * 1e6, 1)
+
+
+def _format_us(value):
+    return "     n/a" if value is None else f"{value:6.0f}us"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog=bootstrap.script_name,
+        description="Measures the latency from input events to vJoy output"
+    )
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(scenarios.keys()),
+        help="comma separated list of scenarios to run"
+    )
+    parser.add_argument(
+        "--rates",
+        default="250,500,1000",
+        help="comma separated list of input rates per device in Hz"
+    )
+    parser.add_argument(
+        "--devices", type=int, default=1,
+        help="number of simulated input devices"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=2.0,
+        help="length of each timed run in seconds"
+    )
+    parser.add_argument(
+        "--allocation-events", type=int, default=500,
+        help="number of events used to measure allocations"
+    )
+    parser.add_argument(
+        "--threaded", action="store_true",
+        help="process events on the dedicated input thread"
+    )
+    parser.add_argument(
+        "--batched", action="store_true",
+        help="send vJoy changes as one report per event"
+    )
+    parser.add_argument(
+        "--output", default="input_latency.json",
+        help="file the results are written to"
+    )
+    parser.add_argument(
+        "--baseline",
+        help="results of a previous run to check for regressions"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="allowed relative regression compared to the baseline"
+    )
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    for name in names:
+        if name not in scenarios:
+            parser.error(f"unknown scenario \"{name}\"")
+    rates = [int(r) for r in args.rates.split(",")]
+
+    benchmark = Benchmark(args.devices, args.threaded, args.batched)
+    try:
+        results = run_scenarios(
+            benchmark, names, rates, args.duration, args.allocation_events
+        )
+    finally:
+        benchmark.stop()
+
+    with open(args.output, "w") as fh:
+        json.dump({
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "threaded": args.threaded,
+            "batched": args.batched,
+            "duration_s": args.duration,
+            "results": results
+        }, fh, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for msg in regressions:
+            print(f"REGRESSION {msg}")
+        if len(regressions) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    bootstrap.run(main)
@@ -0,0 +1,241 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of loading a large profile.
+
+Writes a synthetic profile in which every input of a set of simulated
+devices, in every mode, has a container with a remap and a description
+action, 5,000 inputs by default. The profile is then loaded repeatedly and
+this reports the median of:
+
+ - reading the XML document the way the previous loader did, i.e. parsing
+   it once to check its version and once more to process it
+ - reading the XML document in the single streaming pass of the loader
+ - loading the profile without a cached snapshot, i.e. parsing it and
+   building all objects, including storing the snapshot
+ - loading the profile from its cached snapshot, e.g. when switching back
+   to a recently used game
+
+Usage: python benchmarks/profile_loading.py [-h] [options]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+from xml.etree import ElementTree
+
+import bootstrap
+
+import gremlin.event_handler
+import gremlin.joystick_handling
+import gremlin.plugin_manager
+import gremlin.profile
+from gremlin.common import InputType
+
+import dinput
+import dinput.simulated
+import vjoy.simulated
+
+
+# Inputs of each simulated device
+axis_count = 8
+hat_count = 4
+
+
+def create_profile(fname, devices, mode_count, input_count):
+    """Writes a synthetic profile.
+
+    :param fname path of the profile to write
+    :param devices the simulated devices the profile configures
+    :param mode_count number of modes of each device
+    :param input_count total number of configured inputs
+    """
+    profile = gremlin.profile.Profile()
+    mode_names = [f"Mode {i:d}" for i in range(1, mode_count + 1)]
+    container_type = \
+        gremlin.plugin_manager.ContainerPlugins().tag_map["basic"]
+    action_plugins = gremlin.plugin_manager.ActionPlugins()
+
+    per_mode = input_count // (len(devices) * mode_count)
+    inputs = [(InputType.JoystickAxis, i) for i in range(1, axis_count + 1)] \
+        + [(InputType.JoystickHat, i) for i in range(1, hat_count + 1)]
+    inputs = inputs[:per_mode]
+    button_count = per_mode - len(inputs)
+    inputs += [(InputType.JoystickButton, i) for i in range(1, button_count + 1)]
+
+    for device in devices:
+        profile.initialize_joystick_device(
+            dinput.DeviceSummary(device.summary()),
+            mode_names
+        )
+        for mode in profile.devices[device.guid].modes.values():
+            for input_type, input_id in inputs:
+                item = mode.get_data(input_type, input_id)
+                item.description = f"{mode.name} input {input_id:d}"
+                container = container_type(item)
+                remap = action_plugins.tag_map["remap"](container)
+                remap.input_type = input_type
+                remap.vjoy_device_id = 1
+                remap.vjoy_input_id = input_id
+                container.add_action(remap)
+                description = action_plugins.tag_map["description"](container)
+                description.description = item.description
+                container.add_action(description, 0)
+                item.containers.append(container)
+    profile.to_xml(fname)
+
+
+def median_time(fn, repeats):
+    """Returns the median duration of a function call.
+
+    :param fn the function to time
+    :param repeats number of times the function is called
+    :return median duration in seconds
+    """
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def read_two_pass(fname):
+    """Reads a profile document the way the previous loader did.
+
+    :param fname path of the profile to read
+    """
+    gremlin.profile.ProfileConverter().is_current(fname)
+    ElementTree.parse(fname)
+
+
+def read_streaming(fname):
+    """Reads a profile document in a single streaming pass.
+
+    :param fname path of the profile to read
+    """
+    with open(fname, "rb") as fh:
+        data = fh.read()
+    for _, node in ElementTree.iterparse(io.BytesIO(data)):
+        if node.tag == "device":
+            node.clear()
+
+
+def load_profile(fname):
+    """Loads a profile.
+
+    :param fname path of the profile to load
+    :return the loaded profile
+    """
+    profile = gremlin.profile.Profile()
+    profile.from_xml(fname)
+    return profile
+
+
+def load_uncached(fname):
+    """Loads a profile without using a cached snapshot.
+
+    :param fname path of the profile to load
+    """
+    gremlin.profile.ProfileCache().clear()
+    load_profile(fname)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog=bootstrap.script_name,
+        description="Benchmark of loading a large profile"
+    )
+    parser.add_argument(
+        "--inputs", type=int, default=5000,
+        help="number of configured inputs"
+    )
+    parser.add_argument(
+        "--devices", type=int, default=4, help="number of devices"
+    )
+    parser.add_argument(
+        "--modes", type=int, default=5, help="number of modes of each device"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=5,
+        help="number of times each measurement is repeated"
+    )
+    args = parser.parse_args()
+
+    per_mode = args.inputs // (args.devices * args.modes)
+    devices = [
+        dinput.simulated.SimulatedDevice(
+            f"Benchmark Device {i:d}",
+            axis_count=axis_count,
+            button_count=max(1, per_mode - axis_count - hat_count),
+            hat_count=hat_count
+        )
+        for i in range(1, args.devices + 1)
+    ]
+    vjoy.simulated.SimulatedDriver(button_count=per_mode).install()
+    dinput.DILL.set_backend(dinput.simulated.SimulatedBackend(devices))
+    dinput.DILL.init()
+    gremlin.joystick_handling.joystick_devices_initialization()
+
+    fd, fname = tempfile.mkstemp(suffix=".xml")
+    os.close(fd)
+    try:
+        create_profile(fname, devices, args.modes, args.inputs)
+        cache = gremlin.profile.ProfileCache()
+        profile = load_profile(fname)
+        item_count = sum(
+            len(mode.config[input_type])
+            for device in profile.devices.values()
+            for mode in device.modes.values()
+            for input_type in mode.config
+        )
+        snapshot = cache._entries.get(cache.key(open(fname, "rb").read()))
+
+        print(
+            f"{item_count} inputs, {args.devices} devices with "
+            f"{args.modes} modes, {os.path.getsize(fname) / 1024:.0f} KiB "
+            f"of XML, {len(snapshot or b'') / 1024:.0f} KiB snapshot"
+        )
+        results = [
+            ("XML, two pass", median_time(
+                lambda: read_two_pass(fname), args.repeats
+            )),
+            ("XML, streaming", median_time(
+                lambda: read_streaming(fname), args.repeats
+            )),
+            ("load, uncached", median_time(
+                lambda: load_uncached(fname), args.repeats
+            )),
+        ]
+        load_profile(fname)
+        results.append(("load, cached", median_time(
+            lambda: load_profile(fname), args.repeats
+        )))
+
+        print(f"{'measurement':<16} {'ms':>9}")
+        for name, duration in results:
+            print(f"{name:<16} {duration * 1e3:>9.1f}")
+        print(f"cache hits {cache.hits}, misses {cache.misses}")
+    finally:
+        os.remove(fname)
+
+
+if __name__ == "__main__":
+    bootstrap.run(main)
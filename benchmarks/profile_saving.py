@@ -0,0 +1,205 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of saving a large profile.
+
+Uses the synthetic profile of the profile loading benchmark, 5,000 inputs
+by default, and reports the median duration and the peak memory allocated
+by:
+
+ - saving the profile the way it was done before, i.e. serializing the
+   complete ElementTree, parsing it with minidom and pretty printing it
+ - saving the profile with the streaming writer
+ - checking whether the profile changed by writing it to a temporary file
+   and hashing both files, as done before
+ - checking whether the profile changed using its digest
+
+It also reports whether both ways of saving produce the same document.
+
+Usage: python benchmarks/profile_saving.py [-h] [options]
+"""
+
+import argparse
+import codecs
+import hashlib
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from xml.dom import minidom
+from xml.etree import ElementTree
+
+import bootstrap
+
+import gremlin.event_handler
+import gremlin.joystick_handling
+import gremlin.profile
+
+import dinput
+import dinput.simulated
+import vjoy.simulated
+
+from profile_loading import axis_count, create_profile, hat_count
+
+
+def save_minidom(profile, fname):
+    """Saves a profile by pretty printing it with minidom.
+
+    :param profile the profile to save
+    :param fname path of the file to write
+    """
+    root = ElementTree.Element("profile")
+    root.set("version", str(gremlin.profile.ProfileConverter.current_version))
+    devices = ElementTree.SubElement(root, "devices")
+    for device in sorted(profile.devices.values(), key=lambda x: str(x.device_guid)):
+        devices.append(device.to_xml())
+    vjoy_devices = ElementTree.SubElement(root, "vjoy-devices")
+    for device in profile.vjoy_devices.values():
+        vjoy_devices.append(device.to_xml())
+    for entry in profile.merge_axes:
+        root.append(profile._merge_axis_to_xml(entry))
+    root.append(profile.settings.to_xml())
+    plugins = ElementTree.SubElement(root, "plugins")
+    for plugin in profile.plugins:
+        plugins.append(plugin.to_xml())
+
+    ugly_xml = ElementTree.tostring(root, encoding="utf-8")
+    dom_xml = minidom.parseString(ugly_xml)
+    with codecs.open(fname, "w", "utf-8-sig") as out:
+        out.write(dom_xml.toprettyxml(indent="    "))
+
+
+def changed_via_file(profile, fname, tmp_fname):
+    """Checks for changes by saving the profile and comparing the files.
+
+    :param profile the profile to check
+    :param fname path of the profile's file
+    :param tmp_fname path of the temporary file to write
+    :return True if the files differ, False otherwise
+    """
+    save_minidom(profile, tmp_fname)
+    current_sha = hashlib.sha256(
+        open(tmp_fname, encoding="utf-8").read().encode("utf-8")
+    ).hexdigest()
+    profile_sha = hashlib.sha256(
+        open(fname, encoding="utf-8").read().encode("utf-8")
+    ).hexdigest()
+    return current_sha != profile_sha
+
+
+def measure(fn, repeats):
+    """Returns the median duration and the peak allocation of a function.
+
+    :param fn the function to measure
+    :param repeats number of times the function is timed
+    :return median duration in seconds and peak allocation in bytes
+    """
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(durations), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog=bootstrap.script_name,
+        description="Benchmark of saving a large profile"
+    )
+    parser.add_argument(
+        "--inputs", type=int, default=5000,
+        help="number of configured inputs"
+    )
+    parser.add_argument(
+        "--devices", type=int, default=4, help="number of devices"
+    )
+    parser.add_argument(
+        "--modes", type=int, default=5, help="number of modes of each device"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=5,
+        help="number of times each measurement is repeated"
+    )
+    args = parser.parse_args()
+
+    per_mode = args.inputs // (args.devices * args.modes)
+    devices = [
+        dinput.simulated.SimulatedDevice(
+            f"Benchmark Device {i:d}",
+            axis_count=axis_count,
+            button_count=max(1, per_mode - axis_count - hat_count),
+            hat_count=hat_count
+        )
+        for i in range(1, args.devices + 1)
+    ]
+    vjoy.simulated.SimulatedDriver(button_count=per_mode).install()
+    dinput.DILL.set_backend(dinput.simulated.SimulatedBackend(devices))
+    dinput.DILL.init()
+    gremlin.joystick_handling.joystick_devices_initialization()
+
+    folder = tempfile.mkdtemp()
+    fname = os.path.join(folder, "profile.xml")
+    minidom_fname = os.path.join(folder, "minidom.xml")
+    tmp_fname = os.path.join(folder, "gremlin.xml")
+    try:
+        create_profile(fname, devices, args.modes, args.inputs)
+        profile = gremlin.profile.Profile()
+        profile.from_xml(fname)
+
+        results = [
+            ("save, minidom", measure(
+                lambda: save_minidom(profile, minidom_fname), args.repeats
+            )),
+            ("save, streaming", measure(
+                lambda: profile.to_xml(fname), args.repeats
+            )),
+            ("changed, file", measure(
+                lambda: changed_via_file(profile, fname, tmp_fname),
+                args.repeats
+            )),
+            ("changed, digest", measure(
+                profile.has_changed, args.repeats
+            )),
+        ]
+
+        with open(fname, "rb") as fh:
+            streamed = fh.read()
+        with open(minidom_fname, "rb") as fh:
+            identical = fh.read() == streamed
+        print(
+            f"{args.inputs} inputs, {len(streamed) / 1024:.0f} KiB of XML, "
+            f"documents {'identical' if identical else 'differ'}"
+        )
+        print(f"{'measurement':<16} {'ms':>9} {'peak MiB':>9}")
+        for name, (duration, peak) in results:
+            print(f"{name:<16} {duration * 1e3:>9.1f} {peak / 2**20:>9.1f}")
+    finally:
+        for path in [fname, minidom_fname, tmp_fname]:
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(folder)
+
+
+if __name__ == "__main__":
+    bootstrap.run(main)
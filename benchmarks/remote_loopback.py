@@ -0,0 +1,277 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Loopback benchmark of the remote control channel.
+
+Runs a GremlinServer and the RemoteClient in one process, connected through
+the loopback interface, with the server driving a simulated vJoy driver.
+A set of axes is mirrored to the server at a fixed input rate, half of them
+moving and half of them barely changing. For each axis rate, i.e. the
+number of aggregated axis frames per second with 0 sending every change
+immediately, this reports:
+
+ - datagrams and bytes sent
+ - axis updates dropped by the aggregation
+ - frames lost or reordered
+ - datagrams dropped by the receiver's queue and its largest depth
+ - latency from the send_axis call to the vJoy change (p50, p99, max)
+ - CPU time used by the process per second of streaming
+
+Usage: python benchmarks/remote_loopback.py [-h] [options]
+"""
+
+import argparse
+import bisect
+import collections
+import math
+import struct
+import threading
+import time
+
+import bootstrap
+
+import gremlin.event_handler
+import gremlin.input_devices
+import gremlin.joystick_handling
+import gremlin.remote_protocol
+from gremlin.remote_protocol import Opcode
+
+import vjoy.simulated
+
+
+vjoy_id = 1
+
+
+def _float32(value):
+    """Returns a value rounded to the precision used on the wire.
+
+    :param value the value to round
+    :return value as represented by a 32 bit float
+    """
+    return struct.unpack("<f", struct.pack("<f", value))[0]
+
+
+def _axis_value(axis_id, t):
+    """Returns the value of an axis at a point in time.
+
+    The first half of the axes moves along sine waves while the others
+    only jitter by less than the aggregation epsilon.
+
+    :param axis_id id of the axis
+    :param t time in seconds since the start of the stream
+    :return axis value
+    """
+    if axis_id % 2 == 1:
+        return math.sin(2.0 * math.pi * (t + axis_id / 8.0))
+    return 0.25 + 1e-5 * math.sin(2.0 * math.pi * 50.0 * t)
+
+
+def percentile(values, fraction):
+    """Returns the given percentile of a list of values.
+
+    :param values the values to evaluate
+    :param fraction the percentile as a fraction in [0, 1]
+    :return value at the percentile
+    """
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Loopback:
+
+    """Server and client connected through the loopback interface."""
+
+    def __init__(self, axis_count, legacy):
+        """Starts the server and connects the client to it.
+
+        :param axis_count number of axes of the vJoy device
+        :param legacy if True the client keeps using the msgpack format
+        """
+        self.driver = vjoy.simulated.SimulatedDriver(axis_count=axis_count)
+        self.driver.install()
+        gremlin.joystick_handling.VJoyProxy()[vjoy_id]
+
+        self.received = []
+        handlers = dict(gremlin.input_devices.remote_handlers)
+        axis_handler = handlers[Opcode.Axis]
+
+        def receive_axis(frame, device, target, value):
+            axis_handler(frame, device, target, value)
+            self.received.append((time.perf_counter(), target, value))
+        handlers[Opcode.Axis] = receive_axis
+
+        # Client and server share the same id, hence nothing is ignored
+        self.server = gremlin.input_devices.GremlinServer(
+            ("127.0.0.1", 0),
+            gremlin.remote_protocol.Dispatcher(handlers)
+        )
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever,
+            daemon=True
+        )
+        self.server_thread.start()
+
+        self.client = gremlin.input_devices.remote_client
+        self.client._address = self.server.server_address
+        self.client._broadcast_enabled = not legacy
+        self.client.start()
+        if not legacy:
+            # Enabled here rather than in the configuration, which would
+            # otherwise be changed permanently
+            self.client._negotiation.enabled = True
+            timeout = time.time() + 5.0
+            while not self.client.binary_protocol and time.time() < timeout:
+                time.sleep(0.01)
+            if not self.client.binary_protocol:
+                self.stop()
+                raise RuntimeError("Binary protocol was not negotiated")
+
+        self.bytes_sent = 0
+        send = self.client._send
+
+        def count_bytes(data=None):
+            if data:
+                self.bytes_sent += len(data)
+            send(data)
+        self.client._send = count_bytes
+
+    def run(self, axis_rate, axis_count, input_rate, duration):
+        """Streams axis changes and returns the measured results.
+
+        :param axis_rate number of aggregated axis frames per second
+        :param axis_count number of axes mirrored
+        :param input_rate number of changes per second of each axis
+        :param duration length of the stream in seconds
+        :return dictionary of results
+        """
+        self.client.set_axis_rate(axis_rate)
+        statistics = self.server.dispatcher.statistics
+        statistics.reset()
+        overflow = self.server.dropped
+        self.server.max_queue_depth = 0
+        self.received = []
+        self.bytes_sent = 0
+        frames_sent = self.client.statistics["frames"]
+        dropped = self.client.statistics["axis_dropped"]
+
+        # Send times of each value, values repeat hence the reception is
+        # attributed to the latest send of the value preceding it
+        sent = collections.defaultdict(list)
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        for i in range(int(input_rate * duration)):
+            t = i / input_rate
+            while time.perf_counter() < start + t:
+                time.sleep(0)
+            for axis_id in range(1, axis_count + 1):
+                value = _axis_value(axis_id, t)
+                sent[(axis_id, _float32(value))].append(time.perf_counter())
+                self.client.send_axis(
+                    vjoy_id, axis_id, value, force_remote=True
+                )
+        self.client.set_axis_rate(0)
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+
+        # Wait for outstanding datagrams
+        time.sleep(0.25)
+        latencies = []
+        for received_time, axis_id, value in self.received:
+            times = sent.get((axis_id, _float32(value)), [])
+            index = bisect.bisect_right(times, received_time)
+            if index > 0:
+                latencies.append(received_time - times[index - 1])
+
+        return {
+            "datagrams": self.client.statistics["frames"] - frames_sent,
+            "bytes": self.bytes_sent,
+            "dropped": self.client.statistics["axis_dropped"] - dropped,
+            "received": len(self.received),
+            "lost": statistics.lost,
+            "reordered": statistics.reordered,
+            "overflow": self.server.dropped - overflow,
+            "queue": self.server.max_queue_depth,
+            "p50": percentile(latencies, 0.5),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies) if latencies else float("nan"),
+            "cpu": cpu / elapsed
+        }
+
+    def stop(self):
+        """Stops client and server."""
+        self.client.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        gremlin.joystick_handling.VJoyProxy.reset()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog=bootstrap.script_name,
+        description="Loopback benchmark of the remote control channel"
+    )
+    parser.add_argument(
+        "--axis-rates", default="0,125,250,500",
+        help="comma separated axis frame rates, 0 sends changes immediately"
+    )
+    parser.add_argument(
+        "--axes", type=int, default=8, help="number of axes mirrored"
+    )
+    parser.add_argument(
+        "--input-rate", type=float, default=500.0,
+        help="changes per second of each axis"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=2.0,
+        help="length of each stream in seconds"
+    )
+    parser.add_argument(
+        "--legacy", action="store_true",
+        help="use the msgpack format instead of binary frames"
+    )
+    args = parser.parse_args()
+
+    loopback = Loopback(args.axes, args.legacy)
+    print(
+        f"{args.axes} axes at {args.input_rate:g} Hz for {args.duration:g}s, "
+        f"{'msgpack' if args.legacy else 'binary'} protocol"
+    )
+    print(
+        f"{'axis rate':>9} {'datagrams':>9} {'bytes':>9} {'dropped':>8} "
+        f"{'lost':>5} {'overflow':>8} {'queue':>5} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'cpu':>5}"
+    )
+    try:
+        for axis_rate in [int(v) for v in args.axis_rates.split(",")]:
+            result = loopback.run(
+                axis_rate, args.axes, args.input_rate, args.duration
+            )
+            print(
+                f"{axis_rate:>9} {result['datagrams']:>9} "
+                f"{result['bytes']:>9} {result['dropped']:>8} "
+                f"{result['lost']:>5} {result['overflow']:>8} "
+                f"{result['queue']:>5} {result['p50'] * 1e3:>7.2f} "
+                f"{result['p99'] * 1e3:>7.2f} {result['max'] * 1e3:>7.2f} "
+                f"{result['cpu']:>5.0%}"
+            )
+    finally:
+        loopback.stop()
+
+
+if __name__ == "__main__":
+    bootstrap.run(main)
@@ -180,9 +180,9 @@ class ChainContainerFunctor(gremlin.base_classes.AbstractFunctor):
 
     def process_event(self, event, value):
         if self.timeout > 0.0:
-            if self.last_execution + self.timeout < time.time():
+            if self.last_execution + self.timeout < time.monotonic():
                 self.index = 0
-            self.last_execution = time.time()
+            self.last_execution = time.monotonic()
 
         result = self.action_sets[self.index].process_event(event, value)
 
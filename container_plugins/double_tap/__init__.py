@@ -15,15 +15,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import copy
 import logging
-import threading
 import time
 from xml.etree import ElementTree
 
 from PySide6 import QtWidgets
 
 import gremlin
+import gremlin.scheduler
 import gremlin.ui.common
 import gremlin.ui.input_item
 
@@ -256,13 +255,13 @@ class DoubleTapContainerFunctor(gremlin.base_classes.AbstractFunctor):
                 
                 # Copy state when input is pressed
                 if value.current:
-                    self.value_press = copy.deepcopy(value)
+                    self.value_press = value.clone()
                     self.event_press = event.clone()
 
                 # Execute double tap logic
                 if value.current:
                     # Second activation within the delay, i.e. second tap
-                    if (self.start_time + self.delay) > time.time():
+                    if (self.start_time + self.delay) > time.monotonic():
                         # Prevent repeated double taps from repeated button presses
                         self.start_time = 0
                         self.tap_type = "double"
@@ -270,23 +269,27 @@ class DoubleTapContainerFunctor(gremlin.base_classes.AbstractFunctor):
                             self.double_action_timer.cancel()
                     # First acitvation within the delay, i.e. first tap
                     else:
-                        self.start_time = time.time()
+                        self.start_time = time.monotonic()
                         self.tap_type = "single"
                         if self.activate_on == "exclusive":
                             self.double_action_timer = \
-                                threading.Timer(self.delay, self._single_tap)
-                            self.double_action_timer.start()
+                                gremlin.scheduler.TimerWheel().schedule(
+                                    self.delay,
+                                    self._single_tap
+                                )
 
                 # Input is being released at this point
-                elif self.double_action_timer and self.double_action_timer.is_alive():
+                elif self.double_action_timer and self.double_action_timer.active:
                     # if releasing single tap before delay
                     # we will want to send a short press and release
                     self.double_action_timer.cancel()
-                    self.double_action_timer = threading.Timer(
-                        (self.start_time + self.delay) - time.time(),
-                        lambda: self._single_tap(event, value)
-                    )
-                    self.double_action_timer.start()
+                    self.double_action_timer = \
+                        gremlin.scheduler.TimerWheel().schedule(
+                            (self.start_time + self.delay) - time.monotonic(),
+                            self._single_tap,
+                            event.clone(),
+                            value.clone()
+                        )
 
                 if self.tap_type == "double":
                     self.double_tap.process_event(event, value)
@@ -304,9 +307,19 @@ class DoubleTapContainerFunctor(gremlin.base_classes.AbstractFunctor):
         self.processed_single_tap = False
         self.single_tap.process_event(self.event_press, self.value_press)
         if event_release:
-            time.sleep(0.05)
-            self.single_tap.process_event(event_release, value_release)
-            self.processed_single_tap = True
+            self.double_action_timer = \
+                gremlin.scheduler.TimerWheel().schedule(
+                    0.05,
+                    self._single_tap_release,
+                    event_release,
+                    value_release,
+                    stop_policy=gremlin.scheduler.StopPolicy.Run
+                )
+
+    def _single_tap_release(self, event_release, value_release):
+        """Callback releasing the single tap action after a short press."""
+        self.single_tap.process_event(event_release, value_release)
+        self.processed_single_tap = True
 
 class DoubleTapContainer(gremlin.base_classes.AbstractContainer):
 
@@ -389,7 +389,8 @@ class RangeContainerFunctor(gremlin.base_classes.AbstractFunctor):
     def __init__(self, container):
         container: RangeContainer
         super().__init__(container)
-        
+        self.container = container
+
         self.action_sets = []
         for action_set in container.action_sets:
             self.action_sets.append(
@@ -197,7 +197,7 @@ class SmartToggleContainerFunctor(gremlin.base_classes.AbstractFunctor):
             # Currently not in either toggle or hold mode
             if self.mode is None:
                 self.action_set.process_event(event, value)
-                self.activation_time = time.time()
+                self.activation_time = time.monotonic()
 
             # Run release logic when the second press happens in toggle mode
             elif self.mode == "toggle":
@@ -211,10 +211,10 @@ class SmartToggleContainerFunctor(gremlin.base_classes.AbstractFunctor):
             # If the input is release before the hold timeout occurs switch
             # to toggle mode and store the event for artificial release on
             # next input press
-            if self.activation_time + self.delay > time.time():
+            if self.activation_time + self.delay > time.monotonic():
                 self.mode = "toggle"
                 self.release_event = event.clone()
-                self.release_value = value
+                self.release_value = value.clone()
 
             # Run release logic when the release event occurs in hold mode
             else:
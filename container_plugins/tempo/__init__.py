@@ -15,15 +15,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import copy
 import logging
-import threading
 import time
 from xml.etree import ElementTree
 
 from PySide6 import QtWidgets
 
 import gremlin
+import gremlin.scheduler
 import gremlin.ui.common
 import gremlin.ui.input_item
 
@@ -249,29 +248,32 @@ class TempoContainerFunctor(gremlin.base_classes.AbstractFunctor):
 
         # Copy state when input is pressed
         if value.current:
-            self.value_press = copy.deepcopy(value)
+            self.value_press = value.clone()
             self.event_press = event.clone()
 
         # Execute tempo logic
         if value.current:
-            self.start_time = time.time()
-            self.timer = threading.Timer(self.delay, self._long_press)
-            self.timer.start()
+            self.start_time = time.monotonic()
+            self.timer = gremlin.scheduler.TimerWheel().schedule(
+                self.delay,
+                self._long_press
+            )
 
             if self.activate_on == "press":
                 self.short_set.process_event(self.event_press, self.value_press)
         else:
             # Short press
-            if (self.start_time + self.delay) > time.time():
-                self.timer.cancel()
+            if (self.start_time + self.delay) > time.monotonic():
+                if self.timer:
+                    self.timer.cancel()
 
                 if self.activate_on == "release":
-                    threading.Thread(target=lambda: self._short_press(
+                    self._short_press(
                         self.event_press,
                         self.value_press,
-                        event,
-                        value
-                    )).start()
+                        event.clone(),
+                        value.clone()
+                    )
                 else:
                     self.short_set.process_event(event, value)
             # Long press
@@ -285,7 +287,7 @@ class TempoContainerFunctor(gremlin.base_classes.AbstractFunctor):
         return True
 
     def _short_press(self, event_p, value_p, event_r, value_r):
-        """Callback executed for a short press action.
+        """Executes a short press action, releasing it shortly after.
 
         :param event_p event to press the action
         :param value_p value to press the action
@@ -293,8 +295,13 @@ class TempoContainerFunctor(gremlin.base_classes.AbstractFunctor):
         :param value_r value to release the action
         """
         self.short_set.process_event(event_p, value_p)
-        time.sleep(0.05)
-        self.short_set.process_event(event_r, value_r)
+        gremlin.scheduler.TimerWheel().schedule(
+            0.05,
+            self.short_set.process_event,
+            event_r,
+            value_r,
+            stop_policy=gremlin.scheduler.StopPolicy.Run
+        )
 
     def _long_press(self):
         """Callback executed, when the delay expires."""
@@ -15,9 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import copy
 import logging
-import threading
 import time
 from xml.etree import ElementTree
 
@@ -28,6 +26,7 @@ from  gremlin.clipboard import Clipboard
 import gremlin
 import gremlin.base_classes
 import gremlin.plugin_manager
+import gremlin.scheduler
 import gremlin.ui.common
 import gremlin.ui.input_item
 from gremlin.profile import safe_format, safe_read
@@ -396,10 +395,10 @@ class TempoExContainerFunctor(gremlin.base_classes.AbstractFunctor):
         ''' triggers a short press '''
 
         if self.short_timeout > 0.0:
-            if self.last_short_execution + self.short_timeout < time.time():
+            if self.last_short_execution + self.short_timeout < time.monotonic():
                 # logging.getLogger("system").info(f"reset short index")
                 self.short_index = 0
-            self.last_short_execution = time.time()
+            self.last_short_execution = time.monotonic()
 
         if self.short_index < len(self.short_set):
             # logging.getLogger("system").info(f"execute short press {self.short_index}")
@@ -416,10 +415,10 @@ class TempoExContainerFunctor(gremlin.base_classes.AbstractFunctor):
         ''' triggers a long press '''
 
         if self.long_timeout > 0.0:
-            if self.last_long_execution + self.long_timeout < time.time():
+            if self.last_long_execution + self.long_timeout < time.monotonic():
                 # logging.getLogger("system").info(f"reset long index")
                 self.long_index = 0
-            self.last_long_execution = time.time()
+            self.last_long_execution = time.monotonic()
 
         if self.long_index < len(self.long_set):
             # logging.getLogger("system").info(f"execute long press {self.long_index}")
@@ -441,15 +440,17 @@ class TempoExContainerFunctor(gremlin.base_classes.AbstractFunctor):
 
         # Copy state when input is pressed
         if value.current:
-            self.value_press = copy.deepcopy(value)
+            self.value_press = value.clone()
             self.event_press = event.clone()
 
         # Execute tempoEx logic
         if value.current:
             # raw button was pressed - start timer for long/short press
-            self.start_time = time.time()
-            self.timer = threading.Timer(self.delay, self._long_press)
-            self.timer.start()
+            self.start_time = time.monotonic()
+            self.timer = gremlin.scheduler.TimerWheel().schedule(
+                self.delay,
+                self._long_press
+            )
 
             if self.activate_on == "press":
                 # logging.getLogger("system").info(f"execute short press (activation mode = press)")
@@ -458,17 +459,18 @@ class TempoExContainerFunctor(gremlin.base_classes.AbstractFunctor):
         else:
             # raw button was released
             # Short press (activate on button release)
-            if (self.start_time + self.delay) > time.time():
-                self.timer.cancel() # kill long press timer - use short press
+            if (self.start_time + self.delay) > time.monotonic():
+                if self.timer:
+                    self.timer.cancel() # kill long press timer - use short press
 
                 if self.activate_on == "release":
-                    threading.Thread(target=lambda: self._short_press(
-                        self.short_index,                                            
+                    self._short_press(
+                        self.short_index,
                         self.event_press,
                         self.value_press,
-                        event,
-                        value
-                    )).start()
+                        event.clone(),
+                        value.clone()
+                    )
                 else:
                     self._trigger_short_press(event, value)
                 
@@ -485,7 +487,7 @@ class TempoExContainerFunctor(gremlin.base_classes.AbstractFunctor):
         return True
 
     def _short_press(self, index, event_p, value_p, event_r, value_r):
-        """Callback executed for a short press action.
+        """Executes a short press action, releasing it shortly after.
 
         :param event_p event to press the action
         :param value_p value to press the action
@@ -494,8 +496,13 @@ class TempoExContainerFunctor(gremlin.base_classes.AbstractFunctor):
         """
 
         self._trigger_short_press(event_p, value_p)
-        time.sleep(0.05)
-        self._trigger_short_press(event_r, value_r)
+        gremlin.scheduler.TimerWheel().schedule(
+            0.05,
+            self._trigger_short_press,
+            event_r,
+            value_r,
+            stop_policy=gremlin.scheduler.StopPolicy.Run
+        )
 
 
     def _long_press(self):
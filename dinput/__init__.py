@@ -21,6 +21,7 @@ import ctypes
 import ctypes.wintypes as ctwt
 from enum import Enum
 import os
+import sys
 import time
 import uuid
 from gremlin.util import get_dll_version
@@ -155,6 +156,21 @@ class GUID:
             (guid.Data4[4] << 24) + (guid.Data4[5] << 16) +
             (guid.Data4[6] << 8) + guid.Data4[7]
         )
+        # The GUID is immutable, compute the hash once as it is used to
+        # look up every single input event
+        self._hash = hash((
+            guid.Data1,
+            guid.Data2,
+            guid.Data3,
+            guid.Data4[0],
+            guid.Data4[1],
+            guid.Data4[2],
+            guid.Data4[3],
+            guid.Data4[4],
+            guid.Data4[5],
+            guid.Data4[6],
+            guid.Data4[7]
+        ))
 
     
     @property
@@ -225,19 +241,7 @@ class GUID:
         int
             The has computed from this GUID
         """
-        return hash((
-            self._ctypes_guid.Data1,
-            self._ctypes_guid.Data2,
-            self._ctypes_guid.Data3,
-            self._ctypes_guid.Data4[0],
-            self._ctypes_guid.Data4[1],
-            self._ctypes_guid.Data4[2],
-            self._ctypes_guid.Data4[3],
-            self._ctypes_guid.Data4[4],
-            self._ctypes_guid.Data4[5],
-            self._ctypes_guid.Data4[6],
-            self._ctypes_guid.Data4[7]
-        ))
+        return self._hash
 
 
 GUID_Keyboard = GUID(_GUID_SysKeyboard)
@@ -463,6 +467,10 @@ class DILL:
     device_change_callback_fn = None
     input_event_callback_fn = None
 
+    # True if the backend expects callbacks as ctypes function pointers,
+    # False for backends implemented in Python
+    _native_callbacks = True
+
     # Declare argument and return types for all the functions
     # exposed by the dll
     api_functions = {
@@ -508,12 +516,61 @@ class DILL:
         }
     }
 
+    @staticmethod
+    def set_backend(backend):
+        """Replaces the DILL library with a different source of input.
+
+        The backend has to provide the functions exported by the DILL
+        library, using the same ctypes structures for arguments and return
+        values, with the exception of callbacks which are passed in as
+        regular Python functions. Backends can be replaced at any time
+        unless the library itself has been initialized, callbacks already
+        registered are moved to the new backend.
+
+        Parameters
+        ==========
+        backend : object
+            Source of devices and input events, i.e. a
+            dinput.simulated.SimulatedBackend instance
+        """
+        if DILL.initalized and DILL._native_callbacks:
+            raise DILLError(
+                "Cannot replace the DILL library once it is initialized"
+            )
+
+        DILL._dll = backend
+        DILL._native_callbacks = False
+        DILL.version = getattr(backend, "version", None)
+        if DILL.initalized:
+            backend.init()
+            if DILL.input_event_callback_fn is not None:
+                backend.set_input_event_callback(DILL.input_event_callback_fn)
+            if DILL.device_change_callback_fn is not None:
+                backend.set_device_change_callback(
+                    DILL.device_change_callback_fn
+                )
+
     @staticmethod
     def init():
         """Initializes the DILL library.
 
         This has to be called before any other DILL interactions can take place.
         """
+        # The library is only available on Windows, elsewhere or when
+        # requested simulated devices are used instead
+        if DILL._dll is None and (
+                sys.platform != "win32"
+                or os.environ.get("GREMLIN_SIMULATED_INPUT")
+        ):
+            from dinput.simulated import SimulatedBackend
+            DILL.set_backend(SimulatedBackend())
+
+        if DILL._dll is not None and not DILL._native_callbacks:
+            if not DILL.initalized:
+                DILL._dll.init()
+                DILL.initalized = True
+            return
+
         from pathlib import Path
         from gremlin.util import display_error
 
@@ -572,7 +629,10 @@ class DILL:
         callback : callable
             Function to execute when an event occurs.
         """
-        DILL.input_event_callback_fn = C_EVENT_CALLBACK(callback)
+        if DILL._native_callbacks:
+            DILL.input_event_callback_fn = C_EVENT_CALLBACK(callback)
+        else:
+            DILL.input_event_callback_fn = callback
         DILL._dll.set_input_event_callback(
             DILL.input_event_callback_fn
         )
@@ -589,8 +649,11 @@ class DILL:
         callback : callable
             Function to execute when an event occurs.
         """
-        DILL.device_change_callback_fn = \
-            C_DEVICE_CHANGE_CALLBACK(callback)
+        if DILL._native_callbacks:
+            DILL.device_change_callback_fn = \
+                C_DEVICE_CHANGE_CALLBACK(callback)
+        else:
+            DILL.device_change_callback_fn = callback
         DILL._dll.set_device_change_callback(
             DILL.device_change_callback_fn
         )
@@ -0,0 +1,450 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Pure Python replacement of the DILL library.
+
+The simulated backend provides a configurable set of devices and delivers
+input events through the callbacks registered with DILL, which allows the
+event processing to run without the DirectInput library, e.g. for tests
+and benchmarks. Usage:
+
+    backend = SimulatedBackend([SimulatedDevice("Stick", axis_count=4)])
+    DILL.set_backend(backend)
+    DILL.init()
+"""
+
+import collections
+import heapq
+import logging
+import math
+import threading
+import time
+import uuid
+
+from dinput import DILLError, GUID, InputType, _DeviceSummary, \
+    _GUID, _JoystickInputData
+
+
+# Values used by DILL to identify the input type of an event
+_input_type_values = {
+    InputType.Axis: 1,
+    InputType.Button: 2,
+    InputType.Hat: 3
+}
+
+
+def _ctypes_guid(value):
+    """Returns the ctypes structure corresponding to a GUID.
+
+    Parameters
+    ==========
+    value : GUID, uuid.UUID, or str
+        The GUID to convert
+
+    Returns
+    =======
+    _GUID
+        Structure holding the GUID
+    """
+    if isinstance(value, GUID):
+        return value.ctypes
+    if isinstance(value, _GUID):
+        return value
+    if isinstance(value, str):
+        value = uuid.UUID(value)
+
+    guid = _GUID()
+    guid.Data1 = value.time_low
+    guid.Data2 = value.time_mid
+    guid.Data3 = value.time_hi_version
+    for i, byte in enumerate(value.bytes[8:]):
+        guid.Data4[i] = byte
+    return guid
+
+
+class SimulatedEvent(collections.namedtuple(
+        "SimulatedEvent",
+        ["time", "device_guid", "input_type", "input_index", "value"]
+)):
+
+    """Single input event of a stream played back by the simulated backend.
+
+    The time is the offset in seconds from the start of the playback at
+    which the event is delivered, the value uses the raw DILL
+    representation, i.e. -32768 to 32767 for axes, 0 or 1 for buttons, and
+    -1 or the angle in hundredths of a degree for hats.
+    """
+
+
+class SimulatedDevice:
+
+    """Device with a fixed number of axes, buttons, and hats."""
+
+    def __init__(
+            self,
+            name,
+            guid=None,
+            axis_count=8,
+            button_count=32,
+            hat_count=1,
+            vendor_id=0x0000,
+            product_id=0x0000
+    ):
+        """Creates a new device.
+
+        Parameters
+        ==========
+        name : str
+            Name of the device
+        guid : GUID, uuid.UUID, or str
+            GUID of the device, derived from the name if not provided
+        axis_count : int
+            Number of axes, at most 8
+        button_count : int
+            Number of buttons
+        hat_count : int
+            Number of hats
+        vendor_id : int
+            USB vendor id of the device
+        product_id : int
+            USB product id of the device
+        """
+        if not 0 <= axis_count <= 8:
+            raise DILLError(f"Invalid axis count {axis_count:d}")
+        if guid is None:
+            guid = uuid.uuid5(uuid.NAMESPACE_OID, name)
+
+        self.name = name
+        self.guid = GUID(_ctypes_guid(guid))
+        self.axis_count = axis_count
+        self.button_count = button_count
+        self.hat_count = hat_count
+        self.vendor_id = vendor_id
+        self.product_id = product_id
+        self.joystick_id = 0
+
+        self.axes = [0] * axis_count
+        self.buttons = [False] * button_count
+        self.hats = [-1] * hat_count
+
+    def summary(self):
+        """Returns the DILL description of this device.
+
+        Returns
+        =======
+        _DeviceSummary
+            Structure describing the device's layout
+        """
+        info = _DeviceSummary()
+        info.device_guid = self.guid.ctypes
+        info.vendor_id = self.vendor_id
+        info.product_id = self.product_id
+        info.joystick_id = self.joystick_id
+        info.name = self.name.encode("utf-8")
+        info.axis_count = self.axis_count
+        info.button_count = self.button_count
+        info.hat_count = self.hat_count
+        for i in range(self.axis_count):
+            info.axis_map[i].linear_index = i + 1
+            info.axis_map[i].axis_index = i + 1
+        return info
+
+    def set_state(self, input_type, input_index, value):
+        """Updates the state of a single input.
+
+        Parameters
+        ==========
+        input_type : InputType
+            Type of the input to update
+        input_index : int
+            One based index of the input
+        value : int
+            Raw DILL value of the input
+        """
+        if input_type == InputType.Axis:
+            self.axes[input_index - 1] = value
+        elif input_type == InputType.Button:
+            self.buttons[input_index - 1] = value == 1
+        elif input_type == InputType.Hat:
+            self.hats[input_index - 1] = value
+        else:
+            raise DILLError(f"Invalid input type {input_type}")
+
+
+class SimulatedBackend:
+
+    """Backend providing the functions of the DILL library in Python.
+
+    Events are delivered to the input event callback on the thread that
+    injects them, either the caller of inject or the playback thread.
+    """
+
+    version = "simulated"
+
+    def __init__(self, devices=None):
+        """Creates a new backend.
+
+        Parameters
+        ==========
+        devices : list
+            SimulatedDevice instances connected initially
+        """
+        self._devices = collections.OrderedDict()
+        self._input_callback = None
+        self._device_callback = None
+        self._playback_thread = None
+        self._playback_stop = threading.Event()
+        self._lock = threading.Lock()
+
+        for device in devices if devices is not None else []:
+            self._devices[device.guid] = device
+
+    # DILL library interface
+
+    def init(self):
+        """Initializes the backend, nothing to do in the simulation."""
+        pass
+
+    def set_input_event_callback(self, callback):
+        self._input_callback = callback
+
+    def set_device_change_callback(self, callback):
+        self._device_callback = callback
+
+    def get_device_count(self):
+        return len(self._devices)
+
+    def get_device_information_by_index(self, index):
+        devices = list(self._devices.values())
+        if not 0 <= index < len(devices):
+            return _DeviceSummary()
+        return devices[index].summary()
+
+    def get_device_information_by_guid(self, guid):
+        device = self._devices.get(GUID(guid))
+        return device.summary() if device else _DeviceSummary()
+
+    def device_exists(self, guid):
+        return GUID(guid) in self._devices
+
+    def get_axis(self, guid, index):
+        return self._devices[GUID(guid)].axes[index - 1]
+
+    def get_button(self, guid, index):
+        return self._devices[GUID(guid)].buttons[index - 1]
+
+    def get_hat(self, guid, index):
+        return self._devices[GUID(guid)].hats[index - 1]
+
+    # Simulation control
+
+    @property
+    def devices(self):
+        """Returns the connected devices.
+
+        Returns
+        =======
+        list
+            SimulatedDevice instances in connection order
+        """
+        return list(self._devices.values())
+
+    def add_device(self, device):
+        """Connects a device and reports the change.
+
+        Parameters
+        ==========
+        device : SimulatedDevice
+            The device to connect
+        """
+        self._devices[device.guid] = device
+        if self._device_callback is not None:
+            self._device_callback(device.summary(), 1)
+
+    def remove_device(self, guid):
+        """Disconnects a device and reports the change.
+
+        Parameters
+        ==========
+        guid : GUID
+            GUID of the device to disconnect
+        """
+        device = self._devices.pop(guid, None)
+        if device is not None and self._device_callback is not None:
+            self._device_callback(device.summary(), 2)
+
+    def inject(self, device_guid, input_type, input_index, value):
+        """Delivers a single event to the input event callback.
+
+        Parameters
+        ==========
+        device_guid : GUID
+            GUID of the device generating the event
+        input_type : InputType
+            Type of the input changing state
+        input_index : int
+            One based index of the input
+        value : int
+            Raw DILL value of the input
+        """
+        device = self._devices.get(device_guid)
+        if device is None:
+            raise DILLError(f"Unknown simulated device {device_guid}")
+        with self._lock:
+            device.set_state(input_type, input_index, value)
+            if self._input_callback is None:
+                return
+            data = _JoystickInputData()
+            data.device_guid = device_guid.ctypes
+            data.input_type = _input_type_values[input_type]
+            data.input_index = input_index
+            data.value = value
+            self._input_callback(data)
+
+    def play(self, events, wait=False):
+        """Plays back a timed stream of events.
+
+        Events are delivered by a separate thread at their scheduled time
+        relative to the start of the playback. Events which are late, for
+        example because the callback takes longer than the interval between
+        events, are delivered immediately without skipping any.
+
+        Parameters
+        ==========
+        events : iterable
+            SimulatedEvent instances ordered by their time
+        wait : bool
+            If True returns only once all events have been delivered
+        """
+        self.stop()
+        self._playback_stop.clear()
+        self._playback_thread = threading.Thread(
+            target=self._play,
+            args=(events,),
+            name="simulated_input",
+            daemon=True
+        )
+        self._playback_thread.start()
+        if wait:
+            self._playback_thread.join()
+
+    def stop(self):
+        """Stops an ongoing playback."""
+        if self._playback_thread is not None:
+            self._playback_stop.set()
+            self._playback_thread.join()
+            self._playback_thread = None
+
+    @property
+    def playing(self):
+        """Returns whether or not a playback is ongoing.
+
+        Returns
+        =======
+        bool
+            True while events are being played back
+        """
+        return self._playback_thread is not None \
+            and self._playback_thread.is_alive()
+
+    def _play(self, events):
+        """Delivers events at their scheduled time.
+
+        Parameters
+        ==========
+        events : iterable
+            SimulatedEvent instances ordered by their time
+        """
+        start = time.perf_counter()
+        try:
+            for event in events:
+                if self._playback_stop.is_set():
+                    return
+                # Sleep for the bulk of the delay and spin for the remainder
+                # as sleep granularity is too coarse for high input rates
+                delay = start + event.time - time.perf_counter()
+                if delay > 0.002:
+                    self._playback_stop.wait(delay - 0.001)
+                while time.perf_counter() < start + event.time:
+                    pass
+                self.inject(
+                    event.device_guid,
+                    event.input_type,
+                    event.input_index,
+                    event.value
+                )
+        except Exception as e:
+            logging.getLogger("system").exception(
+                f"Error during simulated input playback: {e}"
+            )
+
+
+def axis_stream(device, index, rate, duration, waveform=None, offset=0.0):
+    """Returns the events of an axis moving at a fixed update rate.
+
+    Parameters
+    ==========
+    device : SimulatedDevice
+        Device owning the axis
+    index : int
+        One based index of the axis
+    rate : float
+        Number of events per second
+    duration : float
+        Length of the stream in seconds
+    waveform : callable
+        Function mapping time in seconds to an axis position in [-1, 1],
+        a sine wave with a period of one second if not provided
+    offset : float
+        Time of the first event in seconds
+
+    Returns
+    =======
+    list
+        SimulatedEvent instances ordered by time
+    """
+    if waveform is None:
+        waveform = lambda t: math.sin(2.0 * math.pi * t)
+
+    events = []
+    for i in range(int(rate * duration)):
+        t = i / rate
+        position = max(-1.0, min(1.0, waveform(t)))
+        events.append(SimulatedEvent(
+            offset + t,
+            device.guid,
+            InputType.Axis,
+            index,
+            int(round(position * 32767))
+        ))
+    return events
+
+
+def merge_streams(*streams):
+    """Returns the events of multiple streams ordered by time.
+
+    Parameters
+    ==========
+    streams : list
+        Lists of SimulatedEvent instances ordered by time
+
+    Returns
+    =======
+    list
+        SimulatedEvent instances of all streams ordered by time
+    """
+    return list(heapq.merge(*streams, key=lambda evt: evt.time))
@@ -55,7 +55,14 @@ def smart_any(conditions):
 
 class Value:
 
-    """Represents an input value, keeping track of raw and "seen" value."""
+    """Represents an input value, keeping track of raw and "seen" value.
+
+    Instances are reused across events by the container callbacks, code
+    holding on to a value beyond the processing of a single event has to
+    store a copy obtained via clone().
+    """
+
+    __slots__ = ("_raw", "_current")
 
     def __init__(self, raw):
         """Creates a new value and initializes it.
@@ -65,6 +72,23 @@ class Value:
         self._raw = raw
         self._current = raw
 
+    def reset(self, raw):
+        """Reinitializes the value with new raw data.
+
+        :param raw the new raw data
+        """
+        self._raw = raw
+        self._current = raw
+
+    def clone(self):
+        """Returns a copy of this value.
+
+        :return independent copy of the value
+        """
+        value = Value(self._raw)
+        value._current = self._current
+        return value
+
     @property
     def raw(self):
         """Returns the raw unmodified value.
@@ -23,11 +23,14 @@ import string
 import sys
 import time
 
+from PySide6 import QtCore
+
 import dinput
 
 import gremlin
-from gremlin import event_handler, input_devices, \
-    joystick_handling, macro, sendinput, user_plugin, util
+from gremlin import event_handler, execution_engine, input_devices, \
+    joystick_handling, macro, relative_axis, scheduler, sendinput, \
+    user_plugin, util
 import gremlin.plugin_manager
 import vjoy as vjoy_module
 
@@ -49,6 +52,7 @@ class CodeRunner:
         self._vjoy_curves = VJoyCurves()
         self._merge_axes = []
         self._running = False
+        self._threaded = False
         
 
     def is_running(self):
@@ -167,87 +171,11 @@ class CodeRunner:
             container_plugins = gremlin.plugin_manager.ContainerPlugins()
             container_plugins.reset_functors()
 
-            # Create input callbacks based on the profile's content
-            for device in profile.devices.values():
-                for mode in device.modes.values():
-                    for input_items in mode.config.values():
-                        for input_item in input_items.values():
-                            # Only add callbacks for input items that actually
-                            # contain actions
-                            if len(input_item.containers) == 0:
-                                continue
-
-                            event = event_handler.Event(
-                                event_type=input_item.input_type,
-                                device_guid=device.device_guid,
-                                identifier=input_item.input_id
-                            )
-
-                            # Create possibly several callbacks depending
-                            # on the input item's content
-                            callbacks = []
-                            for container in input_item.containers:
-                                if not container.is_valid():
-                                    logging.getLogger("system").warning(
-                                        "Incomplete container ignored"
-                                    )
-                                    continue
-                                callbacks.extend(container.generate_callbacks())
-
-                            for cb_data in callbacks:
-                                if cb_data.event is None:
-                                    self.event_handler.add_callback(
-                                        device.device_guid,
-                                        mode.name,
-                                        event,
-                                        cb_data.callback,
-                                        input_item.always_execute
-                                    )
-                                else:
-                                    self.event_handler.add_callback(
-                                        dinput.GUID_Virtual,
-                                        mode.name,
-                                        cb_data.event,
-                                        cb_data.callback,
-                                        input_item.always_execute
-                                    )
-
-            # Create merge axis callbacks
-            for entry in profile.merge_axes:
-                merge_axis = MergeAxis(
-                    entry["vjoy"]["vjoy_id"],
-                    entry["vjoy"]["axis_id"],
-                    entry["operation"]
-                )
-                self._merge_axes.append(merge_axis)
-
-                # Lower axis callback
-                event = event_handler.Event(
-                    event_type=gremlin.common.InputType.JoystickAxis,
-                    device_guid=entry["lower"]["device_guid"],
-                    identifier=entry["lower"]["axis_id"]
-                )
-                self.event_handler.add_callback(
-                    event.device_guid,
-                    entry["mode"],
-                    event,
-                    merge_axis.update_axis1,
-                    False
-                )
-
-                # Upper axis callback
-                event = event_handler.Event(
-                    event_type=gremlin.common.InputType.JoystickAxis,
-                    device_guid=entry["upper"]["device_guid"],
-                    identifier=entry["upper"]["axis_id"]
-                )
-                self.event_handler.add_callback(
-                    event.device_guid,
-                    entry["mode"],
-                    event,
-                    merge_axis.update_axis2,
-                    False
-                )
+            # Create input and merge axis callbacks based on the profile's
+            # content
+            self._merge_axes.extend(
+                create_profile_callbacks(self.event_handler, profile)
+            )
 
             # Create vJoy response curve setups
             self._vjoy_curves.profile_data = profile.vjoy_devices
@@ -257,6 +185,14 @@ class CodeRunner:
 
             # Use inheritance to build input action lookup table
             self.event_handler.build_event_lookup(inheritance_tree)
+            self.event_handler.compile_dispatch_table()
+
+            # Configure batching of vJoy output
+            cfg = gremlin.config.Configuration()
+            vjoy_module.vjoy.report_batcher.configure(
+                cfg.vjoy_batch_output,
+                cfg.vjoy_flush_rate
+            )
 
             # Set vJoy axis default values
             for vid, data in settings.vjoy_initial_values.items():
@@ -267,16 +203,36 @@ class CodeRunner:
             # Connect signals
             evt_listener = event_handler.EventListener()
             kb = input_devices.Keyboard()
-            evt_listener.keyboard_event.connect(
-                self.event_handler.process_event
-            )
-            evt_listener.joystick_event.connect(
-                self.event_handler.process_event
-            )
-            evt_listener.virtual_event.connect(
-                self.event_handler.process_event
-            )
-            evt_listener.keyboard_event.connect(kb.keyboard_event)
+            self._threaded = gremlin.config.Configuration().dedicated_input_thread
+            if self._threaded:
+                # Events are handed to the input processing thread on the
+                # thread that produced them, bypassing the GUI thread
+                engine = execution_engine.ExecutionEngine()
+                engine.start(self.event_handler.process_event)
+                evt_listener.keyboard_event.connect(
+                    kb.keyboard_event,
+                    QtCore.Qt.ConnectionType.DirectConnection
+                )
+                evt_listener.keyboard_event.connect(
+                    engine.enqueue,
+                    QtCore.Qt.ConnectionType.DirectConnection
+                )
+                evt_listener.virtual_event.connect(
+                    engine.enqueue,
+                    QtCore.Qt.ConnectionType.DirectConnection
+                )
+                evt_listener.set_event_sink(engine.enqueue)
+            else:
+                evt_listener.keyboard_event.connect(
+                    self.event_handler.process_event
+                )
+                evt_listener.joystick_event.connect(
+                    self.event_handler.process_event
+                )
+                evt_listener.virtual_event.connect(
+                    self.event_handler.process_event
+                )
+                evt_listener.keyboard_event.connect(kb.keyboard_event)
             evt_listener.gremlin_active = True
 
             # connect remote gremlin client
@@ -308,7 +264,9 @@ class CodeRunner:
             self.event_handler.resume()
             self._running = True
 
-            sendinput.MouseController().start()
+            sendinput.MouseController().start(
+                gremlin.config.Configuration().mouse_tick_rate
+            )
 
             # tell listener profiles are starting
             el = gremlin.event_handler.EventListener()
@@ -352,9 +310,16 @@ class CodeRunner:
             evt_lst.profile_stop.emit()
 
             kb = input_devices.Keyboard()
-            evt_lst.keyboard_event.disconnect(self.event_handler.process_event)
-            evt_lst.joystick_event.disconnect(self.event_handler.process_event)
-            evt_lst.virtual_event.disconnect(self.event_handler.process_event)
+            if self._threaded:
+                engine = execution_engine.ExecutionEngine()
+                evt_lst.set_event_sink(None)
+                evt_lst.keyboard_event.disconnect(engine.enqueue)
+                evt_lst.virtual_event.disconnect(engine.enqueue)
+                engine.stop()
+            else:
+                evt_lst.keyboard_event.disconnect(self.event_handler.process_event)
+                evt_lst.joystick_event.disconnect(self.event_handler.process_event)
+                evt_lst.virtual_event.disconnect(self.event_handler.process_event)
             evt_lst.keyboard_event.disconnect(kb.keyboard_event)
             evt_lst.gremlin_active = False
             self.event_handler.mode_changed.disconnect(
@@ -381,8 +346,11 @@ class CodeRunner:
 
         macro.MacroManager().stop()
         sendinput.MouseController().stop()
+        relative_axis.RelativeAxisIntegrator().stop()
+        scheduler.TimerWheel().cancel_all()
 
         # Remove all claims on VJoy devices
+        vjoy_module.vjoy.report_batcher.configure(False)
         joystick_handling.VJoyProxy.reset()
 
 
@@ -395,6 +363,100 @@ class CodeRunner:
         input_devices.callback_registry.clear()
 
 
+def create_profile_callbacks(handler, profile):
+    """Adds the callbacks of all inputs and merge axes of a profile.
+
+    :param handler the event handler to add the callbacks to
+    :param profile the profile whose content the callbacks are created for
+    :return list of MergeAxis instances created for the profile
+    """
+    merge_axes = []
+
+    # Create input callbacks based on the profile's content
+    for device in profile.devices.values():
+        for mode in device.modes.values():
+            for input_items in mode.config.values():
+                for input_item in input_items.values():
+                    # Only add callbacks for input items that actually
+                    # contain actions
+                    if len(input_item.containers) == 0:
+                        continue
+
+                    event = event_handler.Event(
+                        event_type=input_item.input_type,
+                        device_guid=device.device_guid,
+                        identifier=input_item.input_id
+                    )
+
+                    # Create possibly several callbacks depending
+                    # on the input item's content
+                    callbacks = []
+                    for container in input_item.containers:
+                        if not container.is_valid():
+                            logging.getLogger("system").warning(
+                                "Incomplete container ignored"
+                            )
+                            continue
+                        callbacks.extend(container.generate_callbacks())
+
+                    for cb_data in callbacks:
+                        if cb_data.event is None:
+                            handler.add_callback(
+                                device.device_guid,
+                                mode.name,
+                                event,
+                                cb_data.callback,
+                                input_item.always_execute
+                            )
+                        else:
+                            handler.add_callback(
+                                dinput.GUID_Virtual,
+                                mode.name,
+                                cb_data.event,
+                                cb_data.callback,
+                                input_item.always_execute
+                            )
+
+    # Create merge axis callbacks
+    for entry in profile.merge_axes:
+        merge_axis = MergeAxis(
+            entry["vjoy"]["vjoy_id"],
+            entry["vjoy"]["axis_id"],
+            entry["operation"]
+        )
+        merge_axes.append(merge_axis)
+
+        # Lower axis callback
+        event = event_handler.Event(
+            event_type=gremlin.common.InputType.JoystickAxis,
+            device_guid=entry["lower"]["device_guid"],
+            identifier=entry["lower"]["axis_id"]
+        )
+        handler.add_callback(
+            event.device_guid,
+            entry["mode"],
+            event,
+            merge_axis.update_axis1,
+            False
+        )
+
+        # Upper axis callback
+        event = event_handler.Event(
+            event_type=gremlin.common.InputType.JoystickAxis,
+            device_guid=entry["upper"]["device_guid"],
+            identifier=entry["upper"]["axis_id"]
+        )
+        handler.add_callback(
+            event.device_guid,
+            entry["mode"],
+            event,
+            merge_axis.update_axis2,
+            False
+        )
+
+    return merge_axes
+
+
 class VJoyCurves:
 
     """Handles setting response curves on vJoy devices."""
@@ -424,8 +486,8 @@ class VJoyCurves:
                     if len(data.containers) > 0 and \
                             vjoy[vjoy_id].is_axis_valid(axis_id):
                         action = data.containers[0].action_sets[0][0]
-                        vjoy[vjoy_id].axis(aid).set_deadzone(*action.deadzone)
-                        vjoy[vjoy_id].axis(aid).set_response_curve(
+                        vjoy[vjoy_id].axis(aid).set_deadzone_and_response_curve(
+                            action.deadzone,
                             action.mapping_type,
                             action.control_points
                         )
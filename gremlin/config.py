@@ -15,11 +15,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import atexit
 import json
 import logging
 import time
 import os
 import re
+import threading
 
 from PySide6 import QtCore
 from gremlin.singleton_decorator import SingletonDecorator
@@ -34,16 +36,35 @@ class Configuration:
         fname = os.path.join(util.userprofile_path(), "config.json")
         return fname
 
+    # Modifications are written to disk once no further changes occurred
+    # for save_delay seconds, but remain unwritten for at most
+    # max_save_delay seconds while changes keep coming in
+    save_delay = 0.5
+    max_save_delay = 2.0
+
     def __init__(self):
         """Creates a new instance, loading the current configuration."""
 
 
         self._data = {}
-        
+
+        # Write-behind state, time of the first and last modification not
+        # yet written to disk, the number of modifications, and the state of
+        # the file after the last write used to ignore change notifications
+        # caused by it
+        self._save_condition = threading.Condition(threading.Lock())
+        self._write_lock = threading.RLock()
+        self._save_thread = None
+        self._dirty_since = None
+        self._last_change = None
+        self._changes = 0
+        self._written_state = None
+        atexit.register(self.flush)
+
         fname = self.get_config()
         if not os.path.isfile(fname):
             # create a stub - first time run
-            self.save()
+            self._write()
 
 
         
@@ -53,15 +74,15 @@ class Configuration:
         self.watcher = QtCore.QFileSystemWatcher([
             os.path.join(util.userprofile_path(), "config.json")
         ])
-        self.watcher.fileChanged.connect(self.reload)
+        self.watcher.fileChanged.connect(self._file_changed)
 
     def reload(self):
         """Loads the configuration file's content."""
+        fname = self.get_config()
         if self._last_reload is not None and \
                 time.time() - self._last_reload < 1:
             return
 
-        fname = self.get_config()
         # Attempt to load the configuration file if this fails set
         # default empty values.
         load_successful = False
@@ -82,23 +103,156 @@ class Configuration:
 
         # Ensure required fields are present and if they are missing
         # add empty ones.
+        fields_added = False
         for field in ["calibration", "profiles", "last_mode"]:
             if field not in self._data:
                 self._data[field] = {}
+                fields_added = True
 
-        # Save all data
+        # Only write the file back if its content was incomplete
         self._last_reload = time.time()
-        self.save()
+        self._watch(fname)
+        if not load_successful or fields_added:
+            self.save()
 
     def save(self):
-        """Writes the configuration file to disk."""
+        """Schedules writing the configuration file to disk.
+
+        The file is written by a background thread, multiple modifications
+        in quick succession result in a single write.
+        """
+        with self._save_condition:
+            now = time.monotonic()
+            if self._dirty_since is None:
+                self._dirty_since = now
+            self._last_change = now
+            self._changes += 1
+
+            if self._save_thread is None:
+                self._save_thread = threading.Thread(
+                    target=self._run,
+                    name="config_save",
+                    daemon=True
+                )
+                self._save_thread.start()
+            self._save_condition.notify()
+
+    def flush(self):
+        """Writes pending modifications to disk immediately.
+
+        A write already in progress is waited for, hence the file is up to
+        date once this returns.
+        """
+        with self._write_lock:
+            if self.is_dirty:
+                self._write_pending()
+
+    @property
+    def is_dirty(self):
+        """Returns whether or not modifications have not been written yet.
+
+        :return True if modifications are pending, False otherwise
+        """
+        return self._dirty_since is not None
+
+    def _run(self):
+        """Writes modifications to disk once they are due."""
+        while True:
+            with self._save_condition:
+                while self._dirty_since is None:
+                    self._save_condition.wait()
+                due = min(
+                    self._last_change + self.save_delay,
+                    self._dirty_since + self.max_save_delay
+                )
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._save_condition.wait(delay)
+                    continue
+
+            try:
+                with self._write_lock:
+                    # A flush may have written the modifications meanwhile
+                    if self.is_dirty:
+                        self._write_pending()
+            except RuntimeError:
+                # The data was modified while being encoded, try again
+                pass
+            except OSError as e:
+                logging.getLogger("system").error(
+                    f"Unable to write the configuration file: {e}"
+                )
+                # Retry once further modifications are made or the maximum
+                # delay expired
+                with self._save_condition:
+                    self._save_condition.wait(self.max_save_delay)
+
+    def _write_pending(self):
+        """Writes pending modifications and marks them as written.
+
+        Modifications made while writing remain pending, as do all of them
+        if the write fails. Has to be called with the write lock held.
+        """
+        with self._save_condition:
+            changes = self._changes
+        self._write()
+        with self._save_condition:
+            if self._changes == changes:
+                self._dirty_since = None
+
+    def _write(self):
+        """Writes the configuration file to disk.
+
+        The content is written to a temporary file which then replaces the
+        configuration file, such that the file is never left incomplete.
+        """
         fname = self.get_config()
-        with open(fname, "w") as hdl:
+        with self._write_lock:
             encoder = json.JSONEncoder(
                 sort_keys=True,
                 indent=4
             )
-            hdl.write(encoder.encode(self._data))
+            content = encoder.encode(self._data)
+            tmp_fname = f"{fname}.tmp"
+            with open(tmp_fname, "w") as hdl:
+                hdl.write(content)
+            os.replace(tmp_fname, fname)
+            self._written_state = self._file_state(fname)
+
+    def _file_changed(self, fname):
+        """Reloads the configuration when the file was modified externally.
+
+        :param fname path to the modified file
+        """
+        if self._written_state is not None and \
+                self._file_state(fname) == self._written_state:
+            # Notification about our own write, replacing the file stops
+            # it from being watched
+            self._watch(fname)
+            return
+        self.reload()
+
+    def _file_state(self, fname):
+        """Returns information identifying the current state of a file.
+
+        :param fname path to the file
+        :return modification time and size of the file, None if it does
+            not exist
+        """
+        try:
+            stat = os.stat(fname)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _watch(self, fname):
+        """Ensures the configuration file is watched for changes.
+
+        :param fname path to the configuration file
+        """
+        watcher = getattr(self, "watcher", None)
+        if watcher is not None and fname not in watcher.files():
+            watcher.addPath(fname)
 
 
 
@@ -455,6 +609,64 @@ class Configuration:
             self._data["server_port"] = value
             self.save()
 
+    @property
+    def remote_axis_rate(self):
+        ''' number of remote axis update frames sent per second, 0 sends each change immediately '''
+        return self._data.get("remote_axis_rate", 250)
+
+    @remote_axis_rate.setter
+    def remote_axis_rate(self, value):
+        if type(value) == float:
+            value = int(value)
+        if type(value) == int and value >= 0:
+            self._data["remote_axis_rate"] = value
+            self.save()
+
+    @property
+    def remote_binary_protocol(self):
+        ''' true if binary frames are sent to remote receivers acknowledging them
+
+            legacy receivers on the same multicast group only understand the legacy packets
+        '''
+        return self._data.get("remote_binary_protocol", False)
+
+    @remote_binary_protocol.setter
+    def remote_binary_protocol(self, value):
+        if type(value) == bool and self._data.get("remote_binary_protocol", False) != value:
+            self._data["remote_binary_protocol"] = value
+            self.save()
+
+    @property
+    def mouse_tick_rate(self):
+        ''' number of mouse motion updates sent per second '''
+        return self._data.get("mouse_tick_rate", 250)
+
+    @mouse_tick_rate.setter
+    def mouse_tick_rate(self, value):
+        if type(value) == float:
+            value = int(value)
+        if type(value) == int and value > 0:
+            self._data["mouse_tick_rate"] = value
+            self.save()
+
+    @property
+    def profile_cache_on_disk(self):
+        """Returns whether or not snapshots of loaded profiles are stored on disk.
+
+        :return True if snapshots are stored on disk, False otherwise
+        """
+        return self._data.get("profile_cache_on_disk", False)
+
+    @profile_cache_on_disk.setter
+    def profile_cache_on_disk(self, value):
+        """Sets whether or not snapshots of loaded profiles are stored on disk.
+
+        :param value True to store snapshots on disk, False to only keep
+            them in memory
+        """
+        self._data["profile_cache_on_disk"] = bool(value)
+        self.save()
+
     @property
     def mode_change_message(self):
         """Returns whether or not to show a windows notification on mode change.
@@ -663,6 +875,36 @@ class Configuration:
             clipboard.clear_persisted()
 
 
+    @property
+    def dedicated_input_thread(self):
+        ''' true if profile callbacks run on a dedicated thread instead of the UI thread '''
+        return self._data.get("dedicated_input_thread", False)
+
+    @dedicated_input_thread.setter
+    def dedicated_input_thread(self, value):
+        self._data["dedicated_input_thread"] = bool(value)
+        self.save()
+
+    @property
+    def vjoy_batch_output(self):
+        ''' true if vJoy changes are sent to the driver as complete device reports '''
+        return self._data.get("vjoy_batch_output", False)
+
+    @vjoy_batch_output.setter
+    def vjoy_batch_output(self, value):
+        self._data["vjoy_batch_output"] = bool(value)
+        self.save()
+
+    @property
+    def vjoy_flush_rate(self):
+        ''' number of batched vJoy updates per second, 0 updates after each input event '''
+        return self._data.get("vjoy_flush_rate", 0)
+
+    @vjoy_flush_rate.setter
+    def vjoy_flush_rate(self, value):
+        self._data["vjoy_flush_rate"] = int(value)
+        self.save()
+
     @property
     def verbose(self):
         ''' determines loging level '''
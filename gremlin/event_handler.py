@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections import namedtuple
 import functools
 import inspect
 import logging
@@ -24,10 +25,17 @@ from threading import Thread, Timer
 from PySide6 import QtCore
 
 import dinput
+from vjoy import vjoy
 from . import common, config, error, joystick_handling, windows_event_hook, macro, util, shared_state
 from gremlin.singleton_decorator import SingletonDecorator
 
 
+# Entry of the compiled dispatch table, holding the callbacks to run for
+# a single input while paused and otherwise, in the order they were
+# registered
+DispatchEntry = namedtuple("DispatchEntry", ["always", "all"])
+
+
 class Event:
 
     """Represents a single event captured by the system.
@@ -71,9 +79,10 @@ class Event:
         :param action_id the ID of the action to execute or that generated the event
             is pressed
         """
-        self.event_type = event_type
-        self.identifier = identifier
-        self.device_guid = device_guid
+        self._hash = None
+        self._event_type = event_type
+        self._identifier = identifier
+        self._device_guid = device_guid
         self.is_pressed = is_pressed
         self.value = value
         self.raw_value = raw_value
@@ -96,6 +105,56 @@ class Event:
             self.action_id
         )
 
+    @property
+    def event_type(self):
+        """Returns the type of the event.
+
+        :return InputType of the event
+        """
+        return self._event_type
+
+    @event_type.setter
+    def event_type(self, value):
+        self._event_type = value
+        self._hash = None
+
+    @property
+    def identifier(self):
+        """Returns the identifier of the event source.
+
+        :return identifier of the input that caused the event
+        """
+        return self._identifier
+
+    @identifier.setter
+    def identifier(self, value):
+        self._identifier = value
+        self._hash = None
+
+    @property
+    def device_guid(self):
+        """Returns the GUID of the device that caused the event.
+
+        :return GUID of the device
+        """
+        return self._device_guid
+
+    @device_guid.setter
+    def device_guid(self, value):
+        self._device_guid = value
+        self._hash = None
+
+    @property
+    def input_key(self):
+        """Returns the integer key identifying the input of this event.
+
+        The key is identical for all events originating from the same input
+        and is used to index the compiled dispatch table.
+
+        :return integer key of the input this event belongs to
+        """
+        return self.__hash__()
+
     def __eq__(self, other):
         return self.__hash__() == other.__hash__()
 
@@ -110,22 +169,27 @@ class Event:
         input, e.g. axis, button, hat, key, with different values / states
         shall have the same hash.
 
+        The value is cached as the identifying fields rarely change once an
+        event has been created.
+
         :return integer hash value of this event
         """
-        if self.event_type == common.InputType.Keyboard:
-            return hash((
-                self.device_guid,
-                self.event_type.value,
-                self.identifier,
-                1 if self.identifier[1] else 0
-            ))
-        else:
-            return hash((
-                self.device_guid,
-                self.event_type.value,
-                self.identifier,
-                0
-            ))
+        if self._hash is None:
+            if self._event_type == common.InputType.Keyboard:
+                self._hash = hash((
+                    self._device_guid,
+                    self._event_type.value,
+                    self._identifier,
+                    1 if self._identifier[1] else 0
+                ))
+            else:
+                self._hash = hash((
+                    self._device_guid,
+                    self._event_type.value,
+                    self._identifier,
+                    0
+                ))
+        return self._hash
 
     @staticmethod
     def from_key(key):
@@ -201,8 +265,10 @@ class EventListener(QtCore.QObject):
     # occurs on broadcast mode change
     broadcast_changed = QtCore.Signal(StateChangeEvent)
 
-    
-        
+    # Minimum time between two UI notifications of the same axis while
+    # events are processed by the dedicated input thread
+    ui_axis_interval = 1.0 / 30.0
+
 
     def __init__(self):
         """Creates a new instance."""
@@ -212,9 +278,19 @@ class EventListener(QtCore.QObject):
         self.mouse_hook = windows_event_hook.MouseHook()
         self.mouse_hook.register(self._mouse_handler)
 
-        # Calibration function for each axis of all devices
+        # Calibration lookup table for each axis of all devices, axes
+        # without calibration data use the default table
         self._calibrations = {}
+        self._default_calibration = util.create_calibration_table(
+            util.raw_axis_minimum,
+            0,
+            util.raw_axis_maximum
+        )
 
+        # Function receiving joystick events directly, bypassing Qt signals,
+        # and the time each axis was last reported to the UI
+        self._event_sink = None
+        self._ui_axis_update = {}
 
         # Joystick device change update timeout timer
         self._device_update_timer = None
@@ -238,12 +314,24 @@ class EventListener(QtCore.QObject):
         cfg = config.Configuration()
         for key in self._calibrations:
             limits = cfg.get_calibration(key[0], key[1])
-            self._calibrations[key] = \
-                util.create_calibration_function(
-                    limits[0],
-                    limits[1],
-                    limits[2]
-                )
+            self._calibrations[key] = util.create_calibration_table(
+                limits[0],
+                limits[1],
+                limits[2]
+            )
+
+    def set_event_sink(self, sink):
+        """Sets the function that receives joystick events directly.
+
+        With a sink present joystick events are handed to it on the thread
+        that produced them, while the joystick_event signal only serves as a
+        throttled notification for the UI. Passing None restores delivery
+        of every event through the signal.
+
+        :param sink function called with each joystick event or None
+        """
+        self._event_sink = sink
+        self._ui_axis_update = {}
 
     def _run(self):
         """Starts the event loop."""
@@ -270,7 +358,7 @@ class EventListener(QtCore.QObject):
         if event.input_type == dinput.InputType.Axis:
             if verbose:
                 logging.getLogger("system").info(event)
-            self.joystick_event.emit(Event(
+            self._dispatch_joystick_event(Event(
                 event_type=common.InputType.JoystickAxis,
                 device_guid=event.device_guid,
                 identifier=event.input_index,
@@ -278,20 +366,42 @@ class EventListener(QtCore.QObject):
                 raw_value=event.value
             ))
         elif event.input_type == dinput.InputType.Button:
-            self.joystick_event.emit(Event(
+            self._dispatch_joystick_event(Event(
                 event_type=common.InputType.JoystickButton,
                 device_guid=event.device_guid,
                 identifier=event.input_index,
                 is_pressed=event.value == 1
             ))
         elif event.input_type == dinput.InputType.Hat:
-            self.joystick_event.emit(Event(
+            self._dispatch_joystick_event(Event(
                 event_type=common.InputType.JoystickHat,
                 device_guid=event.device_guid,
                 identifier=event.input_index,
                 value=util.dill_hat_lookup[event.value]
             ))
 
+    def _dispatch_joystick_event(self, event):
+        """Delivers a joystick event to the sink and / or the Qt signal.
+
+        :param event the joystick event to deliver
+        """
+        sink = self._event_sink
+        if sink is None:
+            self.joystick_event.emit(event)
+            return
+
+        sink(event)
+
+        # Axis events are only forwarded to the UI at a limited rate
+        if event.event_type == common.InputType.JoystickAxis:
+            key = (event.device_guid, event.identifier)
+            now = time.monotonic()
+            if now - self._ui_axis_update.get(key, 0.0) < \
+                    self.ui_axis_interval:
+                return
+            self._ui_axis_update[key] = now
+        self.joystick_event.emit(event)
+
     def _joystick_device_handler(self, data, action):
         """Callback for device change events.
 
@@ -363,11 +473,15 @@ class EventListener(QtCore.QObject):
         return True
 
     def _apply_calibration(self, event):
-        key = (event.device_guid, event.input_index)
-        if key in self._calibrations:
-            return self._calibrations[key](event.value)
-        else:
-            return util.axis_calibration(event.value, -32768, 0, 32767)
+        table = self._calibrations.get(
+            (event.device_guid, event.input_index),
+            self._default_calibration
+        )
+        index = event.value - util.raw_axis_minimum
+        if 0 <= index < len(table):
+            return table[index]
+        # Values outside of the raw range saturate
+        return -1.0 if index < 0 else 1.0
 
     def _init_joysticks(self):
         """Initializes joystick devices."""
@@ -386,7 +500,7 @@ class EventListener(QtCore.QObject):
                 entry.axis_index
             )
             self._calibrations[(device_info.device_guid, entry.axis_index)] = \
-                util.create_calibration_function(
+                util.create_calibration_table(
                     limits[0],
                     limits[1],
                     limits[2]
@@ -402,14 +516,23 @@ class EventHandler(QtCore.QObject):
     mode_changed = QtCore.Signal(str)
     # Signal emitted when the application is pause / resumed
     is_active = QtCore.Signal(bool)
+    # Signal emitted when a vJoy error occurs while processing events
+    vjoy_error = QtCore.Signal(str)
 
     def __init__(self):
         """Initializes the EventHandler instance."""
         QtCore.QObject.__init__(self)
+        # Errors may occur on the input processing thread, ensure they are
+        # displayed by the thread owning this object
+        self.vjoy_error.connect(self._display_error)
         self.process_callbacks = True
         self.plugins = {}
         self.callbacks = {}
         self._event_lookup = {}
+        # Compiled dispatch tables, one per mode, and the one of the
+        # currently active mode
+        self._dispatch_table = {}
+        self._active_dispatch = {}
         self._active_mode = None
         self._previous_mode = None
 
@@ -491,6 +614,30 @@ class EventHandler(QtCore.QObject):
             # Recurse until we've dealt with all modes
             self.build_event_lookup(children)
 
+    def compile_dispatch_table(self):
+        """Compiles the callbacks into a flat dispatch table per mode.
+
+        The table maps the integer input key of an event to the callbacks
+        registered for it, the ones that always execute and all of them,
+        such that no filtering is needed while paused. This has to be called
+        once all callbacks have been added and the event lookup was built.
+        """
+        table = {}
+        for modes in self.callbacks.values():
+            for mode, events in modes.items():
+                mode_table = table.setdefault(mode, {})
+                for event, callbacks in events.items():
+                    # Placeholder entries used to make empty modes present
+                    if event is None:
+                        continue
+                    mode_table[event.input_key] = DispatchEntry(
+                        tuple(cb for cb, permanent in callbacks if permanent),
+                        tuple(cb for cb, _ in callbacks)
+                    )
+
+        self._dispatch_table = table
+        self._active_dispatch = table.get(self._active_mode, {})
+
     def change_mode(self, new_mode):
         """Changes the currently active mode.
 
@@ -512,6 +659,9 @@ class EventHandler(QtCore.QObject):
             cfg = config.Configuration()
             cfg.set_last_mode(cfg.last_profile, new_mode)
 
+            # Swap the dispatch table in a single assignment such that
+            # concurrent event processing never sees a partial state
+            self._active_dispatch = self._dispatch_table.get(new_mode, {})
             self._active_mode = new_mode
             self.mode_changed.emit(self._active_mode)
 
@@ -533,6 +683,8 @@ class EventHandler(QtCore.QObject):
     def clear(self):
         """Removes all attached callbacks."""
         self.callbacks = {}
+        self._dispatch_table = {}
+        self._active_dispatch = {}
 
     @QtCore.Slot(Event)
     def process_event(self, event):
@@ -543,15 +695,31 @@ class EventHandler(QtCore.QObject):
         """
 
         m_list = self._matching_callbacks(event)
-        for cb in m_list:
-            try:
-                cb(event)
-            except error.VJoyError as e:
-                util.display_error(str(e))
-                logging.getLogger("system").exception(
-                    f"VJoy related error: {e}"
-                )
-                self.pause()
+
+        # Changes to vJoy devices made by the callbacks are sent to the
+        # driver once all of them ran
+        batcher = vjoy.report_batcher
+        batcher.begin()
+        try:
+            for cb in m_list:
+                try:
+                    cb(event)
+                except error.VJoyError as e:
+                    logging.getLogger("system").exception(
+                        f"VJoy related error: {e}"
+                    )
+                    self.pause()
+                    self.vjoy_error.emit(str(e))
+        finally:
+            batcher.end()
+
+    @QtCore.Slot(str)
+    def _display_error(self, msg):
+        """Displays an error message raised during event processing.
+
+        :param msg the error message to display
+        """
+        util.display_error(msg)
 
     def _matching_callbacks(self, event):
         """Returns the list of callbacks to execute in response to
@@ -559,21 +727,18 @@ class EventHandler(QtCore.QObject):
 
         :param event the event for which to search the matching
             callbacks
-        :return a list of all callbacks registered and valid for the
+        :return a tuple of all callbacks registered and valid for the
             given event
         """
-        # Obtain callbacks matching the event
-        callback_list = []
-        if event.device_guid in self.callbacks:
-            callback_list = self.callbacks[event.device_guid].get(
-                self._active_mode, {}
-            ).get(event, [])
+        entry = self._active_dispatch.get(event.input_key)
+        if entry is None:
+            return ()
 
         # Filter events when the system is paused
         if not self.process_callbacks:
-            return [c[0] for c in callback_list if c[1]]
+            return entry.always
         else:
-            return [c[0] for c in callback_list]
+            return entry.all
 
     def _install_plugins(self, callback):
         """Installs the current plugins into the given callback.
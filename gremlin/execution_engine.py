@@ -0,0 +1,220 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import collections
+import logging
+import threading
+
+from gremlin import common
+from gremlin.singleton_decorator import SingletonDecorator
+
+
+syslog = logging.getLogger("system")
+
+
+class CoalescingEventQueue:
+
+    """Event queue which only keeps the most recent value of each axis.
+
+    Axis events are placed into a per (device, axis) mailbox. While a
+    mailbox is waiting to be processed any newer sample of the same axis
+    replaces the stored event instead of being queued. All other events,
+    buttons, hats, keys, are queued in strict order and act as barriers,
+    i.e. an axis sample is never merged across such an event, which keeps
+    the relative order of all inputs intact.
+    """
+
+    def __init__(self):
+        """Creates a new, empty queue."""
+        self._condition = threading.Condition(threading.Lock())
+        self._entries = collections.deque()
+        self._mailboxes = {}
+        self._barrier = 0
+
+        self.received_count = 0
+        self.merged_count = 0
+        self.max_depth = 0
+
+    def __len__(self):
+        """Returns the number of entries waiting to be processed.
+
+        :return number of queued entries
+        """
+        return len(self._entries)
+
+    def put(self, event):
+        """Adds an event to the queue.
+
+        :param event the event to add, None can be used to wake up a
+            consumer waiting on the queue
+        """
+        with self._condition:
+            if event is not None:
+                self.received_count += 1
+            if event is not None and \
+                    event.event_type == common.InputType.JoystickAxis:
+                key = event.input_key
+                mailbox = self._mailboxes.get(key)
+                if mailbox is not None and mailbox[0] == self._barrier:
+                    mailbox[1] = event
+                    self.merged_count += 1
+                    return
+
+                mailbox = [self._barrier, event]
+                self._mailboxes[key] = mailbox
+                self._entries.append(mailbox)
+            else:
+                self._barrier += 1
+                self._entries.append(event)
+
+            self.max_depth = max(self.max_depth, len(self._entries))
+            self._condition.notify()
+
+    def get(self):
+        """Returns the oldest entry, waiting for one if the queue is empty.
+
+        :return the next event to process
+        """
+        with self._condition:
+            while len(self._entries) == 0:
+                self._condition.wait()
+
+            entry = self._entries.popleft()
+            if isinstance(entry, list):
+                event = entry[1]
+                key = event.input_key
+                if self._mailboxes.get(key) is entry:
+                    del self._mailboxes[key]
+                return event
+            return entry
+
+    def clear(self):
+        """Discards all queued entries."""
+        with self._condition:
+            self._entries.clear()
+            self._mailboxes = {}
+
+    def statistics(self):
+        """Returns counters describing the queue's activity.
+
+        :return dictionary with the number of received and merged events
+            as well as the largest queue depth observed
+        """
+        with self._condition:
+            return {
+                "received": self.received_count,
+                "merged": self.merged_count,
+                "max_depth": self.max_depth,
+                "depth": len(self._entries)
+            }
+
+
+@SingletonDecorator
+class ExecutionEngine:
+
+    """Processes input events on a dedicated worker thread.
+
+    By default events are delivered to the EventHandler through queued Qt
+    signals which are executed by the GUI thread, which means any UI work
+    delays the processing of inputs. When the engine is running events are
+    instead placed into a coalescing queue which is drained by a worker
+    thread that runs the profile callbacks, independent of the GUI thread.
+    """
+
+    def __init__(self):
+        """Creates a new instance."""
+        self._queue = CoalescingEventQueue()
+        self._thread = None
+        self._running = False
+        self._process_fn = None
+
+    @property
+    def running(self):
+        """Returns whether or not the engine is processing events.
+
+        :return True if the worker thread is running, False otherwise
+        """
+        return self._running
+
+    def start(self, process_fn):
+        """Starts the worker thread.
+
+        :param process_fn function called with each queued event
+        """
+        if self._running:
+            return
+
+        self._process_fn = process_fn
+        self._queue = CoalescingEventQueue()
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name="input_processing",
+            daemon=True
+        )
+        self._thread.start()
+        syslog.debug("Input processing thread started")
+
+    def stop(self):
+        """Stops the worker thread, discarding any events not yet processed."""
+        if not self._running:
+            return
+
+        self._running = False
+        # Wake the worker up in case it is waiting for events
+        self._queue.put(None)
+        if self._thread is not None and self._thread.is_alive() and \
+                self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self._process_fn = None
+        stats = self._queue.statistics()
+        syslog.debug(
+            f"Input processing thread stopped - received {stats['received']} "
+            f"events, merged {stats['merged']} axis samples, "
+            f"max queue depth {stats['max_depth']}"
+        )
+        self._queue.clear()
+
+    def statistics(self):
+        """Returns the counters of the event queue.
+
+        :return dictionary of queue counters
+        """
+        return self._queue.statistics()
+
+    def enqueue(self, event):
+        """Queues an event for processing by the worker thread.
+
+        This is safe to call from any thread.
+
+        :param event the event to process
+        """
+        if self._running:
+            self._queue.put(event)
+
+    def _run(self):
+        """Processes queued events until the engine is stopped."""
+        while self._running:
+            event = self._queue.get()
+            if event is None or not self._running:
+                continue
+            try:
+                self._process_fn(event)
+            except Exception as e:
+                # Never let a single faulty callback terminate the thread
+                syslog.exception(f"Error while processing input event: {e}")
@@ -17,15 +17,20 @@
 
 from abc import abstractmethod, ABCMeta
 from collections import namedtuple
-import copy
 import logging
-import time
+import threading
 
-from gremlin import actions, base_classes, common, error, plugin_manager
+from gremlin import actions, base_classes, common, error, plugin_manager, \
+    scheduler
+from vjoy import vjoy
 
 
 CallbackData = namedtuple("ContainerCallback", ["callback", "event"])
 
+# Delay in seconds after which an event that forced the activation of a
+# virtual axis button is processed again in order to release the button
+forced_activation_delay = 0.05
+
 
 class ContainerCallback:
 
@@ -35,6 +40,18 @@ class ContainerCallback:
     and chained actions.
     """
 
+    # Event types whose value is taken from the event's value field, all
+    # other valid types use the event's pressed state
+    value_types = frozenset([
+        common.InputType.JoystickAxis,
+        common.InputType.JoystickHat
+    ])
+    pressed_types = frozenset([
+        common.InputType.JoystickButton,
+        common.InputType.Keyboard,
+        common.InputType.VirtualButton
+    ])
+
     def __init__(self, container):
         """Creates a new instance based according to the given input item.
 
@@ -42,6 +59,8 @@ class ContainerCallback:
             execution graph base callback
         """
         self.execution_graph = ContainerExecutionGraph(container)
+        self._value = actions.Value(None)
+        self._value_lock = threading.Lock()
 
     def __call__(self, event):
         """Executes the callback based on the event's content.
@@ -49,31 +68,32 @@ class ContainerCallback:
         Creates a Value object from the event and passes the two through the
         execution graph until every entry has run or it is aborted.
         """
-        if event.event_type in [
-            common.InputType.JoystickAxis,
-            common.InputType.JoystickHat
-        ]:
-            value = actions.Value(event.value)
-        elif event.event_type in [
-            common.InputType.JoystickButton,
-            common.InputType.Keyboard,
-            common.InputType.VirtualButton
-        ]:
-            value = actions.Value(event.is_pressed)
+        event_type = event.event_type
+        if event_type in self.value_types:
+            raw = event.value
+        elif event_type in self.pressed_types:
+            raw = event.is_pressed
         else:
             raise error.GremlinError("Invalid event type")
 
-        # Containers representing a virtual button get their individual
-        # value instance, all others share one to propagate changes across
-        shared_value = copy.deepcopy(value)
-
         if event == common.InputType.VirtualButton:
             # TODO: remove this at a future stage
             logging.getLogger("system").error(
                 "Virtual button code path being used"
             )
+            return
+
+        # The value instance is reused for every event, only when the
+        # callback is re-entered, e.g. from another thread, a new one is
+        # created for the nested call
+        if self._value_lock.acquire(blocking=False):
+            try:
+                self._value.reset(raw)
+                self.execution_graph.process_event(event, self._value)
+            finally:
+                self._value_lock.release()
         else:
-            self.execution_graph.process_event(event, shared_value)
+            self.execution_graph.process_event(event, actions.Value(raw))
 
 
 class VirtualButtonCallback:
@@ -109,6 +129,10 @@ class VirtualButtonProcess:
         :param container the container using a virtual button configuration
         """
         self.virtual_button = None
+        self._generation = 0
+        # Events are processed by the input thread and, when repeated, by
+        # the timer wheel thread
+        self._lock = threading.Lock()
 
         if isinstance(data, base_classes.VirtualAxisButton):
             self.virtual_button = actions.AxisButton(
@@ -128,7 +152,36 @@ class VirtualButtonProcess:
 
         :param event the input event being processed
         """
-        self.virtual_button.process_event(event)
+        with self._lock:
+            self._generation += 1
+            self.virtual_button.process_event(event)
+
+            # An axis moving over the activation region between two events
+            # presses the button, release it again a short while later
+            # without holding up the processing of other inputs
+            if getattr(self.virtual_button, "forced_activation", False):
+                scheduler.TimerWheel().schedule(
+                    forced_activation_delay,
+                    self._process_again,
+                    event,
+                    self._generation
+                )
+
+    def _process_again(self, event, generation):
+        """Processes an event again unless a newer one has been seen.
+
+        :param event the event to process again
+        :param generation the number of events processed when the repeated
+            processing was scheduled
+        """
+        vjoy.report_batcher.begin()
+        try:
+            with self._lock:
+                # A more recent event already updated the button's state
+                if generation == self._generation:
+                    self.virtual_button.process_event(event)
+        finally:
+            vjoy.report_batcher.end()
 
 
 class AbstractExecutionGraph(metaclass=ABCMeta):
@@ -150,10 +203,21 @@ class AbstractExecutionGraph(metaclass=ABCMeta):
         :param instance the object to use in order to generate the graph
         """
         self.functors = []
-        self.transitions = {}
-        self.current_index = 0
+        self._generation = 0
+        # Events are processed by the input thread and, when repeated, by
+        # the timer wheel thread. Reentrant as actions may cause further
+        # events to be processed by the same graph.
+        self._lock = threading.RLock()
+        # Jump arrays holding, for each node, the index of the node to
+        # execute next on success and failure respectively, -1 terminates
+        self.next_on_success = []
+        self.next_on_failure = []
+        self._is_axis_button = []
 
         self._build_graph(instance)
+        self._is_axis_button = [
+            isinstance(functor, actions.AxisButton) for functor in self.functors
+        ]
 
     def process_event(self, event, value):
         """Executes the graph with the provided data.
@@ -161,31 +225,64 @@ class AbstractExecutionGraph(metaclass=ABCMeta):
         :param event the raw event that caused the execution of this graph
         :param value the possibly modified value extracted from the event
         """
-        
-
         # Processing an event twice is needed when a virtual axis button has
         # "jumped" over it's activation region without triggering it. Once
-        # this is detected the "press" event is sent and the second run ensures
-        # a "release" event is sent.
-        process_again = False
-
-        while self.current_index is not None and len(self.functors) > 0:
-            functor = self.functors[self.current_index]
-
-            result = functor.process_event(event, value)
-
-            if isinstance(functor, actions.AxisButton):
-                process_again = functor.forced_activation
+        # this is detected the "press" event is sent and the second run,
+        # scheduled for later so other inputs are not held up, ensures a
+        # "release" event is sent.
+        with self._lock:
+            process_again = False
+            self._generation += 1
+
+            functors = self.functors
+            next_on_success = self.next_on_success
+            next_on_failure = self.next_on_failure
+            is_axis_button = self._is_axis_button
+
+            index = 0 if len(functors) > 0 else -1
+            while index >= 0:
+                functor = functors[index]
+
+                result = functor.process_event(event, value)
+
+                if is_axis_button[index]:
+                    process_again = functor.forced_activation
+
+                # Nodes which don't report an outcome terminate the graph
+                if result is None:
+                    index = -1
+                elif result:
+                    index = next_on_success[index]
+                else:
+                    index = next_on_failure[index]
+
+            # The value instance may be reused once this call returns, hence
+            # the deferred processing needs its own copy
+            if process_again:
+                scheduler.TimerWheel().schedule(
+                    forced_activation_delay,
+                    self._process_again,
+                    event,
+                    value.clone(),
+                    self._generation
+                )
 
-            self.current_index = self.transitions.get(
-                (self.current_index, result),
-                None
-            )
-        self.current_index = 0
+    def _process_again(self, event, value, generation):
+        """Executes the graph again unless a newer event has been processed.
 
-        if process_again:
-            time.sleep(0.05)
-            self.process_event(event, value)
+        :param event the event to process again
+        :param value the value to use
+        :param generation the number of events processed when the repeated
+            execution was scheduled
+        """
+        vjoy.report_batcher.begin()
+        try:
+            with self._lock:
+                # A more recent event already updated the graph's state
+                if generation == self._generation:
+                    self.process_event(event, value)
+        finally:
+            vjoy.report_batcher.end()
 
     @abstractmethod
     def _build_graph(self, instance):
@@ -252,24 +349,25 @@ class AbstractExecutionGraph(metaclass=ABCMeta):
         :param sequence the sequence of nodes
         """
         seq_count = len(sequence)
-        self.transitions = {}
+        self.next_on_success = [-1] * seq_count
+        self.next_on_failure = [-1] * seq_count
         for i, seq in enumerate(sequence):
             if seq == "Condition":
                 # On success, transition to the next node of any type in line
-                self.transitions[(i, True)] = i+1
+                self.next_on_success[i] = i+1
                 offset = i + 1
                 # On failure, transition to the condition node after the
                 # next action node
                 while offset < seq_count:
                     if sequence[offset] == "Action":
                         if offset+1 < seq_count:
-                            self.transitions[(i, False)] = offset+1
+                            self.next_on_failure[i] = offset+1
                             break
                     offset += 1
             elif seq == "Action" and i+1 < seq_count:
                 # Transition to the next node irrespective of failure or success
-                self.transitions[(i, True)] = i+1
-                self.transitions[(i, False)] = i + 1
+                self.next_on_success[i] = i+1
+                self.next_on_failure[i] = i + 1
 
 
 class ContainerExecutionGraph(AbstractExecutionGraph):
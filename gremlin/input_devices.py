@@ -18,7 +18,6 @@
 
 import collections
 import functools
-import heapq
 import inspect
 import logging
 import time
@@ -32,12 +31,12 @@ import gremlin.keyboard
 import gremlin.types
 from dinput import DILL, GUID, GUID_Invalid
 
-from . import common, error, event_handler, joystick_handling, util
+from . import common, error, event_handler, joystick_handling, remote_protocol, scheduler, util
 
 import win32api
 import gremlin.sendinput, gremlin.tts
 
-import socketserver, socket, msgpack
+import selectors, socket, select
 import enum
 
 from gremlin.singleton_decorator import SingletonDecorator
@@ -415,47 +414,84 @@ class CallbackRegistry:
 
 class PeriodicRegistry:
 
-    """Registry for periodically executed functions."""
+    """Registry for periodically executed functions.
+
+    The functions are executed at a fixed rate by a PeriodicScheduler,
+    which is created anew every time the registry is started.
+    """
 
     def __init__(self):
         """Creates a new instance."""
         self._registry = {}
-        self._running = False
-        self._thread = threading.Thread(target=self._thread_loop)
-        self._queue = []
+        self._scheduler = None
         self._plugins = []
 
     def start(self):
         """Starts the event loop."""
-        # Only proceed if we have functions to call
-        if len(self._registry) == 0:
+        # Only proceed if we have functions to call and are not running
+        if len(self._registry) == 0 or self._scheduler is not None:
             return
 
-        # Only create a new thread and start it if the thread is not
-        # currently running
-        self._running = True
-        if not self._thread.is_alive():
-            self._thread = threading.Thread(target=self._thread_loop)
-            self._thread.start()
+        # Setup plugins to use
+        self._plugins = [
+            JoystickPlugin(),
+            VJoyPlugin(),
+            KeyboardPlugin()
+        ]
+        self._scheduler = scheduler.PeriodicScheduler("periodic_registry")
+        for interval, callback, policy, pooled in self._registry.values():
+            self._scheduler.add(
+                self._install_plugins(callback), interval, policy, pooled
+            )
+        self._scheduler.start()
 
     def stop(self):
         """Stops the event loop."""
-        self._running = False
-        if self._thread.is_alive():
-            self._thread.join()
+        if self._scheduler is None:
+            return
 
-    def add(self, callback, interval):
+        self._scheduler.stop()
+        for task in self._scheduler.tasks:
+            syslog.info(f"Periodic {task.name}: {task.statistics}")
+        self._scheduler = None
+
+    def add(
+            self,
+            callback,
+            interval,
+            policy=scheduler.OverrunPolicy.Skip,
+            pooled=False
+    ):
         """Adds a function to execute periodically.
 
         :param callback the function to execute
         :param interval the time between executions
+        :param policy OverrunPolicy applied when executions fall behind,
+            pooled functions only support OverrunPolicy.Skip
+        :param pooled if True the function runs in a worker pool
         """
-        self._registry[callback] = (interval, callback)
+        if pooled and policy == scheduler.OverrunPolicy.CatchUp:
+            raise error.GremlinError(
+                f"Pooled periodic function {callback.__name__} cannot catch up"
+            )
+        self._registry[callback] = (interval, callback, policy, pooled)
 
     def clear(self):
         """Clears the registry."""
         self._registry = {}
 
+    @property
+    def statistics(self):
+        """Returns the execution statistics of the running functions.
+
+        :return dictionary of statistics keyed by function name
+        """
+        if self._scheduler is None:
+            return {}
+        return {
+            task.name: task.statistics for task in self._scheduler.tasks
+        }
+
     def _install_plugins(self, callback):
         """Installs the current plugins into the given callback.
 
@@ -473,47 +509,6 @@ class PeriodicRegistry:
         return callback
 
 
-    def _thread_loop(self):
-        """Main execution loop run in a separate thread."""
-        import uuid
-        # Setup plugins to use
-        self._plugins = [
-            JoystickPlugin(),
-            VJoyPlugin(),
-            KeyboardPlugin()
-        ]
-        callback_map = {}
-        period_map = {}
-        # Populate the queue
-        self._queue = []
-        for item in self._registry.values():
-            plugin_cb = self._install_plugins(item[1])
-            node_id = str(uuid.uuid1())
-            callback_map[node_id] = plugin_cb
-            period_map[node_id] = item[0]
-            value = time.time() + period_map[node_id]
-            heapq.heappush(self._queue, (value, node_id))
-
-
-        # Main thread loop
-        while self._running:
-            # Process all events that require running
-            if self._queue:
-                while self._queue[0][0] < time.time():
-                    value, node_id = heapq.heappop(self._queue)
-                    callback_map[node_id]()
-
-                    heapq.heappush(
-                        self._queue,
-                        (time.time() + period_map[node_id], node_id)
-                    )
-
-            # Sleep until either the next function needs to be run or
-            # our timeout expires
-            time.sleep(min(self._queue[0][0] - time.time(), 1.0))
-
-            
-
 class SimpleRegistry:
 
     """Registry for functions executed  """
@@ -676,97 +671,210 @@ class StateChangeRegistry():
 
 
 
-class GremlinServer(socketserver.ThreadingMixIn,socketserver.UDPServer):
-    pass
+class GremlinServer():
+    ''' UDP receiver decoding and applying remote gremlin client packets on a single thread
 
-class GremlinSocketHandler(socketserver.BaseRequestHandler):
-    ''' handles remote input from a gremlin client on the network 
-    
-        received network events are processed here
-    
+        all available datagrams are read into a bounded queue and then dispatched in
+        order, when more datagrams are waiting than the queue holds, i.e. packets arrive
+        faster than they can be applied, the oldest ones are dropped
     '''
 
+    # largest number of datagrams waiting to be dispatched
+    max_queue = 256
 
-    def handle(self):
-        
-      
-        # handles input data
-        raw_data = self.request[0].strip()
-        # socket = self.request[1]
-        
-        data = msgpack.unpackb(raw_data)
-        # syslog.debug(f"Gremlin received remote data: {data}")
+    def __init__(self, server_address, dispatcher = None):
+        ''' binds the receiving socket
 
-        sender = data["sender"]
-        if sender == remote_client.id:
-            # ignore our own broadcasts
-            return 
-        
-        action = data["action"]
-        if action == "hb":
-            # heart beat
-            return 
-        
-        if action == "key":
-            # keyboard output
-            virtual_code = data["vc"]
-            scan_code = data["sc"]
-            flags = data["flags"]
-            win32api.keybd_event(virtual_code, scan_code, flags, 0)
-        elif action == "mouse":
-            
-            subtype = data["subtype"]
-            if subtype == "wheel":
-                direction = data["direction"]
-                gremlin.sendinput.mouse_wheel(direction)
-
-            elif subtype == "button":
-                button_id = data["button"]
-                button = gremlin.sendinput.MouseButton.to_enum(button_id)
-                is_pressed = data["value"]
-                if is_pressed:
-                    gremlin.sendinput.mouse_press(button)
-                else:
-                    gremlin.sendinput.mouse_release(button)
-            elif subtype == "axis":
-                dx = data["dx"]
-                dy = data["dy"]
-                mouse_controller = gremlin.sendinput.MouseController()
-                mouse_controller.set_absolute_motion(dx, dy)
-
-            elif subtype == "amotion":
-                # accelerated motion
-                a = data["acc"]
-                min_speed = data["min_speed"]
-                max_speed = data["max_speed"] 
-                time_to_max_speed = data["time_to_speed"]
-                mouse_controller = gremlin.sendinput.MouseController()
-                mouse_controller.set_accelerated_motion(a,min_speed,max_speed,time_to_max_speed)
-
-
-        elif action in ("button","axis","hat","relative_axis"):
-            # joystick button
-            device = data["device"]
-            target = data["target"]
-            value = data["value"]
-            proxy = joystick_handling.VJoyProxy()
-            if device in proxy.vjoy_devices:
-                # valid device
-                vjoy = proxy[device]
-                
-                if action == "button":
-                    # emit button change
-                    if target > 0 and target < vjoy.button_count:
-                        proxy[device].button(target).is_pressed = value
-                elif action == "axis":
-                    if target > 0 and target <= vjoy.axis_count:
-                        proxy[device].axis(target).value = value
-                elif action == "hat":
-                    if target > 0 and target <= vjoy.hat_count:
-                        proxy[device].hat(target).direction = value
-                elif action == "relative_axis":
-                     if target > 0 and target <= vjoy.axis_count:
-                        proxy[device].axis(target).value = max(-1.0,min(1.0, proxy[device].axis(target).value + value))
+        :param server_address (host, port) tuple to receive on
+        :param dispatcher remote_protocol.Dispatcher applying the packets
+        '''
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self.socket.bind(server_address)
+        except OSError:
+            self.socket.close()
+            raise
+        self.socket.setblocking(False)
+        self.server_address = self.socket.getsockname()
+        self.dispatcher = dispatcher
+
+        self._queue = collections.deque()
+        # wakes the loop on shutdown, a socket pair works with select on all platforms
+        self._wakeup_read, self._wakeup_write = socket.socketpair()
+        self._wakeup_read.setblocking(False)
+        self._shutdown_requested = False
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+        # backpressure metrics
+        self.received = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_queue_depth = 0
+
+    def serve_forever(self):
+        ''' receives and dispatches datagrams until shutdown is called '''
+        selector = selectors.DefaultSelector()
+        selector.register(self.socket, selectors.EVENT_READ)
+        selector.register(self._wakeup_read, selectors.EVENT_READ)
+        self._stopped.clear()
+        try:
+            while not self._shutdown_requested:
+                for key, _ in selector.select():
+                    if key.fileobj is self.socket:
+                        self._read()
+                    else:
+                        self._clear_wakeup()
+                self._process()
+        finally:
+            selector.close()
+            self._shutdown_requested = False
+            self._stopped.set()
+
+    def shutdown(self):
+        ''' stops serve_forever and waits for it to return '''
+        # also stops a loop which is about to start
+        self._shutdown_requested = True
+        self._wakeup_write.send(b"\0")
+        self._stopped.wait()
+
+    def server_close(self):
+        ''' closes the sockets '''
+        self.socket.close()
+        self._wakeup_read.close()
+        self._wakeup_write.close()
+
+    def _read(self):
+        ''' moves all datagrams available on the socket into the queue
+
+            the socket is drained completely so that a backlog larger than the queue
+            drops the oldest datagrams rather than delaying the newest ones
+        '''
+        queue = self._queue
+        while True:
+            try:
+                packet = self.socket.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as err:
+                # e.g. ICMP port unreachable reported for an earlier reply
+                syslog.debug(f"Gremlin listener: receive error {err}")
+                break
+            self.received += 1
+            if len(queue) >= self.max_queue:
+                queue.popleft()
+                self.dropped += 1
+            queue.append(packet)
+        self.max_queue_depth = max(self.max_queue_depth, len(queue))
+
+    def _process(self):
+        ''' dispatches the queued datagrams '''
+        queue = self._queue
+        dispatch = self.dispatcher.dispatch
+        while queue:
+            data, address = queue.popleft()
+            try:
+                dispatch(data, address, self.socket)
+            except Exception as err:
+                self.errors += 1
+                syslog.debug(f"Gremlin listener: invalid packet from {address[0]}: {err}")
+
+    def _clear_wakeup(self):
+        try:
+            while self._wakeup_read.recv(64):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def __str__(self):
+        return f"received={self.received} dropped={self.dropped} errors={self.errors} " \
+            f"max queue={self.max_queue_depth}"
+
+
+def _remote_heartbeat(frame, protocol):
+    ''' heart beat - acknowledges the binary protocol to clients announcing it '''
+    if protocol >= remote_protocol.VERSION and frame.socket is not None:
+        ack = remote_protocol.FrameEncoder(remote_client.sender_id).encode(
+            remote_protocol.Opcode.HelloAck, remote_protocol.VERSION
+        )
+        frame.socket.sendto(ack, frame.address)
+
+def _remote_vjoy(device):
+    ''' returns the vjoy device if it is available to the remote '''
+    proxy = joystick_handling.VJoyProxy()
+    if device in proxy.vjoy_devices:
+        return proxy[device]
+    return None
+
+def _remote_button(frame, device, target, value):
+    vjoy = _remote_vjoy(device)
+    if vjoy and target > 0 and target < vjoy.button_count:
+        vjoy.button(target).is_pressed = value
+
+def _remote_toggle_button(frame, device, target):
+    vjoy = _remote_vjoy(device)
+    if vjoy and target > 0 and target < vjoy.button_count:
+        button = vjoy.button(target)
+        button.is_pressed = not button.is_pressed
+
+def _remote_axis(frame, device, target, value):
+    vjoy = _remote_vjoy(device)
+    if vjoy and target > 0 and target <= vjoy.axis_count:
+        vjoy.axis(target).value = value
+
+def _remote_relative_axis(frame, device, target, value):
+    vjoy = _remote_vjoy(device)
+    if vjoy and target > 0 and target <= vjoy.axis_count:
+        axis = vjoy.axis(target)
+        axis.value = max(-1.0, min(1.0, axis.value + value))
+
+def _remote_hat(frame, device, target, x, y):
+    vjoy = _remote_vjoy(device)
+    if vjoy and target > 0 and target <= vjoy.hat_count:
+        vjoy.hat(target).direction = (x, y)
+
+def _remote_key(frame, virtual_code, scan_code, flags):
+    # keyboard output
+    win32api.keybd_event(virtual_code, scan_code, flags, 0)
+
+def _remote_mouse_button(frame, button_id, is_pressed):
+    if isinstance(button_id, str):
+        button = gremlin.sendinput.MouseButton.to_enum(button_id)
+    else:
+        button = gremlin.sendinput.MouseButton(button_id)
+    if is_pressed:
+        gremlin.sendinput.mouse_press(button)
+    else:
+        gremlin.sendinput.mouse_release(button)
+
+def _remote_mouse_wheel(frame, direction):
+    gremlin.sendinput.mouse_wheel(direction)
+
+def _remote_mouse_motion(frame, dx, dy):
+    mouse_controller = gremlin.sendinput.MouseController()
+    mouse_controller.set_absolute_motion(dx, dy, source="remote")
+
+def _remote_mouse_acceleration(frame, a, min_speed, max_speed, time_to_max_speed):
+    # accelerated motion
+    mouse_controller = gremlin.sendinput.MouseController()
+    mouse_controller.set_accelerated_motion(
+        a, min_speed, max_speed, time_to_max_speed, source="remote"
+    )
+
+# handler of each record type received from remote clients
+remote_handlers = {
+    remote_protocol.Opcode.Heartbeat: _remote_heartbeat,
+    remote_protocol.Opcode.Button: _remote_button,
+    remote_protocol.Opcode.ToggleButton: _remote_toggle_button,
+    remote_protocol.Opcode.Axis: _remote_axis,
+    remote_protocol.Opcode.RelativeAxis: _remote_relative_axis,
+    remote_protocol.Opcode.Hat: _remote_hat,
+    remote_protocol.Opcode.Key: _remote_key,
+    remote_protocol.Opcode.MouseButton: _remote_mouse_button,
+    remote_protocol.Opcode.MouseWheel: _remote_mouse_wheel,
+    remote_protocol.Opcode.MouseMotion: _remote_mouse_motion,
+    remote_protocol.Opcode.MouseAcceleration: _remote_mouse_acceleration,
+}
 
 class RPCGremlin():
     ''' remote UDP multicast listener '''
@@ -783,34 +891,38 @@ class RPCGremlin():
         self._server = None
         self._running = False
         self._thread = None
-        self._server_thread = None
-        self._keep_running = False
 
         
 
-    def _run(self):
+    def _create_server(self):
+        ''' creates the receiving server and joins the multicast group '''
         import struct
-        syslog.debug("Starting gremlin listener...")
-        self._server = GremlinServer(('', self._port),GremlinSocketHandler)
-        self._server_thread = threading.Thread(target=self._server.serve_forever)
-        self._server_thread.daemon = True
+        dispatcher = remote_protocol.Dispatcher(
+            remote_handlers,
+            (remote_client.id, remote_client.sender_id)
+        )
+        server = GremlinServer(('', self._port), dispatcher)
         try:
-            self._server_thread.start()
             # enable listen to multicast UDP
             group = socket.inet_aton(RPCGremlin.MULTICAST_GROUP)
             mreq = struct.pack('4sL', group, socket.INADDR_ANY)
-            self._server.socket.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
-            syslog.debug(f"Starting gremlin server listener:  multicast group {RPCGremlin.MULTICAST_GROUP} port {self._port} ...")
-            self._keep_running = True
-            self._running = True
-            while self._keep_running:
-                time.sleep(1)
+            server.socket.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+        except OSError:
+            server.server_close()
+            raise
+        return server
+
+    def _run(self):
+        server = self._server
+        try:
+            # packets are received and applied on this thread until stopped
+            server.serve_forever()
         except Exception as ex:
-            pass
+            syslog.error(f"Gremlin listener error: {ex}")
 
-        self._server.shutdown()
-        self._server.server_close()
+        server.server_close()
         self._running = False
+        syslog.debug(f"Gremlin listener statistics: {server} {server.dispatcher.statistics}")
         syslog.debug("Gremlin listener stopped.")
         proxy = joystick_handling.VJoyProxy()
         # release any locks on devices
@@ -840,7 +952,16 @@ class RPCGremlin():
                 syslog.debug(f"Remote proxy VJOY [{key}] ok")
             except:
                 pass
+        syslog.debug("Starting gremlin listener...")
+        try:
+            self._server = self._create_server()
+        except OSError as ex:
+            syslog.error(f"Unable to start gremlin listener on port {self._port}: {ex}")
+            return
+        syslog.debug(f"Starting gremlin server listener:  multicast group {RPCGremlin.MULTICAST_GROUP} port {self._port} ...")
+        self._running = True
         self._thread = threading.Thread(target=self._run)
+        self._thread.setName("remote_listener")
         self._thread.start()
 
         
@@ -851,10 +972,11 @@ class RPCGremlin():
             return
         
         # stop the server loop
-        self._keep_running = False
+        self._server.shutdown()
         if self._thread.is_alive():
             self._thread.join()
         self._thread = None
+        self._server = None
 
         syslog.debug("Gremlin RPC server stopped...")
 
@@ -905,6 +1027,12 @@ class RemoteServer(QtCore.QObject):
 class RemoteClient(QtCore.QObject):
     """ Provides access to a remote Gremlin instance """
 
+    # seconds between snapshots of the state controlled by this client
+    snapshot_interval = 2.0
+    # seconds between heartbeats while the binary protocol is enabled, acknowledgements
+    # of receivers expire after three heartbeats without one
+    heartbeat_interval = 5.0
+
     class ClientMode(enum.Enum):
         Local = 1
         Remote = 2
@@ -923,12 +1051,30 @@ class RemoteClient(QtCore.QObject):
         self._sock = None
         # unique ID of this client
         self._id = common.get_guid()
+        self._encoder = remote_protocol.FrameEncoder(remote_protocol.sender_id(self._id))
+        # binary frames are only sent if enabled and a receiver acknowledged them recently
+        self._negotiation = remote_protocol.Negotiation(
+            config.remote_binary_protocol, 3 * self.heartbeat_interval
+        )
         self._alive_thread = None
         self._alive_thread_stop_requested = False
+        # axis changes are aggregated and sent once per tick by the output thread
+        self._aggregator = remote_protocol.AxisAggregator()
+        self._output_thread = None
+        self._output_stop = threading.Event()
+        self._frames_sent = 0
+        # last record sent for each button, axis, and hat, keyed by (opcode, vjoy id, input id)
+        self._state = {}
 
 
     def start(self):
         ''' creates a multicast client send socket'''
+        self.ensure_socket()
+
+        config = gremlin.config.Configuration()
+        self.set_axis_rate(config.remote_axis_rate)
+        self._negotiation.enabled = config.remote_binary_protocol
+
         if self._broadcast_enabled:
             # alive thread is only on master machine
             if not self._alive_thread:        
@@ -938,8 +1084,6 @@ class RemoteClient(QtCore.QObject):
                 self._alive_thread.setName("remote_alive")
                 self._alive_thread.start()
 
-        self.ensure_socket()
-
 
     def ensure_socket(self):
         # makes sure the socket exists
@@ -959,163 +1103,240 @@ class RemoteClient(QtCore.QObject):
                 self._alive_thread.join()
             syslog.debug("Alive thread stopped")
             self._alive_thread = None
+
+        if self._output_thread:
+            self.set_axis_rate(0)
+            syslog.debug(f"Remote output stopped: {self._frames_sent} frames, "
+                         f"{self._aggregator.updates} axis updates, {self._aggregator.dropped} dropped")
             
         
         if self._sock:
             self._sock.close()
             self._sock = None
+            # the next session negotiates the protocol again
+            self._negotiation.reset()
+            self._state = {}
             syslog.debug("Gremlin RPC client stopped.")
 
     def _alive_ticker(self):
-        ''' sends an alive packet to keep the remote alive '''
+        ''' sends an alive packet to keep the remote alive 
+        
+            the heartbeat announces the binary protocol, receivers supporting it reply
+            with an acknowledgement after which binary frames are sent if the user
+            enabled them, legacy receivers on the same group need legacy packets
+
+            snapshots of the controlled state are sent in between so receivers converge
+            after lost frames or when they start after the client
+        '''
 
         notify_time = time.time()
+        snapshot_time = notify_time + self.snapshot_interval
         while not self._alive_thread_stop_requested:
-            if time.time() >= notify_time:
-                data = {}
-                data["sender"] = self._id
-                data["action"] = "hb"
-                raw_data = msgpack.packb(data)
-                self._send(raw_data)
+            now = time.time()
+            if now >= notify_time:
+                self._send_record(remote_protocol.Opcode.Heartbeat, remote_protocol.VERSION)
                 syslog.debug("Alive heartbeat")
-                notify_time = time.time() + 30
-            time.sleep(1)
+                # acknowledgements expire unless they are renewed by each heartbeat
+                notify_time = now + (self.heartbeat_interval if self._negotiation.enabled else 30)
+            if now >= snapshot_time:
+                try:
+                    self.send_snapshot()
+                except OSError as err:
+                    syslog.debug(f"Remote: unable to send snapshot: {err}")
+                snapshot_time = now + self.snapshot_interval
+            self._receive_replies(min(1.0, self.snapshot_interval))
+
+    def send_snapshot(self):
+        ''' sends the last value sent for every button, axis, and hat 
         
+            only sent while remote control is enabled so the remote's own inputs are not overridden
+        '''
+        if not self._negotiation.is_binary() or not self.enabled:
+            return
+        # copying is atomic, the state is updated by other threads
+        records = list(self._state.copy().values())
+        if not records:
+            return
+        marker = (remote_protocol.Opcode.Snapshot, ())
+        step = remote_protocol.max_records - 1
+        for i in range(0, len(records), step):
+            self._send(self._encoder.encode_records([marker] + records[i:i + step]))
+
+    def _receive_replies(self, timeout):
+        ''' waits for and processes replies from receivers '''
+        sock = self._sock
+        if not sock:
+            time.sleep(timeout)
+            return
+        try:
+            readable, _, _ = select.select([sock], [], [], timeout)
+            if not readable:
+                return
+            data, address = sock.recvfrom(1024)
+        except OSError:
+            # socket closed or reply from a host that went away
+            return
+        if len(data) > remote_protocol.header.size and data[0] == remote_protocol.MAGIC \
+                and data[remote_protocol.header.size] == remote_protocol.Opcode.HelloAck:
+            if self._negotiation.acknowledge(address):
+                syslog.debug(f"Remote receiver {address[0]} supports binary protocol")
+
+    def set_axis_rate(self, rate):
+        ''' sets the number of axis frames sent per second, 0 sends each axis change immediately '''
+        if self._output_thread:
+            self._output_stop.set()
+            self._output_thread.join()
+            self._output_thread = None
+            # send what is left of the last tick
+            self.flush()
+
+        if rate > 0:
+            self._aggregator.reset()
+            self._output_stop.clear()
+            self._output_thread = threading.Thread(target=self._output_ticker, args=(rate,))
+            self._output_thread.setName("remote_output")
+            self._output_thread.daemon = True
+            self._output_thread.start()
+
+    def _output_ticker(self, rate):
+        ''' sends the aggregated axis changes at a fixed rate '''
+        period = 1.0 / rate
+        next_tick = time.perf_counter()
+        while not self._output_stop.is_set():
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._output_stop.wait(delay)
+            else:
+                # fell behind, skip the missed ticks rather than bursting
+                next_tick = time.perf_counter()
+            try:
+                self.flush()
+            except OSError as err:
+                syslog.debug(f"Remote output: unable to send axis frame: {err}")
+
+    def flush(self):
+        ''' sends all pending axis changes '''
+        records = self._aggregator.drain()
+        if records:
+            self._send_records(records)
+
+    def _send_records(self, records):
+        ''' sends records as few binary frames, each record on its own otherwise '''
+        if self._negotiation.is_binary():
+            tick = (remote_protocol.Opcode.Tick, (time.time(),))
+            step = remote_protocol.max_records
+            for i in range(0, len(records), step):
+                self._send(self._encoder.encode_records([tick] + records[i:i + step]))
+        else:
+            for opcode, values in records:
+                self._send(remote_protocol.encode_legacy(self._id, opcode, *values))
 
     def _send(self, data = None):
         ''' sends data to the socket'''
         if data:
             self.ensure_socket()
             self._sock.sendto(data, self._address)
+            self._frames_sent += 1
+
+    def _send_record(self, opcode, *values):
+        ''' sends a single record in the negotiated format '''
+        if self._negotiation.is_binary():
+            data = self._encoder.encode(opcode, *values)
+        else:
+            data = remote_protocol.encode_legacy(self._id, opcode, *values)
+        self._send(data)
 
     def send_button(self, device_id, button_id, is_pressed, force_remote = False):
         ''' handles a remote joystick event '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "button"
-            data["device"] = device_id
-            data["target"] = button_id
-            data["value"] = is_pressed
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
+            values = (device_id, button_id, is_pressed)
+            self._state[(remote_protocol.Opcode.Button, device_id, button_id)] = (remote_protocol.Opcode.Button, values)
+            self._send_record(remote_protocol.Opcode.Button, *values)
             #syslog.debug(f"remote gremlin event set button: {device_id} {button_id} {is_pressed}")
 
     def toggle_button(self, device_id, button_id, force_remote = False):
         ''' toggles a button '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "toggle"
-            data["device"] = device_id
-            data["target"] = button_id
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
+            # the resulting state is only known to the remote
+            self._state.pop((remote_protocol.Opcode.Button, device_id, button_id), None)
+            self._send_record(remote_protocol.Opcode.ToggleButton, device_id, button_id)
             #syslog.debug(f"remote gremlin event toggle button: {device_id} {button_id}")
 
     def send_axis(self, device_id, axis_id, value, force_remote = False):
         ''' handles a remote joystick event '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "axis"
-            data["device"] = device_id
-            data["target"] = axis_id
-            data["value"] = value
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
+            self._state[(remote_protocol.Opcode.Axis, device_id, axis_id)] = (remote_protocol.Opcode.Axis, (device_id, axis_id, value))
+            if self._output_thread:
+                self._aggregator.set_axis(device_id, axis_id, value)
+            else:
+                self._send_record(remote_protocol.Opcode.Axis, device_id, axis_id, value)
             #syslog.debug(f"remote gremlin event set axis: {device_id} {axis_id} {value}")
 
+    def send_axes(self, axis_values, force_remote = False):
+        ''' sends several axis values together
+
+        :param axis_values list of (device_id, axis_id, value) tuples
+        '''
+        if self.enabled or force_remote:
+            records = []
+            for device_id, axis_id, value in axis_values:
+                record = (remote_protocol.Opcode.Axis, (device_id, axis_id, value))
+                self._state[(remote_protocol.Opcode.Axis, device_id, axis_id)] = record
+                if self._output_thread:
+                    self._aggregator.set_axis(device_id, axis_id, value)
+                else:
+                    records.append(record)
+            if records:
+                self._send_records(records)
+
     def send_relative_axis(self, device_id, axis_id, value, force_remote = False):
         ''' handles a remote relative axis joystick event '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "relative_axis"
-            data["device"] = device_id
-            data["target"] = axis_id
-            data["value"] = value
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)        
+            # the resulting value is only known to the remote
+            self._state.pop((remote_protocol.Opcode.Axis, device_id, axis_id), None)
+            if self._output_thread:
+                self._aggregator.add_relative(device_id, axis_id, value)
+            else:
+                self._send_record(remote_protocol.Opcode.RelativeAxis, device_id, axis_id, value)
 
     def send_hat(self, device_id, hat_id, direction, force_remote = False):
         ''' handles a remote joystick event '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "hat"
-            data["device"] = device_id
-            data["target"] = hat_id
-            data["value"] = direction
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
+            values = (device_id, hat_id, *direction)
+            self._state[(remote_protocol.Opcode.Hat, device_id, hat_id)] = (remote_protocol.Opcode.Hat, values)
+            self._send_record(remote_protocol.Opcode.Hat, *values)
             #syslog.debug(f"remote gremlin event set hat: {device_id} {hat_id} {direction}")
 
     def send_key(self, virtual_code, scan_code, flags, force_remote = False):
         ''' handles a key event '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "key"
-            data["vc"] = virtual_code
-            data["sc"] = scan_code
-            data["flags"] = flags
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
+            self._send_record(remote_protocol.Opcode.Key, virtual_code, scan_code, flags)
             #syslog.debug(f"remote gremlin event set key: virtual code: {virtual_code} scan code: {scan_code} flags: {flags}")
 
     def send_mouse_button(self, button_id, is_pressed, force_remote = False):
         ''' sends a mouse button press or release '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "mouse"
-            data["subtype"] = "button"
-            data["button"] = button_id
-            data["value"] = is_pressed
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
+            if isinstance(button_id, enum.Enum):
+                button_id = button_id.value
+            self._send_record(remote_protocol.Opcode.MouseButton, button_id, is_pressed)
             #syslog.debug(f"remote gremlin event set mouse: button: {button_id} pressed: {is_pressed}")
 
     def send_mouse_wheel(self, direction, force_remote = False):
         ''' sends mousewheel data  '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "mouse"
-            data["subtype"] = "wheel"
-            data["direction"] = direction
-            
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
+            self._send_record(remote_protocol.Opcode.MouseWheel, direction)
             #syslog.debug(f"remote gremlin event set mouse: wheel {direction}")
 
     def send_mouse_motion(self, dx, dy, force_remote = False):
         ''' sends mouse motion data '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "mouse"
-            data["subtype"] = "axis"
-            data["dx"] = dx
-            data["dy"] = dy
-            
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
+            self._send_record(remote_protocol.Opcode.MouseMotion, dx, dy)
             #syslog.debug(f"remote gremlin event set mouse: axis {dx} {dy}")
 
     def send_mouse_motion_acceleration(self, a, min_speed, max_speed, time_to_max_speed, force_remote = False):
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "mouse"
-            data["subtype"] = "amotion"
-            data["acc"] = a
-            data["min_speed"] = min_speed
-            data["max_speed"] = max_speed
-            data["time_to_speed"] = time_to_max_speed
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
+            self._send_record(remote_protocol.Opcode.MouseAcceleration, a, min_speed, max_speed, time_to_max_speed)
 
 
     @property
@@ -1128,6 +1349,25 @@ class RemoteClient(QtCore.QObject):
     def id(self):
         return self._id
 
+    @property
+    def sender_id(self):
+        ''' numeric id of this client in binary frames '''
+        return self._encoder.sender
+
+    @property
+    def binary_protocol(self):
+        ''' true if binary frames are sent '''
+        return self._negotiation.is_binary()
+
+    @property
+    def statistics(self):
+        ''' counters of the data sent so far '''
+        return {
+            "frames": self._frames_sent,
+            "axis_updates": self._aggregator.updates,
+            "axis_dropped": self._aggregator.dropped,
+        }
+
             
 
 
@@ -1902,10 +2142,20 @@ def keyboard(key_name, mode, always_execute=False):
 
 
 
-def periodic(interval):
+def periodic(interval, policy=scheduler.OverrunPolicy.Skip, pooled=False):
     """Decorator for periodic function callbacks.
 
+    The function is executed at a fixed rate, i.e. its runtime does not
+    delay later executions. Executions that fall behind by more than an
+    interval are dropped, or with OverrunPolicy.CatchUp run back to back.
+    Slow functions can be marked as pooled to run them in a worker pool,
+    so that they do not delay other periodic functions. A pooled function
+    still running when it is due again skips that execution, hence pooled
+    functions cannot be combined with OverrunPolicy.CatchUp.
+
     :param interval the duration between executions of the function
+    :param policy OverrunPolicy applied when executions fall behind
+    :param pooled if True the function runs in a worker pool
     """
 
     def wrap(callback):
@@ -1914,7 +2164,7 @@ def periodic(interval):
         def wrapper_fn(*args, **kwargs):
             callback(*args, **kwargs)
 
-        periodic_registry.add(wrapper_fn, interval)
+        periodic_registry.add(wrapper_fn, interval, policy, pooled)
 
         return wrapper_fn
 
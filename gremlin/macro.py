@@ -16,12 +16,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import collections
+import concurrent.futures
 import ctypes
 from ctypes import wintypes
-import functools
 import logging
 import time
-from threading import Event, Lock, Thread
+from threading import Lock
 from xml.etree import ElementTree
 
 from PySide6 import QtCore
@@ -31,6 +31,7 @@ import win32api
 
 import gremlin
 import gremlin.input_devices
+import gremlin.scheduler
 from gremlin.singleton_decorator import SingletonDecorator
 
 
@@ -222,18 +223,100 @@ def _send_key_up(key, is_local = True, is_remote = False, force_remote = False):
         gremlin.input_devices.remote_client.send_key(key.virtual_code, key.scan_code, flags, force_remote )
 
 
+class MacroRun:
+
+    """Execution state of a single macro run.
+
+    A run is executed step by step by the worker pool of the MacroManager.
+    Pauses end the current step and schedule the next one on the timer
+    wheel, hence no worker is blocked while a macro waits.
+    """
+
+    __slots__ = (
+        "macro", "is_local", "is_remote", "queued", "started", "index",
+        "count", "timer"
+    )
+
+    def __init__(self, macro, is_local, is_remote):
+        """Creates a new run.
+
+        :param macro the macro to run
+        :param is_local true if local control, None to use the remote state
+        :param is_remote true if remote control, None to use the remote state
+        """
+        self.macro = macro
+        self.is_local = is_local
+        self.is_remote = is_remote
+        self.queued = time.monotonic()
+        self.started = None
+        self.index = 0
+        self.count = 0
+        self.timer = None
+
+
+class MacroStatistics:
+
+    """Start latency statistics of a macro.
+
+    The start latency is the time between a macro being queued and its
+    first action being executed, which includes the time spent waiting
+    for a previous run of the same macro or an exclusive macro.
+    """
+
+    def __init__(self):
+        """Creates a new instance."""
+        self.runs = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def record(self, latency):
+        """Records the start latency of a run.
+
+        :param latency time in seconds between queuing and starting
+        """
+        self.runs += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    @property
+    def latency_mean(self):
+        """Returns the mean start latency.
+
+        :return mean start latency in seconds
+        """
+        return self.latency_total / self.runs if self.runs > 0 else 0.0
+
+    def __str__(self):
+        return f"runs: {self.runs} " \
+            f"latency: {self.latency_mean * 1e3:.2f}/{self.latency_max * 1e3:.2f}ms"
+
+
 @SingletonDecorator
 class MacroManager:
 
-    """Manages the proper dispatching and scheduling of macros."""
+    """Manages the proper dispatching and scheduling of macros.
+
+    Queued macros are kept in a queue indexed by macro id, each id holding
+    the runs waiting for the previous run of the same macro to complete.
+    Macros are executed by a small pool of worker threads, pauses between
+    actions and repetitions are scheduled on the shared timer wheel.
+    """
+
+    # Number of threads executing macro actions
+    worker_count = 4
 
     def __init__(self):
         """Initializes the instance."""
         self._active = {}
-        self._queue = []
+        self._queue = collections.OrderedDict()
         self._flags = {}
+        self._statistics = {}
         self._flags_lock = Lock()
         self._queue_lock = Lock()
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.worker_count,
+            thread_name_prefix="macro"
+        )
 
         # Default delay between subsequent message dispatch. This is to get
         # around some games not picking up messages if they are sent in too
@@ -242,198 +325,270 @@ class MacroManager:
 
         self._is_executing_exclusive = False
         self._is_running = False
-        self._schedule_event = Event()
-
-        self._run_scheduler_thread = None
 
     def start(self):
         """Starts the scheduler."""
-        self._active = {}
-        self._flags = {}
-        self._is_running = True
-        if self._run_scheduler_thread is None:
-            self._run_scheduler_thread = Thread(target=self._run_scheduler)
-        if not self._run_scheduler_thread.is_alive():
-            self._run_scheduler_thread.start()
+        with self._queue_lock:
+            self._active = {}
+            self._flags = {}
+            self._statistics = {}
+            self._is_executing_exclusive = False
+            self._is_running = True
+            self._schedule()
 
     def stop(self):
         """Stops the scheduler."""
-        self._is_running = False
-        if self._run_scheduler_thread is not None and \
-                self._run_scheduler_thread.is_alive():
-
-            # Terminate the scheduler
-            self._schedule_event.set()
-            self._run_scheduler_thread.join()
-            self._run_scheduler_thread = None
+        with self._queue_lock:
+            self._is_running = False
 
             # Terminate any macro that is still active
             with self._flags_lock:
                 for key, value in self._flags.items():
                     self._flags[key] = False
 
+        syslog = logging.getLogger("system")
+        for macro_id, statistics in self._statistics.items():
+            syslog.info(f"Macro {macro_id}: {statistics}")
+
     def queue_macro(self, macro, is_local = None, is_remote = None):
         """Queues a macro in the schedule taking the repeat type into account.
 
         :param macro the macro to add to the scheduler
         """
-        if isinstance(macro.repeat, ToggleRepeat) and macro.id in self._active:
-            self.terminate_macro(macro)
-        else:
-            # Preprocess macro to contain pauses as necessary
-            if not is_local:
-                is_local = macro.is_local
-            if not is_remote:
-                is_remote = macro.is_remote
+        if not is_local:
+            is_local = macro.is_local
+        if not is_remote:
+            is_remote = macro.is_remote
+
+        with self._queue_lock:
+            # A second press of a toggle macro stops it, regardless of
+            # whether its run has already been dispatched or is still queued
+            if isinstance(macro.repeat, ToggleRepeat) and \
+                    (macro.id in self._active or macro.id in self._queue):
+                self._terminate(macro.id)
+                return
 
+            # Preprocess macro to contain pauses as necessary
             self._preprocess_macro(macro)
-            with self._queue_lock:
-                self._queue.append(MacroEntry(macro, True, is_local, is_remote))
-            self._schedule_event.set()
+            if macro.id not in self._queue:
+                self._queue[macro.id] = collections.deque()
+            self._queue[macro.id].append(
+                MacroRun(macro, is_local, is_remote)
+            )
+            # Repeating macros run until terminated, which has to be possible
+            # from the moment they are queued
+            if macro.repeat is not None:
+                with self._flags_lock:
+                    self._flags[macro.id] = True
+            self._schedule()
 
     def terminate_macro(self, macro):
-        """Adds a termination request for a macro to the execution queue.
+        """Terminates a running macro and drops its queued runs.
+
+        A repeating macro completes its current repetition before stopping.
 
         :param macro the macro to terminate
         """
-        self._queue.append(MacroEntry(macro, False, macro.is_local, macro.is_remote))
-        self._schedule_event.set()
-
-    def _run_scheduler(self):
-        """Dispatches macros as required."""
-        while self._is_running:
-            # Wake up when the event triggers and reset it
-            self._schedule_event.wait()
-            self._schedule_event.clear()
-
-            # Run scheduled macros and ensure exclusive ones run separately
-            # from all other macros
-            with self._queue_lock:
-                entries_to_remove = []
-                has_exclusive = False
-                for i, entry in enumerate(self._queue):
-                    # Terminate macro if needed
-                    if entry.state is False:
-                        if entry.macro.id in self._flags \
-                                and self._flags[entry.macro.id]:
-                            # Terminate currently running macro
-                            with self._flags_lock:
-                                self._flags[entry.macro.id] = False
-                            # del self._queue[i]
-
-                            # Remove all queued up macros with the same id as
-                            # they should have been impossible to queue up
-                            # in the first place
-                            removal_list = []
-                            for queue_entry in self._queue:
-                                if queue_entry.macro.id == entry.macro.id:
-                                    removal_list.append(queue_entry)
-                            for queue_entry in removal_list:
-                                self._queue.remove(queue_entry)
-                    # Don't run a queued macro if the same instance is already
-                    # running
-                    elif entry.macro.id in self._active:
-                        continue
-                    # Handle exclusive macros
-                    elif entry.macro.exclusive:
-                        has_exclusive = True
-                        if len(self._active) == 0:
-                            self._dispatch_macro(entry.macro, entry.is_local, entry.is_remote)
-                            self._is_executing_exclusive = True
-                            entries_to_remove.append(entry)
-                    # Start a queued up macro
-                    elif not has_exclusive and not self._is_executing_exclusive:
-                        self._dispatch_macro(entry.macro, entry.is_local, entry.is_remote)
-                        entries_to_remove.append(entry)
-
-                # Remove all entries we've processed
-                for entry in entries_to_remove:
-                    if entry in self._queue:
-                        self._queue.remove(entry)
-
-    def _dispatch_macro(self, macro, is_local = None, is_remote = None):
-        """Dispatches a single macro to be run.
-
-        :param macro the macro to dispatch
-        :param is_local true if local control, set to None to use the macro flag
-        :param is_remote true if remote control, set to None to use the macro flag
+        with self._queue_lock:
+            self._terminate(macro.id)
+
+    def statistics(self, macro_id):
+        """Returns the start latency statistics of a macro.
+
+        :param macro_id id of the macro
+        :return MacroStatistics of the macro, None if it never ran
+        """
+        return self._statistics.get(macro_id)
+
+    def _terminate(self, macro_id):
+        """Stops the repetitions of a macro and drops its queued runs.
+
+        Has to be called with the queue lock held.
+
+        :param macro_id id of the macro to terminate
+        """
+        with self._flags_lock:
+            self._flags[macro_id] = False
+
+        # Remove all queued up runs of the macro as they should have
+        # been impossible to queue up in the first place
+        self._queue.pop(macro_id, None)
+
+    def _schedule(self):
+        """Dispatches queued macros as required.
+
+        Exclusive macros only start once no other macro is running and
+        block every macro queued after them until they complete. Has to be
+        called with the queue lock held.
         """
+        if not self._is_running:
+            return
+
+        has_exclusive = False
+        for macro_id in list(self._queue):
+            runs = self._queue[macro_id]
+            # Don't run a queued macro if the same instance is already
+            # running
+            if macro_id in self._active:
+                continue
+
+            run = runs[0]
+            if run.macro.exclusive:
+                has_exclusive = True
+                if len(self._active) > 0:
+                    continue
+                self._is_executing_exclusive = True
+            elif has_exclusive or self._is_executing_exclusive:
+                continue
+
+            runs.popleft()
+            if len(runs) == 0:
+                del self._queue[macro_id]
+            self._dispatch_macro(run)
+
+    def _dispatch_macro(self, run):
+        """Dispatches a single macro run to the worker pool.
+
+        :param run the macro run to dispatch
+        """
+        macro = run.macro
         if macro.id not in self._active:
-            self._active[macro.id] = macro
-            Thread(target=functools.partial(self._execute_macro, macro, is_local, is_remote)).start()
+            self._active[macro.id] = run
+            if macro.repeat is not None:
+                with self._flags_lock:
+                    self._flags[macro.id] = True
+            self._pool.submit(self._execute_macro, run)
         else:
             logging.getLogger("system").warning(
                 "Attempting to dispatch an already running macro"
             )
 
-    def _execute_macro(self, macro, is_local = None, is_remote = None):
-        """Executes a given macro in a separate thread.
+    def _resume_macro(self, run):
+        """Continues a macro run after a pause.
+
+        Called by the timer wheel, hence only hands the run to the pool.
+
+        :param run the macro run to continue
+        """
+        run.timer = None
+        self._pool.submit(self._execute_macro, run)
+
+    def _execute_macro(self, run):
+        """Executes the actions of a macro run up to its next pause.
 
-        This method will run all provided actions and once they all have been
-        executed will remove the macro from the set of active macros and
-        inform the scheduler of the completion.
+        Once every action and repetition has been executed the macro is
+        removed from the set of active macros and the next queued macros
+        are dispatched.
 
         The macro flags is_local/is_remote control where the macro actions are sent
 
-        :param macro the macro object to be executed
+        :param run the macro run to execute
         """
-        # Handle macros with a repeat mode
-        # if not is_local:
-        #     is_local = macro.is_local
-        # if not is_remote:
-        #     is_remote = macro.is_remote
+        macro = run.macro
+        try:
+            if run.started is None:
+                self._start_run(run)
+
+            while True:
+                # Decide whether to start another repetition
+                if run.index == 0 and run.count > 0:
+                    if not self._repeat(run):
+                        break
+
+                if run.index >= len(macro.sequence):
+                    if macro.repeat is None:
+                        # indicate the macro is done
+                        if macro.completed_callback:
+                            macro.completed_callback()
+                        break
+
+                    # Wait for the repeat delay before the next repetition
+                    run.index = 0
+                    run.count += 1
+                    self._pause(run, macro.repeat.delay)
+                    return
+
+                action = macro.sequence[run.index]
+                run.index += 1
+                if isinstance(action, PauseAction):
+                    self._pause(run, action.get_duration())
+                    return
+                if macro.repeat is None:
+                    action(run.is_local, run.is_remote, macro.force_remote)
+                else:
+                    action(run.is_local, run.is_remote)
+        except Exception as e:
+            logging.getLogger("system").exception(
+                f"Error executing macro {macro.id}: {e}"
+            )
+
+        self._complete_run(run)
 
+    def _start_run(self, run):
+        """Prepares a macro run for the execution of its first action.
+
+        :param run the macro run to start
+        """
+        macro = run.macro
+        run.started = time.monotonic()
+        if macro.id not in self._statistics:
+            self._statistics[macro.id] = MacroStatistics()
+        self._statistics[macro.id].record(run.started - run.queued)
 
         (state_is_local, state_is_remote) = gremlin.input_devices.remote_state.state
-        if not is_remote:
-            is_remote = state_is_remote
-        if not is_local:
-            is_local = state_is_local
-        
+        if not run.is_remote:
+            run.is_remote = state_is_remote
+        if not run.is_local:
+            run.is_local = state_is_local
+
         if macro.force_remote:
-            is_remote = True
-            is_local = False
+            run.is_remote = True
+            run.is_local = False
 
+    def _repeat(self, run):
+        """Returns whether or not a repeating macro runs another repetition.
 
-        if macro.repeat is not None:
-            delay = macro.repeat.delay
+        :param run the macro run to check
+        :return True if another repetition is to be executed
+        """
+        repeat = run.macro.repeat
+        if not self._flags.get(run.macro.id, False):
+            return False
+        if isinstance(repeat, CountRepeat):
+            return run.count < repeat.count
+        return type(repeat) in [HoldRepeat, ToggleRepeat]
+
+    def _pause(self, run, duration):
+        """Continues a macro run after the given duration.
+
+        The continuation survives the profile being stopped so that a run
+        always executes its remaining actions, such as key releases.
 
+        :param run the macro run to pause
+        :param duration the duration of the pause in seconds
+        """
+        run.timer = gremlin.scheduler.TimerWheel().schedule(
+            duration,
+            self._resume_macro,
+            run,
+            stop_policy=gremlin.scheduler.StopPolicy.Keep
+        )
+
+    def _complete_run(self, run):
+        """Removes a completed run and dispatches the next macros.
+
+        :param run the macro run that completed
+        """
+        macro = run.macro
+        with self._queue_lock:
+            if self._active.get(macro.id) is run:
+                del self._active[macro.id]
+            if macro.exclusive:
+                self._is_executing_exclusive = False
             with self._flags_lock:
-                self._flags[macro.id] = True
-
-            # Handle count repeat mode
-            if isinstance(macro.repeat, CountRepeat):
-                count = 0
-                while count < macro.repeat.count and self._flags[macro.id]:
-                    for action in macro.sequence:
-                        action(is_local, is_remote)
-                    count += 1
-                    time.sleep(delay)
-
-            # Handle continuous repeat modes
-            elif type(macro.repeat) in [HoldRepeat, ToggleRepeat]:
-                while self._flags[macro.id]:
-                    for action in macro.sequence:
-                        action(is_local, is_remote)
-                    time.sleep(delay)
-
-        # Handle simple one shot macros
-        else:
-            for action in macro.sequence:
-                action(is_local, is_remote, macro.force_remote)
-            # indicate the macro is done
-            if macro.completed_callback:
-                macro.completed_callback()
-
-        # Remove macro from active set, notify manager, and remove any
-        # potential callbacks
-        del self._active[macro.id]
-        if macro.exclusive:
-            self._is_executing_exclusive = False
-        with self._flags_lock:
-            if macro.id in self._flags:
-                self._flags[macro.id] = False
-        self._schedule_event.set()
+                if macro.id in self._flags:
+                    self._flags[macro.id] = False
+            self._schedule()
 
     def _preprocess_macro(self, macro):
         """Inserts pauses as necessary into the macro."""
@@ -761,8 +916,14 @@ class PauseAction(AbstractAction):
         self.is_random = is_random
 
     def __call__(self, is_local = None, is_remote = None, force_remote = None):
+        time.sleep(self.get_duration())
+
+    def get_duration(self):
+        """Returns the duration of the next pause.
+
+        :return duration in seconds, randomized if the pause is random
+        """
         import random
-        # is_local, is_remote = self._update_flags(is_local, is_remote, force_remote)
         if self.is_random:
             # random pause
             duration_min = self.duration
@@ -776,7 +937,7 @@ class PauseAction(AbstractAction):
         else:
             duration = self.duration
 
-        time.sleep(duration)
+        return duration
 
 
 class VJoyMacroAction(AbstractAction):
@@ -1,305 +1,590 @@
-# -*- coding: utf-8; -*-
-
-# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
-#
-# This program is free software: you can redistribute it and/or modify
-# it under the terms of the GNU General Public License as published by
-# the Free Software Foundation, either version 3 of the License, or
-# (at your option) any later version.
-#
-# This program is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU General Public License for more details.
-#
-# You should have received a copy of the GNU General Public License
-# along with this program.  If not, see <http://www.gnu.org/licenses/>.
-
-
-import importlib
-import logging
-import os
-import copy
-
-from . import common, error
-from gremlin.util import *
-
-from gremlin.singleton_decorator import SingletonDecorator
-
-
-@SingletonDecorator
-class ContainerPlugins:
-
-    """Handles discovery and handling of container plugins."""
-
-    def __init__(self):
-        """Initializes the container plugin manager."""
-        self._plugins = {}
-        self._discover_plugins()
-
-        self._tag_to_type_map = {}
-        self._name_to_type_map = {}
-        # tracks all functors
-        self._functors = []
-
-        self._create_maps()
-
-        self._parent_widget_map = {} # map of item data to QT widget main UI container widget
-        self._input_data_container_map = {} # map of item data to the actual containers created for it
-
-        
-    def reset_functors(self):
-        ''' clears functor tracking '''
-        self._functors = []
-
-    def register_functor(self, functor):
-        ''' registers a functor for latching purposes'''
-        if not functor in self._functors:
-            self._functors.append(functor)
-
-    @property
-    def functors(self):
-        return self._functors
-
-    @property
-    def repository(self):
-        """Returns the dictionary of all found plugins.
-
-        :return dictionary containing all plugins found
-        """
-        return self._plugins
-    
-    def set_widget(self, item_data, widget):
-        ''' sets the associated parent widget of a container for the specific input type'''
-        self._parent_widget_map[item_data] = widget
-
-    def get_widget(self, item_data):
-        ''' gets the associated parent widget of a container for the specific input type '''
-        if item_data in self._parent_widget_map.keys():
-            return self._parent_widget_map[item_data]
-        return None
-    
-    def set_container_data(self, item_data, container):
-        if not item_data in self._input_data_container_map.keys():
-            self._input_data_container_map[item_data] = []
-        if not container in self._input_data_container_map[item_data]:
-            self._input_data_container_map[item_data].append(container)
-
-    def get_container(self, item_data):
-        if not item_data in self._input_data_container_map.keys():
-            return []
-        return self._input_data_container_map[item_data]
-    
-    def get_parent_widget(self, container):
-        ''' gets the parent widget of the given container '''
-        for item_data, containers in self._input_data_container_map.items():
-            for container_item in containers:
-                if container == container_item:
-                    return self.get_widget(item_data)
-        # not found for this container
-        return None
-
-
-    @property
-    def tag_map(self):
-        """Returns the mapping from a container tag to the container plugin.
-
-        :return mapping from container name to container plugin
-        """
-        return self._tag_to_type_map
-
-    def get_class(self, name):
-        """Returns the class object corresponding to the given name.
-
-        :param name of the container class to return
-        :return class object corresponding to the provided name
-        """
-        if name not in self._name_to_type_map:
-            raise error.GremlinError(
-                f"No container with name '{name}' exists"
-            )
-        return self._name_to_type_map[name]
-
-    def _discover_plugins(self):
-        """Processes known plugin folders for action plugins."""
-        plugin_folder = "container_plugins"
-        root_path = get_root_path()
-        walk_path = os.path.join(root_path, plugin_folder)
-        log_sys(f"Container plugin folder: {walk_path}")
-        if not os.path.isdir(walk_path):
-            raise error(f"Unable to find container plugins: {walk_path}")
-        
-        for root, dirs, files in os.walk(walk_path):
-            for fname in [v for v in files if v == "__init__.py"]:
-                try:
-                    folder, module = os.path.split(root)
-
-                    if not folder.lower().endswith(plugin_folder):
-                        continue
-
-                    # Attempt to load the file and if it looks like a proper
-                    # action_plugins store it in the registry
-                    plugin = importlib.import_module(
-                        f"container_plugins.{module}"
-                    )
-                    if "version" in plugin.__dict__:
-                        self._plugins[plugin.name] = plugin.create
-                        log_sys(f"Loaded container plugin: {plugin.name}"
-                        )
-                    else:
-                        del plugin
-                except Exception as e:
-                    # Log an error and ignore the action_plugins if
-                    # anything is wrong with it
-                    logging.getLogger("system").warning(
-                        f"Loading container_plugins '{fname}' failed due to: {e}"
-                    )
-
-    def _create_maps(self):
-        """Creates a lookup table from container tag to container object."""
-        for entry in self._plugins.values():
-            self._tag_to_type_map[entry.tag] = entry
-            self._name_to_type_map[entry.name] = entry
-
-    def duplicate(self, container):
-        ''' duplicates a container '''
-        # because containers can be quite complex - we'll just generate the xml and change IDs as needed and reload
-        # into a new container of the same type
-        from gremlin.base_classes import AbstractContainer
-        assert isinstance(container, AbstractContainer),"Invalid container data for duplicate()"
-        container_item = copy.deepcopy(container)
-
-        for action_set in container_item.get_action_sets():
-            for action in action_set:
-                action.action_id = common.get_guid()
-        
-        return container_item
-
-
-
-
-    
-
-       
-
-
-@SingletonDecorator
-class ActionPlugins:
-
-    """Handles discovery and handling of action plugins."""
-
-    def __init__(self):
-        """Initializes the action plugin manager."""
-        self._plugins = {}
-        self._type_to_action_map = {}
-        self._type_to_name_map = {}
-        self._name_to_type_map = {}
-        self._tag_to_type_map = {}
-        self._parameter_requirements = {}
-
-        self._discover_plugins()
-
-        self._create_type_action_map()
-        self._create_action_name_map()
-
-    @property
-    def repository(self):
-        """Returns the dictionary of all found plugins.
-
-        :return dictionary containing all plugins found
-        """
-        return self._plugins
-
-    @property
-    def type_action_map(self):
-        """Returns a mapping from input types to valid action plugins.
-
-        :return mapping from input types to associated actions
-        """
-        return self._type_to_action_map
-
-    @property
-    def tag_map(self):
-        """Returns the mapping from an action tag to the action plugin.
-
-        :return mapping from action name to action plugin
-        """
-        return self._tag_to_type_map
-
-    def get_class(self, name):
-        """Returns the class object corresponding to the given name.
-
-        :param name of the action class to return
-        :return class object corresponding to the provided name
-        """
-        if name not in self._name_to_type_map:
-            raise error.GremlinError(
-                f"No action with name '{name}' exists"
-            )
-        return self._name_to_type_map[name]
-
-    def plugins_requiring_parameter(self, param_name):
-        """Returns the list of plugins requiring a certain parameter.
-
-        :param param_name the parameter name required by the returned actions
-        :return list of actions requiring a certain parameter in the callback
-        """
-        return self._parameter_requirements.get(param_name, [])
-
-    def _create_type_action_map(self):
-        """Creates a lookup table from input types to available actions."""
-        self._type_to_action_map = {
-            common.InputType.JoystickAxis: [],
-            common.InputType.JoystickButton: [],
-            common.InputType.JoystickHat: [],
-            common.InputType.Keyboard: []
-        }
-
-        for entry in self._plugins.values():
-            for input_type in entry.input_types:
-                self._type_to_action_map[input_type].append(entry)
-
-    def _create_action_name_map(self):
-        """Creates a lookup table from action names to actions."""
-        for entry in self._plugins.values():
-            self._name_to_type_map[entry.name] = entry
-            self._tag_to_type_map[entry.tag] = entry
-
-    def _discover_plugins(self):
-        """Processes known plugin folders for action plugins."""
-        plugin_folder = "action_plugins"
-        root_path = get_root_path()
-        walk_path = os.path.join(root_path, plugin_folder)
-        log_sys(f"Action plugin folder: {walk_path}")
-        if not os.path.isdir(walk_path):
-            raise error(f"Unable to find action_plugins: {walk_path}")
-        
-        for root, dirs, files in os.walk(walk_path):
-            for _ in [v for v in files if v == "__init__.py"]:
-                try:
-                    folder, module = os.path.split(root)
-                    if not folder.lower().endswith(plugin_folder):
-                        continue
-
-                    # Attempt to load the file and if it looks like a proper
-                    # action_plugins store it in the registry
-                    plugin = importlib.import_module(
-                        f"action_plugins.{module}"
-                    )
-                    if "version" in plugin.__dict__:
-                        self._plugins[plugin.name] = plugin.create
-                        log_sys(f"Loaded action plugin: {plugin.name}")
-                    else:
-                        del plugin
-                except Exception as e:
-                    # Log an error and ignore the action_plugins if
-                    # anything is wrong with it
-                    log_sys_warn(f"Loading action_plugins '{root.split("\\")[-1]}' failed due to: {e}")
-
-
-    def duplicate(self, action):
-        ''' duplicates an action and gives it a unique ID '''
-        dup = copy.deepcopy(action)
-        dup.action_id = common.get_guid()
-        return dup
-    
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import ast
+import importlib
+import json
+import os
+import copy
+
+from . import common, error
+from gremlin.util import *
+
+from gremlin.singleton_decorator import SingletonDecorator
+
+
+class PluginEntry:
+
+    """Plugin registered from its manifest entry.
+
+    Holds the metadata needed to list and look up a plugin and only imports
+    the plugin's module once the plugin class itself is needed, i.e. when
+    the plugin is instantiated or any other attribute, such as its widget,
+    is accessed. If importing the module fails the on_load_failure callback
+    is invoked with the entry, allowing the plugin to be unregistered.
+    """
+
+    def __init__(self, metadata, plugin_type=None):
+        """Creates a new entry.
+
+        :param metadata the plugin's manifest entry
+        :param plugin_type the plugin class if its module is already imported
+        """
+        self.module = metadata["module"]
+        self.version = metadata["version"]
+        self.plugin_name = metadata["plugin_name"]
+        self.name = metadata["name"]
+        self.tag = metadata["tag"]
+        self.input_types = [
+            common.InputType[v] for v in metadata["input_types"]
+        ]
+        self._type = plugin_type
+        self.load_failed = False
+        self.on_load_failure = None
+
+    @property
+    def is_loaded(self):
+        """Returns whether or not the plugin's module has been imported.
+
+        :return True if the module has been imported, False otherwise
+        """
+        return self._type is not None
+
+    def load(self):
+        """Returns the plugin class, importing its module if needed.
+
+        :return the plugin class
+        """
+        if self._type is None:
+            try:
+                plugin = importlib.import_module(self.module)
+            except Exception as e:
+                self.load_failed = True
+                if self.on_load_failure is not None:
+                    self.on_load_failure(self)
+                raise error.GremlinError(
+                    f"Loading plugin '{self.plugin_name}' failed due to: {e}"
+                )
+            self._type = plugin.create
+            log_sys(f"Loaded plugin: {self.plugin_name}")
+        return self._type
+
+    def __call__(self, *args, **kwargs):
+        """Creates an instance of the plugin.
+
+        :return the new plugin instance
+        """
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        """Returns the attributes of the plugin class not in the manifest.
+
+        :param name the name of the attribute
+        :return value of the plugin class' attribute
+        """
+        if name.startswith("__") or name == "_type":
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self):
+        return f"PluginEntry({self.module})"
+
+
+class PluginManifest:
+
+    """Metadata of the plugins found in a plugin folder.
+
+    The metadata of a plugin is read from the source of its __init__.py
+    rather than by importing it, falling back to importing the module only
+    if the values aren't plain literals. The manifest is cached on disk and
+    a plugin's metadata is only read again once its file changes.
+    """
+
+    # Version of the cached manifest, to be increased when its content changes
+    manifest_version = 1
+
+    def __init__(self, plugin_folder, root_path=None, cache_file=None):
+        """Creates a new manifest.
+
+        :param plugin_folder name of the folder, and package, of the plugins
+        :param root_path folder containing the plugin folder
+        :param cache_file path of the cached manifest, defaults to one in
+            the user's profile folder
+        """
+        self.plugin_folder = plugin_folder
+        self.folder = os.path.join(
+            root_path if root_path is not None else get_root_path(),
+            plugin_folder
+        )
+        self._cache_file = cache_file
+
+    @property
+    def cache_file(self):
+        """Returns the path of the cached manifest.
+
+        :return path of the cached manifest, None if there is no location
+        """
+        if self._cache_file is None:
+            try:
+                self._cache_file = os.path.join(
+                    userprofile_path(),
+                    "plugin_cache",
+                    f"{self.plugin_folder}.json"
+                )
+            except Exception:
+                return None
+        return self._cache_file
+
+    def entries(self):
+        """Returns the entries of all plugins in the plugin folder.
+
+        :return list of PluginEntry instances
+        """
+        if not os.path.isdir(self.folder):
+            raise error.GremlinError(
+                f"Unable to find {self.plugin_folder}: {self.folder}"
+            )
+
+        cached = self._read_cache()
+        metadata = {}
+        entries = []
+        for module in sorted(os.listdir(self.folder)):
+            fname = os.path.join(self.folder, module, "__init__.py")
+            if not os.path.isfile(fname):
+                continue
+            try:
+                stat = os.stat(fname)
+                stamp = [stat.st_mtime_ns, stat.st_size]
+                data = cached.get(module)
+                plugin_type = None
+                if data is None or data["stamp"] != stamp:
+                    plugin, plugin_type = self._read_metadata(module, fname)
+                    data = {"stamp": stamp, "plugin": plugin}
+                metadata[module] = data
+                if data["plugin"] is not None:
+                    entries.append(PluginEntry(data["plugin"], plugin_type))
+            except Exception as e:
+                # Log an error and ignore the plugin if anything is wrong
+                # with it
+                log_sys_warn(
+                    f"Loading {self.plugin_folder} '{module}' failed due to: {e}"
+                )
+
+        if metadata != cached:
+            self._write_cache(metadata)
+        return entries
+
+    def _read_metadata(self, module, fname):
+        """Returns the manifest entry of a single plugin.
+
+        :param module name of the plugin's module within the plugin folder
+        :param fname path of the plugin's __init__.py
+        :return manifest entry, None if the module is not a plugin, and the
+            plugin class if the module had to be imported
+        """
+        try:
+            return self._parse_metadata(module, fname), None
+        except ValueError:
+            pass
+
+        plugin = importlib.import_module(f"{self.plugin_folder}.{module}")
+        if "version" not in plugin.__dict__:
+            return None, None
+        return {
+            "module": plugin.__name__,
+            "version": plugin.version,
+            "plugin_name": plugin.name,
+            "name": plugin.create.name,
+            "tag": plugin.create.tag,
+            "input_types": [v.name for v in plugin.create.input_types]
+        }, plugin.create
+
+    def _parse_metadata(self, module, fname):
+        """Returns the manifest entry of a plugin read from its source.
+
+        :param module name of the plugin's module within the plugin folder
+        :param fname path of the plugin's __init__.py
+        :return manifest entry, None if the module is not a plugin
+        """
+        with open(fname, "rb") as fh:
+            tree = ast.parse(fh.read(), fname)
+
+        module_values = {}
+        classes = {}
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                    and isinstance(node.targets[0], ast.Name):
+                module_values[node.targets[0].id] = node.value
+            elif isinstance(node, ast.ClassDef):
+                classes[node.name] = node
+        if "version" not in module_values:
+            return None
+
+        create = module_values.get("create")
+        if not isinstance(create, ast.Name) or create.id not in classes:
+            raise ValueError(f"Plugin class of {module} not found")
+        class_values = {}
+        for node in classes[create.id].body:
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                    and isinstance(node.targets[0], ast.Name):
+                class_values[node.targets[0].id] = node.value
+        for key in ["name", "tag", "input_types"]:
+            if key not in class_values:
+                raise ValueError(f"Plugin class of {module} has no {key}")
+
+        # Input types are given as InputType members, e.g.
+        # gremlin.common.InputType.JoystickAxis
+        input_types = class_values["input_types"]
+        if not isinstance(input_types, ast.List) or not all(
+            isinstance(v, ast.Attribute) and v.attr in common.InputType.__members__
+            for v in input_types.elts
+        ):
+            raise ValueError(f"Input types of {module} are not literal")
+
+        return {
+            "module": f"{self.plugin_folder}.{module}",
+            "version": ast.literal_eval(module_values["version"]),
+            "plugin_name": ast.literal_eval(module_values["name"]),
+            "name": ast.literal_eval(class_values["name"]),
+            "tag": ast.literal_eval(class_values["tag"]),
+            "input_types": [v.attr for v in input_types.elts]
+        }
+
+    def _read_cache(self):
+        """Returns the cached manifest entries.
+
+        :return cached manifest entries keyed by module name, empty if there
+            is no valid cached manifest
+        """
+        fname = self.cache_file
+        if fname is None or not os.path.isfile(fname):
+            return {}
+        try:
+            with open(fname, encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") == self.manifest_version and \
+                    data.get("folder") == self.folder:
+                return data["plugins"]
+        except Exception as e:
+            log_sys_warn(f"Unable to read plugin manifest {fname}: {e}")
+        return {}
+
+    def _write_cache(self, metadata):
+        """Stores the manifest entries on disk.
+
+        :param metadata manifest entries keyed by module name
+        """
+        fname = self.cache_file
+        if fname is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(fname), exist_ok=True)
+            with open(f"{fname}.tmp", "w", encoding="utf-8") as fh:
+                json.dump(
+                    {
+                        "version": self.manifest_version,
+                        "folder": self.folder,
+                        "plugins": metadata
+                    },
+                    fh,
+                    indent=4
+                )
+            os.replace(f"{fname}.tmp", fname)
+        except OSError as e:
+            log_sys_warn(f"Unable to write plugin manifest {fname}: {e}")
+
+
+@SingletonDecorator
+class ContainerPlugins:
+
+    """Handles discovery and handling of container plugins."""
+
+    def __init__(self):
+        """Initializes the container plugin manager."""
+        self._plugins = {}
+        self._discover_plugins()
+
+        self._tag_to_type_map = {}
+        self._name_to_type_map = {}
+        # tracks all functors
+        self._functors = []
+
+        self._create_maps()
+
+        self._parent_widget_map = {} # map of item data to QT widget main UI container widget
+        self._input_data_container_map = {} # map of item data to the actual containers created for it
+
+        
+    def reset_functors(self):
+        ''' clears functor tracking '''
+        self._functors = []
+
+    def register_functor(self, functor):
+        ''' registers a functor for latching purposes'''
+        if not functor in self._functors:
+            self._functors.append(functor)
+
+    @property
+    def functors(self):
+        return self._functors
+
+    @property
+    def repository(self):
+        """Returns the dictionary of all found plugins.
+
+        :return dictionary containing all plugins found
+        """
+        return self._plugins
+    
+    def set_widget(self, item_data, widget):
+        ''' sets the associated parent widget of a container for the specific input type'''
+        self._parent_widget_map[item_data] = widget
+
+    def get_widget(self, item_data):
+        ''' gets the associated parent widget of a container for the specific input type '''
+        if item_data in self._parent_widget_map.keys():
+            return self._parent_widget_map[item_data]
+        return None
+    
+    def set_container_data(self, item_data, container):
+        if not item_data in self._input_data_container_map.keys():
+            self._input_data_container_map[item_data] = []
+        if not container in self._input_data_container_map[item_data]:
+            self._input_data_container_map[item_data].append(container)
+
+    def get_container(self, item_data):
+        if not item_data in self._input_data_container_map.keys():
+            return []
+        return self._input_data_container_map[item_data]
+    
+    def get_parent_widget(self, container):
+        ''' gets the parent widget of the given container '''
+        for item_data, containers in self._input_data_container_map.items():
+            for container_item in containers:
+                if container == container_item:
+                    return self.get_widget(item_data)
+        # not found for this container
+        return None
+
+
+    @property
+    def tag_map(self):
+        """Returns the mapping from a container tag to the container plugin.
+
+        :return mapping from container name to container plugin
+        """
+        return self._tag_to_type_map
+
+    def get_class(self, name):
+        """Returns the class object corresponding to the given name.
+
+        :param name of the container class to return
+        :return class object corresponding to the provided name
+        """
+        if name not in self._name_to_type_map:
+            raise error.GremlinError(
+                f"No container with name '{name}' exists"
+            )
+        return self._name_to_type_map[name]
+
+    def _discover_plugins(self):
+        """Registers the container plugins listed in the plugin manifest.
+
+        Plugin modules are only imported once a plugin is first used.
+        """
+        manifest = PluginManifest("container_plugins")
+        log_sys(f"Container plugin folder: {manifest.folder}")
+        for entry in manifest.entries():
+            self._register(entry)
+            log_sys(f"Registered container plugin: {entry.plugin_name}")
+
+    def _register(self, entry):
+        """Adds a plugin to the repository.
+
+        :param entry the PluginEntry of the plugin
+        """
+        entry.on_load_failure = self._unregister
+        self._plugins[entry.plugin_name] = entry
+
+    def _unregister(self, entry):
+        """Removes a plugin whose module failed to import.
+
+        :param entry the PluginEntry of the plugin
+        """
+        for lookup in [
+            self._plugins, self._tag_to_type_map, self._name_to_type_map
+        ]:
+            for key in [k for k, v in lookup.items() if v is entry]:
+                del lookup[key]
+        log_sys_error(
+            f"Removed container plugin {entry.plugin_name} as it failed to load"
+        )
+
+    def _create_maps(self):
+        """Creates a lookup table from container tag to container object."""
+        for entry in self._plugins.values():
+            self._tag_to_type_map[entry.tag] = entry
+            self._name_to_type_map[entry.name] = entry
+
+    def duplicate(self, container):
+        ''' duplicates a container '''
+        # because containers can be quite complex - we'll just generate the xml and change IDs as needed and reload
+        # into a new container of the same type
+        from gremlin.base_classes import AbstractContainer
+        assert isinstance(container, AbstractContainer),"Invalid container data for duplicate()"
+        container_item = copy.deepcopy(container)
+
+        for action_set in container_item.get_action_sets():
+            for action in action_set:
+                action.action_id = common.get_guid()
+        
+        return container_item
+
+
+
+
+    
+
+       
+
+
+@SingletonDecorator
+class ActionPlugins:
+
+    """Handles discovery and handling of action plugins."""
+
+    def __init__(self):
+        """Initializes the action plugin manager."""
+        self._plugins = {}
+        self._type_to_action_map = {}
+        self._type_to_name_map = {}
+        self._name_to_type_map = {}
+        self._tag_to_type_map = {}
+        self._parameter_requirements = {}
+
+        self._discover_plugins()
+
+        self._create_type_action_map()
+        self._create_action_name_map()
+
+    @property
+    def repository(self):
+        """Returns the dictionary of all found plugins.
+
+        :return dictionary containing all plugins found
+        """
+        return self._plugins
+
+    @property
+    def type_action_map(self):
+        """Returns a mapping from input types to valid action plugins.
+
+        :return mapping from input types to associated actions
+        """
+        return self._type_to_action_map
+
+    @property
+    def tag_map(self):
+        """Returns the mapping from an action tag to the action plugin.
+
+        :return mapping from action name to action plugin
+        """
+        return self._tag_to_type_map
+
+    def get_class(self, name):
+        """Returns the class object corresponding to the given name.
+
+        :param name of the action class to return
+        :return class object corresponding to the provided name
+        """
+        if name not in self._name_to_type_map:
+            raise error.GremlinError(
+                f"No action with name '{name}' exists"
+            )
+        return self._name_to_type_map[name]
+
+    def plugins_requiring_parameter(self, param_name):
+        """Returns the list of plugins requiring a certain parameter.
+
+        :param param_name the parameter name required by the returned actions
+        :return list of actions requiring a certain parameter in the callback
+        """
+        return self._parameter_requirements.get(param_name, [])
+
+    def _create_type_action_map(self):
+        """Creates a lookup table from input types to available actions."""
+        self._type_to_action_map = {
+            common.InputType.JoystickAxis: [],
+            common.InputType.JoystickButton: [],
+            common.InputType.JoystickHat: [],
+            common.InputType.Keyboard: []
+        }
+
+        for entry in self._plugins.values():
+            for input_type in entry.input_types:
+                self._type_to_action_map[input_type].append(entry)
+
+    def _create_action_name_map(self):
+        """Creates a lookup table from action names to actions."""
+        for entry in self._plugins.values():
+            self._name_to_type_map[entry.name] = entry
+            self._tag_to_type_map[entry.tag] = entry
+
+    def _discover_plugins(self):
+        """Registers the action plugins listed in the plugin manifest.
+
+        Plugin modules are only imported once a plugin is first used.
+        """
+        manifest = PluginManifest("action_plugins")
+        log_sys(f"Action plugin folder: {manifest.folder}")
+        for entry in manifest.entries():
+            self._register(entry)
+            log_sys(f"Registered action plugin: {entry.plugin_name}")
+
+    def _register(self, entry):
+        """Adds a plugin to the repository.
+
+        :param entry the PluginEntry of the plugin
+        """
+        entry.on_load_failure = self._unregister
+        self._plugins[entry.plugin_name] = entry
+
+    def _unregister(self, entry):
+        """Removes a plugin whose module failed to import.
+
+        :param entry the PluginEntry of the plugin
+        """
+        for lookup in [
+            self._plugins, self._tag_to_type_map, self._name_to_type_map
+        ]:
+            for key in [k for k, v in lookup.items() if v is entry]:
+                del lookup[key]
+        for entries in self._type_to_action_map.values():
+            if entry in entries:
+                entries.remove(entry)
+        log_sys_error(
+            f"Removed action plugin {entry.plugin_name} as it failed to load"
+        )
+
+
+    def duplicate(self, action):
+        ''' duplicates an action and gives it a unique ID '''
+        dup = copy.deepcopy(action)
+        dup.action_id = common.get_guid()
+        return dup
+    
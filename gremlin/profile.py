@@ -16,14 +16,17 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from abc import abstractmethod, ABCMeta
-import codecs
 import collections
 import copy
+import hashlib
+import io
 import logging
 import os
+import pickle
 import shutil
+import sys
+import threading
 import uuid
-from xml.dom import minidom
 from xml.etree import ElementTree
 
 from PySide6 import QtCore
@@ -33,6 +36,7 @@ import dinput
 import action_plugins
 from gremlin.common import DeviceType, InputType, MergeAxisOperation, PluginVariableType
 from . import base_classes, common, error, input_devices, joystick_handling, plugin_manager, util
+from gremlin.singleton_decorator import SingletonDecorator
 
 
 # Data struct representing profile information of a device
@@ -212,6 +216,143 @@ def safe_format(value, data_type, formatter=str):
         )
 
 
+def _escape_xml(text, attribute=False):
+    """Returns text with the characters XML reserves replaced.
+
+    :param text the text to escape
+    :param attribute if True the text is escaped for use as attribute value
+    :return escaped text
+    """
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    if attribute:
+        if "\"" in text:
+            text = text.replace("\"", "&quot;")
+        if "\r" in text:
+            text = text.replace("\r", "&#13;")
+        if "\n" in text:
+            text = text.replace("\n", "&#10;")
+        if "\t" in text:
+            text = text.replace("\t", "&#9;")
+    return text
+
+
+class XmlWriter:
+
+    """Writes an indented XML document one element at a time.
+
+    The output is the same as the one of minidom's toprettyxml with an
+    indentation of four spaces, without building the serialized document
+    and a DOM of it first. Text consisting only of whitespace is dropped
+    as the writer determines the layout of the document.
+    """
+
+    indent = "    "
+
+    def __init__(self, stream):
+        """Creates a new instance and writes the XML declaration.
+
+        :param stream text stream to write the document to
+        """
+        self._stream = stream
+        self._open = []
+        self._start_pending = False
+        stream.write("<?xml version=\"1.0\" ?>\n")
+
+    def start(self, tag, attributes=None):
+        """Opens an element, subsequently written elements are its children.
+
+        :param tag the tag of the element
+        :param attributes dictionary of the element's attributes
+        """
+        self._close_start_tag()
+        self._stream.write(
+            f"{self.indent * len(self._open)}<{tag}"
+            f"{self._attributes(attributes or {})}"
+        )
+        self._open.append(tag)
+        self._start_pending = True
+
+    def end(self):
+        """Closes the most recently opened element."""
+        tag = self._open.pop()
+        if self._start_pending:
+            self._stream.write("/>\n")
+            self._start_pending = False
+        else:
+            self._stream.write(f"{self.indent * len(self._open)}</{tag}>\n")
+
+    def element(self, node):
+        """Writes an element including all of its children.
+
+        :param node the ElementTree element to write
+        """
+        self._close_start_tag()
+        self._write_element(node, self.indent * len(self._open))
+
+    def _close_start_tag(self):
+        """Completes the start tag of the open element if needed."""
+        if self._start_pending:
+            self._stream.write(">\n")
+            self._start_pending = False
+
+    def _attributes(self, attributes):
+        """Returns the text representing the attributes of an element.
+
+        :param attributes dictionary of the attributes
+        :return attributes as written in the start tag
+        """
+        return "".join(
+            f" {key}=\"{_escape_xml(value, True)}\""
+            for key, value in attributes.items()
+        )
+
+    def _write_element(self, node, indent):
+        """Writes an element and its children.
+
+        :param node the ElementTree element to write
+        :param indent indentation of the element
+        """
+        write = self._stream.write
+        write(f"{indent}<{node.tag}{self._attributes(node.attrib)}")
+        text = node.text if node.text and not node.text.isspace() else None
+        if len(node) == 0:
+            if text is None:
+                write("/>\n")
+            else:
+                write(f">{_escape_xml(text)}</{node.tag}>\n")
+            return
+
+        write(">\n")
+        child_indent = indent + self.indent
+        if text is not None:
+            write(f"{child_indent}{_escape_xml(text)}\n")
+        for child in node:
+            self._write_element(child, child_indent)
+            if child.tail and not child.tail.isspace():
+                write(f"{child_indent}{_escape_xml(child.tail)}\n")
+        write(f"{indent}</{node.tag}>\n")
+
+
+def _flatten_xml(node, parts):
+    """Appends a textual representation of an XML node to a list.
+
+    This is a cheaper alternative to serializing the node when only its
+    content needs to be compared.
+
+    :param node the XML node to flatten
+    :param parts list to which the node's representation is appended
+    """
+    parts.append(f"<{node.tag}{node.attrib}{node.text or ''}")
+    for child in node:
+        _flatten_xml(child, parts)
+    parts.append(">")
+
+
 def extract_remap_actions(action_sets):
     """Returns a list of remap actions from a list of actions.
 
@@ -285,11 +426,8 @@ class ProfileConverter:
 
         if new_root is not None:
             # Save converted version
-            ugly_xml = ElementTree.tostring(new_root, encoding="unicode")
-            ugly_xml = "".join([line.strip() for line in ugly_xml.split("\n")])
-            dom_xml = minidom.parseString(ugly_xml)
-            with open(fname, "w") as out:
-                out.write(dom_xml.toprettyxml(indent="    ", newl="\n"))
+            with open(fname, "w", encoding="utf-8", newline="\n") as out:
+                XmlWriter(out).element(new_root)
         else:
             raise error.ProfileError("Failed to convert profile")
 
@@ -1296,6 +1434,320 @@ class Settings:
         self.vjoy_initial_values[vid][aid] = value
 
 
+class _SnapshotPickler(pickle.Pickler):
+
+    """Pickles the objects of a profile without the profile itself."""
+
+    def __init__(self, file, profile):
+        """Creates a new instance.
+
+        :param file the file to write the pickled data to
+        :param profile the profile the pickled objects belong to
+        """
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._profile = profile
+
+    def persistent_id(self, obj):
+        return "profile" if obj is self._profile else None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+
+    """Unpickles the objects of a profile into the given profile."""
+
+    def __init__(self, file, profile):
+        """Creates a new instance.
+
+        :param file the file to read the pickled data from
+        :param profile the profile the unpickled objects are attached to
+        """
+        super().__init__(file)
+        self._profile = profile
+
+    def persistent_load(self, pid):
+        if pid != "profile":
+            raise pickle.UnpicklingError(f"Unknown persistent id: {pid}")
+        return self._profile
+
+
+@SingletonDecorator
+class ProfileCache:
+
+    """Caches the objects built when loading a profile.
+
+    A snapshot of the objects parsed from a profile document is stored under
+    a hash of the document's content, the connected devices, and the code
+    building the objects. Snapshots of the most recently loaded profiles are
+    kept in memory and, if enabled, on disk. Loading an unchanged profile
+    again, e.g. when switching back to a game, then only unpickles the
+    snapshot instead of parsing the document and creating every object.
+    """
+
+    # Number of snapshots kept in memory and on disk
+    max_entries = 4
+    max_disk_entries = 16
+
+    # Version of the snapshot content, to be increased when it changes
+    snapshot_version = 2
+
+    def __init__(self):
+        """Creates a new instance."""
+        self._entries = collections.OrderedDict()
+        self._failed = set()
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def disk_enabled(self):
+        """Returns whether or not snapshots are stored on disk.
+
+        :return True if snapshots are written to disk, False otherwise
+        """
+        from gremlin.config import Configuration
+        return Configuration().profile_cache_on_disk
+
+    @property
+    def folder(self):
+        """Returns the folder containing the snapshots stored on disk.
+
+        :return path to the snapshot folder
+        """
+        return os.path.join(util.userprofile_path(), "profile_cache")
+
+    def key(self, data):
+        """Returns the key under which the profile document is cached.
+
+        :param data content of the profile document
+        :return key of the document's snapshot
+        """
+        digest = hashlib.sha256()
+        digest.update(
+            f"{ProfileConverter.current_version}:"
+            f"{self.snapshot_version}".encode()
+        )
+        digest.update(self._code_fingerprint())
+        digest.update(self._device_signature())
+        digest.update(data)
+        return digest.hexdigest()
+
+    def restore(self, key, profile):
+        """Restores the objects of a cached profile.
+
+        :param key the key of the profile's snapshot
+        :param profile the profile to populate with the cached objects
+        :return True if the profile was restored, False otherwise
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+        if data is None and self.disk_enabled:
+            data = self._read(key)
+            if data is not None:
+                self._insert(key, data)
+        if data is None:
+            self.misses += 1
+            return False
+
+        try:
+            devices, vjoy_devices, merge_axes, settings, plugins, digest = \
+                _SnapshotUnpickler(io.BytesIO(data), profile).load()
+        except Exception as e:
+            logging.getLogger("system").warning(
+                f"Unable to restore cached profile: {e}"
+            )
+            self.discard(key)
+            self.misses += 1
+            return False
+
+        profile.devices = devices
+        profile.vjoy_devices = vjoy_devices
+        profile.merge_axes = merge_axes
+        profile.settings = settings
+        profile.plugins = plugins
+        profile._saved_digest = digest
+
+        # Parsing an input item registers its containers with the plugin
+        # manager, which the snapshot doesn't capture
+        container_plugins = plugin_manager.ContainerPlugins()
+        for device in list(devices.values()) + list(vjoy_devices.values()):
+            for mode in device.modes.values():
+                for item in mode.all_input_items():
+                    for container in item.containers:
+                        container_plugins.set_container_data(item, container)
+
+        self.hits += 1
+        return True
+
+    def store(self, key, profile):
+        """Stores a snapshot of the objects of a profile.
+
+        :param key the key of the profile's snapshot
+        :param profile the profile to store
+        """
+        if key in self._failed:
+            return
+
+        buffer = io.BytesIO()
+        try:
+            _SnapshotPickler(buffer, profile).dump((
+                profile.devices,
+                profile.vjoy_devices,
+                profile.merge_axes,
+                profile.settings,
+                profile.plugins,
+                profile._saved_digest
+            ))
+        except Exception as e:
+            # Objects that can't be pickled, e.g. ones holding on to a
+            # widget, prevent caching of the profile
+            logging.getLogger("system").warning(
+                f"Unable to cache profile: {e}"
+            )
+            self._failed.add(key)
+            return
+
+        data = buffer.getvalue()
+        self._insert(key, data)
+        if self.disk_enabled:
+            self._write(key, data)
+
+    def discard(self, key):
+        """Removes the snapshot stored under the given key.
+
+        :param key the key of the snapshot to remove
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk_enabled:
+            try:
+                os.remove(os.path.join(self.folder, f"{key}.snapshot"))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Removes all snapshots held in memory and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._failed.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def remove_snapshots(self):
+        """Removes all snapshots stored on disk."""
+        folder = self.folder
+        if not os.path.isdir(folder):
+            return
+        for fname in os.listdir(folder):
+            if fname.endswith(".snapshot"):
+                try:
+                    os.remove(os.path.join(folder, fname))
+                except OSError:
+                    pass
+
+    def _insert(self, key, data):
+        """Adds a snapshot to the ones held in memory.
+
+        :param key the key of the snapshot
+        :param data the pickled snapshot
+        """
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _read(self, key):
+        """Returns a snapshot stored on disk.
+
+        :param key the key of the snapshot
+        :return the pickled snapshot, None if there is none
+        """
+        fname = os.path.join(self.folder, f"{key}.snapshot")
+        try:
+            with open(fname, "rb") as fh:
+                data = fh.read()
+            # Mark the snapshot as recently used
+            os.utime(fname)
+            return data
+        except OSError:
+            return None
+
+    def _write(self, key, data):
+        """Stores a snapshot on disk, removing the least recently used ones.
+
+        :param key the key of the snapshot
+        :param data the pickled snapshot
+        """
+        folder = self.folder
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fname = os.path.join(folder, f"{key}.snapshot")
+            with open(f"{fname}.tmp", "wb") as fh:
+                fh.write(data)
+            os.replace(f"{fname}.tmp", fname)
+
+            snapshots = sorted(
+                [
+                    os.path.join(folder, v) for v in os.listdir(folder)
+                    if v.endswith(".snapshot")
+                ],
+                key=os.path.getmtime
+            )
+            for fname in snapshots[:-self.max_disk_entries]:
+                os.remove(fname)
+        except OSError as e:
+            logging.getLogger("system").warning(
+                f"Unable to store profile snapshot: {e}"
+            )
+
+    def _code_fingerprint(self):
+        """Returns a fingerprint of the code building the profile objects.
+
+        Snapshots are only valid for the classes that created them, hence
+        any change to the sources or the executable invalidates them.
+
+        :return fingerprint of the code
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            paths = [sys.executable]
+            root_path = util.get_root_path()
+            for folder in ["gremlin", "action_plugins", "container_plugins"]:
+                for root, dirs, files in os.walk(os.path.join(root_path, folder)):
+                    dirs.sort()
+                    paths.extend(
+                        os.path.join(root, v) for v in sorted(files)
+                        if v.endswith(".py")
+                    )
+            for path in paths:
+                try:
+                    stat = os.stat(path)
+                    digest.update(
+                        f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode()
+                    )
+                except OSError:
+                    pass
+            self._fingerprint = digest.digest()
+        return self._fingerprint
+
+    def _device_signature(self):
+        """Returns a signature of the connected devices.
+
+        The devices determine which axes of a profile are kept as well as
+        which devices are added to it.
+
+        :return signature of the connected devices
+        """
+        return "|".join(
+            f"{dev.device_guid}:{dev.name}:{dev.is_virtual}:"
+            f"{[v.axis_index for v in dev.axis_map]}"
+            for dev in joystick_handling.joystick_devices()
+        ).encode()
+
+
 class Profile():
 
     """Stores the contents of an entire configuration profile.
@@ -1314,6 +1766,8 @@ class Profile():
         self.plugins = []
         self.settings = Settings(self)
         self.parent = parent
+        # Digest of the content as last loaded or saved
+        self._saved_digest = None
 
     def initialize_joystick_device(self, device, modes):
         """Ensures a joystick is properly initialized in the profile.
@@ -1446,35 +1900,107 @@ class Profile():
     def from_xml(self, fname):
         """Parses the global XML document into the profile data structure.
 
+        Documents loaded before are restored from the profile cache instead
+        of being parsed again.
+
         :param fname the path to the XML file to parse
+        :return True if the profile was converted to the current version,
+            False otherwise
         """
-        # Check for outdated profile structure and warn user / convert
-        profile_converter = ProfileConverter()
+        with open(fname, "rb") as fh:
+            data = fh.read()
+
+        cache = ProfileCache()
+        key = cache.key(data)
         profile_was_updated = False
-        if not profile_converter.is_current(fname):
-            logging.getLogger("system").warning("Outdated profile, converting")
-            profile_converter.convert_profile(fname)
-            profile_was_updated = True
+        if not cache.restore(key, self):
+            # Check for outdated profile structure and warn user / convert
+            if not self._parse_xml_stream(data):
+                logging.getLogger("system").warning(
+                    "Outdated profile, converting"
+                )
+                ProfileConverter().convert_profile(fname)
+                profile_was_updated = True
+                with open(fname, "rb") as fh:
+                    data = fh.read()
+                key = cache.key(data)
+                if not self._parse_xml_stream(data):
+                    raise error.ProfileError("Failed to convert profile")
+            self._add_connected_devices()
+            self.mark_unchanged()
+            cache.store(key, self)
 
-        tree = ElementTree.parse(fname)
-        root = tree.getroot()
+        return profile_was_updated
 
-        # Parse each device into separate DeviceConfiguration objects
-        for child in root.iter("device"):
-            device = Device(self)
-            device.from_xml(child)
-            self.devices[device.device_guid] = device
+    def _parse_xml_stream(self, data):
+        """Parses the XML document in a single streaming pass.
 
-        # Parse each vjoy device into separate DeviceConfiguration objects
-        for child in root.iter("vjoy-device"):
-            device = Device(self)
-            device.from_xml(child)
+        Each device, merge axis, settings, and plugin entry is turned into
+        its profile object once its element is complete, after which the
+        element's content is discarded.
+
+        :param data content of the XML document
+        :return True if the document was parsed, False if it is outdated
+            and has to be converted first
+        """
+        handlers = {
+            ("profile", "devices", "device"): self._parse_device,
+            ("profile", "vjoy-devices", "vjoy-device"): self._parse_device,
+            ("profile", "merge-axis"):
+                lambda node: self.merge_axes.append(self._parse_merge_axis(node)),
+            ("profile", "settings"): self.settings.from_xml,
+            ("profile", "plugins", "plugin"): self._parse_plugin,
+        }
+
+        path = []
+        for event, node in ElementTree.iterparse(
+                io.BytesIO(data),
+                events=("start", "end")
+        ):
+            if event == "start":
+                if len(path) == 0 and \
+                        ProfileConverter()._determine_version(node) != \
+                        ProfileConverter.current_version:
+                    return False
+                path.append(node.tag)
+                continue
+
+            handler = handlers.get(tuple(path))
+            path.pop()
+            if handler is not None:
+                handler(node)
+                node.clear()
+        return True
+
+    def _parse_device(self, node):
+        """Parses a device or vJoy device entry.
+
+        :param node the node to process
+        """
+        device = Device(self)
+        device.from_xml(node)
+        if node.tag == "vjoy-device":
             self.vjoy_devices[device.device_guid] = device
+        else:
+            self.devices[device.device_guid] = device
+
+    def _parse_plugin(self, node):
+        """Parses a plugin entry.
+
+        :param node the node to process
+        """
+        plugin = Plugin(self)
+        plugin.from_xml(node)
+        self.plugins.append(plugin)
+
+    def _add_connected_devices(self):
+        """Adds an entry for every connected device missing in the profile.
 
-        # Ensure that the profile contains an entry for every existing
-        # device even if it was not part of the loaded XML and
-        # replicate the modes present in the profile. This adds both entries
-        # for physical and virtual joysticks.
+        This ensures that the profile contains an entry for every existing
+        device even if it was not part of the loaded XML and replicates the
+        modes present in the profile. This adds both entries for physical
+        and virtual joysticks.
+        """
         devices = joystick_handling.joystick_devices()
         for dev in devices:
             add_device = False
@@ -1502,83 +2028,123 @@ class Profile():
                         new_device.modes[mode] = Mode(new_device)
                         new_device.modes[mode].name = mode
 
-        # Parse merge axis entries
-        for child in root.iter("merge-axis"):
-            self.merge_axes.append(self._parse_merge_axis(child))
+    def to_xml(self, fname):
+        """Generates XML code corresponding to this profile.
+
+        The document is written one device at a time to a temporary file
+        which replaces the existing file once it is complete.
+
+        :param fname name of the file to save the XML to
+        """
+        tmp_fname = f"{fname}.tmp"
+        with open(tmp_fname, "w", encoding="utf-8-sig", newline="\n") as out:
+            writer = XmlWriter(out)
+            writer.start(
+                "profile",
+                {"version": str(ProfileConverter.current_version)}
+            )
 
-        # Parse settings entries
-        self.settings.from_xml(root.find("settings"))
+            # Device settings
+            writer.start("devices")
+            device_list = sorted(
+                self.devices.values(),
+                key=lambda x: str(x.device_guid)
+            )
+            for device in device_list:
+                writer.element(device.to_xml())
+            writer.end()
 
-        # Parse plugin entries
-        for child in root.findall("plugins/plugin"):
-            plugin = Plugin(self)
-            plugin.from_xml(child)
-            self.plugins.append(plugin)
+            # VJoy settings
+            writer.start("vjoy-devices")
+            for device in self.vjoy_devices.values():
+                writer.element(device.to_xml())
+            writer.end()
 
-        return profile_was_updated
+            # Merge axis data
+            for entry in self.merge_axes:
+                writer.element(self._merge_axis_to_xml(entry))
 
-    def to_xml(self, fname):
-        """Generates XML code corresponding to this profile.
+            # Settings data
+            writer.element(self.settings.to_xml())
 
-        :param fname name of the file to save the XML to
+            # User plugins
+            writer.start("plugins")
+            for plugin in self.plugins:
+                writer.element(plugin.to_xml())
+            writer.end()
+
+            writer.end()
+        os.replace(tmp_fname, fname)
+        self.mark_unchanged()
+
+    def digest(self):
+        """Returns a hash of the content of the profile.
+
+        Input items without any configuration, which the UI creates for
+        every input it shows, and devices holding only such items, e.g. the
+        connected devices added when loading the profile, are ignored. Two
+        profiles with the same configuration thus have the same digest
+        regardless of the devices connected or the tabs shown.
+
+        :return hash of the profile's content
         """
-        # Generate XML document
-        root = ElementTree.Element("profile")
-        root.set("version", str(ProfileConverter.current_version))
+        parts = []
+        input_types = [
+            InputType.JoystickAxis,
+            InputType.JoystickButton,
+            InputType.JoystickHat,
+            InputType.Keyboard
+        ]
 
-        # Device settings
-        devices = ElementTree.Element("devices")
-        device_list = sorted(
-            self.devices.values(),
-            key=lambda x: str(x.device_guid)
+        modes = set()
+        devices = sorted(
+            list(self.devices.values()) + list(self.vjoy_devices.values()),
+            key=lambda x: (str(x.type), str(x.device_guid))
         )
-        for device in device_list:
-            devices.append(device.to_xml())
-        root.append(devices)
+        for device in devices:
+            items = []
+            for mode in sorted(device.modes.values(), key=lambda x: str(x.name)):
+                modes.add((str(mode.name), str(mode.inherit)))
+                for input_type in input_types:
+                    for item in sorted(
+                            mode.config[input_type].values(),
+                            key=lambda x: x.input_id
+                    ):
+                        if item.containers or item.description or \
+                                item.always_execute:
+                            items.append((mode.name, item))
+            if len(items) == 0 and device.label in ["", device.name]:
+                continue
 
-        # VJoy settings
-        vjoy_devices = ElementTree.Element("vjoy-devices")
-        for device in self.vjoy_devices.values():
-            vjoy_devices.append(device.to_xml())
-        root.append(vjoy_devices)
+            parts.append(
+                f"device:{device.device_guid}:{device.type}:"
+                f"{device.name}:{device.label}\0"
+            )
+            for mode_name, item in items:
+                parts.append(f"mode:{mode_name}\0")
+                _flatten_xml(item.to_xml(), parts)
 
-        # Merge axis data
+        for name, inherit in sorted(modes):
+            parts.append(f"mode:{name}:{inherit}\0")
         for entry in self.merge_axes:
-            node = ElementTree.Element("merge-axis")
-            node.set("mode", safe_format(entry["mode"], str))
-            node.set("operation", safe_format(
-                MergeAxisOperation.to_string(entry["operation"]),
-                str
-            ))
-            for tag in ["vjoy"]:
-                sub_node = ElementTree.Element(tag)
-                sub_node.set(
-                    "vjoy-id",
-                    safe_format(entry[tag]["vjoy_id"], int)
-                )
-                sub_node.set("axis-id", safe_format(entry[tag]["axis_id"], int))
-                node.append(sub_node)
-            for tag in ["lower", "upper"]:
-                sub_node = ElementTree.Element(tag)
-                sub_node.set("device-guid", write_guid(entry[tag]["device_guid"]))
-                sub_node.set("axis-id", safe_format(entry[tag]["axis_id"], int))
-                node.append(sub_node)
-            root.append(node)
-
-        # Settings data
-        root.append(self.settings.to_xml())
-
-        # User plugins
-        plugins = ElementTree.Element("plugins")
+            _flatten_xml(self._merge_axis_to_xml(entry), parts)
+        _flatten_xml(self.settings.to_xml(), parts)
         for plugin in self.plugins:
-            plugins.append(plugin.to_xml())
-        root.append(plugins)
+            _flatten_xml(plugin.to_xml(), parts)
+        return hashlib.sha256("".join(parts).encode()).hexdigest()
+
+    def has_changed(self):
+        """Returns whether the profile changed since it was loaded or saved.
+
+        :return True if the content changed or was never saved, False
+            otherwise
+        """
+        return self._saved_digest is None or \
+            self.digest() != self._saved_digest
 
-        # Serialize XML document
-        ugly_xml = ElementTree.tostring(root, encoding="utf-8")
-        dom_xml = minidom.parseString(ugly_xml)
-        with codecs.open(fname, "w", "utf-8-sig") as out:
-            out.write(dom_xml.toprettyxml(indent="    "))
+    def mark_unchanged(self):
+        """Makes the current content the reference for change detection."""
+        self._saved_digest = self.digest()
 
     def get_device_modes(self, device_guid, device_type, device_name=None):
         """Returns the modes associated with the given device.
@@ -1644,6 +2210,33 @@ class Profile():
 
         return is_empty
 
+    def _merge_axis_to_xml(self, entry):
+        """Returns the XML node of a merge axis entry.
+
+        :param entry the merge axis data structure to convert
+        :return XML node representing the merge axis entry
+        """
+        node = ElementTree.Element("merge-axis")
+        node.set("mode", safe_format(entry["mode"], str))
+        node.set("operation", safe_format(
+            MergeAxisOperation.to_string(entry["operation"]),
+            str
+        ))
+        for tag in ["vjoy"]:
+            sub_node = ElementTree.Element(tag)
+            sub_node.set(
+                "vjoy-id",
+                safe_format(entry[tag]["vjoy_id"], int)
+            )
+            sub_node.set("axis-id", safe_format(entry[tag]["axis_id"], int))
+            node.append(sub_node)
+        for tag in ["lower", "upper"]:
+            sub_node = ElementTree.Element(tag)
+            sub_node.set("device-guid", write_guid(entry[tag]["device_guid"]))
+            sub_node.set("axis-id", safe_format(entry[tag]["axis_id"], int))
+            node.append(sub_node)
+        return node
+
     def _parse_merge_axis(self, node):
         """Parses merge axis entries.
 
@@ -0,0 +1,224 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import threading
+import time
+
+from vjoy import vjoy
+
+import gremlin.error
+from gremlin import input_devices, joystick_handling
+from gremlin.singleton_decorator import SingletonDecorator
+
+
+syslog = logging.getLogger("system")
+
+
+class RelativeAxis:
+
+    """State of a vJoy axis driven in relative mode."""
+
+    __slots__ = (
+        "vjoy_id", "axis_id", "delta", "value", "at_rest", "last_update",
+        "is_local", "is_remote"
+    )
+
+    def __init__(self, vjoy_id, axis_id, value):
+        """Creates a new instance.
+
+        :param vjoy_id id of the vJoy device
+        :param axis_id id of the axis
+        :param value current value of the axis
+        """
+        self.vjoy_id = vjoy_id
+        self.axis_id = axis_id
+        self.delta = 0.0
+        self.value = value
+        self.at_rest = False
+        self.last_update = time.monotonic()
+        self.is_local = True
+        self.is_remote = False
+
+
+@SingletonDecorator
+class RelativeAxisIntegrator:
+
+    """Moves every vJoy axis driven in relative mode from a single thread.
+
+    Actions set the rate at which an axis changes, each tick the integrator
+    advances all axes by their rate scaled with the time elapsed since the
+    previous tick. The vJoy changes of a tick are made as one batch and
+    the remote values are sent in a single frame. An axis is released
+    once its input has been at rest for rest_timeout seconds, or when
+    something else changed the axis value. The thread sleeps while no axis
+    is moving.
+    """
+
+    # Number of integration steps per second
+    tick_rate = 100
+    # Period the deltas refer to, i.e. a delta is the change in 10 ms
+    delta_period = 0.01
+    # Time an axis keeps moving after its input came to rest
+    rest_timeout = 1.0
+
+    def __init__(self):
+        """Creates a new instance."""
+        self._axes = {}
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._thread = None
+        self.ticks = 0
+
+    def update(
+            self,
+            vjoy_id,
+            axis_id,
+            delta,
+            at_rest,
+            is_local=True,
+            is_remote=False
+    ):
+        """Sets the rate at which an axis changes.
+
+        :param vjoy_id id of the vJoy device
+        :param axis_id id of the axis
+        :param delta change of the axis value per delta_period
+        :param at_rest True if the input driving the axis is at rest
+        :param is_local if True the vJoy axis is changed
+        :param is_remote if True the value is sent to remote clients
+        """
+        key = (vjoy_id, axis_id)
+        with self._lock:
+            axis = self._axes.get(key)
+            if axis is None:
+                try:
+                    value = joystick_handling.VJoyProxy()[vjoy_id] \
+                        .axis(axis_id).value
+                except gremlin.error.VJoyError as e:
+                    syslog.error(f"Relative axis unavailable: {e}")
+                    return
+                axis = RelativeAxis(vjoy_id, axis_id, value)
+                self._axes[key] = axis
+            axis.delta = delta
+            axis.at_rest = at_rest
+            axis.last_update = time.monotonic()
+            axis.is_local = is_local
+            axis.is_remote = is_remote
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="relative_axis",
+                    daemon=True
+                )
+                self._thread.start()
+        self._wake_event.set()
+
+    def stop(self):
+        """Releases all axes."""
+        with self._lock:
+            self._axes = {}
+
+    @property
+    def axis_count(self):
+        """Returns the number of axes currently moving.
+
+        :return number of axes
+        """
+        return len(self._axes)
+
+    def _tick(self, now, dt):
+        """Advances all axes by the elapsed time.
+
+        :param now current monotonic time
+        :param dt time in seconds since the previous tick
+        """
+        with self._lock:
+            axes = list(self._axes.values())
+
+        released = []
+        remote_values = []
+        vjoy.report_batcher.begin()
+        try:
+            for axis in axes:
+                try:
+                    vjoy_axis = joystick_handling.VJoyProxy()[axis.vjoy_id] \
+                        .axis(axis.axis_id)
+                    # Release the axis if its value was changed elsewhere
+                    if axis.is_local and \
+                            abs(vjoy_axis.value - axis.value) > 0.0001:
+                        released.append(axis)
+                        continue
+
+                    axis.value = max(-1.0, min(
+                        1.0,
+                        axis.value + axis.delta * dt / self.delta_period
+                    ))
+                    if axis.is_local:
+                        vjoy_axis.value = axis.value
+                    if axis.is_remote:
+                        remote_values.append(
+                            (axis.vjoy_id, axis.axis_id, axis.value)
+                        )
+                except gremlin.error.VJoyError:
+                    released.append(axis)
+                    continue
+
+                if axis.at_rest and axis.last_update + self.rest_timeout < now:
+                    released.append(axis)
+        finally:
+            vjoy.report_batcher.end()
+
+        if remote_values:
+            input_devices.remote_client.send_axes(remote_values)
+
+        if released:
+            with self._lock:
+                for axis in released:
+                    key = (axis.vjoy_id, axis.axis_id)
+                    # The axis may have been reacquired in the meantime
+                    if self._axes.get(key) is axis \
+                            and axis.last_update <= now:
+                        del self._axes[key]
+        self.ticks += 1
+
+    def _run(self):
+        """Advances the axes at a fixed rate while any of them moves."""
+        last_time = time.monotonic()
+        next_tick = last_time
+        while True:
+            if len(self._axes) == 0:
+                self._wake_event.clear()
+                if len(self._axes) == 0:
+                    self._wake_event.wait()
+                last_time = time.monotonic()
+                next_tick = last_time
+                continue
+
+            # Wait for the next tick, resynchronizing when falling behind
+            interval = 1.0 / self.tick_rate
+            next_tick += interval
+            now = time.monotonic()
+            if next_tick > now:
+                time.sleep(next_tick - now)
+            elif now - next_tick > interval:
+                next_tick = now
+
+            now = time.monotonic()
+            self._tick(now, now - last_time)
+            last_time = now
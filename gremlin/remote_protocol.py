@@ -0,0 +1,659 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Wire format of the remote control UDP channel.
+
+A frame consists of a fixed header followed by one or more records:
+
+    header: magic (B), version (B), sender id (H), sequence number (I)
+    record: opcode (B) followed by the opcode's fixed payload layout
+
+The magic byte 0xC1 is never produced by msgpack, which allows frames and
+packets of the legacy msgpack dictionary format to share the same socket.
+Clients send the legacy format until a receiver acknowledges a heartbeat
+announcing the protocol version, legacy receivers simply never do.
+
+Axis updates are aggregated by the client and sent once per tick as a
+single frame starting with a Tick record carrying the send time, which the
+receiver uses together with the sequence numbers to track latency and
+lost frames.
+
+Sequence numbers increase monotonically per sender. The receiver applies
+button, axis, and hat records only if their frame is newer than the one
+which last changed the same input, as frames can arrive out of order.
+Clients periodically send a snapshot of every input they control, which
+lets receivers that joined late or lost frames converge.
+"""
+
+import collections
+import enum
+import itertools
+import logging
+import struct
+import threading
+import time
+import zlib
+
+import msgpack
+
+
+# Byte identifying a binary frame, reserved and never used by msgpack
+MAGIC = 0xC1
+
+# Version of the binary frame format
+VERSION = 1
+
+
+class Opcode(enum.IntEnum):
+
+    """Record types of the binary frame format."""
+
+    Heartbeat = 0x01
+    HelloAck = 0x02
+    Tick = 0x03
+    Snapshot = 0x04
+    Button = 0x10
+    ToggleButton = 0x11
+    Axis = 0x12
+    RelativeAxis = 0x13
+    Hat = 0x14
+    Key = 0x20
+    MouseButton = 0x21
+    MouseWheel = 0x22
+    MouseMotion = 0x23
+    MouseAcceleration = 0x24
+
+
+# Payload layout of each record type, without the opcode
+record_layouts = {
+    Opcode.Heartbeat: "B",          # protocol version of the sender
+    Opcode.HelloAck: "B",           # protocol version of the receiver
+    Opcode.Tick: "d",               # send time of the frame, time.time()
+    Opcode.Snapshot: "",            # remaining records are a state snapshot
+    Opcode.Button: "BH?",           # vjoy id, button id, is pressed
+    Opcode.ToggleButton: "BH",      # vjoy id, button id
+    Opcode.Axis: "BBf",             # vjoy id, axis id, value
+    Opcode.RelativeAxis: "BBf",     # vjoy id, axis id, delta
+    Opcode.Hat: "BBbb",             # vjoy id, hat id, x, y
+    Opcode.Key: "HHI",              # virtual code, scan code, flags
+    Opcode.MouseButton: "B?",       # button id, is pressed
+    Opcode.MouseWheel: "h",         # direction
+    Opcode.MouseMotion: "ff",       # dx, dy
+    Opcode.MouseAcceleration: "ffff",  # direction, min, max, time to max
+}
+
+header = struct.Struct("<BBHI")
+
+# Records setting the state of a single input, the first two values are the
+# vjoy id and input id, only the newest of those is applied
+stateful_opcodes = (Opcode.Button, Opcode.Axis, Opcode.Hat)
+
+# Largest number of records sent in a single frame, keeps frames of axis
+# records below a typical MTU
+max_records = 160
+
+
+class Frame(collections.namedtuple(
+        "Frame",
+        ["sender", "sequence", "address", "socket"]
+)):
+
+    """Origin of the records being dispatched.
+
+    For legacy packets the sender is the client's guid string and the
+    sequence number is None, for binary frames the sender is the numeric
+    sender id.
+    """
+
+
+def sender_id(guid):
+    """Returns the numeric sender id corresponding to a client guid.
+
+    :param guid the unique id string of the client
+    :return id fitting into the frame header
+    """
+    return zlib.crc32(guid.encode("utf-8")) & 0xFFFF
+
+
+class FrameEncoder:
+
+    """Creates binary frames for a single sender.
+
+    Header and record layout are combined into a single precompiled struct
+    per opcode so encoding a single record frame is one pack call.
+    """
+
+    def __init__(self, sender):
+        """Creates a new encoder.
+
+        :param sender numeric id of the sender
+        """
+        self.sender = sender
+        # next() on a count is atomic, frames can be built on any thread
+        self._sequence = itertools.count()
+        self._frames = {}
+        self._records = {}
+        for opcode, layout in record_layouts.items():
+            self._frames[opcode] = struct.Struct(f"<BBHIB{layout}")
+            self._records[opcode] = struct.Struct(f"<B{layout}")
+
+    def encode(self, opcode, *values):
+        """Returns a frame containing a single record.
+
+        :param opcode type of the record
+        :param values payload values of the record
+        :return bytes of the frame
+        """
+        return self._frames[opcode].pack(
+            MAGIC,
+            VERSION,
+            self.sender,
+            next(self._sequence) & 0xFFFFFFFF,
+            opcode,
+            *values
+        )
+
+    def encode_records(self, records):
+        """Returns a frame containing multiple records.
+
+        :param records list of (opcode, values) tuples
+        :return bytes of the frame
+        """
+        parts = [header.pack(
+            MAGIC, VERSION, self.sender, next(self._sequence) & 0xFFFFFFFF
+        )]
+        for opcode, values in records:
+            parts.append(self._records[opcode].pack(opcode, *values))
+        return b"".join(parts)
+
+
+class AxisAggregator:
+
+    """Collects the axis updates of a tick and releases the relevant ones.
+
+    Only the latest value of each axis is kept and relative axis deltas are
+    summed up. Absolute values differing by less than epsilon from the value
+    released last for the same axis are dropped.
+    """
+
+    epsilon = 1e-4
+
+    def __init__(self):
+        """Creates a new aggregator."""
+        self._lock = threading.Lock()
+        # Pending values, keyed by (vjoy id, axis id)
+        self._axes = {}
+        self._relative = {}
+        # Absolute values released last, keyed by (vjoy id, axis id)
+        self._released = {}
+        self.updates = 0
+        self.dropped = 0
+
+    def set_axis(self, vjoy_id, axis_id, value):
+        """Stores the new value of an axis.
+
+        :param vjoy_id id of the vjoy device
+        :param axis_id id of the axis
+        :param value new value of the axis
+        """
+        key = (vjoy_id, axis_id)
+        with self._lock:
+            self.updates += 1
+            if key in self._axes:
+                self.dropped += 1
+            self._axes[key] = value
+            # The absolute value supersedes earlier relative changes
+            self._relative.pop(key, None)
+
+    def add_relative(self, vjoy_id, axis_id, delta):
+        """Adds a relative change to an axis.
+
+        :param vjoy_id id of the vjoy device
+        :param axis_id id of the axis
+        :param delta change of the axis value
+        """
+        key = (vjoy_id, axis_id)
+        with self._lock:
+            self.updates += 1
+            if key in self._relative:
+                self.dropped += 1
+            self._relative[key] = self._relative.get(key, 0.0) + delta
+
+    def drain(self):
+        """Returns the records of all relevant pending updates.
+
+        :return list of (opcode, values) tuples
+        """
+        records = []
+        with self._lock:
+            for key, value in self._axes.items():
+                last = self._released.get(key)
+                if last is not None and abs(value - last) < self.epsilon:
+                    self.dropped += 1
+                    continue
+                self._released[key] = value
+                records.append((Opcode.Axis, (key[0], key[1], value)))
+            for key, delta in self._relative.items():
+                if delta == 0.0:
+                    self.dropped += 1
+                    continue
+                records.append((Opcode.RelativeAxis, (key[0], key[1], delta)))
+            self._axes = {}
+            self._relative = {}
+        return records
+
+    def reset(self):
+        """Discards pending updates and forgets the released values."""
+        with self._lock:
+            self._axes = {}
+            self._relative = {}
+            self._released = {}
+
+
+class Negotiation:
+
+    """Decides whether a client sends binary frames or legacy packets.
+
+    Receivers supporting binary frames acknowledge the client's heartbeat,
+    legacy receivers never answer. As the latter can't be detected, binary
+    frames are only sent if the user opted in and a receiver acknowledged
+    them recently. Once acknowledgements stop, e.g. because the receiver
+    was closed, the client falls back to legacy packets.
+    """
+
+    def __init__(self, enabled=False, timeout=15.0):
+        """Creates a new instance.
+
+        :param enabled whether or not binary frames may be sent at all
+        :param timeout seconds after which an acknowledgement expires
+        """
+        self.enabled = enabled
+        self.timeout = timeout
+        # Time of the last acknowledgement, keyed by receiver address
+        self._acks = {}
+        self._latest = None
+
+    def acknowledge(self, address, now=None):
+        """Records an acknowledgement of the binary protocol.
+
+        :param address address of the acknowledging receiver
+        :param now current time, defaults to time.time()
+        :return True if the receiver wasn't known to support binary frames
+        """
+        now = time.time() if now is None else now
+        is_new = address not in self._acks
+        self._acks[address] = now
+        self._latest = now
+        return is_new
+
+    def is_binary(self, now=None):
+        """Returns whether or not binary frames are to be sent.
+
+        :param now current time, defaults to time.time()
+        :return True if binary frames are sent, False otherwise
+        """
+        if not self.enabled or self._latest is None:
+            return False
+        now = time.time() if now is None else now
+        return now - self._latest <= self.timeout
+
+    def receivers(self, now=None):
+        """Returns the receivers that acknowledged the binary protocol recently.
+
+        :param now current time, defaults to time.time()
+        :return list of receiver addresses
+        """
+        now = time.time() if now is None else now
+        return [
+            address for address, ack_time in self._acks.items()
+            if now - ack_time <= self.timeout
+        ]
+
+    def reset(self):
+        """Forgets all acknowledgements."""
+        self._acks = {}
+        self._latest = None
+
+
+# Conversion between records and the legacy msgpack dictionaries
+def _legacy_joystick(action):
+    return lambda sender, values: {
+        "sender": sender,
+        "action": action,
+        "device": values[0],
+        "target": values[1],
+        "value": values[2]
+    }
+
+
+_to_legacy = {
+    Opcode.Heartbeat: lambda sender, values: {
+        "sender": sender, "action": "hb", "protocol": values[0]
+    },
+    Opcode.Button: _legacy_joystick("button"),
+    Opcode.ToggleButton: lambda sender, values: {
+        "sender": sender,
+        "action": "toggle",
+        "device": values[0],
+        "target": values[1]
+    },
+    Opcode.Axis: _legacy_joystick("axis"),
+    Opcode.RelativeAxis: _legacy_joystick("relative_axis"),
+    Opcode.Hat: lambda sender, values: {
+        "sender": sender,
+        "action": "hat",
+        "device": values[0],
+        "target": values[1],
+        "value": (values[2], values[3])
+    },
+    Opcode.Key: lambda sender, values: {
+        "sender": sender,
+        "action": "key",
+        "vc": values[0],
+        "sc": values[1],
+        "flags": values[2]
+    },
+    Opcode.MouseButton: lambda sender, values: {
+        "sender": sender,
+        "action": "mouse",
+        "subtype": "button",
+        "button": values[0],
+        "value": values[1]
+    },
+    Opcode.MouseWheel: lambda sender, values: {
+        "sender": sender,
+        "action": "mouse",
+        "subtype": "wheel",
+        "direction": values[0]
+    },
+    Opcode.MouseMotion: lambda sender, values: {
+        "sender": sender,
+        "action": "mouse",
+        "subtype": "axis",
+        "dx": values[0],
+        "dy": values[1]
+    },
+    Opcode.MouseAcceleration: lambda sender, values: {
+        "sender": sender,
+        "action": "mouse",
+        "subtype": "amotion",
+        "acc": values[0],
+        "min_speed": values[1],
+        "max_speed": values[2],
+        "time_to_speed": values[3]
+    },
+}
+
+_from_legacy = {
+    "hb": lambda data: (Opcode.Heartbeat, (data.get("protocol", 0),)),
+    "button": lambda data: (
+        Opcode.Button, (data["device"], data["target"], data["value"])
+    ),
+    "toggle": lambda data: (
+        Opcode.ToggleButton, (data["device"], data["target"])
+    ),
+    "axis": lambda data: (
+        Opcode.Axis, (data["device"], data["target"], data["value"])
+    ),
+    "relative_axis": lambda data: (
+        Opcode.RelativeAxis, (data["device"], data["target"], data["value"])
+    ),
+    "hat": lambda data: (
+        Opcode.Hat, (data["device"], data["target"], *data["value"])
+    ),
+    "key": lambda data: (
+        Opcode.Key, (data["vc"], data["sc"], data["flags"])
+    ),
+    "mouse:button": lambda data: (
+        Opcode.MouseButton, (data["button"], data["value"])
+    ),
+    "mouse:wheel": lambda data: (Opcode.MouseWheel, (data["direction"],)),
+    "mouse:axis": lambda data: (Opcode.MouseMotion, (data["dx"], data["dy"])),
+    "mouse:amotion": lambda data: (
+        Opcode.MouseAcceleration,
+        (data["acc"], data["min_speed"], data["max_speed"],
+         data["time_to_speed"])
+    ),
+}
+
+
+def encode_legacy(sender, opcode, *values):
+    """Returns a packet in the legacy msgpack dictionary format.
+
+    :param sender the unique id string of the client
+    :param opcode type of the record
+    :param values payload values of the record
+    :return bytes of the packet
+    """
+    return msgpack.packb(_to_legacy[opcode](sender, values))
+
+
+class ReceiveStatistics:
+
+    """Counts received frames, lost frames, and the latency of ticks.
+
+    Frames are considered lost when the sequence numbers of a sender skip
+    values, a frame arriving after a later one counts as reordered instead.
+    Latency is measured with the send time of Tick records and is only
+    meaningful if the clocks of sender and receiver are synchronized.
+    """
+
+    def __init__(self):
+        """Creates a new, empty, set of counters."""
+        self._lock = threading.Lock()
+        self._next_sequence = {}
+        self.reset()
+
+    def reset(self):
+        """Resets all counters."""
+        with self._lock:
+            self._next_sequence.clear()
+            self.frames = 0
+            self.records = 0
+            self.lost = 0
+            self.reordered = 0
+            self.stale = 0
+            self.snapshots = 0
+            self.latency_count = 0
+            self.latency_total = 0.0
+            self.latency_max = 0.0
+
+    def frame(self, sender, sequence, records):
+        """Records the reception of a frame.
+
+        :param sender numeric id of the sender
+        :param sequence sequence number of the frame
+        :param records number of records dispatched from the frame
+        """
+        with self._lock:
+            self.frames += 1
+            self.records += records
+            expected = self._next_sequence.get(sender)
+            if expected is not None:
+                gap = (sequence - expected) & 0xFFFFFFFF
+                if gap >= 0x80000000:
+                    # Older than the latest frame, which counted it as lost
+                    self.reordered += 1
+                    self.lost = max(0, self.lost - 1)
+                    return
+                self.lost += gap
+            self._next_sequence[sender] = (sequence + 1) & 0xFFFFFFFF
+
+    def record_stale(self):
+        """Records a record dropped as a newer one changed its input."""
+        with self._lock:
+            self.stale += 1
+
+    def record_snapshot(self):
+        """Records the reception of a snapshot frame."""
+        with self._lock:
+            self.snapshots += 1
+
+    def latency(self, sent_time):
+        """Records the latency of a tick.
+
+        :param sent_time time.time() at which the tick was sent
+        """
+        latency = time.time() - sent_time
+        with self._lock:
+            self.latency_count += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    @property
+    def latency_mean(self):
+        """Returns the mean latency of all ticks.
+
+        :return mean latency in seconds, 0 if no tick was received
+        """
+        if self.latency_count == 0:
+            return 0.0
+        return self.latency_total / self.latency_count
+
+    def __str__(self):
+        return f"frames={self.frames} records={self.records} " \
+            f"lost={self.lost} reordered={self.reordered} " \
+            f"stale={self.stale} snapshots={self.snapshots} " \
+            f"latency mean={self.latency_mean * 1e3:.2f}ms " \
+            f"max={self.latency_max * 1e3:.2f}ms"
+
+
+class Dispatcher:
+
+    """Decodes received packets and invokes the handler of each record.
+
+    The dispatch table is indexed by opcode and holds the precompiled
+    record layout together with its handler, so that decoding a record is
+    a single lookup and unpack. Tick and Snapshot records are handled by
+    the dispatcher itself unless a handler is provided for them.
+
+    Records of stateful opcodes are dropped if the input they change was
+    last changed by a newer frame of the same sender, frames of different
+    senders are applied in the order they arrive.
+    """
+
+    def __init__(self, handlers, ignored_senders=()):
+        """Creates a new dispatcher.
+
+        :param handlers dictionary mapping opcodes to callables, which are
+            invoked with the Frame followed by the record's payload values
+        :param ignored_senders sender ids and guids whose packets are dropped
+        """
+        self.ignored_senders = set(ignored_senders)
+        self.statistics = ReceiveStatistics()
+        handlers = dict(handlers)
+        handlers.setdefault(
+            Opcode.Tick,
+            lambda frame, sent_time: self.statistics.latency(sent_time)
+        )
+        handlers.setdefault(
+            Opcode.Snapshot,
+            lambda frame: self.statistics.record_snapshot()
+        )
+        self._table = [None] * 256
+        for opcode, handler in handlers.items():
+            layout = struct.Struct(f"<{record_layouts[opcode]}")
+            self._table[opcode] = (
+                layout.unpack_from,
+                layout.size,
+                handler,
+                opcode in stateful_opcodes
+            )
+        # (sender, sequence) of the frame which last changed each input,
+        # keyed by (opcode, vjoy id, input id)
+        self._latest = {}
+        # Frames may be dispatched from multiple threads, checking and
+        # applying a record has to happen atomically
+        self._lock = threading.Lock()
+
+    def dispatch(self, data, address=None, socket=None):
+        """Processes a single received packet.
+
+        :param data bytes of the packet
+        :param address address of the packet's sender
+        :param socket socket on which the packet was received
+        :return number of records dispatched
+        """
+        if len(data) == 0:
+            return 0
+        if data[0] != MAGIC:
+            return self._dispatch_legacy(data, address, socket)
+        if len(data) < header.size:
+            return 0
+
+        _, version, sender, sequence = header.unpack_from(data)
+        if version != VERSION or sender in self.ignored_senders:
+            return 0
+
+        frame = Frame(sender, sequence, address, socket)
+        table = self._table
+        latest = self._latest
+        offset = header.size
+        count = 0
+        with self._lock:
+            while offset < len(data):
+                opcode = data[offset]
+                entry = table[opcode]
+                if entry is None:
+                    # Unknown record, the remainder can't be parsed
+                    logging.getLogger("system").debug(
+                        f"Remote: unsupported opcode {opcode:#x}"
+                    )
+                    break
+                unpack_from, size, handler, stateful = entry
+                if offset + 1 + size > len(data):
+                    break
+                values = unpack_from(data, offset + 1)
+                offset += 1 + size
+                if stateful:
+                    key = (opcode, values[0], values[1])
+                    last = latest.get(key)
+                    if last is not None and last[0] == sender and \
+                            (sequence - last[1]) & 0xFFFFFFFF >= 0x80000000:
+                        self.statistics.record_stale()
+                        continue
+                    latest[key] = (sender, sequence)
+                handler(frame, *values)
+                count += 1
+        self.statistics.frame(sender, sequence, count)
+        return count
+
+    def _dispatch_legacy(self, data, address, socket):
+        """Processes a packet in the legacy msgpack dictionary format.
+
+        :param data bytes of the packet
+        :param address address of the packet's sender
+        :param socket socket on which the packet was received
+        :return number of records dispatched
+        """
+        packet = msgpack.unpackb(data)
+        sender = packet["sender"]
+        if sender in self.ignored_senders:
+            return 0
+
+        action = packet["action"]
+        if action == "mouse":
+            action = f"mouse:{packet['subtype']}"
+        translate = _from_legacy.get(action)
+        if translate is None:
+            return 0
+        opcode, values = translate(packet)
+        entry = self._table[opcode]
+        if entry is None:
+            return 0
+        entry[2](Frame(sender, None, address, socket), *values)
+        return 1
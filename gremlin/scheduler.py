@@ -0,0 +1,519 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import concurrent.futures
+import enum
+import heapq
+import logging
+import math
+import threading
+import time
+
+from gremlin import error
+from gremlin.singleton_decorator import SingletonDecorator
+
+
+syslog = logging.getLogger("system")
+
+
+class StopPolicy(enum.Enum):
+
+    """Behaviour of a scheduled callback when all callbacks are cancelled."""
+
+    # Drop the callback without running it
+    Cancel = 1
+    # Run the callback immediately instead of dropping it
+    Run = 2
+    # Keep the callback scheduled and run it when it becomes due
+    Keep = 3
+
+
+class TimerHandle:
+
+    """Handle of a callback scheduled with the timer wheel."""
+
+    __slots__ = (
+        "deadline", "tick", "callback", "args", "stop_policy",
+        "cancelled", "executed"
+    )
+
+    def __init__(self, deadline, tick, callback, args, stop_policy):
+        """Creates a new handle.
+
+        :param deadline monotonic time at which the callback is due
+        :param tick index of the wheel tick in which the callback runs
+        :param callback the function to execute
+        :param args positional arguments passed to the callback
+        :param stop_policy StopPolicy applied by TimerWheel.cancel_all
+        """
+        self.deadline = deadline
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.stop_policy = stop_policy
+        self.cancelled = False
+        self.executed = False
+
+    def cancel(self):
+        """Prevents the callback from running if it has not run yet."""
+        self.cancelled = True
+
+    @property
+    def active(self):
+        """Returns whether or not the callback is still waiting to run.
+
+        :return True if the callback has neither run nor been cancelled
+        """
+        return not (self.cancelled or self.executed)
+
+
+@SingletonDecorator
+class TimerWheel:
+
+    """Hashed timer wheel executing delayed callbacks on a single thread.
+
+    Time is divided into ticks of fixed length, each scheduled callback is
+    placed into the slot of the tick it is due in. The worker thread only
+    runs while callbacks are pending and then advances one tick at a time,
+    executing the callbacks of every slot it passes whose deadline has
+    been reached. Callbacks are run in the worker thread and therefore
+    must not block for extended periods of time.
+    """
+
+    # Length of a single tick in seconds
+    tick_length = 0.005
+    # Number of slots of the wheel
+    slot_count = 512
+    # Maximum number of passes cancel_all makes over callbacks which
+    # schedule further StopPolicy.Run callbacks
+    stop_passes = 8
+
+    def __init__(self):
+        """Creates a new instance."""
+        self._condition = threading.Condition(threading.Lock())
+        self._slots = [[] for _ in range(self.slot_count)]
+        self._start_time = time.monotonic()
+        self._current_tick = 0
+        self._pending = 0
+        self._thread = None
+
+    def schedule(self, delay, callback, *args, stop_policy=StopPolicy.Cancel):
+        """Schedules a callback to run after the given delay.
+
+        :param delay time in seconds after which to run the callback
+        :param callback the function to execute
+        :param args positional arguments passed to the callback
+        :param stop_policy StopPolicy applied by cancel_all
+        :return handle which can be used to cancel the callback
+        """
+        now = time.monotonic()
+        deadline = now + max(0.0, delay)
+        with self._condition:
+            if self._pending == 0:
+                # The wheel does not advance while idle, move it to the
+                # current time before adding new entries
+                self._current_tick = int(
+                    (now - self._start_time) / self.tick_length
+                )
+            tick = max(
+                self._current_tick,
+                math.ceil((deadline - self._start_time) / self.tick_length)
+            )
+            handle = TimerHandle(deadline, tick, callback, args, stop_policy)
+            self._slots[tick % self.slot_count].append(handle)
+            self._pending += 1
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="timer_wheel",
+                    daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        return handle
+
+    def cancel_all(self):
+        """Cancels every callback which has not run yet.
+
+        Callbacks scheduled with StopPolicy.Run, typically the release half
+        of a press, are executed right away in the calling thread instead,
+        including any such callbacks they schedule themselves. Callbacks
+        scheduled with StopPolicy.Keep are left untouched.
+        """
+        for _ in range(self.stop_passes):
+            run = []
+            with self._condition:
+                for slot in self._slots:
+                    remaining = []
+                    for handle in slot:
+                        if handle.stop_policy == StopPolicy.Keep:
+                            remaining.append(handle)
+                        elif handle.stop_policy == StopPolicy.Run \
+                                and not handle.cancelled:
+                            run.append(handle)
+                        else:
+                            handle.cancelled = True
+                    self._pending -= len(slot) - len(remaining)
+                    slot[:] = remaining
+
+            if len(run) == 0:
+                return
+            for handle in sorted(run, key=lambda h: h.deadline):
+                self._execute(handle)
+        syslog.warning(
+            "Scheduled callbacks kept rescheduling themselves while stopping"
+        )
+
+    @property
+    def pending(self):
+        """Returns the number of callbacks waiting to be run.
+
+        :return number of scheduled callbacks
+        """
+        return self._pending
+
+    def _collect_due(self, now):
+        """Returns all callbacks due at the given time.
+
+        :param now current monotonic time
+        :return list of handles to execute
+        """
+        due = []
+        now_tick = int((now - self._start_time) / self.tick_length)
+        while self._current_tick <= now_tick and self._pending > 0:
+            slot = self._slots[self._current_tick % self.slot_count]
+            if len(slot) > 0:
+                # Entries with a later tick belong to a future turn of the
+                # wheel and remain in the slot
+                remaining = []
+                for handle in slot:
+                    if handle.tick <= self._current_tick:
+                        due.append(handle)
+                    else:
+                        remaining.append(handle)
+                self._pending -= len(slot) - len(remaining)
+                slot[:] = remaining
+            self._current_tick += 1
+        return due
+
+    def _run(self):
+        """Executes callbacks as they become due."""
+        while True:
+            with self._condition:
+                while self._pending == 0:
+                    self._condition.wait()
+                now = time.monotonic()
+                due = self._collect_due(now)
+                if len(due) == 0:
+                    # Sleep until the start of the next tick
+                    self._condition.wait(max(
+                        0.0005,
+                        self._start_time
+                            + self._current_tick * self.tick_length - now
+                    ))
+                    continue
+
+            for handle in due:
+                self._execute(handle)
+
+    def _execute(self, handle):
+        """Runs the callback of a handle unless it has been cancelled.
+
+        :param handle the handle whose callback to run
+        """
+        if handle.cancelled or handle.executed:
+            return
+        handle.executed = True
+        try:
+            handle.callback(*handle.args)
+        except Exception as e:
+            syslog.exception(f"Error in scheduled callback: {e}")
+
+
+class OverrunPolicy(enum.Enum):
+
+    """Behaviour of a periodic callback which missed one or more periods."""
+
+    # Drop the missed executions and resume at the next period
+    Skip = 1
+    # Run the missed executions back to back, up to a limit
+    CatchUp = 2
+
+
+class PeriodicStatistics:
+
+    """Execution statistics of a single periodic callback.
+
+    Jitter is the delay between the time an execution was due and the time
+    it started, runtime the time the callback took to complete. Overruns
+    are executions which took longer than the interval, skipped counts the
+    periods dropped due to being behind and busy the periods dropped as
+    the previous pooled execution was still running.
+    """
+
+    def __init__(self):
+        """Creates a new instance."""
+        self.reset()
+
+    def reset(self):
+        """Resets all counters."""
+        self.runs = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.busy = 0
+        self.jitter_total = 0.0
+        self.jitter_max = 0.0
+        self.runtime_total = 0.0
+        self.runtime_max = 0.0
+
+    def record(self, jitter, runtime, interval):
+        """Records a single execution.
+
+        :param jitter delay in seconds between the deadline and the start
+        :param runtime duration of the execution in seconds
+        :param interval time in seconds between executions
+        """
+        self.runs += 1
+        if runtime > interval:
+            self.overruns += 1
+        self.jitter_total += jitter
+        self.jitter_max = max(self.jitter_max, jitter)
+        self.runtime_total += runtime
+        self.runtime_max = max(self.runtime_max, runtime)
+
+    @property
+    def jitter_mean(self):
+        """Returns the mean jitter of all executions.
+
+        :return mean jitter in seconds
+        """
+        return self.jitter_total / self.runs if self.runs > 0 else 0.0
+
+    @property
+    def runtime_mean(self):
+        """Returns the mean runtime of all executions.
+
+        :return mean runtime in seconds
+        """
+        return self.runtime_total / self.runs if self.runs > 0 else 0.0
+
+    def __str__(self):
+        return f"runs: {self.runs} overruns: {self.overruns} " \
+            f"skipped: {self.skipped} busy: {self.busy} " \
+            f"jitter: {self.jitter_mean * 1e3:.2f}/{self.jitter_max * 1e3:.2f}ms " \
+            f"runtime: {self.runtime_mean * 1e3:.2f}/{self.runtime_max * 1e3:.2f}ms"
+
+
+class PeriodicTask:
+
+    """Callback executed at a fixed rate by the periodic scheduler."""
+
+    def __init__(self, callback, interval, policy, pooled):
+        """Creates a new task.
+
+        :param callback the function to execute
+        :param interval time in seconds between the starts of executions
+        :param policy OverrunPolicy applied when periods are missed
+        :param pooled if True the callback runs in the worker pool
+        """
+        self.callback = callback
+        self.interval = interval
+        self.policy = policy
+        self.pooled = pooled
+        self.deadline = 0.0
+        self.statistics = PeriodicStatistics()
+        self._future = None
+
+    @property
+    def name(self):
+        """Returns the name of the callback.
+
+        :return name of the callback
+        """
+        callback = self.callback
+        while hasattr(callback, "func"):
+            callback = callback.func
+        return getattr(callback, "__qualname__", repr(callback))
+
+    def execute(self, deadline):
+        """Executes the callback and records its statistics.
+
+        :param deadline monotonic time at which the execution was due
+        """
+        start = time.monotonic()
+        try:
+            self.callback()
+        except Exception as e:
+            syslog.exception(f"Error in periodic callback {self.name}: {e}")
+        self.statistics.record(
+            max(0.0, start - deadline),
+            time.monotonic() - start,
+            self.interval
+        )
+
+    @property
+    def busy(self):
+        """Returns whether or not a pooled execution is still running.
+
+        :return True if the previous execution has not completed
+        """
+        return self._future is not None and not self._future.done()
+
+
+class PeriodicScheduler:
+
+    """Executes callbacks at a fixed rate on a monotonic clock.
+
+    Deadlines advance by exactly one interval per execution, i.e. they lie
+    on a fixed grid relative to the start time, so the runtime of the
+    callbacks does not cause the periods to drift. All callbacks are run by
+    a single thread unless they are marked as pooled, in which case they
+    are handed to a small worker pool so that a slow callback cannot delay
+    the others. A pooled callback that is still running when it is due
+    again skips that period, hence pooled callbacks cannot catch up.
+    """
+
+    # Maximum number of missed periods run back to back with CatchUp
+    max_catch_up = 4
+    # Number of threads of the pool running pooled callbacks
+    worker_count = 4
+
+    def __init__(self, name="periodic"):
+        """Creates a new instance.
+
+        :param name name of the scheduler thread
+        """
+        self._name = name
+        self._tasks = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._pool = None
+
+    def add(self, callback, interval, policy=OverrunPolicy.Skip, pooled=False):
+        """Adds a callback to execute periodically.
+
+        :param callback the function to execute
+        :param interval time in seconds between executions
+        :param policy OverrunPolicy applied when periods are missed, pooled
+            callbacks only support OverrunPolicy.Skip
+        :param pooled if True the callback runs in the worker pool
+        :return task representing the callback
+        """
+        if interval <= 0:
+            raise error.GremlinError(
+                f"Invalid periodic interval {interval} for {callback}"
+            )
+        if pooled and policy == OverrunPolicy.CatchUp:
+            raise error.GremlinError(
+                f"Pooled periodic callback {callback} cannot catch up"
+            )
+        task = PeriodicTask(callback, interval, policy, pooled)
+        self._tasks.append(task)
+        return task
+
+    def clear(self):
+        """Removes all callbacks, the scheduler has to be stopped."""
+        self._tasks = []
+
+    @property
+    def tasks(self):
+        """Returns the tasks executed by the scheduler.
+
+        :return list of tasks
+        """
+        return list(self._tasks)
+
+    @property
+    def is_running(self):
+        """Returns whether or not the scheduler thread is running.
+
+        :return True if the scheduler is running
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Starts executing the callbacks."""
+        if self.is_running or len(self._tasks) == 0:
+            return
+
+        if any(task.pooled for task in self._tasks):
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.worker_count,
+                thread_name_prefix=f"{self._name}_worker"
+            )
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=self._name,
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops executing the callbacks and waits for running ones."""
+        self._stop.set()
+        if self.is_running and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _advance(self, task, now):
+        """Moves the deadline of a task past an execution.
+
+        :param task the task whose deadline to move
+        :param now current monotonic time
+        """
+        task.deadline += task.interval
+        missed = int((now - task.deadline) // task.interval)
+        if missed <= 0:
+            return
+        if task.policy == OverrunPolicy.CatchUp \
+                and missed <= self.max_catch_up:
+            return
+
+        # Too far behind, drop the missed periods but stay on the grid
+        task.statistics.skipped += missed
+        task.deadline += missed * task.interval
+
+    def _run(self):
+        """Executes callbacks as they become due."""
+        start = time.monotonic()
+        queue = []
+        for index, task in enumerate(self._tasks):
+            task.deadline = start + task.interval
+            task.statistics.reset()
+            heapq.heappush(queue, (task.deadline, index, task))
+
+        while not self._stop.is_set():
+            deadline, index, task = queue[0]
+            now = time.monotonic()
+            if deadline > now:
+                self._stop.wait(deadline - now)
+                continue
+
+            if not task.pooled:
+                task.execute(deadline)
+            elif task.busy:
+                task.statistics.busy += 1
+            else:
+                task._future = self._pool.submit(task.execute, deadline)
+
+            self._advance(task, time.monotonic())
+            heapq.heapreplace(queue, (task.deadline, index, task))
@@ -69,10 +69,12 @@ class MotionType(enum.Enum):
 
 class MouseMotion:
 
-    """Base class of all mouse motion behaviours."""
+    """Base class of all mouse motion behaviours.
 
-    # Time step between calls
-    delta_t = 0.01
+    Motions are described by their velocity, the distance travelled is
+    obtained by integrating the velocity over the time that actually
+    elapsed between two updates.
+    """
 
     def __init__(self, dx=0, dy=0):
         """Creates a new instance.
@@ -83,47 +85,21 @@ class MouseMotion:
         self.dx = dx
         self.dy = dy
 
-        self._tick_dx_value, self._tick_dx_time = self._compute_values(self.dx)
-        self._tick_dy_value, self._tick_dy_time = self._compute_values(self.dy)
-
-        self._dx_timestamp = 0
-        self._dy_timestamp = 0
-
-    def __call__(self):
-        """Returns the change in x and y for this point in time.
+    @property
+    def is_idle(self):
+        """Returns whether or not the motion moves the mouse.
 
-        :return dx, dy for this time point
+        :return True if the velocity is zero, False otherwise
         """
-        if self._tick_dx_value == 0 and self._tick_dy_value == 0:
-            return 0, 0
-
-        delta_x = 0
-        delta_y = 0
-
-        cur_time = time.time()
-        if self._dx_timestamp < cur_time:
-            delta_x = self._tick_dx_value
-            self._dx_timestamp = cur_time + self._tick_dx_time
-        if self._dy_timestamp < cur_time:
-            delta_y = self._tick_dy_value
-            self._dy_timestamp = cur_time + self._tick_dy_time
+        return abs(self.dx) < 1e-6 and abs(self.dy) < 1e-6
 
-        return delta_x, delta_y
+    def advance(self, dt):
+        """Returns the distance travelled during the given time.
 
-    def _compute_values(self, delta):
-        """Computes discretization values to send integer motions.
-
-        :param delta the amount of change in pixels per second to discretize for
+        :param dt elapsed time in seconds
+        :return distance along x and y in fractional pixels
         """
-        delta = 0.0 if abs(delta) < 1e-6 else delta
-        tick_value = math.ceil(abs(delta) / 100.0)
-        if tick_value == 0:
-            tick_time = MouseMotion.delta_t
-        else:
-            tick_time = 1.0 / (abs(delta) / tick_value)
-            tick_value = int(math.copysign(tick_value, delta))
-
-        return tick_value, tick_time
+        return self.dx * dt, self.dy * dt
 
 
 class FixedMouseMotion(MouseMotion):
@@ -144,7 +120,6 @@ class FixedMouseMotion(MouseMotion):
         :param value speed in pixels per second along the x axis
         """
         self.dx = value
-        self._tick_dx_value, self._tick_dx_time = self._compute_values(self.dx)
 
     def set_dy(self, value):
         """Updates the y velocity.
@@ -152,7 +127,6 @@ class FixedMouseMotion(MouseMotion):
         :param value speed in pixels per second along the y axis
         """
         self.dy = value
-        self._tick_dy_value, self._tick_dy_time = self._compute_values(self.dy)
 
 
 class AcceleratedMouseMotion(MouseMotion):
@@ -181,8 +155,6 @@ class AcceleratedMouseMotion(MouseMotion):
         self.current_velocity = self.min_velocity
         self.dx, self.dy = \
             self._decompose_xy(self.direction, self.current_velocity)
-        self._tick_dx_value, self._tick_dx_time = self._compute_values(self.dx)
-        self._tick_dy_value, self._tick_dy_time = self._compute_values(self.dy)
 
     def set_direction(self, direction):
         """Sets the direction for which to emit position changes.
@@ -192,8 +164,17 @@ class AcceleratedMouseMotion(MouseMotion):
         self.direction = direction - 90.0
         self.dx, self.dy = \
             self._decompose_xy(self.direction, self.current_velocity)
-        self._tick_dx_value, self._tick_dx_time = self._compute_values(self.dx)
-        self._tick_dy_value, self._tick_dy_time = self._compute_values(self.dy)
+
+    @property
+    def is_idle(self):
+        """Returns whether or not the motion moves the mouse.
+
+        A motion starting at rest still accelerates and thus is only idle
+        if it can never gain any speed.
+
+        :return True if the maximum velocity is zero, False otherwise
+        """
+        return self.max_velocity <= 0
 
     def _decompose_xy(self, direction, value):
         """Returns x and y values corresponding to a direction and value.
@@ -205,67 +186,98 @@ class AcceleratedMouseMotion(MouseMotion):
         return value * math.cos(deg2rad(direction)),\
             value * math.sin(deg2rad(direction))
 
-    def __call__(self):
-        """Returns the change in x and y for this point in time.
+    def advance(self, dt):
+        """Returns the distance travelled during the given time.
+
+        The velocity increases linearly until it reaches the maximum
+        velocity, the distance covers both the accelerating and the
+        constant part of the interval.
 
-        :return dx, dy for this time point
+        :param dt elapsed time in seconds
+        :return distance along x and y in fractional pixels
         """
-        # Get values to return using current integration step values
-        dx, dy = super().__call__()
-
-        # Apply acceleration to obtain next integration step values
-        self.current_velocity = min(
-            self.max_velocity,
-            self.current_velocity + self.acceleration * MouseMotion.delta_t
-        )
+        start_velocity = self.current_velocity
+        if start_velocity >= self.max_velocity:
+            distance = start_velocity * dt
+        else:
+            accelerating = min(
+                dt,
+                (self.max_velocity - start_velocity) / self.acceleration
+            )
+            self.current_velocity = min(
+                self.max_velocity,
+                start_velocity + self.acceleration * accelerating
+            )
+            distance = (start_velocity + self.current_velocity) / 2.0 \
+                * accelerating + self.current_velocity * (dt - accelerating)
+
         self.dx, self.dy = \
             self._decompose_xy(self.direction, self.current_velocity)
-        self._tick_dx_value, self._tick_dx_time = self._compute_values(self.dx)
-        self._tick_dy_value, self._tick_dy_time = self._compute_values(self.dy)
-
-        # Return cached values
-        return dx, dy
+        return self._decompose_xy(self.direction, distance)
 
 
 @SingletonDecorator
 class MouseController:
 
-    """Centralizes sending mouse events in a organized manner."""
+    """Centralizes sending mouse events in a organized manner.
+
+    Motions are set per source, e.g. an action plugin or the remote control
+    channel, and every tick the distance travelled by all sources is
+    combined into a single motion event. The fractional part of the
+    distance is carried over to the next tick, hence slow motions move the
+    mouse at the correct average speed. Ticks are timed on the monotonic
+    clock and the thread sleeps while no source is moving.
+    """
+
+    # Source used when no source is specified
+    default_source = "default"
 
     def __init__(self):
         """Creates a new instance."""
-        self._motion_type = MotionType.Fixed
-        self._delta_generator = FixedMouseMotion(0, 0)
+        self._sources = {}
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._remainder = [0.0, 0.0]
+        self.tick_rate = 250
+
+        # Number of ticks run and motion events sent
+        self.ticks = 0
+        self.sent = 0
 
         self._is_running = False
         self._thread = threading.Thread(target=self._control_loop)
 
-    def set_absolute_motion(self, dx=None, dy=None):
+    def set_absolute_motion(self, dx=None, dy=None, source=None):
         """Configures a motion using absolute velocities.
 
         If dx / dy are set to None their values will not be updated.
 
         :param dx velocity along the x axis in pixels per second
         :param dy velocity along the y axis in pixels per second
+        :param source name of the source of the motion
         """
-        if self._motion_type == MotionType.Fixed:
-            if dx is not None:
-                self._delta_generator.set_dx(dx)
-            if dy is not None:
-                self._delta_generator.set_dy(dy)
-        else:
-            self._motion_type = MotionType.Fixed
-            self._delta_generator = FixedMouseMotion(
-                dx if dx is not None else 0,
-                dy if dy is not None else 0
-            )
+        source = source or self.default_source
+        with self._lock:
+            motion = self._sources.get(source)
+            if isinstance(motion, FixedMouseMotion):
+                if dx is not None:
+                    motion.set_dx(dx)
+                if dy is not None:
+                    motion.set_dy(dy)
+            else:
+                self._sources[source] = FixedMouseMotion(
+                    dx if dx is not None else 0,
+                    dy if dy is not None else 0
+                )
+        self._wake_event.set()
 
     def set_accelerated_motion(
             self,
             direction,
             min_speed,
             max_speed,
-            time_to_max_speed
+            time_to_max_speed,
+            source=None
     ):
         """Configures a motion using acceleration.
 
@@ -273,39 +285,105 @@ class MouseController:
         :param min_speed minimum speed in pixels per second
         :param max_speed maximum speed in pixels per second
         :param time_to_max_speed time to reach max_speed
+        :param source name of the source of the motion
         """
-        if self._motion_type == MotionType.Accelerated:
-            self._delta_generator.set_direction(direction)
-        else:
-            self._delta_generator = AcceleratedMouseMotion(
-                direction,
-                min_speed,
-                max_speed,
-                time_to_max_speed
-            )
-            self._motion_type = MotionType.Accelerated
-
-    def start(self):
-        """Starts the thread that will send motions when required."""
+        source = source or self.default_source
+        with self._lock:
+            motion = self._sources.get(source)
+            if isinstance(motion, AcceleratedMouseMotion):
+                motion.set_direction(direction)
+            else:
+                self._sources[source] = AcceleratedMouseMotion(
+                    direction,
+                    min_speed,
+                    max_speed,
+                    time_to_max_speed
+                )
+        self._wake_event.set()
+
+    def start(self, tick_rate=None):
+        """Starts the thread that will send motions when required.
+
+        :param tick_rate number of motion updates per second
+        """
+        if tick_rate is not None and tick_rate > 0:
+            self.tick_rate = tick_rate
         if not self._is_running:
-            self._thread = threading.Thread(target=self._control_loop)
+            self._is_running = True
+            self._thread = threading.Thread(
+                target=self._control_loop,
+                name="mouse_controller",
+                daemon=True
+            )
             self._thread.start()
 
     def stop(self):
-        """Stops the thread that sends motion events."""
+        """Stops the thread that sends motion events and all motions."""
+        self._is_running = False
+        self._wake_event.set()
         if self._thread.is_alive():
-            self._is_running = False
             self._thread.join()
+        with self._lock:
+            self._sources = {}
+            self._remainder = [0.0, 0.0]
+
+    def _is_idle(self):
+        """Returns whether or not all sources are at rest.
+
+        :return True if no source moves the mouse
+        """
+        with self._lock:
+            return all(motion.is_idle for motion in self._sources.values())
+
+    def _tick(self, dt):
+        """Sends the motion of all sources during the elapsed time.
+
+        :param dt time in seconds since the previous tick
+        """
+        with self._lock:
+            for motion in self._sources.values():
+                x, y = motion.advance(dt)
+                self._remainder[0] += x
+                self._remainder[1] += y
+            # Send whole pixels and keep the fraction for the next tick,
+            # ignoring rounding errors of the accumulated fractions
+            dx = int(round(self._remainder[0], 9))
+            dy = int(round(self._remainder[1], 9))
+            self._remainder[0] -= dx
+            self._remainder[1] -= dy
+
+        self.ticks += 1
+        if dx != 0 or dy != 0:
+            self.sent += 1
+            _send_input(_mouse_input(MOUSEEVENTF_MOVE, dx, dy))
 
     def _control_loop(self):
         """Loop responsible for creating and sending mouse motion events."""
-        self._is_running = True
-
+        last_time = time.monotonic()
+        next_tick = last_time
         while self._is_running:
-            dx, dy = self._delta_generator()
-            if dx != 0 or dy != 0:
-                mouse_relative_motion(int(dx), int(dy))
-            time.sleep(0.01)
+            if self._is_idle():
+                self._wake_event.clear()
+                if self._is_idle() and self._is_running:
+                    with self._lock:
+                        self._remainder = [0.0, 0.0]
+                    self._wake_event.wait()
+                last_time = time.monotonic()
+                next_tick = last_time
+                continue
+
+            # Wait for the next tick, resynchronizing when falling behind
+            interval = 1.0 / self.tick_rate
+            next_tick += interval
+            now = time.monotonic()
+            if next_tick > now:
+                time.sleep(next_tick - now)
+            elif now - next_tick > interval:
+                next_tick = now
+
+            now = time.monotonic()
+            self._tick(now - last_time)
+            last_time = now
 
 
 class _MOUSEINPUT(ctypes.Structure):
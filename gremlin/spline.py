@@ -16,7 +16,10 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import array
 import collections
+
+import gremlin.error
 import gremlin.util
 
 
@@ -201,3 +204,144 @@ class CubicBezierSpline:
         high = self._lookup[index][interval[1]][1]
 
         return low.y + (x - low.x) * ((high.y - low.y) / (high.x - low.x))
+
+
+class CurveTable:
+
+    """Dense lookup table approximating a curve over the range [-1, 1].
+
+    The curve is sampled at equally spaced positions once, evaluating the
+    table then only requires linear interpolation between the two closest
+    samples, independent of the complexity of the original curve.
+    """
+
+    __slots__ = ("_samples", "_scale", "_last_index")
+
+    # Number of samples used unless specified otherwise
+    default_resolution = 2049
+
+    def __init__(self, curve_fn, resolution=None):
+        """Creates a new table by sampling the given curve.
+
+        :param curve_fn the function to sample over [-1, 1]
+        :param resolution number of samples to take, defaults to
+            default_resolution
+        """
+        if resolution is None:
+            resolution = CurveTable.default_resolution
+        if resolution < 2:
+            raise gremlin.error.GremlinError(
+                f"Invalid curve table resolution {resolution}"
+            )
+
+        step = 2.0 / (resolution - 1)
+        self._samples = array.array(
+            "d",
+            [curve_fn(-1.0 + i * step) for i in range(resolution)]
+        )
+        self._scale = (resolution - 1) / 2.0
+        self._last_index = resolution - 1
+
+    @property
+    def resolution(self):
+        """Returns the number of samples of the table.
+
+        :return number of samples
+        """
+        return len(self._samples)
+
+    def __call__(self, x):
+        """Returns the interpolated curve value at the desired position.
+
+        :param x the location at which to evaluate the curve, values outside
+            of [-1, 1] are clamped
+        :return curve value at the provided position
+        """
+        position = (x + 1.0) * self._scale
+        if position <= 0.0:
+            return self._samples[0]
+        index = int(position)
+        if index >= self._last_index:
+            return self._samples[self._last_index]
+
+        low = self._samples[index]
+        return low + (self._samples[index + 1] - low) * (position - index)
+
+
+# Maximum number of curve tables kept by create_curve_table
+curve_table_cache_size = 128
+
+# Cache of curve tables keyed by their curve, deadzone and resolution
+_curve_tables = collections.OrderedDict()
+
+
+def create_spline(spline_type, control_points):
+    """Returns the spline of the given type passing through the points.
+
+    :param spline_type the type of spline, either "cubic-spline" or
+        "cubic-bezier-spline"
+    :param control_points the control points defining the spline
+    :return spline instance
+    """
+    if spline_type == "cubic-spline":
+        return CubicSpline(control_points)
+    elif spline_type == "cubic-bezier-spline":
+        return CubicBezierSpline(control_points)
+    else:
+        raise gremlin.error.GremlinError(
+            f"Invalid spline type \"{spline_type}\""
+        )
+
+
+def create_curve_table(
+        spline_type,
+        control_points,
+        deadzone=(-1.0, 0.0, 0.0, 1.0),
+        resolution=None
+):
+    """Returns a table combining a deadzone and a response curve.
+
+    Tables are cached based on the provided data, requesting the table of
+    an unchanged curve again returns the existing instance.
+
+    :param spline_type the type of spline, see create_spline, or None to
+        only apply the deadzone
+    :param control_points the control points defining the spline
+    :param deadzone the low, center low, center high, and high deadzone
+        limits
+    :param resolution number of samples of the table
+    :return CurveTable instance
+    """
+    if resolution is None:
+        resolution = CurveTable.default_resolution
+    key = (
+        spline_type,
+        tuple(tuple(point) for point in control_points),
+        tuple(deadzone),
+        resolution
+    )
+    table = _curve_tables.get(key)
+    if table is not None:
+        _curve_tables.move_to_end(key)
+        return table
+
+    # Imported here as vjoy itself depends on this module
+    from vjoy.vjoy import deadzone as deadzone_fn
+
+    limits = tuple(deadzone)
+    if spline_type is None:
+        table = CurveTable(
+            lambda x: deadzone_fn(x, *limits),
+            resolution
+        )
+    else:
+        spline = create_spline(spline_type, control_points)
+        table = CurveTable(
+            lambda x: spline(deadzone_fn(x, *limits)),
+            resolution
+        )
+
+    _curve_tables[key] = table
+    if len(_curve_tables) > curve_table_cache_size:
+        _curve_tables.popitem(last=False)
+    return table
@@ -328,6 +328,35 @@ class ActionContainerView(common.AbstractView):
         return lambda: self.model.remove_container(widget.profile_data)
 
 
+class LazyDeviceTab(QtWidgets.QWidget):
+
+    """Placeholder of a device tab whose widget is created on first use.
+
+    Creating the widget of every device tab up front builds the input item
+    rows of all devices, even though only a single tab is visible at any
+    time.
+    """
+
+    def __init__(self, widget_type, *args, parent=None):
+        """Creates a new placeholder.
+
+        :param widget_type the type of the device tab widget to create
+        :param args arguments passed to the widget, except for the mode
+        :param parent the parent of this widget
+        """
+        super().__init__(parent)
+        self.widget_type = widget_type
+        self.args = args
+
+    def create(self, current_mode):
+        """Creates the device tab widget this placeholder stands in for.
+
+        :param current_mode currently active mode
+        :return the device tab widget
+        """
+        return self.widget_type(*self.args, current_mode)
+
+
 class JoystickDeviceTabWidget(QtWidgets.QWidget):
 
     """Widget used to configure a single device."""
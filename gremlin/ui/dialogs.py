@@ -127,6 +127,46 @@ class OptionsUi(common.BaseDialogUi):
         self.verbose.clicked.connect(self._verbose)
         self.verbose.setChecked(self.config.verbose)
 
+        # Process inputs on a dedicated thread
+        self.dedicated_input_thread = QtWidgets.QCheckBox(
+            "Process inputs on a dedicated thread (applies on profile start)"
+        )
+        self.dedicated_input_thread.clicked.connect(self._dedicated_input_thread)
+        self.dedicated_input_thread.setChecked(self.config.dedicated_input_thread)
+
+        # Batched vJoy output
+        self.vjoy_batch_output = QtWidgets.QCheckBox(
+            "Send vJoy changes as one update per input event (applies on profile start)"
+        )
+        self.vjoy_batch_output.clicked.connect(self._vjoy_batch_output)
+        self.vjoy_batch_output.setChecked(self.config.vjoy_batch_output)
+
+        self.vjoy_flush_rate_layout = QtWidgets.QHBoxLayout()
+        self.vjoy_flush_rate_label = QtWidgets.QLabel(
+            "vJoy update rate (Hz, 0 updates after each input event)"
+        )
+        self.vjoy_flush_rate_value = QtWidgets.QSpinBox()
+        self.vjoy_flush_rate_value.setRange(0, 1000)
+        self.vjoy_flush_rate_value.setValue(self.config.vjoy_flush_rate)
+        self.vjoy_flush_rate_value.setEnabled(self.config.vjoy_batch_output)
+        self.vjoy_flush_rate_value.valueChanged.connect(self._vjoy_flush_rate)
+        self.vjoy_flush_rate_layout.addWidget(self.vjoy_flush_rate_label)
+        self.vjoy_flush_rate_layout.addWidget(self.vjoy_flush_rate_value)
+        self.vjoy_flush_rate_layout.addStretch()
+
+        # Mouse motion update rate
+        self.mouse_tick_rate_layout = QtWidgets.QHBoxLayout()
+        self.mouse_tick_rate_label = QtWidgets.QLabel(
+            "Mouse motion update rate (Hz, applies on profile start)"
+        )
+        self.mouse_tick_rate_value = QtWidgets.QSpinBox()
+        self.mouse_tick_rate_value.setRange(10, 1000)
+        self.mouse_tick_rate_value.setValue(self.config.mouse_tick_rate)
+        self.mouse_tick_rate_value.valueChanged.connect(self._mouse_tick_rate)
+        self.mouse_tick_rate_layout.addWidget(self.mouse_tick_rate_label)
+        self.mouse_tick_rate_layout.addWidget(self.mouse_tick_rate_value)
+        self.mouse_tick_rate_layout.addStretch()
+
         # Show message on mode change
         self.show_mode_change_message = QtWidgets.QCheckBox(
             "Show message when changing mode"
@@ -165,10 +205,25 @@ class OptionsUi(common.BaseDialogUi):
         self.remote_control_port.setValue(float(self.config.server_port))
         self.remote_control_port.valueChanged.connect(self._remote_control_server_port)
 
+        self.remote_axis_rate_label = QtWidgets.QLabel("Axis rate (Hz):")
+        self.remote_axis_rate = QtWidgets.QSpinBox()
+        self.remote_axis_rate.setRange(0, 1000)
+        self.remote_axis_rate.setValue(self.config.remote_axis_rate)
+        self.remote_axis_rate.setToolTip("Rate at which axis changes are sent to remote clients, 0 sends every change immediately")
+        self.remote_axis_rate.valueChanged.connect(self._remote_axis_rate)
+
+        self.remote_binary_protocol = QtWidgets.QCheckBox("Binary protocol")
+        self.remote_binary_protocol.setChecked(self.config.remote_binary_protocol)
+        self.remote_binary_protocol.setToolTip("Sends compact binary frames to receivers supporting them, only enable if all receivers support them")
+        self.remote_binary_protocol.clicked.connect(self._remote_binary_protocol)
+
         self.remote_control_layout.addWidget(self.enable_remote_control)
         self.remote_control_layout.addWidget(self.enable_remote_broadcast)
         self.remote_control_layout.addWidget(self.remote_control_label)
         self.remote_control_layout.addWidget(self.remote_control_port)
+        self.remote_control_layout.addWidget(self.remote_axis_rate_label)
+        self.remote_control_layout.addWidget(self.remote_axis_rate)
+        self.remote_control_layout.addWidget(self.remote_binary_protocol)
         self.remote_control_layout.addStretch()
 
 
@@ -236,6 +291,10 @@ class OptionsUi(common.BaseDialogUi):
         self.general_layout.addWidget(self.start_with_windows)
         self.general_layout.addWidget(self.persist_clipboard)
         self.general_layout.addWidget(self.verbose)
+        self.general_layout.addWidget(self.dedicated_input_thread)
+        self.general_layout.addWidget(self.vjoy_batch_output)
+        self.general_layout.addLayout(self.vjoy_flush_rate_layout)
+        self.general_layout.addLayout(self.mouse_tick_rate_layout)
         self.general_layout.addWidget(self.show_mode_change_message)
 
         self.general_layout.addLayout(self.default_action_layout)
@@ -269,6 +328,16 @@ If this option is on, the last active profile will remain active until a differe
         self.keep_last_autoload_checkbox.setChecked(self.config.keep_last_autoload)
         self.keep_last_autoload_checkbox.setEnabled(self.config.autoload_profiles)
 
+        # Profile cache option
+        self.profile_cache_checkbox = QtWidgets.QCheckBox(
+            "Keep snapshots of loaded profiles on disk"
+        )
+        self.profile_cache_checkbox.setToolTip("""Recently loaded profiles are always cached in memory to speed up switching between them.
+
+If this option is on, snapshots of the loaded profiles are also stored on disk, which speeds up the first load after a restart.""")
+        self.profile_cache_checkbox.clicked.connect(self._profile_cache_on_disk)
+        self.profile_cache_checkbox.setChecked(self.config.profile_cache_on_disk)
+
         # Executable dropdown list
         self.executable_layout = QtWidgets.QHBoxLayout()
         self.executable_label = QtWidgets.QLabel("Executable")
@@ -311,6 +380,7 @@ If this option is on, the last active profile will remain active until a differe
 
         self.profile_page_layout.addWidget(self.autoload_checkbox)
         self.profile_page_layout.addWidget(self.keep_last_autoload_checkbox)
+        self.profile_page_layout.addWidget(self.profile_cache_checkbox)
         self.profile_page_layout.addLayout(self.executable_layout)
         self.profile_page_layout.addLayout(self.profile_layout)
         self.profile_page_layout.addStretch()
@@ -434,6 +504,15 @@ If this option is on, the last active profile will remain active until a differe
         self.config.keep_last_autoload = clicked
         self.config.save()
 
+    def _profile_cache_on_disk(self, clicked):
+        """Stores whether profile snapshots are kept on disk.
+
+        :param clicked whether or not the checkbox is ticked
+        """
+        self.config.profile_cache_on_disk = clicked
+        if not clicked:
+            gremlin.profile.ProfileCache().remove_snapshots()
+
     def _activate_on_launch(self, clicked):
         """Stores activation of profile on launch preference.
 
@@ -471,6 +550,23 @@ If this option is on, the last active profile will remain active until a differe
         self.config.save
 
 
+    def _dedicated_input_thread(self, clicked):
+        ''' stores the input processing thread setting '''
+        self.config.dedicated_input_thread = clicked
+
+    def _vjoy_batch_output(self, clicked):
+        ''' stores the batched vJoy output setting '''
+        self.config.vjoy_batch_output = clicked
+        self.vjoy_flush_rate_value.setEnabled(clicked)
+
+    def _vjoy_flush_rate(self, value):
+        ''' stores the batched vJoy update rate '''
+        self.config.vjoy_flush_rate = value
+
+    def _mouse_tick_rate(self, value):
+        ''' stores the mouse motion update rate '''
+        self.config.mouse_tick_rate = value
+
     def _start_windows(self, clicked):
         """Set registry entry to launch Joystick Gremlin on login.
 
@@ -673,6 +769,14 @@ If this option is on, the last active profile will remain active until a differe
         self.config.server_port = value
         self.config.save()
 
+    def _remote_axis_rate(self, value):
+        ''' updates the rate of remote axis updates '''
+        self.config.remote_axis_rate = value
+
+    def _remote_binary_protocol(self, clicked):
+        ''' enables or disables binary frames for remote receivers '''
+        self.config.remote_binary_protocol = clicked
+
     def _macro_axis_polling_rate(self, value):
         """Updates the config with the newly set polling rate.
 
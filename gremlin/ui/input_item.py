@@ -101,6 +101,25 @@ class InputItemListModel(common.AbstractModel):
             len(input_items.config[InputType.JoystickHat]) + \
             len(input_items.config[InputType.Keyboard])
 
+    def signature(self):
+        """Returns the inputs making up the rows of the model.
+
+        Views use this to tell whether rows created previously for the
+        current mode still match the model.
+
+        :return tuple identifying the inputs of every row
+        """
+        input_items = self._device_data.modes[self._mode]
+        return tuple(
+            tuple(sorted(input_items.config[input_type].keys()))
+            for input_type in [
+                InputType.JoystickAxis,
+                InputType.JoystickButton,
+                InputType.JoystickHat,
+                InputType.Keyboard
+            ]
+        )
+
     def data(self, index):
         """Returns the data stored at the provided index.
 
@@ -185,6 +204,41 @@ class InputItemListModel(common.AbstractModel):
             return offset_map[event.event_type] + event.identifier - 1
 
 
+class InputItemListPage:
+
+    """Input item rows of a single mode shown by an InputItemListView.
+
+    Rows are created in batches as the user scrolls towards the end of the
+    page rather than all at once, which keeps devices with hundreds of
+    buttons responsive.
+    """
+
+    def __init__(self, mode, signature, indices):
+        """Creates a new page.
+
+        :param mode the mode whose input items the page shows
+        :param signature the model signature the page was created from
+        :param indices the model indices of the rows shown on the page
+        """
+        self.mode = mode
+        self.signature = signature
+        self.indices = indices
+        self.built = 0
+
+        self.widget = QtWidgets.QWidget()
+        self.layout = QtWidgets.QVBoxLayout()
+        self.widget.setLayout(self.layout)
+        self.layout.addStretch()
+
+    @property
+    def complete(self):
+        """Returns whether all rows of the page have been created.
+
+        :return True if every row exists, False otherwise
+        """
+        return self.built >= len(self.indices)
+
+
 class InputItemListView(common.AbstractView):
 
     """View displaying the contents of an InputItemListModel."""
@@ -197,6 +251,11 @@ class InputItemListView(common.AbstractView):
         InputType.Keyboard: ""
     }
 
+    # Pages with at least this many rows create their rows incrementally
+    lazy_row_threshold = 128
+    # Number of rows created at a time by incrementally created pages
+    row_batch_size = 48
+
     def __init__(self, parent=None, name = "Not set"):
         """Creates a new view instance.
 
@@ -214,18 +273,22 @@ class InputItemListView(common.AbstractView):
         self.current_index = None
         #syslog.debug("listview init")
 
+        # Pages of the modes shown so far, the current one is displayed
+        self._pages = {}
+        self._page = None
+
         # Create required UI items
         self.main_layout = QtWidgets.QVBoxLayout(self)
         self.scroll_area = QtWidgets.QScrollArea()
-        self.scroll_widget = QtWidgets.QWidget()
-        self.scroll_layout = QtWidgets.QVBoxLayout()
-
-        # Configure the widget holding the layout with all the buttons
-        self.scroll_widget.setLayout(self.scroll_layout)
 
         # Configure the scroll area
         self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setWidget(self.scroll_widget)
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._scrolled)
+        # Rows that don't fill the visible area leave nothing to scroll
+        scroll_bar.rangeChanged.connect(
+            lambda minimum, maximum: self._scrolled(scroll_bar.value())
+        )
 
         # Add the scroll area to the main layout
         self.main_layout.addWidget(self.scroll_area)
@@ -243,6 +306,14 @@ class InputItemListView(common.AbstractView):
         #syslog.debug(f"listview index {self.name} set to {value}")
         self._current_index = value
 
+    @property
+    def scroll_layout(self):
+        """Returns the layout holding the rows of the displayed mode.
+
+        :return layout of the displayed page
+        """
+        return self._page.layout if self._page is not None else None
+
 
     def _profile_device_mapping_changed(self, event):
         if not event.device_guid:
@@ -265,23 +336,87 @@ class InputItemListView(common.AbstractView):
         :param types list of input types to display
         """
         self.shown_input_types = types
+        self.invalidate()
         self.redraw()
 
+    def _model_changed(self):
+        """Discards the pages created from the previous model."""
+        self.invalidate()
+
+    def invalidate(self):
+        """Discards the pages of all modes that are not displayed.
+
+        The displayed page is recreated by the next redraw.
+        """
+        for page in self._pages.values():
+            if page is not self._page:
+                page.widget.deleteLater()
+        self._pages = {}
+
     def redraw(self):
-        """Redraws the entire model."""
+        """Redraws the entire model.
+
+        Pages of previously shown modes are reused as long as the model
+        still contains the same inputs, otherwise they are recreated.
+        """
         verbose = gremlin.config.Configuration().verbose
         if verbose:
             logging.getLogger("system").info(f"device redraw begin") 
-        common.clear_layout(self.scroll_layout)
 
         if self.model is None:
+            self._show_page(None)
             return
 
-        for index in range(self.model.rows()):
-            data = self.model.data(index)
-            if data.input_type not in self.shown_input_types:
-                continue
+        mode = self.model.mode
+        signature = self.model.signature()
+        page = self._pages.get(mode)
+        if page is None or page.signature != signature:
+            indices = [
+                index for index in range(self.model.rows())
+                if self.model.data(index).input_type in self.shown_input_types
+            ]
+            page = InputItemListPage(mode, signature, indices)
+            if len(indices) < self.lazy_row_threshold:
+                self._build_rows(page, len(indices))
+            else:
+                self._build_rows(page, self.row_batch_size)
+        self._show_page(page)
+
+        if verbose:
+            logging.getLogger("system").info(f"device redraw end") 
+
+    def _show_page(self, page):
+        """Displays the given page, keeping the previous one for reuse.
 
+        :param page the page to display
+        """
+        if page is self._page:
+            return
+
+        previous = self._page
+        if previous is not None:
+            self.scroll_area.takeWidget()
+            if self._pages.get(previous.mode) is previous:
+                previous.widget.setParent(self)
+                previous.widget.hide()
+            else:
+                previous.widget.deleteLater()
+
+        self._page = page
+        if page is not None:
+            self._pages[page.mode] = page
+            self.scroll_area.setWidget(page.widget)
+            page.widget.show()
+            self._highlight(self.current_index)
+
+    def _build_rows(self, page, count):
+        """Creates the next rows of a page.
+
+        :param page the page to add rows to
+        :param count the number of rows to create
+        """
+        for index in page.indices[page.built:page.built + count]:
+            data = self.model.data(index)
             identifier = InputIdentifier(
                 data.input_type,
                 data.input_id,
@@ -291,18 +426,41 @@ class InputItemListView(common.AbstractView):
             widget.create_action_icons(data)
             widget.update_description(data.description)
             widget.selected.connect(self._create_selection_callback(index))
-            self.scroll_layout.addWidget(widget)
-        self.scroll_layout.addStretch()
+            # Rows go before the trailing stretch
+            page.layout.insertWidget(page.built, widget)
+            page.built += 1
 
-        if verbose:
-            logging.getLogger("system").info(f"device redraw end") 
+    def _ensure_row(self, index):
+        """Creates all rows of the displayed page up to the given position.
+
+        :param index the position of the row that has to exist
+        """
+        page = self._page
+        if page is not None and index is not None and index >= page.built:
+            self._build_rows(page, index + 1 - page.built)
+
+    def _scrolled(self, value):
+        """Creates more rows when the end of the displayed page is reached.
+
+        :param value the position of the scroll bar
+        """
+        page = self._page
+        if page is None or page.complete:
+            return
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        if value >= scroll_bar.maximum() - scroll_bar.pageStep():
+            self._build_rows(page, self.row_batch_size)
 
     def redraw_index(self, index):
         """Redraws the view entry at the given index.
 
         :param index the index of the entry to redraw
         """
-        if self.model is None:
+        if self.model is None or self._page is None:
+            return
+
+        # Rows not created yet show the current data once they are
+        if index is None or index >= self._page.built:
             return
 
         data = self.model.data(index)
@@ -342,7 +500,28 @@ class InputItemListView(common.AbstractView):
         
         return self.model.data(index)
 
+    def _highlight(self, index):
+        """Highlights the row at the given index and no other.
 
+        :param index the index of the row to highlight
+        :return the highlighted row widget, None if there is none
+        """
+        if self._page is None:
+            return None
+
+        selected = None
+        for i in range(self.scroll_layout.count()):
+            item = self.scroll_layout.itemAt(i)
+            if item.widget():
+                widget = item.widget()
+                widget.setAutoFillBackground(False)
+                if i == index:
+                    palette = QtGui.QPalette()
+                    palette.setColor(QtGui.QPalette.ColorRole.Window, QtGui.QColorConstants.DarkGray)
+                    widget.setAutoFillBackground(True)
+                    widget.setPalette(palette)
+                    selected = widget
+        return selected
 
     def select_item(self, index, emit_signal=True):
         """Handles selecting a specific item.
@@ -365,35 +544,24 @@ class InputItemListView(common.AbstractView):
             self.current_index = index
 
             # Go through all entries in the layout, deselecting those that are
-            # actual widgets and selecting the previously selected one
-            valid_index = False
-            # height = 0
-            for i in range(self.scroll_layout.count()):
-                item = self.scroll_layout.itemAt(i)
-                if item.widget():
-                    widget = item.widget()
-                    # height += widget.height
-                    widget.setAutoFillBackground(False)
-                    if i == index:
-                        palette = QtGui.QPalette()
-                        palette.setColor(QtGui.QPalette.ColorRole.Window, QtGui.QColorConstants.DarkGray)
-                        widget.setAutoFillBackground(True)
-                        widget.setPalette(palette)
-                        valid_index = True
-
-
-                        # self.scroll_area.ensureVisible(x,height)
-                        QtCore.QTimer.singleShot(0, partial(self.scroll_area.ensureWidgetVisible, widget))
-
-                        # signal the hardware input device changed
-                        el = gremlin.event_handler.EventListener()
-                        event = gremlin.event_handler.DeviceChangeEvent()
-                        data = self.model.data(index)
-                        event.device_guid = self.model._device_data.device_guid
-                        event.device_name = self.model._device_data.name
-                        event.device_input_type = data.input_type if data else None
-                        event.device_input_id = data.input_id if data else None
-                        el.profile_device_changed.emit(event)
+            # actual widgets and selecting the previously selected one, which
+            # may not have been created yet
+            self._ensure_row(index)
+            widget = self._highlight(index)
+            valid_index = widget is not None
+            if valid_index:
+                # self.scroll_area.ensureVisible(x,height)
+                QtCore.QTimer.singleShot(0, partial(self.scroll_area.ensureWidgetVisible, widget))
+
+                # signal the hardware input device changed
+                el = gremlin.event_handler.EventListener()
+                event = gremlin.event_handler.DeviceChangeEvent()
+                data = self.model.data(index)
+                event.device_guid = self.model._device_data.device_guid
+                event.device_name = self.model._device_data.name
+                event.device_input_type = data.input_type if data else None
+                event.device_input_id = data.input_id if data else None
+                el.profile_device_changed.emit(event)
 
             if emit_signal and valid_index:
                 self.item_selected.emit(index)
@@ -15,6 +15,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import array
+import collections
 import ctypes
 import importlib
 import logging
@@ -131,6 +133,57 @@ def create_calibration_function(minimum, center, maximum):
         return lambda x: axis_calibration(x, minimum, center, maximum)
 
 
+# Range of raw axis values reported by DILL
+raw_axis_minimum = -32768
+raw_axis_maximum = 32767
+
+# Maximum number of calibration tables kept by create_calibration_table,
+# each table holds 65536 doubles, i.e. 512 KiB
+calibration_table_cache_size = 32
+
+# Calibration tables shared between axes with identical calibration data
+_calibration_tables = collections.OrderedDict()
+
+
+def create_calibration_table(minimum, center, maximum):
+    """Returns a lookup table holding the calibrated value of every raw value.
+
+    The entry for a raw value v is located at index v - raw_axis_minimum.
+    The most recently used tables are cached and shared between axes using
+    the same calibration data and therefore must not be modified.
+
+    :param minimum the minimal value ever reported
+    :param center the value in the neutral position
+    :param maximum the maximal value ever reported
+    :return array containing the calibrated value for each raw value
+    """
+    key = (minimum, center, maximum)
+    table = _calibration_tables.get(key)
+    if table is not None:
+        _calibration_tables.move_to_end(key)
+        return table
+
+    calibrate = create_calibration_function(minimum, center, maximum)
+    table = array.array("d", map(
+        calibrate,
+        range(raw_axis_minimum, raw_axis_maximum + 1)
+    ))
+    _calibration_tables[key] = table
+    if len(_calibration_tables) > calibration_table_cache_size:
+        _calibration_tables.popitem(last=False)
+    return table
+
+
+def apply_calibration_table(table, values):
+    """Returns the calibrated values of a sequence of raw axis values.
+
+    :param table the calibration table created by create_calibration_table
+    :param values the raw axis values to convert
+    :return list of calibrated values
+    """
+    return [table[value - raw_axis_minimum] for value in values]
+
+
 def truncate(text, left_size, right_size):
     """Returns a truncated string matching the specified character counts.
 
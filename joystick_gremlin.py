@@ -21,7 +21,6 @@ Main UI of JoystickGremlin.
 
 import argparse
 import ctypes
-import hashlib
 import logging
 import os
 import sys
@@ -127,6 +126,7 @@ class GremlinUi(QtWidgets.QMainWindow):
 
         self.mode_selector = gremlin.ui.common.ModeWidget()
         self.mode_selector.mode_changed.connect(self._mode_changed_cb)
+        self.ui.devices.currentChanged.connect(self._tab_changed_cb)
 
         self.ui.toolBar.addWidget(self.mode_selector)
 
@@ -549,6 +549,10 @@ class GremlinUi(QtWidgets.QMainWindow):
         updated, otherwise the user is prompted for a new file.
         """
         if self._profile_fname:
+            # Nothing to write if the file still holds the current content
+            if os.path.isfile(self._profile_fname) and \
+                    not self._profile.has_changed():
+                return
             self._profile.to_xml(self._profile_fname)
         else:
             self.save_profile_as()
@@ -666,7 +670,12 @@ class GremlinUi(QtWidgets.QMainWindow):
     def _create_tabs(self, activate_tab=None):
         """Creates the tabs of the configuration dialog representing
         the different connected devices.
+
+        Device tabs start out as placeholders and only create their widget
+        once they are shown or an input of their device is selected.
         """
+        # Tabs are only created once all of them exist
+        blocker = QtCore.QSignalBlocker(self.ui.devices)
         self.ui.devices.clear()
         self.tabs = {}
 
@@ -682,10 +691,10 @@ class GremlinUi(QtWidgets.QMainWindow):
                 device.name
             )
 
-            widget = gremlin.ui.device_tab.JoystickDeviceTabWidget(
+            widget = gremlin.ui.device_tab.LazyDeviceTab(
+                gremlin.ui.device_tab.JoystickDeviceTabWidget,
                 device,
-                device_profile,
-                self._current_mode
+                device_profile
             )
             self.tabs[device.device_guid] = widget
             tab_label = device.name.strip()
@@ -703,10 +712,10 @@ class GremlinUi(QtWidgets.QMainWindow):
                 device.name
             )
 
-            widget = gremlin.ui.device_tab.JoystickDeviceTabWidget(
+            widget = gremlin.ui.device_tab.LazyDeviceTab(
+                gremlin.ui.device_tab.JoystickDeviceTabWidget,
                 device,
-                device_profile,
-                self._current_mode
+                device_profile
             )
             self.tabs[device.device_guid] = widget
             tab_label = device.name.strip()
@@ -719,9 +728,9 @@ class GremlinUi(QtWidgets.QMainWindow):
             gremlin.profile.DeviceType.Keyboard,
             "keyboard"
         )
-        widget = gremlin.ui.device_tab.KeyboardDeviceTabWidget(
-            device_profile,
-            self._current_mode
+        widget = gremlin.ui.device_tab.LazyDeviceTab(
+            gremlin.ui.device_tab.KeyboardDeviceTabWidget,
+            device_profile
         )
         self.tabs[dinput.GUID_Keyboard] = widget
         self.ui.devices.addTab(widget, "Keyboard")
@@ -738,10 +747,10 @@ class GremlinUi(QtWidgets.QMainWindow):
                 device.name
             )
 
-            widget = gremlin.ui.device_tab.JoystickDeviceTabWidget(
+            widget = gremlin.ui.device_tab.LazyDeviceTab(
+                gremlin.ui.device_tab.JoystickDeviceTabWidget,
                 device,
-                device_profile,
-                self._current_mode
+                device_profile
             )
             self.tabs[device.device_guid] = widget
             self.ui.devices.addTab(widget,f"{device.name} #{device.vjoy_id:d}")
@@ -763,10 +772,47 @@ class GremlinUi(QtWidgets.QMainWindow):
         if activate_tab is not None:
             for i in range(self.ui.devices.count()):
                 if self.ui.devices.tabText(i) == activate_tab:
-                    with QtCore.QSignalBlocker(self.ui.devices):
-                        self.ui.devices.setCurrentIndex(i)
+                    self.ui.devices.setCurrentIndex(i)
+        blocker.unblock()
 
-                      
+        # Only the visible tab needs its widget right away
+        self._tab_changed_cb(self.ui.devices.currentIndex())
+
+    def _device_tab(self, device_guid):
+        """Returns the tab widget of a device, creating it if needed.
+
+        :param device_guid the GUID of the device whose tab to return
+        :return the device's tab widget
+        """
+        widget = self.tabs[device_guid]
+        if not isinstance(widget, gremlin.ui.device_tab.LazyDeviceTab):
+            return widget
+
+        tab = widget.create(self._current_mode)
+        index = self.ui.devices.indexOf(widget)
+        is_current = self.ui.devices.currentIndex() == index
+        with QtCore.QSignalBlocker(self.ui.devices):
+            tab_label = self.ui.devices.tabText(index)
+            self.ui.devices.removeTab(index)
+            self.ui.devices.insertTab(index, tab, tab_label)
+            if is_current:
+                self.ui.devices.setCurrentIndex(index)
+        widget.deleteLater()
+        self.tabs[device_guid] = tab
+        return tab
+
+    def _tab_changed_cb(self, index):
+        """Creates the widget of a device tab when it is first shown.
+
+        :param index the index of the tab being shown
+        """
+        widget = self.ui.devices.widget(index)
+        if not isinstance(widget, gremlin.ui.device_tab.LazyDeviceTab):
+            return
+        for device_guid, tab in self.tabs.items():
+            if tab is widget:
+                self._device_tab(device_guid)
+                return
 
     def _setup_icons(self):
         """Sets the icons of all QAction items."""
@@ -921,7 +967,10 @@ class GremlinUi(QtWidgets.QMainWindow):
                         
             # get the widget for the tab corresponding to the device
             widget = self.tabs[event.device_guid] 
-            if not isinstance(widget, gremlin.ui.device_tab.JoystickDeviceTabWidget):
+            tab_type = widget.widget_type \
+                if isinstance(widget, gremlin.ui.device_tab.LazyDeviceTab) \
+                else type(widget)
+            if not issubclass(tab_type, gremlin.ui.device_tab.JoystickDeviceTabWidget):
                 if verbose:
                     logging.getLogger("system").error(f"Event: unable to find tab widget for: {device_name}/{event.device_guid}")
                 return
@@ -961,6 +1010,7 @@ class GremlinUi(QtWidgets.QMainWindow):
 
             # If we want to act on the given event figure out which button
             # needs to be pressed and press ii
+            widget = self._device_tab(event.device_guid)
             widget.input_item_list_view.select_item(event)
             #syslog.debug(f"selecting input") # {event.input_type} {event.action_id}")
             index = widget.input_item_list_view.current_index
@@ -999,8 +1049,10 @@ class GremlinUi(QtWidgets.QMainWindow):
         if self._current_mode != new_mode:
             with QtCore.QSignalBlocker(self.mode_selector):
                 self._current_mode = new_mode
+                # Tabs not created yet start out in the current mode
                 for tab in self.tabs.values():
-                    tab.set_mode(new_mode)
+                    if not isinstance(tab, gremlin.ui.device_tab.LazyDeviceTab):
+                        tab.set_mode(new_mode)
 
     def _process_changed_cb(self, path):
         """Handles changes in the active process.
@@ -1308,17 +1360,7 @@ class GremlinUi(QtWidgets.QMainWindow):
         """
         if self._profile_fname is None:
             return True
-        else:
-            tmp_path = os.path.join(os.getenv("temp"), "gremlin.xml")
-            self._profile.to_xml(tmp_path)
-            current_sha = hashlib.sha256(
-                open(tmp_path).read().encode("utf-8")
-            ).hexdigest()
-            profile_sha = hashlib.sha256(
-                open(self._profile_fname).read().encode("utf-8")
-            ).hexdigest()
-
-            return current_sha != profile_sha
+        return self._profile.has_changed()
 
     def _last_active_mode(self):
         """Returns the name of the mode last active.
@@ -1713,6 +1755,9 @@ if __name__ == "__main__":
     # Relinquish control over all VJoy devices used
     gremlin.joystick_handling.VJoyProxy.reset()
 
+    # Write configuration changes still pending
+    gremlin.config.Configuration().flush()
+
     hg.remove_process(os.getpid())
 
     syslog.info("Terminating Gremlin")
@@ -1,16 +1,36 @@
+import os
 import sys
 sys.path.append(".")
 
-import pytest
+# Resources are located relative to the started script, which is pytest
+# rather than Gremlin itself
+sys.argv[0] = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "joystick_gremlin.py"
+)
 
-import dinput
+import pytest
 
+# Imported ahead of dinput, which itself depends on gremlin
 import gremlin.event_handler
 import gremlin.joystick_handling
 
+import dinput
+import dinput.simulated
+import vjoy.simulated
+
 
 @pytest.fixture(scope="session", autouse=True)
 def joystick_init():
+    # Without the DirectInput and vJoy libraries available, or when
+    # requested, run against simulated devices
+    if sys.platform != "win32" or os.environ.get("GREMLIN_SIMULATED_INPUT"):
+        vjoy.simulated.SimulatedDriver().install()
+        dinput.DILL.set_backend(dinput.simulated.SimulatedBackend([
+            dinput.simulated.SimulatedDevice("Simulated Joystick"),
+            dinput.simulated.SimulatedDevice(
+                "Simulated Throttle", axis_count=4, button_count=64
+            )
+        ]))
     dinput.DILL.init()
     gremlin.joystick_handling.joystick_devices_initialization()
 
@@ -18,8 +18,10 @@
 import sys
 sys.path.append(".")
 
+import json
 import os
 import tempfile
+import time
 import pytest
 
 import gremlin.config
@@ -108,4 +110,34 @@ def test_exceptions():
         c.set("test", "some", "other", "test")
 
     with pytest.raises(gremlin.error.GremlinError):
-        c.value("does", "not", "exist")
\ No newline at end of file
+        c.value("does", "not", "exist")
+
+
+def test_debounced_save(tmp_path, monkeypatch):
+    c = gremlin.config.Configuration()
+    c.flush()
+    fname = tmp_path / "config.json"
+    monkeypatch.setattr(c, "get_config", lambda: str(fname))
+    # Start from an empty configuration independent of the other tests
+    monkeypatch.setattr(
+        c, "_data", {"calibration": {}, "profiles": {}, "last_mode": {}}
+    )
+    monkeypatch.setattr(c, "save_delay", 0.05)
+
+    for i in range(20):
+        c.set_last_mode("profile.xml", f"mode {i}")
+    assert c.is_dirty
+    assert not fname.exists()
+
+    end = time.monotonic() + 2.0
+    while c.is_dirty and time.monotonic() < end:
+        time.sleep(0.01)
+    with open(fname) as hdl:
+        assert json.load(hdl)["last_mode"]["profile.xml"] == "mode 19"
+    assert not os.path.exists(f"{fname}.tmp")
+
+    c.set_last_mode("profile.xml", "final")
+    c.flush()
+    assert not c.is_dirty
+    with open(fname) as hdl:
+        assert json.load(hdl)["last_mode"]["profile.xml"] == "final"
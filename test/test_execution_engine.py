@@ -0,0 +1,94 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import gremlin.common
+import gremlin.event_handler
+import gremlin.execution_engine
+
+import dinput
+
+
+def _axis(axis_id, value):
+    return gremlin.event_handler.Event(
+        event_type=gremlin.common.InputType.JoystickAxis,
+        identifier=axis_id,
+        device_guid=dinput.GUID_Virtual,
+        value=value
+    )
+
+
+def _button(button_id, is_pressed):
+    return gremlin.event_handler.Event(
+        event_type=gremlin.common.InputType.JoystickButton,
+        identifier=button_id,
+        device_guid=dinput.GUID_Virtual,
+        is_pressed=is_pressed
+    )
+
+
+def _drain(queue):
+    events = []
+    while len(queue) > 0:
+        events.append(queue.get())
+    return events
+
+
+def test_axis_latest_value_wins():
+    queue = gremlin.execution_engine.CoalescingEventQueue()
+    for i in range(10):
+        queue.put(_axis(1, i / 10.0))
+    queue.put(_axis(2, 0.5))
+
+    events = _drain(queue)
+    assert [e.value for e in events] == [0.9, 0.5]
+
+    stats = queue.statistics()
+    assert stats["received"] == 11
+    assert stats["merged"] == 9
+    assert stats["max_depth"] == 2
+
+
+def test_buttons_preserve_order():
+    queue = gremlin.execution_engine.CoalescingEventQueue()
+    queue.put(_axis(1, 0.1))
+    queue.put(_button(1, True))
+    queue.put(_axis(1, 0.2))
+    queue.put(_axis(1, 0.3))
+    queue.put(_button(1, False))
+    queue.put(_button(2, True))
+
+    events = _drain(queue)
+    assert [(e.event_type, e.value, e.is_pressed) for e in events] == [
+        (gremlin.common.InputType.JoystickAxis, 0.1, None),
+        (gremlin.common.InputType.JoystickButton, None, True),
+        (gremlin.common.InputType.JoystickAxis, 0.3, None),
+        (gremlin.common.InputType.JoystickButton, None, False),
+        (gremlin.common.InputType.JoystickButton, None, True),
+    ]
+    assert queue.statistics()["merged"] == 1
+
+
+def test_axis_after_processing_is_queued_again():
+    queue = gremlin.execution_engine.CoalescingEventQueue()
+    queue.put(_axis(1, 0.1))
+    assert queue.get().value == 0.1
+    queue.put(_axis(1, 0.2))
+    assert len(queue) == 1
+    assert queue.get().value == 0.2
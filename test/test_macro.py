@@ -0,0 +1,171 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import threading
+import time
+
+import pytest
+
+import gremlin.macro
+import gremlin.scheduler
+
+
+class RecordAction(gremlin.macro.AbstractAction):
+
+    """Macro action recording its execution."""
+
+    def __init__(self, calls, name):
+        self.calls = calls
+        self.name = name
+
+    def __call__(self, is_local=None, is_remote=None, force_remote=None):
+        self.calls.append((self.name, time.monotonic(), threading.get_ident()))
+
+
+def _macro(calls, names, exclusive=False, repeat=None):
+    macro = gremlin.macro.Macro()
+    for name in names:
+        macro.add_action(RecordAction(calls, name))
+    macro.exclusive = exclusive
+    macro.repeat = repeat
+    return macro
+
+
+def _wait_idle(manager, timeout=5.0):
+    end = time.monotonic() + timeout
+    while (manager._active or manager._queue) and time.monotonic() < end:
+        time.sleep(0.01)
+    assert not manager._active and not manager._queue
+
+
+@pytest.fixture
+def manager():
+    manager = gremlin.macro.MacroManager()
+    default_delay = manager.default_delay
+    manager.default_delay = 0.02
+    manager.start()
+    yield manager
+    manager.stop()
+    manager.default_delay = default_delay
+
+
+def test_pauses_do_not_block_workers(manager):
+    calls = []
+    macros = [
+        _macro(calls, [f"{i}a", f"{i}b"])
+        for i in range(manager.worker_count * 2)
+    ]
+    start = time.monotonic()
+    for macro in macros:
+        manager.queue_macro(macro)
+    _wait_idle(manager)
+
+    # All macros run concurrently despite there being fewer workers
+    assert len(calls) == 4 * manager.worker_count
+    assert time.monotonic() - start < 0.2
+    assert len({ident for _, _, ident in calls}) <= manager.worker_count
+    for i in range(len(macros)):
+        first = next(t for name, t, _ in calls if name == f"{i}a")
+        second = next(t for name, t, _ in calls if name == f"{i}b")
+        assert second - first >= 0.015
+    assert manager.statistics(macros[0].id).runs == 1
+
+
+def test_runs_of_a_macro_are_sequential(manager):
+    calls = []
+    macro = _macro(calls, ["a", "b"])
+    for _ in range(3):
+        manager.queue_macro(macro)
+    _wait_idle(manager)
+
+    assert [name for name, _, _ in calls] == ["a", "b"] * 3
+    assert manager.statistics(macro.id).runs == 3
+    assert manager.statistics(macro.id).latency_max >= 0.02
+
+
+def test_exclusive_macro_runs_alone(manager):
+    calls = []
+    first = _macro(calls, ["first1", "first2"])
+    exclusive = _macro(calls, ["exclusive1", "exclusive2"], exclusive=True)
+    last = _macro(calls, ["last"])
+    manager.queue_macro(first)
+    manager.queue_macro(exclusive)
+    manager.queue_macro(last)
+    _wait_idle(manager)
+
+    assert [name for name, _, _ in calls] == \
+        ["first1", "first2", "exclusive1", "exclusive2", "last"]
+
+
+def test_repeat_modes(manager):
+    calls = []
+    count = _macro(calls, ["count"], repeat=gremlin.macro.CountRepeat(3, 0.01))
+    manager.queue_macro(count)
+    _wait_idle(manager)
+    assert [name for name, _, _ in calls] == ["count"] * 3
+
+    calls.clear()
+    toggle = _macro(calls, ["toggle"], repeat=gremlin.macro.ToggleRepeat(0.01))
+    manager.queue_macro(toggle)
+    time.sleep(0.1)
+    manager.queue_macro(toggle)
+    _wait_idle(manager)
+    assert len(calls) >= 3
+
+
+def test_terminate_queued_repeat(manager):
+    calls = []
+    blocker = _macro(calls, ["blocker1", "blocker2"], exclusive=True)
+    hold = _macro(calls, ["hold"], repeat=gremlin.macro.HoldRepeat(0.01))
+    toggle = _macro(calls, ["toggle"], repeat=gremlin.macro.ToggleRepeat(0.01))
+
+    # Runs waiting behind an exclusive macro are dropped by a release or a
+    # second toggle press before they ever start
+    manager.queue_macro(blocker)
+    manager.queue_macro(hold)
+    manager.queue_macro(toggle)
+    manager.terminate_macro(hold)
+    manager.queue_macro(toggle)
+    _wait_idle(manager)
+    assert [name for name, _, _ in calls] == ["blocker1", "blocker2"]
+
+    # Terminating right after queueing stops the macro after its first
+    # repetition, even if the run has not started executing yet
+    calls.clear()
+    manager.queue_macro(hold)
+    manager.terminate_macro(hold)
+    _wait_idle(manager)
+    time.sleep(0.05)
+    assert [name for name, _, _ in calls] == ["hold"]
+
+
+def test_stop_drains_running_macros(manager):
+    calls = []
+    macro = _macro(calls, ["press", "release"])
+    macro.add_action(gremlin.macro.PauseAction(0.05))
+    macro.add_action(RecordAction(calls, "after"))
+    manager.queue_macro(macro)
+    time.sleep(0.005)
+
+    # Stopping the profile mid-pause still executes the remaining actions
+    manager.stop()
+    gremlin.scheduler.TimerWheel().cancel_all()
+    time.sleep(0.2)
+    assert [name for name, _, _ in calls] == ["press", "release", "after"]
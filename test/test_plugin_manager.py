@@ -0,0 +1,169 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import json
+import os
+
+import pytest
+
+import gremlin.error
+import gremlin.plugin_manager
+from gremlin.common import InputType
+from gremlin.plugin_manager import PluginManifest
+
+
+literal_plugin = """
+import gremlin.common
+
+class Literal:
+    name = "Literal Plugin"
+    tag = "literal"
+    input_types = [
+        gremlin.common.InputType.JoystickButton,
+        gremlin.common.InputType.Keyboard
+    ]
+
+    def __init__(self, parent):
+        self.parent = parent
+
+version = 1
+name = "literal"
+create = Literal
+"""
+
+computed_plugin = """
+class Computed:
+    name = "Computed " + "Plugin"
+    tag = "computed"
+    input_types = []
+
+version = 2
+name = "computed"
+create = Computed
+"""
+
+broken_plugin = literal_plugin.replace("literal", "broken").replace(
+    "Literal", "Broken"
+) + """
+raise ImportError("missing dependency")
+"""
+
+
+def _write_plugins(folder):
+    for module, source in [
+        ("literal", literal_plugin),
+        ("computed", computed_plugin),
+        ("broken", broken_plugin),
+        ("helpers", "value = 1\n")
+    ]:
+        os.makedirs(folder / "fake_plugins" / module)
+        (folder / "fake_plugins" / module / "__init__.py").write_text(source)
+    (folder / "fake_plugins" / "__init__.py").write_text("")
+
+
+def test_manifest_of_shipped_plugins():
+    for manager, plugin_name in [
+        (gremlin.plugin_manager.ActionPlugins(), "remap"),
+        (gremlin.plugin_manager.ContainerPlugins(), "basic")
+    ]:
+        assert plugin_name in manager.repository
+        for entry in manager.repository.values():
+            plugin_type = entry.load()
+            assert entry.name == plugin_type.name
+            assert entry.tag == plugin_type.tag
+            assert entry.input_types == list(plugin_type.input_types)
+            assert manager.tag_map[entry.tag] is entry
+
+
+def test_plugins_are_imported_on_first_use(tmp_path, monkeypatch):
+    _write_plugins(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cache_file = str(tmp_path / "cache" / "fake_plugins.json")
+
+    manifest = PluginManifest("fake_plugins", str(tmp_path), cache_file)
+    entries = {v.plugin_name: v for v in manifest.entries()}
+    assert sorted(entries) == ["broken", "computed", "literal"]
+
+    # Plain literals are read without importing the plugin
+    literal = entries["literal"]
+    assert not literal.is_loaded
+    assert "fake_plugins.literal" not in sys.modules
+    assert literal.name == "Literal Plugin"
+    assert literal.tag == "literal"
+    assert literal.input_types == [InputType.JoystickButton, InputType.Keyboard]
+    assert entries["computed"].is_loaded
+    assert entries["computed"].name == "Computed Plugin"
+
+    instance = literal("parent")
+    assert literal.is_loaded
+    assert instance.parent == "parent"
+    assert type(instance) is sys.modules["fake_plugins.literal"].Literal
+
+    with open(cache_file, encoding="utf-8") as fh:
+        cached = json.load(fh)["plugins"]
+    assert cached["helpers"]["plugin"] is None
+    assert cached["literal"]["plugin"]["module"] == "fake_plugins.literal"
+
+
+def test_changed_plugins_are_read_again(tmp_path, monkeypatch):
+    _write_plugins(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cache_file = str(tmp_path / "fake_plugins.json")
+    PluginManifest("fake_plugins", str(tmp_path), cache_file).entries()
+
+    # Cached entries are used as long as the plugin's file is unchanged
+    with open(cache_file, encoding="utf-8") as fh:
+        data = json.load(fh)
+    data["plugins"]["literal"]["plugin"]["name"] = "Cached Name"
+    with open(cache_file, "w", encoding="utf-8") as fh:
+        json.dump(data, fh)
+    entries = PluginManifest("fake_plugins", str(tmp_path), cache_file).entries()
+    assert [v.name for v in entries if v.tag == "literal"] == ["Cached Name"]
+
+    fname = tmp_path / "fake_plugins" / "literal" / "__init__.py"
+    fname.write_text(literal_plugin.replace('"Literal Plugin"', '"New Name"'))
+    stat = os.stat(fname)
+    os.utime(fname, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    entries = PluginManifest("fake_plugins", str(tmp_path), cache_file).entries()
+    assert [v.name for v in entries if v.tag == "literal"] == ["New Name"]
+
+
+def test_plugins_failing_to_load_are_removed(tmp_path, monkeypatch):
+    _write_plugins(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cache_file = str(tmp_path / "fake_plugins.json")
+    manifest = PluginManifest("fake_plugins", str(tmp_path), cache_file)
+    broken = next(v for v in manifest.entries() if v.plugin_name == "broken")
+
+    manager = gremlin.plugin_manager.ActionPlugins()
+    manager._register(broken)
+    manager._create_type_action_map()
+    manager._create_action_name_map()
+    assert manager.tag_map["broken"] is broken
+    assert broken in manager.type_action_map[InputType.Keyboard]
+
+    with pytest.raises(gremlin.error.GremlinError):
+        manager.get_class("Broken Plugin")("parent")
+    assert broken.load_failed
+    assert "broken" not in manager.repository
+    assert "broken" not in manager.tag_map
+    assert broken not in manager.type_action_map[InputType.Keyboard]
+    with pytest.raises(gremlin.error.GremlinError):
+        manager.get_class("Broken Plugin")
@@ -0,0 +1,161 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import pytest
+
+import gremlin.plugin_manager
+import gremlin.profile
+from gremlin.common import DeviceType, InputType
+
+
+device_guid = gremlin.profile.parse_guid(
+    "{8F2B9D0E-4B7A-4C4E-9D55-2F6A1C3E5B10}"
+)
+
+
+def _write_profile(fname, button_count):
+    """Writes a profile mapping every button to a description action.
+
+    :param fname path of the profile to write
+    :param button_count number of buttons configured in each mode
+    """
+    profile = gremlin.profile.Profile()
+    device = profile.get_device_modes(
+        device_guid, DeviceType.Joystick, "Cached Joystick"
+    )
+    container_type = \
+        gremlin.plugin_manager.ContainerPlugins().repository["basic"]
+    action_type = \
+        gremlin.plugin_manager.ActionPlugins().repository["description"]
+    for mode_name in ["Default", "Other"]:
+        device.ensure_mode_exists(mode_name)
+        mode = device.modes[mode_name]
+        for input_id in range(1, button_count + 1):
+            item = mode.get_data(InputType.JoystickButton, input_id)
+            item.description = f"Button {input_id}"
+            container = container_type(item)
+            action = action_type(container)
+            action.description = f"{mode_name} {input_id}"
+            container.add_action(action)
+            item.containers.append(container)
+    profile.settings.startup_mode = "Other"
+    profile.to_xml(fname)
+
+
+def _load(fname):
+    profile = gremlin.profile.Profile()
+    assert profile.from_xml(fname) is False
+    return profile
+
+
+@pytest.fixture
+def cache():
+    cache = gremlin.profile.ProfileCache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+def test_cached_profile_matches_parsed_one(cache, tmp_path):
+    fname = str(tmp_path / "profile.xml")
+    _write_profile(fname, 20)
+
+    parsed = _load(fname)
+    assert (cache.hits, cache.misses) == (0, 1)
+    restored = _load(fname)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    device = restored.devices[device_guid]
+    assert device is not parsed.devices[device_guid]
+    assert sorted(device.modes) == ["Default", "Other"]
+    assert restored.settings.startup_mode == "Other"
+    assert restored.settings.parent is restored
+    for input_id in [1, 20]:
+        item = device.modes["Other"].config[InputType.JoystickButton][input_id]
+        assert item.parent.parent is device
+        assert item.description == f"Button {input_id}"
+        container = item.containers[0]
+        assert container.action_sets[0][0].description == f"Other {input_id}"
+        assert container in \
+            gremlin.plugin_manager.ContainerPlugins().get_container(item)
+
+    # Both profiles write the same document
+    parsed.to_xml(str(tmp_path / "parsed.xml"))
+    restored.to_xml(str(tmp_path / "restored.xml"))
+    assert (tmp_path / "parsed.xml").read_bytes() == \
+        (tmp_path / "restored.xml").read_bytes()
+
+
+def test_changed_profile_is_parsed_again(cache, tmp_path):
+    fname = str(tmp_path / "profile.xml")
+    _write_profile(fname, 5)
+    _load(fname)
+
+    _write_profile(fname, 6)
+    profile = _load(fname)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert len(profile.devices[device_guid].modes["Default"]
+               .config[InputType.JoystickButton]) == 6
+
+    # Only the most recently used snapshots are kept
+    for button_count in range(cache.max_entries):
+        _write_profile(fname, 10 + button_count)
+        _load(fname)
+    _write_profile(fname, 5)
+    _load(fname)
+    assert cache.hits == 0
+
+
+def test_outdated_profile_is_not_parsed(tmp_path):
+    data = b'<profile version="8"><devices><device name="x"/></devices></profile>'
+    profile = gremlin.profile.Profile()
+    assert profile._parse_xml_stream(data) is False
+    assert profile.devices == {}
+
+
+def test_change_detection(cache, tmp_path):
+    fname = str(tmp_path / "profile.xml")
+    _write_profile(fname, 5)
+    assert gremlin.profile.Profile().has_changed()
+
+    for profile in [_load(fname), _load(fname)]:
+        assert not profile.has_changed()
+
+        # Inputs shown in the UI without configuration are no change
+        mode = profile.devices[device_guid].modes["Default"]
+        mode.get_data(InputType.JoystickButton, 32)
+        profile.get_device_modes(
+            gremlin.profile.parse_guid("{00000000-0000-0000-0000-000000000001}"),
+            DeviceType.Joystick,
+            "Other Joystick"
+        ).ensure_mode_exists("Default")
+        assert not profile.has_changed()
+
+        action = mode.config[InputType.JoystickButton][3] \
+            .containers[0].action_sets[0][0]
+        action.description = "Changed"
+        assert profile.has_changed()
+        action.description = "Default 3"
+        assert not profile.has_changed()
+
+        profile.settings.default_delay = 0.1
+        assert profile.has_changed()
+        profile.to_xml(str(tmp_path / "saved.xml"))
+        assert not profile.has_changed()
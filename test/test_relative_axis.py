@@ -0,0 +1,112 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import time
+
+import pytest
+
+import gremlin.joystick_handling
+import gremlin.relative_axis
+from vjoy import vjoy
+import vjoy.simulated
+
+
+@pytest.fixture
+def integrator():
+    """Returns the integrator driving a simulated vJoy device."""
+    driver = vjoy.simulated.SimulatedDriver()
+    driver.install()
+    vjoy.vjoy.report_batcher.configure(True)
+    integrator = gremlin.relative_axis.RelativeAxisIntegrator()
+    rest_timeout = integrator.rest_timeout
+    integrator.rest_timeout = 0.1
+    device = gremlin.joystick_handling.VJoyProxy()[1]
+    device.axis(1).value = 0.0
+    device.axis(2).value = 0.0
+    driver.clear()
+
+    yield integrator, device, driver
+
+    integrator.stop()
+    integrator.rest_timeout = rest_timeout
+    vjoy.vjoy.report_batcher.configure(False)
+    gremlin.joystick_handling.VJoyProxy.reset()
+
+
+def _wait(condition, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_axes_advance_together(integrator, monkeypatch):
+    integrator, device, driver = integrator
+
+    # Time integrated by each tick
+    elapsed = []
+    tick = integrator._tick
+
+    def count(now, dt):
+        tick(now, dt)
+        elapsed.append(dt)
+    monkeypatch.setattr(integrator, "_tick", count)
+
+    integrator.update(1, 1, 0.01, False)
+    integrator.update(1, 2, -0.005, False)
+    assert _wait(lambda: len(elapsed) >= 30)
+    moving = sum(elapsed)
+    integrator.update(1, 1, 0.0, True)
+    integrator.update(1, 2, 0.0, True)
+    ticks = len(elapsed)
+    assert _wait(lambda: len(elapsed) >= ticks + 2)
+    total = sum(elapsed)
+
+    # Values change by delta per 10 ms regardless of the tick timing, the
+    # ticks around the updates may or may not have moved the axes yet
+    low = moving - elapsed[0] - 1e-6
+    assert low <= device.axis(1).value <= total + 1e-6
+    assert low <= -2 * device.axis(2).value <= total + 1e-6
+    # Both axes are sent in a single report per tick
+    functions = {record.function for record in driver.records}
+    assert functions == {"UpdateVJD"}
+    assert len(driver.records) <= integrator.ticks
+
+    assert _wait(lambda: integrator.axis_count == 0)
+
+
+def test_axis_is_released_when_changed_elsewhere(integrator):
+    integrator, device, driver = integrator
+
+    integrator.update(1, 1, 0.01, False)
+    assert _wait(lambda: device.axis(1).value > 0.05)
+    device.axis(1).value = -0.5
+
+    assert _wait(lambda: integrator.axis_count == 0)
+    assert device.axis(1).value == -0.5
+
+
+def test_values_are_clamped(integrator):
+    integrator, device, driver = integrator
+
+    integrator.update(1, 1, 0.5, False)
+    assert _wait(lambda: device.axis(1).value == 1.0)
+    time.sleep(0.05)
+    assert device.axis(1).value == 1.0
@@ -0,0 +1,319 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import socket
+import threading
+import time
+
+import pytest
+
+import gremlin.remote_protocol as rp
+from gremlin.remote_protocol import Opcode
+
+
+@pytest.fixture
+def received():
+    """Returns a dispatcher recording every record it dispatches."""
+    records = []
+
+    def record(opcode):
+        return lambda frame, *values: records.append((frame, opcode, values))
+
+    dispatcher = rp.Dispatcher(
+        {opcode: record(opcode) for opcode in rp.record_layouts},
+        ignored_senders=("own-guid", rp.sender_id("own-guid"))
+    )
+    return dispatcher, records
+
+
+def test_binary_frames(received):
+    dispatcher, records = received
+    encoder = rp.FrameEncoder(rp.sender_id("client"))
+
+    data = encoder.encode(Opcode.Axis, 2, 3, 0.5)
+    assert data[0] == rp.MAGIC
+    assert len(data) == rp.header.size + 1 + 6
+    assert dispatcher.dispatch(data) == 1
+    frame, opcode, values = records[0]
+    assert opcode == Opcode.Axis
+    assert values == (2, 3, 0.5)
+    assert frame.sender == encoder.sender
+    assert frame.sequence == 0
+
+    data = encoder.encode_records([
+        (Opcode.Button, (1, 100, True)),
+        (Opcode.Hat, (1, 2, -1, 1)),
+        (Opcode.Key, (0x41, 0x1e, 2))
+    ])
+    assert dispatcher.dispatch(data) == 3
+    assert [(r[0].sequence, r[1], r[2]) for r in records[1:]] == [
+        (1, Opcode.Button, (1, 100, True)),
+        (1, Opcode.Hat, (1, 2, -1, 1)),
+        (1, Opcode.Key, (0x41, 0x1e, 2))
+    ]
+
+    # Truncated records and frames of another version are dropped
+    assert dispatcher.dispatch(data[:-1]) == 2
+    assert dispatcher.dispatch(data[:1] + b"\x7f" + data[2:]) == 0
+
+
+def test_legacy_packets(received):
+    dispatcher, records = received
+
+    for opcode, values in [
+        (Opcode.Heartbeat, (1,)),
+        (Opcode.Axis, (1, 4, -0.25)),
+        (Opcode.Hat, (1, 1, 0, -1)),
+        (Opcode.MouseButton, (2, False)),
+        (Opcode.MouseAcceleration, (90, 1.0, 20.0, 2.0))
+    ]:
+        data = rp.encode_legacy("client", opcode, *values)
+        assert data[0] != rp.MAGIC
+        assert dispatcher.dispatch(data, ("127.0.0.1", 1)) == 1
+        frame, received_opcode, received_values = records[-1]
+        assert frame.sender == "client"
+        assert frame.sequence is None
+        assert frame.address == ("127.0.0.1", 1)
+        assert received_opcode == opcode
+        assert received_values == values
+
+
+def test_own_packets_are_ignored(received):
+    dispatcher, records = received
+    encoder = rp.FrameEncoder(rp.sender_id("own-guid"))
+
+    assert dispatcher.dispatch(encoder.encode(Opcode.Button, 1, 1, True)) == 0
+    assert dispatcher.dispatch(
+        rp.encode_legacy("own-guid", Opcode.Button, 1, 1, True)
+    ) == 0
+    assert records == []
+
+
+def test_axis_aggregation():
+    aggregator = rp.AxisAggregator()
+
+    aggregator.set_axis(1, 1, 0.1)
+    aggregator.set_axis(1, 1, 0.2)
+    aggregator.set_axis(1, 2, -0.5)
+    aggregator.add_relative(1, 3, 0.1)
+    aggregator.add_relative(1, 3, 0.15)
+    assert aggregator.drain() == [
+        (Opcode.Axis, (1, 1, 0.2)),
+        (Opcode.Axis, (1, 2, -0.5)),
+        (Opcode.RelativeAxis, (1, 3, 0.25))
+    ]
+    assert aggregator.drain() == []
+
+    # Changes below epsilon are dropped, larger ones are released
+    aggregator.set_axis(1, 1, 0.2 + rp.AxisAggregator.epsilon / 2)
+    aggregator.set_axis(1, 2, -0.4)
+    assert aggregator.drain() == [(Opcode.Axis, (1, 2, -0.4))]
+    assert aggregator.updates == 7
+    assert aggregator.dropped == 3
+
+
+def test_loss_and_latency_statistics():
+    # Tick records are handled by the dispatcher itself
+    dispatcher = rp.Dispatcher({Opcode.Axis: lambda frame, *values: None})
+    encoder = rp.FrameEncoder(rp.sender_id("client"))
+    tick = (Opcode.Tick, (time.time() - 0.01,))
+
+    frames = [
+        encoder.encode_records([tick, (Opcode.Axis, (1, axis_id, 0.0))])
+        for axis_id in range(1, 6)
+    ]
+    for index in [0, 1, 3, 4, 2]:
+        dispatcher.dispatch(frames[index])
+
+    statistics = dispatcher.statistics
+    assert statistics.frames == 5
+    assert statistics.records == 10
+    assert statistics.lost == 0
+    assert statistics.reordered == 1
+    assert statistics.latency_count == 5
+    assert statistics.latency_mean >= 0.01
+
+
+def test_newest_frame_wins(received):
+    dispatcher, records = received
+    first = rp.FrameEncoder(rp.sender_id("first"))
+    second = rp.FrameEncoder(rp.sender_id("second"))
+
+    old_frame = first.encode(Opcode.Axis, 1, 1, 0.25)
+    old_relative = first.encode(Opcode.RelativeAxis, 1, 1, 0.25)
+    new_frame = first.encode_records([
+        (Opcode.Snapshot, ()),
+        (Opcode.Axis, (1, 1, 0.5)),
+        (Opcode.Button, (1, 1, True))
+    ])
+    assert dispatcher.dispatch(new_frame) == 3
+    # Older frames don't overwrite the state, relative changes still apply
+    assert dispatcher.dispatch(old_frame) == 0
+    assert dispatcher.dispatch(old_relative) == 1
+    assert dispatcher.statistics.stale == 1
+    # Frames of another sender are applied in order of arrival
+    assert dispatcher.dispatch(second.encode(Opcode.Axis, 1, 1, -0.5)) == 1
+    assert dispatcher.dispatch(first.encode(Opcode.Axis, 1, 1, 0.75)) == 1
+
+    axis_values = [r[2][2] for r in records if r[1] == Opcode.Axis]
+    assert axis_values == [0.5, -0.5, 0.75]
+
+
+def test_server_applies_packets_on_one_thread():
+    import gremlin.input_devices
+
+    applied = []
+    dispatcher = rp.Dispatcher({
+        Opcode.Axis: lambda frame, *values:
+            applied.append((threading.get_ident(), values))
+    })
+    server = gremlin.input_devices.GremlinServer(("127.0.0.1", 0), dispatcher)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    encoder = rp.FrameEncoder(rp.sender_id("client"))
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        for i in range(50):
+            sock.sendto(
+                encoder.encode(Opcode.Axis, 1, 1, i / 50),
+                server.server_address
+            )
+        timeout = time.time() + 5.0
+        while len(applied) < 50 and time.time() < timeout:
+            time.sleep(0.01)
+    finally:
+        sock.close()
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    assert [values[2] for _, values in applied] == \
+        [pytest.approx(i / 50) for i in range(50)]
+    assert {ident for ident, _ in applied} == {thread.ident}
+    assert server.received == 50
+    assert server.dropped == 0
+
+
+def test_server_drops_oldest_datagrams():
+    import gremlin.input_devices
+
+    applied = []
+    dispatcher = rp.Dispatcher({
+        Opcode.Axis: lambda frame, *values: applied.append(values)
+    })
+    server = gremlin.input_devices.GremlinServer(("127.0.0.1", 0), dispatcher)
+    server.max_queue = 8
+
+    # Flood the socket before the server reads from it
+    encoder = rp.FrameEncoder(rp.sender_id("client"))
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    for i in range(50):
+        sock.sendto(
+            encoder.encode(Opcode.Axis, 1, 1, i / 50),
+            server.server_address
+        )
+    sock.close()
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    timeout = time.time() + 5.0
+    while server.received < 50 and time.time() < timeout:
+        time.sleep(0.01)
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+    assert server.received == 50
+    assert server.dropped == 42
+    assert server.max_queue_depth == 8
+    # Only the newest datagrams were applied
+    assert [values[2] for values in applied] == \
+        [pytest.approx(i / 50) for i in range(42, 50)]
+
+
+def test_negotiation_expires():
+    negotiation = rp.Negotiation(enabled=True, timeout=15.0)
+    assert not negotiation.is_binary(now=100.0)
+    assert negotiation.acknowledge(("10.0.0.2", 1), now=100.0)
+    assert not negotiation.acknowledge(("10.0.0.2", 1), now=101.0)
+    assert negotiation.is_binary(now=110.0)
+    assert negotiation.receivers(now=110.0) == [("10.0.0.2", 1)]
+    # Acknowledgements stopped, e.g. the receiver was closed
+    assert not negotiation.is_binary(now=120.0)
+    assert negotiation.receivers(now=120.0) == []
+
+    # Without opting in acknowledgements don't switch to binary frames
+    negotiation = rp.Negotiation(enabled=False)
+    negotiation.acknowledge(("10.0.0.2", 1))
+    assert not negotiation.is_binary()
+
+
+def test_client_with_legacy_and_binary_receivers():
+    import gremlin.input_devices
+
+    legacy = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    legacy.bind(("127.0.0.1", 0))
+    legacy.settimeout(5.0)
+    binary = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    client = gremlin.input_devices.RemoteClient()
+    client._address = legacy.getsockname()
+    client._negotiation.enabled = False
+    records = []
+    dispatcher = rp.Dispatcher({
+        Opcode.Heartbeat: lambda frame, *values: None,
+        Opcode.Button: lambda frame, *values: records.append(values)
+    })
+    ack = rp.FrameEncoder(rp.sender_id("receiver")).encode(
+        Opcode.HelloAck, rp.VERSION
+    )
+
+    def press(button_id):
+        client._send_record(Opcode.Button, 1, button_id, True)
+        data, _ = legacy.recvfrom(1024)
+        assert dispatcher.dispatch(data) == 1
+        return data[0] == rp.MAGIC
+
+    try:
+        client._send_record(Opcode.Heartbeat, rp.VERSION)
+        assert dispatcher.dispatch(legacy.recvfrom(1024)[0]) == 1
+
+        # The binary receiver answers the heartbeat, the legacy one doesn't,
+        # which keeps the legacy receiver working unless binary is enabled
+        binary.sendto(ack, client._sock.getsockname())
+        client._receive_replies(5.0)
+        assert not client.binary_protocol
+        assert press(1) is False
+
+        client._negotiation.enabled = True
+        binary.sendto(ack, client._sock.getsockname())
+        client._receive_replies(5.0)
+        assert client.binary_protocol
+        assert press(2) is True
+
+        # Without further acknowledgements the client falls back to legacy
+        client._negotiation.timeout = 0.0
+        time.sleep(0.01)
+        assert press(3) is False
+        assert records == [(1, 1, True), (1, 2, True), (1, 3, True)]
+    finally:
+        client.stop()
+        legacy.close()
+        binary.close()
@@ -0,0 +1,232 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import threading
+import time
+
+import pytest
+
+import gremlin.error
+import gremlin.scheduler
+
+
+def test_callbacks_run_in_order_on_one_thread():
+    wheel = gremlin.scheduler.TimerWheel()
+    done = threading.Event()
+    calls = []
+
+    def record(name):
+        calls.append((name, threading.get_ident()))
+        if name == "last":
+            done.set()
+
+    cancelled = wheel.schedule(0.02, record, "cancelled")
+    late = wheel.schedule(0.05, record, "last")
+    early = wheel.schedule(0.01, record, "first")
+    assert early.active and late.active
+
+    cancelled.cancel()
+    assert not cancelled.active
+    assert done.wait(2.0)
+
+    assert [name for name, _ in calls] == ["first", "last"]
+    assert len({ident for _, ident in calls}) == 1
+    assert threading.get_ident() not in {ident for _, ident in calls}
+    assert not early.active and early.executed
+    assert not cancelled.executed
+
+
+def test_cancel_all():
+    wheel = gremlin.scheduler.TimerWheel()
+    calls = []
+
+    handles = [wheel.schedule(0.02, calls.append, i) for i in range(10)]
+    wheel.cancel_all()
+    time.sleep(0.1)
+
+    assert calls == []
+    assert wheel.pending == 0
+    assert not any(handle.active for handle in handles)
+
+
+def test_cancel_all_stop_policies():
+    wheel = gremlin.scheduler.TimerWheel()
+    StopPolicy = gremlin.scheduler.StopPolicy
+    kept = threading.Event()
+    calls = []
+
+    def press(name):
+        calls.append(f"{name} press")
+        wheel.schedule(
+            0.5, calls.append, f"{name} release", stop_policy=StopPolicy.Run
+        )
+
+    wheel.schedule(0.05, calls.append, "cancelled")
+    wheel.schedule(0.04, press, "pulse", stop_policy=StopPolicy.Run)
+    wheel.schedule(0.02, calls.append, "release", stop_policy=StopPolicy.Run)
+    wheel.schedule(0.03, kept.set, stop_policy=StopPolicy.Keep)
+    dropped = wheel.schedule(
+        0.01, calls.append, "dropped", stop_policy=StopPolicy.Run
+    )
+    dropped.cancel()
+    wheel.cancel_all()
+
+    # Callbacks to run on stop execute in deadline order, including the ones
+    # they schedule, while kept callbacks still run once due
+    assert calls == ["release", "pulse press", "pulse release"]
+    assert wheel.pending == 1
+    assert kept.wait(2.0)
+    time.sleep(0.05)
+    assert calls == ["release", "pulse press", "pulse release"]
+    assert wheel.pending == 0
+
+
+def _wait_for(condition, timeout=5.0):
+    """Waits until the condition holds or the timeout expires.
+
+    :param condition function returning True once the wait is over
+    :param timeout maximum time in seconds to wait
+    :return value of the condition
+    """
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.005)
+    return condition()
+
+
+def _record_deadlines(task):
+    """Returns the list the deadlines of the task's executions are added to.
+
+    :param task the periodic task whose executions to record
+    :return list of deadlines
+    """
+    deadlines = []
+    execute = task.execute
+
+    def record(deadline):
+        deadlines.append(deadline)
+        execute(deadline)
+    task.execute = record
+    return deadlines
+
+
+def _grid_offsets(deadlines, interval):
+    """Returns the number of intervals each deadline lies after the first.
+
+    :param deadlines the deadlines of consecutive executions
+    :param interval time in seconds between executions
+    :return list of grid offsets
+    """
+    offsets = []
+    for deadline in deadlines:
+        offset = (deadline - deadlines[0]) / interval
+        assert offset == pytest.approx(round(offset), abs=1e-6)
+        offsets.append(round(offset))
+    return offsets
+
+
+def test_periodic_callbacks_do_not_drift():
+    scheduler = gremlin.scheduler.PeriodicScheduler()
+    starts = []
+
+    def slow():
+        starts.append(time.monotonic())
+        time.sleep(0.005)
+
+    task = scheduler.add(slow, 0.02)
+    deadlines = _record_deadlines(task)
+    scheduler.start()
+    assert _wait_for(lambda: len(starts) >= 10)
+    scheduler.stop()
+
+    # Deadlines stay on the grid despite the runtime of the callback, only
+    # advancing further when periods are skipped
+    offsets = _grid_offsets(deadlines, 0.02)
+    assert offsets[-1] == len(deadlines) - 1 + task.statistics.skipped
+    assert all(start >= deadline for start, deadline in zip(starts, deadlines))
+    assert task.statistics.runs == len(starts)
+    assert task.statistics.runtime_max >= 0.005
+
+
+def test_periodic_overrun_policies():
+    # Separate schedulers so the stalls do not delay the other callbacks
+    schedulers = [gremlin.scheduler.PeriodicScheduler() for _ in range(3)]
+    calls = {"skip": 0, "catch_up": 0, "pooled": 0}
+
+    def stall(name):
+        calls[name] += 1
+        if calls[name] == 1:
+            time.sleep(0.055)
+
+    skip = schedulers[0].add(lambda: stall("skip"), 0.02)
+    catch_up = schedulers[1].add(
+        lambda: stall("catch_up"),
+        0.02,
+        gremlin.scheduler.OverrunPolicy.CatchUp
+    )
+    pooled = schedulers[2].add(lambda: stall("pooled"), 0.02, pooled=True)
+    skip_deadlines = _record_deadlines(skip)
+    catch_up_deadlines = _record_deadlines(catch_up)
+    for scheduler in schedulers:
+        scheduler.start()
+    assert _wait_for(lambda: min(calls.values()) >= 5)
+    for scheduler in schedulers:
+        scheduler.stop()
+
+    # The periods missed by the stall are dropped
+    assert skip.statistics.overruns >= 1
+    assert skip.statistics.skipped >= 1
+    offsets = _grid_offsets(skip_deadlines, 0.02)
+    assert offsets[1] >= 2
+    assert offsets[-1] == len(skip_deadlines) - 1 + skip.statistics.skipped
+    # Missed periods are run back to back
+    assert catch_up.statistics.overruns >= 1
+    assert catch_up.statistics.skipped == 0
+    offsets = _grid_offsets(catch_up_deadlines, 0.02)
+    assert offsets == list(range(len(catch_up_deadlines)))
+    # Pooled callbacks that are still running skip their periods instead
+    # and therefore cannot catch up
+    assert pooled.statistics.busy >= 1
+    with pytest.raises(gremlin.error.GremlinError):
+        schedulers[2].add(
+            lambda: None,
+            0.02,
+            gremlin.scheduler.OverrunPolicy.CatchUp,
+            pooled=True
+        )
+
+
+def test_pooled_callbacks_do_not_delay_others():
+    scheduler = gremlin.scheduler.PeriodicScheduler()
+    release = threading.Event()
+    fast = scheduler.add(lambda: None, 0.01)
+    slow = scheduler.add(lambda: release.wait(5.0), 0.01, pooled=True)
+    scheduler.start()
+
+    # The fast callback keeps running while the pooled one is blocked
+    assert _wait_for(lambda: slow.busy)
+    runs = fast.statistics.runs
+    assert _wait_for(lambda: fast.statistics.runs >= runs + 5)
+    assert slow.busy
+    release.set()
+    scheduler.stop()
+
+    assert slow.statistics.runs >= 1
+    assert slow.statistics.busy >= 1
@@ -0,0 +1,100 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import time
+
+import pytest
+
+import gremlin.sendinput
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Replaces SendInput with a sink recording the mouse motions."""
+    motions = []
+    monkeypatch.setattr(
+        gremlin.sendinput,
+        "_send_input",
+        lambda *inputs: motions.extend(
+            (i.union.mi.dx, i.union.mi.dy) for i in inputs
+        )
+    )
+    yield motions
+    gremlin.sendinput.MouseController().stop()
+
+
+def test_sub_pixel_motion_is_accumulated(sent):
+    controller = gremlin.sendinput.MouseController()
+    controller.set_absolute_motion(30, -10)
+    for _ in range(100):
+        controller._tick(0.01)
+
+    # Each tick moves less than a pixel, yet the total distance is exact
+    assert sum(dx for dx, _ in sent) == 30
+    assert sum(dy for _, dy in sent) == -10
+    assert all(abs(dx) <= 1 and abs(dy) <= 1 for dx, dy in sent)
+
+
+def test_sources_are_combined(sent):
+    controller = gremlin.sendinput.MouseController()
+    controller.set_absolute_motion(100, 0, source="first")
+    controller.set_absolute_motion(None, 50, source="second")
+    controller.set_absolute_motion(100, None, source="second")
+    controller._tick(0.1)
+
+    assert sent == [(20, 5)]
+
+
+def test_accelerated_motion_distance():
+    motion = gremlin.sendinput.AcceleratedMouseMotion(90, 0, 100, 1.0)
+    distance = 0.0
+    for dt in [0.013, 0.007] * 100:
+        distance += motion.advance(dt)[0]
+
+    # Accelerating for one second and moving at full speed for another
+    assert distance == pytest.approx(150.0)
+    assert motion.current_velocity == pytest.approx(100.0)
+
+
+def test_accelerated_motion_from_rest(sent):
+    controller = gremlin.sendinput.MouseController()
+    ticks = controller.ticks
+    controller.start(tick_rate=100)
+    controller.set_accelerated_motion(90, 0, 1000, 0.1)
+    time.sleep(0.3)
+    controller.stop()
+
+    # A motion without minimum speed is not mistaken for being at rest
+    assert sum(dx for dx, _ in sent) > 100
+    assert controller.ticks - ticks > 10
+
+
+def test_motion_is_scaled_by_elapsed_time(sent):
+    controller = gremlin.sendinput.MouseController()
+    controller.start(tick_rate=100)
+    controller.set_absolute_motion(200, 0)
+    start = time.monotonic()
+    time.sleep(0.5)
+    controller.set_absolute_motion(0, 0)
+    elapsed = time.monotonic() - start
+    controller.stop()
+
+    assert sum(dx for dx, _ in sent) == pytest.approx(200 * elapsed, abs=4)
+    assert len(sent) <= controller.ticks
@@ -0,0 +1,88 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import uuid
+
+import gremlin.event_handler
+
+import dinput
+from dinput.simulated import SimulatedBackend, SimulatedDevice, \
+    SimulatedEvent, axis_stream, merge_streams
+
+
+def test_device_information():
+    guid = uuid.UUID("{12345678-9abc-def0-1234-56789abcdef0}")
+    stick = SimulatedDevice("Stick", guid=guid, axis_count=3, hat_count=2)
+    backend = SimulatedBackend([stick])
+
+    assert str(stick.guid) == "{12345678-9ABC-DEF0-1234-56789ABCDEF0}"
+    assert backend.get_device_count() == 1
+    assert backend.device_exists(stick.guid.ctypes)
+    assert not backend.device_exists(dinput.GUID_Virtual.ctypes)
+
+    info = dinput.DeviceSummary(backend.get_device_information_by_index(0))
+    assert info.device_guid == stick.guid
+    assert info.name == "Stick"
+    assert info.axis_count == 3
+    assert info.button_count == 32
+    assert info.hat_count == 2
+    assert [a.axis_index for a in info.axis_map[:4]] == [1, 2, 3, 0]
+
+
+def test_inject_events():
+    stick = SimulatedDevice("Stick")
+    backend = SimulatedBackend([stick])
+    events = []
+    backend.set_input_event_callback(
+        lambda data: events.append(dinput.InputEvent(data))
+    )
+
+    backend.inject(stick.guid, dinput.InputType.Axis, 2, -32768)
+    backend.inject(stick.guid, dinput.InputType.Button, 5, 1)
+    backend.inject(stick.guid, dinput.InputType.Hat, 1, 9000)
+
+    assert [(e.device_guid, e.input_type, e.input_index, e.value)
+            for e in events] == [
+        (stick.guid, dinput.InputType.Axis, 2, -32768),
+        (stick.guid, dinput.InputType.Button, 5, 1),
+        (stick.guid, dinput.InputType.Hat, 1, 9000)
+    ]
+    assert backend.get_axis(stick.guid.ctypes, 2) == -32768
+    assert backend.get_button(stick.guid.ctypes, 5)
+    assert backend.get_hat(stick.guid.ctypes, 1) == 9000
+
+
+def test_timed_playback():
+    stick = SimulatedDevice("Stick")
+    backend = SimulatedBackend([stick])
+    values = []
+    backend.set_input_event_callback(lambda data: values.append(data.value))
+
+    stream = merge_streams(
+        axis_stream(stick, 1, 500, 0.1, waveform=lambda t: 1.0),
+        [SimulatedEvent(0.051, stick.guid, dinput.InputType.Button, 1, 1)]
+    )
+    assert len(stream) == 51
+    backend.play(stream, wait=True)
+
+    assert not backend.playing
+    assert len(values) == 51
+    assert values[26] == 1
+    assert values[:26] == [32767] * 26
@@ -0,0 +1,62 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import pytest
+
+import gremlin.error
+import gremlin.spline
+from vjoy.vjoy import deadzone
+
+
+def test_curve_table_matches_spline():
+    points = [(-1.0, -1.0), (-0.3, -0.1), (0.4, 0.2), (1.0, 1.0)]
+    spline = gremlin.spline.CubicSpline(points)
+    table = gremlin.spline.CurveTable(spline)
+
+    for i in range(-100, 101):
+        x = i / 100.0
+        assert table(x) == pytest.approx(spline(x), abs=1e-6)
+
+    # Values outside the valid range are clamped
+    assert table(-2.0) == pytest.approx(spline(-1.0))
+    assert table(2.0) == pytest.approx(spline(1.0))
+
+
+def test_curve_table_with_deadzone():
+    points = [(-1.0, -1.0), (-0.2, -0.4), (0.0, 0.0), (0.2, 0.4), (1.0, 1.0)]
+    limits = (-0.9, -0.1, 0.1, 0.9)
+    spline = gremlin.spline.CubicSpline(points)
+    table = gremlin.spline.create_curve_table("cubic-spline", points, limits)
+
+    # The largest error occurs within the samples enclosing a deadzone limit
+    for i in range(-100, 101):
+        x = i / 100.0
+        assert table(x) == pytest.approx(
+            spline(deadzone(x, *limits)),
+            abs=1e-3
+        )
+
+    # Unchanged curves reuse the existing table
+    assert table is gremlin.spline.create_curve_table(
+        "cubic-spline", list(points), list(limits)
+    )
+
+    with pytest.raises(gremlin.error.GremlinError):
+        gremlin.spline.create_curve_table("linear", points)
@@ -18,6 +18,7 @@
 import sys
 sys.path.append(".")
 
+import collections
 import os
 import pytest
 import uuid
@@ -145,4 +146,33 @@ def test_read_property():
     with pytest.raises(gremlin.error.ProfileError, match=r"Property element is missing"):
         gremlin.util.read_property(
             doc, "value", gremlin.types.PropertyType.Int
-        )
\ No newline at end of file
+        )
+
+def test_calibration_table():
+    for limits in [(-32768, 0, 32767), (-30000, 1200, 31000), (0, 0, 65535)]:
+        table = gremlin.util.create_calibration_table(*limits)
+        calibrate = gremlin.util.create_calibration_function(*limits)
+        assert len(table) == 65536
+        for raw in [-32768, -30001, -1, 0, 1, 1200, 16384, 31001, 32767]:
+            assert table[raw + 32768] == calibrate(raw)
+
+    table = gremlin.util.create_calibration_table(-32768, 0, 32767)
+    assert table is gremlin.util.create_calibration_table(-32768, 0, 32767)
+    assert gremlin.util.apply_calibration_table(table, [-32768, 0, 32767]) \
+        == [-1.0, 0.0, 1.0]
+
+
+def test_calibration_table_cache(monkeypatch):
+    monkeypatch.setattr(gremlin.util, "calibration_table_cache_size", 2)
+    monkeypatch.setattr(
+        gremlin.util, "_calibration_tables", collections.OrderedDict()
+    )
+    first = gremlin.util.create_calibration_table(-100, 0, 100)
+    gremlin.util.create_calibration_table(-200, 0, 200)
+    assert first is gremlin.util.create_calibration_table(-100, 0, 100)
+
+    # The least recently used table is dropped once the cache is full
+    gremlin.util.create_calibration_table(-300, 0, 300)
+    assert len(gremlin.util._calibration_tables) == 2
+    assert first is gremlin.util.create_calibration_table(-100, 0, 100)
+    assert (-200, 0, 200) not in gremlin.util._calibration_tables
@@ -0,0 +1,94 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import time
+
+import gremlin.base_classes
+import gremlin.common
+import gremlin.event_handler
+import gremlin.execution_graph
+import gremlin.scheduler
+
+import dinput
+
+
+def _axis(value):
+    return gremlin.event_handler.Event(
+        event_type=gremlin.common.InputType.JoystickAxis,
+        identifier=1,
+        device_guid=dinput.GUID_Virtual,
+        value=value
+    )
+
+
+def _wait_for_timers(timeout=1.0):
+    end = time.monotonic() + timeout
+    while gremlin.scheduler.TimerWheel().pending > 0 \
+            and time.monotonic() < end:
+        time.sleep(0.01)
+
+
+def test_fast_sweep_does_not_block():
+    process = gremlin.execution_graph.VirtualButtonProcess(
+        gremlin.base_classes.VirtualAxisButton(-0.1, 0.1)
+    )
+
+    # Every sample jumps over the activation region of the button
+    worst = 0.0
+    for i in range(200):
+        start = time.perf_counter()
+        process(_axis(-1.0 if i % 2 == 0 else 1.0))
+        worst = max(worst, time.perf_counter() - start)
+
+    # Releasing a skipped activation must not stall the dispatching thread
+    assert worst < gremlin.execution_graph.forced_activation_delay / 2
+
+    # The release of the last forced activation happens later on
+    assert process.virtual_button.is_pressed
+    _wait_for_timers()
+    time.sleep(0.01)
+    assert not process.virtual_button.is_pressed
+
+
+def test_stale_release_is_skipped():
+    process = gremlin.execution_graph.VirtualButtonProcess(
+        gremlin.base_classes.VirtualAxisButton(-0.1, 0.1)
+    )
+
+    process(_axis(-1.0))
+    process(_axis(1.0))
+    # Moving into the activation region before the deferred processing
+    # happens has to keep the button pressed
+    process(_axis(0.0))
+    _wait_for_timers()
+    time.sleep(0.01)
+    assert process.virtual_button.is_pressed
+
+
+def test_timer_wheel_order_and_cancel():
+    wheel = gremlin.scheduler.TimerWheel()
+    calls = []
+    wheel.schedule(0.03, calls.append, "late")
+    wheel.schedule(0.01, calls.append, "early")
+    handle = wheel.schedule(0.02, calls.append, "cancelled")
+    handle.cancel()
+    _wait_for_timers()
+    time.sleep(0.01)
+    assert calls == ["early", "late"]
@@ -0,0 +1,136 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import pytest
+
+from vjoy import vjoy
+from vjoy.vjoy_interface import VJoyInterface, VJoyState
+
+
+class RecordingBackend(vjoy.ReportBackend):
+
+    """Report backend storing every update instead of sending it."""
+
+    def __init__(self):
+        self.updates = []
+
+    def update(self, vjoy_id, position):
+        self.updates.append((vjoy_id, position))
+        return True
+
+
+@pytest.fixture
+def device(monkeypatch):
+    """Returns a vJoy device backed by a fake driver interface."""
+    fake = {
+        "vJoyEnabled": lambda: True,
+        "GetvJoyVersion": lambda: 0x219,
+        "GetVJDStatus": lambda vid: VJoyState.Free.value,
+        "AcquireVJD": lambda vid: True,
+        "RelinquishVJD": lambda vid: True,
+        "ResetVJD": lambda vid: True,
+        "GetOwnerPid": lambda vid: 0,
+        "GetVJDAxisExist": lambda vid, axis: 1 if axis <= 0x32 else 0,
+        "GetVJDAxisMin":
+            lambda vid, axis, ref: setattr(ref._obj, "value", 0) or True,
+        "GetVJDAxisMax":
+            lambda vid, axis, ref: setattr(ref._obj, "value", 32767) or True,
+        "GetVJDButtonNumber": lambda vid: 40,
+        "GetVJDDiscPovNumber": lambda vid: 0,
+        "GetVJDContPovNumber": lambda vid: 2,
+        "SetAxis": lambda value, vid, axis: True,
+        "SetBtn": lambda state, vid, button: True,
+        "SetContPov": lambda value, vid, hat: True,
+    }
+    for name, fn in fake.items():
+        monkeypatch.setattr(VJoyInterface, name, fn, raising=False)
+
+    backend = RecordingBackend()
+    monkeypatch.setattr(vjoy.report_batcher, "backend", backend)
+    vjoy.report_batcher.configure(True)
+
+    dev = vjoy.VJoy(1)
+    backend.updates.clear()
+    yield dev, backend
+
+    vjoy.report_batcher.configure(False)
+    dev.invalidate()
+
+
+def test_single_flush_per_event(device):
+    dev, backend = device
+
+    vjoy.report_batcher.begin()
+    dev.axis(1).value = 1.0
+    dev.axis(2).value = -1.0
+    dev.button(1).is_pressed = True
+    dev.button(33).is_pressed = True
+    dev.hat(2).direction = (1, 0)
+    assert len(backend.updates) == 0
+    vjoy.report_batcher.end()
+
+    assert len(backend.updates) == 1
+    vjoy_id, position = backend.updates[0]
+    assert vjoy_id == 1
+    assert position.bDevice == 1
+    assert position.wAxisX == 32766
+    assert position.wAxisY == 0
+    assert position.lButtons == 1
+    assert position.lButtonsEx1 == 1
+    assert position.bHats == 0xFFFFFFFF
+    assert position.bHatsEx1 == 9000
+
+    # Nothing changed, hence nothing is sent
+    vjoy.report_batcher.begin()
+    vjoy.report_batcher.end()
+    assert len(backend.updates) == 1
+
+
+def test_changes_outside_of_events_are_sent(device):
+    dev, backend = device
+
+    dev.button(32).is_pressed = True
+    dev.button(2).is_pressed = True
+    assert len(backend.updates) == 2
+    assert backend.updates[-1][1].lButtons == -0x80000000 | 0x2
+
+    dev.button(32).is_pressed = False
+    assert backend.updates[-1][1].lButtons == 0x2
+
+
+def test_deadzone_and_response_curve_bake_once(device, monkeypatch):
+    dev, _ = device
+    import gremlin.spline
+
+    baked = []
+    create_curve_table = gremlin.spline.create_curve_table
+
+    def record(*args, **kwargs):
+        baked.append(args)
+        return create_curve_table(*args, **kwargs)
+    monkeypatch.setattr(gremlin.spline, "create_curve_table", record)
+
+    points = [(-1.0, -1.0), (0.0, 0.0), (1.0, 1.0)]
+    limits = (-0.9, -0.1, 0.1, 0.9)
+    dev.axis(1).set_deadzone_and_response_curve(limits, "cubic-spline", points)
+    assert baked == [("cubic-spline", points, limits)]
+
+    dev.axis(1).value = 0.05
+    assert dev.axis(1).value == pytest.approx(0.0, abs=1e-3)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import time
+import types
+
+import pytest
+
+import dinput
+import gremlin.actions
+import gremlin.event_handler
+import gremlin.joystick_handling
+import gremlin.scheduler
+from gremlin.common import InputType
+from gremlin.input_devices import VjoyAction
+import vjoy.simulated
+
+import action_plugins.map_to_vjoy as map_to_vjoy
+
+
+@pytest.fixture
+def driver():
+    """Returns a simulated vJoy driver."""
+    driver = vjoy.simulated.SimulatedDriver()
+    driver.install()
+    gremlin.joystick_handling.VJoyProxy()[1]
+    driver.clear()
+    yield driver
+    gremlin.scheduler.TimerWheel().cancel_all()
+    gremlin.joystick_handling.VJoyProxy.reset()
+
+
+def _pulse_functor(pulse_delay):
+    action = types.SimpleNamespace(
+        parent=types.SimpleNamespace(activation_condition=None),
+        activation_condition=None,
+        vjoy_device_id=1,
+        vjoy_input_id=3,
+        input_type=InputType.JoystickButton,
+        axis_mode="absolute",
+        axis_scaling=1.0,
+        action_mode=VjoyAction.VJoyPulse,
+        pulse_delay=pulse_delay,
+        start_pressed=False,
+        target_value=0.0,
+        target_value_valid=True,
+        range_low=-1.0,
+        range_high=1.0,
+        exec_on_release=False,
+        paired=False,
+        axis_start_value=0.0,
+        merge_device_b_guid=None,
+        merge_device_b_axis=1,
+    )
+    return map_to_vjoy.VJoyRemapFunctor(action)
+
+
+def _press(functor):
+    event = gremlin.event_handler.Event(
+        InputType.JoystickButton,
+        1,
+        dinput.GUID_Keyboard,
+        is_pressed=True
+    )
+    functor.process_event(event, gremlin.actions.Value(True))
+
+
+def _button_states(driver):
+    return [
+        record.arguments[1] for record in driver.records
+        if record.function == "SetBtn" and record.arguments[0] == 3
+    ]
+
+
+def test_pulse(driver):
+    functor = _pulse_functor(50)
+    _press(functor)
+    # Presses during a pulse are ignored
+    _press(functor)
+    time.sleep(0.2)
+
+    assert _button_states(driver) == [True, False]
+    assert not functor.lock.locked()
+
+
+def test_stop_during_pulse(driver):
+    functor = _pulse_functor(500)
+    _press(functor)
+    time.sleep(0.05)
+    assert _button_states(driver) == [True]
+
+    # Stopping the profile releases the button right away
+    gremlin.scheduler.TimerWheel().cancel_all()
+    assert _button_states(driver) == [True, False]
+    assert not functor.lock.locked()
+
+    # A pulse not yet started is still completed
+    driver.clear()
+    _press(functor)
+    gremlin.scheduler.TimerWheel().cancel_all()
+    assert _button_states(driver) == [True, False]
+    assert not functor.lock.locked()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import io
+from xml.dom import minidom
+from xml.etree import ElementTree
+
+from gremlin.profile import XmlWriter
+
+
+def _document():
+    root = ElementTree.Element("profile")
+    root.set("version", "9")
+    devices = ElementTree.SubElement(root, "devices")
+    device = ElementTree.SubElement(devices, "device")
+    device.set("name", "Stick \"Pro\" & <Co>")
+    device.set("label", "Stick é")
+    mode = ElementTree.SubElement(device, "mode")
+    mode.set("name", "Default")
+    ElementTree.SubElement(mode, "button").set("id", "1")
+    ElementTree.SubElement(root, "vjoy-devices")
+    settings = ElementTree.SubElement(root, "settings")
+    ElementTree.SubElement(settings, "startup-mode").text = "Default"
+    ElementTree.SubElement(settings, "default-delay").text = "0.05 < 1 & more"
+    return root
+
+
+def test_output_matches_minidom():
+    root = _document()
+    expected = minidom.parseString(
+        ElementTree.tostring(root, encoding="utf-8")
+    ).toprettyxml(indent="    ")
+
+    out = io.StringIO()
+    XmlWriter(out).element(root)
+    assert out.getvalue() == expected
+
+    # Writing the same document element by element gives the same result
+    out = io.StringIO()
+    writer = XmlWriter(out)
+    writer.start("profile", {"version": "9"})
+    writer.start("devices")
+    for device in root.find("devices"):
+        writer.element(device)
+    writer.end()
+    writer.start("vjoy-devices")
+    writer.end()
+    writer.element(root.find("settings"))
+    writer.end()
+    assert out.getvalue() == expected
+
+
+def test_escaped_values_read_back_unchanged():
+    root = _document()
+    # Line breaks and tabs in attributes survive attribute normalization
+    root.find("devices/device").set("label", "line\nbreak\ttab\rreturn")
+    out = io.StringIO()
+    XmlWriter(out).element(root)
+
+    parsed = ElementTree.fromstring(out.getvalue())
+    for key in ["name", "label"]:
+        assert parsed.find("devices/device").get(key) == \
+            root.find("devices/device").get(key)
+    assert parsed.find("settings/default-delay").text == "0.05 < 1 & more"
+
+
+def test_whitespace_is_reformatted():
+    root = ElementTree.fromstring(
+        "<a>\n  <b x='1'>  </b>\n  <c>text</c>\n</a>"
+    )
+    out = io.StringIO()
+    XmlWriter(out).element(root)
+    assert out.getvalue() == \
+        '<?xml version="1.0" ?>\n' \
+        '<a>\n' \
+        '    <b x="1"/>\n' \
+        '    <c>text</c>\n' \
+        '</a>\n'
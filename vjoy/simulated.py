@@ -0,0 +1,186 @@
+# -*- coding: utf-8; -*-
+
+# Copyright (C) 2015 - 2019 Lionel Ott - Modified by Muchimi (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Pure Python replacement of the vJoy interface library.
+
+The simulated driver provides a configurable number of vJoy devices and
+records every change made to them instead of sending it to the driver,
+which allows running the output path without vJoy being installed, e.g. for
+tests and benchmarks. Usage:
+
+    driver = SimulatedDriver(device_count=2)
+    driver.install()
+"""
+
+import collections
+import os
+import time
+
+from vjoy.vjoy_interface import JoystickPosition, VJoyInterface, VJoyState
+
+
+# Identifiers of the axes a vJoy device can have, X to Slider1
+axis_ids = list(range(0x30, 0x38))
+
+
+class OutputRecord(collections.namedtuple(
+        "OutputRecord",
+        ["time", "vjoy_id", "function", "arguments"]
+)):
+
+    """Single change made to a vJoy device.
+
+    The time is taken from time.perf_counter, the function is the name of
+    the vJoy interface function that was called, i.e. SetAxis, SetBtn,
+    SetContPov, SetDiscPov, or UpdateVJD, and the arguments are the ones
+    passed to it without the device id. For UpdateVJD the argument is a
+    copy of the JoystickPosition structure.
+    """
+
+
+class SimulatedDriver:
+
+    """Provides the functions of the vJoy interface library in Python.
+
+    All functions are plain functions stored on the instance, rather than
+    methods, as the interface configures them the same way it does the
+    functions of the library.
+    """
+
+    def __init__(
+            self,
+            device_count=1,
+            axis_count=8,
+            button_count=128,
+            hat_count=4,
+            axis_range=(0, 32767)
+    ):
+        """Creates a new driver.
+
+        :param device_count number of vJoy devices, numbered from 1
+        :param axis_count number of axes of each device, at most 8
+        :param button_count number of buttons of each device
+        :param hat_count number of continuous hats of each device
+        :param axis_range minimum and maximum raw axis values
+        """
+        self.device_count = device_count
+        self.axis_count = axis_count
+        self.button_count = button_count
+        self.hat_count = hat_count
+        self.axis_range = axis_range
+        self.records = []
+        self._owned = set()
+
+        def exists(vjoy_id):
+            return 1 <= vjoy_id <= self.device_count
+
+        def record(function, vjoy_id, *arguments):
+            if not exists(vjoy_id):
+                return False
+            self.records.append(OutputRecord(
+                time.perf_counter(), vjoy_id, function, arguments
+            ))
+            return True
+
+        def get_axis_limit(index):
+            def get(vjoy_id, axis_id, value):
+                value._obj.value = self.axis_range[index]
+                return exists(vjoy_id) and axis_id in self._axis_ids()
+            return get
+
+        def get_status(vjoy_id):
+            if not exists(vjoy_id):
+                return VJoyState.Missing.value
+            if vjoy_id in self._owned:
+                return VJoyState.Owned.value
+            return VJoyState.Free.value
+
+        def acquire(vjoy_id):
+            if get_status(vjoy_id) != VJoyState.Free.value:
+                return False
+            self._owned.add(vjoy_id)
+            return True
+
+        def relinquish(vjoy_id):
+            self._owned.discard(vjoy_id)
+            return True
+
+        def update(vjoy_id, position):
+            return record(
+                "UpdateVJD",
+                vjoy_id,
+                JoystickPosition.from_buffer_copy(position._obj)
+            )
+
+        # General vJoy information
+        self.GetvJoyVersion = lambda: 0x219
+        self.vJoyEnabled = lambda: True
+        self.GetvJoyProductString = lambda: "Simulated vJoy"
+        self.GetvJoyManufacturerString = lambda: "Joystick Gremlin"
+        self.GetvJoySerialNumberString = lambda: "0"
+
+        # Device properties
+        self.GetVJDButtonNumber = lambda vjoy_id: self.button_count
+        self.GetVJDDiscPovNumber = lambda vjoy_id: 0
+        self.GetVJDContPovNumber = lambda vjoy_id: self.hat_count
+        self.GetVJDAxisExist = \
+            lambda vjoy_id, axis_id: axis_id in self._axis_ids()
+        self.GetVJDAxisMax = get_axis_limit(1)
+        self.GetVJDAxisMin = get_axis_limit(0)
+
+        # Device management
+        self.GetOwnerPid = \
+            lambda vjoy_id: os.getpid() if vjoy_id in self._owned else 0
+        self.AcquireVJD = acquire
+        self.RelinquishVJD = relinquish
+        self.UpdateVJD = update
+        self.GetVJDStatus = get_status
+
+        # Reset functions
+        self.ResetVJD = lambda vjoy_id: exists(vjoy_id)
+        self.ResetAll = lambda: True
+        self.ResetButtons = lambda vjoy_id: exists(vjoy_id)
+        self.ResetPovs = lambda vjoy_id: exists(vjoy_id)
+
+        # Input state modification
+        self.SetAxis = lambda value, vjoy_id, axis_id: \
+            record("SetAxis", vjoy_id, axis_id, value)
+        self.SetBtn = lambda state, vjoy_id, button_id: \
+            record("SetBtn", vjoy_id, button_id, state)
+        self.SetDiscPov = lambda value, vjoy_id, hat_id: \
+            record("SetDiscPov", vjoy_id, hat_id, value)
+        self.SetContPov = lambda value, vjoy_id, hat_id: \
+            record("SetContPov", vjoy_id, hat_id, value)
+
+    def install(self):
+        """Makes the vJoy interface use this driver instead of the library.
+
+        This has to happen before any vJoy device is accessed.
+        """
+        VJoyInterface.vjoy_dll = self
+        VJoyInterface.initialize()
+
+    def clear(self):
+        """Removes all recorded changes."""
+        self.records = []
+
+    def _axis_ids(self):
+        """Returns the identifiers of the axes present on each device.
+
+        :return list of axis identifiers
+        """
+        return axis_ids[:self.axis_count]
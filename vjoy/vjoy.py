@@ -22,9 +22,10 @@ import logging
 import threading
 import time
 import os
+import weakref
 
-from vjoy.vjoy_interface import VJoyState, VJoyInterface
-from gremlin.error import VJoyError
+from vjoy.vjoy_interface import JoystickPosition, VJoyState, VJoyInterface
+from gremlin.error import MissingImplementationError, VJoyError
 import gremlin.common
 import gremlin.spline
 
@@ -142,6 +143,238 @@ def hat_configuration_valid(vjoy_id):
     return continuous_count >= discrete_count
 
 
+class VJoyReport:
+
+    """In memory copy of the complete state of a vJoy device.
+
+    Changes to the individual controls are accumulated in the report which
+    is then sent to the driver as a whole, resulting in a single update of
+    the device instead of one per modified control.
+    """
+
+    # Report fields holding the value of each axis, by HID usage
+    axis_fields = {
+        AxisName.X.value: "wAxisX",
+        AxisName.Y.value: "wAxisY",
+        AxisName.Z.value: "wAxisZ",
+        AxisName.RX.value: "wAxisXRot",
+        AxisName.RY.value: "wAxisYRot",
+        AxisName.RZ.value: "wAxisZRot",
+        AxisName.SL0.value: "wSlider",
+        AxisName.SL1.value: "wDial"
+    }
+
+    # Report fields holding 32 buttons each
+    button_fields = ["lButtons", "lButtonsEx1", "lButtonsEx2", "lButtonsEx3"]
+
+    # Report fields holding one continuous hat each
+    hat_fields = ["bHats", "bHatsEx1", "bHatsEx2", "bHatsEx3"]
+
+    def __init__(self, vjoy_id):
+        """Creates a new report for the given device.
+
+        :param vjoy_id id of the vJoy device the report belongs to
+        """
+        self._lock = threading.Lock()
+        self._position = JoystickPosition()
+        self._buttons = [0] * len(VJoyReport.button_fields)
+        self._vjoy_id = vjoy_id
+        self.dirty = False
+        self.reset()
+
+    def reset(self):
+        """Resets all controls to their default state."""
+        with self._lock:
+            ctypes.memset(
+                ctypes.addressof(self._position),
+                0,
+                ctypes.sizeof(self._position)
+            )
+            self._position.bDevice = self._vjoy_id
+            self._buttons = [0] * len(VJoyReport.button_fields)
+            for field in VJoyReport.hat_fields:
+                setattr(self._position, field, 0xFFFFFFFF)
+            self.dirty = True
+
+    def set_axis(self, axis_id, value):
+        """Sets the raw value of an axis.
+
+        :param axis_id HID usage of the axis
+        :param value raw axis value
+        """
+        with self._lock:
+            setattr(self._position, VJoyReport.axis_fields[axis_id], value)
+            self.dirty = True
+
+    def set_button(self, button_id, is_pressed):
+        """Sets the state of a button.
+
+        :param button_id index of the button, starting at 1
+        :param is_pressed True if the button is pressed, False otherwise
+        """
+        index, bit = divmod(button_id - 1, 32)
+        with self._lock:
+            if is_pressed:
+                self._buttons[index] |= 1 << bit
+            else:
+                self._buttons[index] &= ~(1 << bit)
+            # The fields are signed, hence convert the bit mask
+            mask = self._buttons[index]
+            setattr(
+                self._position,
+                VJoyReport.button_fields[index],
+                mask - (1 << 32) if mask & 0x80000000 else mask
+            )
+            self.dirty = True
+
+    def set_hat(self, hat_id, value):
+        """Sets the raw value of a continuous hat.
+
+        :param hat_id index of the hat, starting at 1
+        :param value raw hat value, -1 representing the center position
+        """
+        with self._lock:
+            setattr(
+                self._position,
+                VJoyReport.hat_fields[hat_id - 1],
+                value & 0xFFFFFFFF
+            )
+            self.dirty = True
+
+    def take(self):
+        """Returns a copy of the report if it changed since the last call.
+
+        :return copy of the report data or None if nothing changed
+        """
+        with self._lock:
+            if not self.dirty:
+                return None
+            self.dirty = False
+            return JoystickPosition.from_buffer_copy(self._position)
+
+
+class ReportBackend:
+
+    """Interface through which complete device reports are sent to vJoy."""
+
+    def update(self, vjoy_id, position):
+        """Sends the state of a device to the driver.
+
+        :param vjoy_id id of the vJoy device to update
+        :param position JoystickPosition instance holding the device state
+        :return True if the update succeeded, False otherwise
+        """
+        raise MissingImplementationError(
+            "ReportBackend::update not implemented"
+        )
+
+
+class DriverReportBackend(ReportBackend):
+
+    """Sends reports to the vJoy driver via UpdateVJD."""
+
+    def update(self, vjoy_id, position):
+        return VJoyInterface.UpdateVJD(vjoy_id, ctypes.byref(position))
+
+
+class ReportBatcher:
+
+    """Coordinates the batching of vJoy output.
+
+    With batching enabled every device accumulates changes in a VJoyReport.
+    Changes made while processing an event, i.e. between begin() and end(),
+    are sent to the driver once the processing finishes. Changes made
+    outside of event processing are sent right away. Alternatively, with a
+    flush rate set, all pending changes are sent at that fixed rate.
+    """
+
+    def __init__(self):
+        """Creates a new instance with batching disabled."""
+        self.enabled = False
+        self.flush_rate = 0
+        self.backend = DriverReportBackend()
+
+        self._devices = weakref.WeakSet()
+        self._state = threading.local()
+        self._flush_thread = None
+        self._flush_stop = threading.Event()
+
+    def configure(self, enabled, flush_rate=0):
+        """Sets the batching behavior.
+
+        :param enabled whether or not output is batched
+        :param flush_rate number of flushes per second, 0 flushes at the end
+            of processing each event
+        """
+        self._stop_flush_thread()
+        self.enabled = enabled
+        self.flush_rate = flush_rate if enabled else 0
+        for device in list(self._devices):
+            device.set_batching(enabled)
+        if self.flush_rate > 0:
+            self._flush_stop.clear()
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop,
+                name="vjoy_flush",
+                daemon=True
+            )
+            self._flush_thread.start()
+
+    def register(self, device):
+        """Adds a device whose output is managed by the batcher.
+
+        :param device the VJoy instance to manage
+        """
+        self._devices.add(device)
+        device.set_batching(self.enabled)
+
+    def unregister(self, device):
+        """Removes a device from the batcher.
+
+        :param device the VJoy instance to remove
+        """
+        self._devices.discard(device)
+
+    def begin(self):
+        """Marks the start of processing an event on the calling thread."""
+        self._state.depth = getattr(self._state, "depth", 0) + 1
+
+    def end(self):
+        """Marks the end of processing an event on the calling thread."""
+        self._state.depth -= 1
+        if self._state.depth == 0 and self.enabled and self.flush_rate == 0:
+            self.flush()
+
+    def changed(self, device):
+        """Informs the batcher about a change to a device's report.
+
+        :param device the VJoy instance whose report changed
+        """
+        if self.flush_rate == 0 and getattr(self._state, "depth", 0) == 0:
+            device.flush()
+
+    def flush(self):
+        """Sends the pending changes of all devices to the driver."""
+        for device in list(self._devices):
+            device.flush()
+
+    def _stop_flush_thread(self):
+        """Terminates the periodic flush thread if it is running."""
+        if self._flush_thread is not None:
+            self._flush_stop.set()
+            self._flush_thread.join()
+            self._flush_thread = None
+            self.flush()
+
+    def _flush_loop(self):
+        """Periodically sends pending changes to the driver."""
+        interval = 1.0 / self.flush_rate
+        while not self._flush_stop.wait(interval):
+            self.flush()
+
+
+# Batching of the output of all vJoy devices
+report_batcher = ReportBatcher()
 
 
 class Axis:
@@ -176,8 +409,12 @@ class Axis:
         self._max_value = tmp.value
         self._half_range = int(self._max_value / 2)
 
-        self._deadzone_fn = lambda x: deadzone(x, -1.0, -0.0, 0.0, 1.0)
-        self._response_curve_fn = lambda x: x
+        # Deadzone and response curve are combined into a single curve
+        # table, None when neither is configured
+        self._deadzone = (-1.0, 0.0, 0.0, 1.0)
+        self._spline_type = None
+        self._control_points = ()
+        self._curve_fn = None
 
         # If this is not the case our value setter needs to change
         if self._min_value != 0:
@@ -190,14 +427,8 @@ class Axis:
         :param spline_type the type of spline to use
         :param control_points the control points defining the spline
         """
-        if spline_type == "cubic-spline":
-            self._response_curve_fn = gremlin.spline.CubicSpline(control_points)
-        elif spline_type == "cubic-bezier-spline":
-            self._response_curve_fn = \
-                gremlin.spline.CubicBezierSpline(control_points)
-        else:
-            logging.getLogger("system").error("Invalid spline type specified")
-            self._response_curve_fn = lambda x: x
+        self._set_spline(spline_type, control_points)
+        self._update_curve()
 
     def set_deadzone(self, low, center_low, center_high, high):
         """Sets the deadzone for the axis.
@@ -207,9 +438,53 @@ class Axis:
         :param center_high upper center deadzone limit
         :param high high deadzone limit
         """
-        self._deadzone_fn = lambda x: deadzone(
-            x, low, center_low, center_high, high
-        )
+        self._deadzone = (low, center_low, center_high, high)
+        self._update_curve()
+
+    def set_deadzone_and_response_curve(
+            self,
+            deadzone,
+            spline_type,
+            control_points
+    ):
+        """Sets the deadzone and the response curve of the axis at once.
+
+        Unlike setting them individually the curve table is only baked once.
+
+        :param deadzone the low, center low, center high, and high deadzone
+            limits
+        :param spline_type the type of spline to use
+        :param control_points the control points defining the spline
+        """
+        self._deadzone = tuple(deadzone)
+        self._set_spline(spline_type, control_points)
+        self._update_curve()
+
+    def _set_spline(self, spline_type, control_points):
+        """Stores the response curve without updating the curve table.
+
+        :param spline_type the type of spline to use
+        :param control_points the control points defining the spline
+        """
+        if spline_type in ["cubic-spline", "cubic-bezier-spline"]:
+            self._spline_type = spline_type
+            self._control_points = control_points
+        else:
+            logging.getLogger("system").error("Invalid spline type specified")
+            self._spline_type = None
+            self._control_points = ()
+
+    def _update_curve(self):
+        """Bakes the deadzone and response curve into a curve table."""
+        if self._spline_type is None and \
+                self._deadzone == (-1.0, 0.0, 0.0, 1.0):
+            self._curve_fn = None
+        else:
+            self._curve_fn = gremlin.spline.create_curve_table(
+                self._spline_type,
+                self._control_points,
+                self._deadzone
+            )
 
     @property
     def value(self):
@@ -240,14 +515,14 @@ class Axis:
 
         # Normalize value to [-1, 1] and apply response curve and deadzone
         # settings
-        self._value = self._response_curve_fn(
-            self._deadzone_fn(min(1.0, max(-1.0, value)))
-        )
+        value = min(1.0, max(-1.0, value))
+        if self._curve_fn is not None:
+            value = self._curve_fn(value)
+        self._value = value
 
-        if not VJoyInterface.SetAxis(
-                int(self._half_range + self._half_range * self._value),
-                self.vjoy_id,
-                self.axis_id
+        if not self.vjoy_dev.set_axis_raw(
+                self.axis_id,
+                int(self._half_range + self._half_range * self._value)
         ):
             from gremlin.ui import backend
             from gremlin.util import log_sys_warn
@@ -275,10 +550,9 @@ class Axis:
         # settings
         self._value = value
 
-        if not VJoyInterface.SetAxis(
-                int(self._half_range + self._half_range * self._value),
-                self.vjoy_id,
-                self.axis_id
+        if not self.vjoy_dev.set_axis_raw(
+                self.axis_id,
+                int(self._half_range + self._half_range * self._value)
         ):
             raise VJoyError(
                 f"Failed setting axis value - { _error_string(self.vjoy_id, self.axis_id, self._value)}"
@@ -319,11 +593,7 @@ class Button:
         assert(isinstance(is_pressed, bool))
         self.vjoy_dev.ensure_ownership()
         self._is_pressed = is_pressed
-        if not VJoyInterface.SetBtn(
-                self._is_pressed,
-                self.vjoy_id,
-                self.button_id
-        ):
+        if not self.vjoy_dev.set_button_raw(self.button_id, self._is_pressed):
             raise VJoyError(
                 f"Failed setting button value - {_error_string(self.vjoy_id, self.button_id, self._is_pressed)}"
             )
@@ -427,10 +697,9 @@ class Hat:
             )
 
         self._direction = direction
-        if not VJoyInterface.SetContPov(
-                Hat.to_continuous_direction[direction],
-                self.vjoy_id,
-                self.hat_id
+        if not self.vjoy_dev.set_hat_raw(
+                self.hat_id,
+                Hat.to_continuous_direction[direction]
         ):
             raise VJoyError(
                 f"Failed to set hat direction - {_error_string(self.vjoy_id, self.axis_id, self._direction)}"
@@ -489,6 +758,9 @@ class VJoy:
         self.vjoy_id = vjoy_id
         self.pid = os.getpid()
 
+        # Report accumulating changes while output batching is enabled
+        self._report = None
+
         # Initialize all controls
         self._axis_lookup = {}
         self._axis_names = {}
@@ -505,6 +777,7 @@ class VJoy:
         self._keep_alive_timer.start()
 
         # Reset all controls
+        report_batcher.register(self)
         self.reset()
 
     def ensure_ownership(self):
@@ -528,6 +801,86 @@ class VJoy:
                     f"Failed to re-acquire the vJoy device - vid: {self.vjoy_id}"
                 )
 
+    def set_batching(self, enabled):
+        """Enables or disables accumulating changes in a report.
+
+        :param enabled if True changes are sent as complete reports, if
+            False each control is updated individually
+        """
+        if enabled and self._report is None:
+            # Initialize the report with the current state of the controls
+            report = VJoyReport(self.vjoy_id)
+            for axis in self._axis.values():
+                report.set_axis(
+                    axis.axis_id,
+                    int(axis._half_range + axis._half_range * axis._value)
+                )
+            for button in self._button.values():
+                report.set_button(button.button_id, button._is_pressed)
+            for hat in self._hat.values():
+                report.set_hat(
+                    hat.hat_id,
+                    Hat.to_continuous_direction.get(hat._direction, -1)
+                )
+            self._report = report
+        elif not enabled and self._report is not None:
+            self.flush()
+            self._report = None
+
+    def set_axis_raw(self, axis_id, value):
+        """Sets the raw value of an axis.
+
+        :param axis_id HID usage of the axis
+        :param value raw axis value
+        :return True if successful, False otherwise
+        """
+        report = self._report
+        if report is None:
+            return VJoyInterface.SetAxis(value, self.vjoy_id, axis_id)
+        report.set_axis(axis_id, value)
+        report_batcher.changed(self)
+        return True
+
+    def set_button_raw(self, button_id, is_pressed):
+        """Sets the state of a button.
+
+        :param button_id index of the button
+        :param is_pressed True if the button is pressed, False otherwise
+        :return True if successful, False otherwise
+        """
+        report = self._report
+        if report is None:
+            return VJoyInterface.SetBtn(is_pressed, self.vjoy_id, button_id)
+        report.set_button(button_id, is_pressed)
+        report_batcher.changed(self)
+        return True
+
+    def set_hat_raw(self, hat_id, value):
+        """Sets the raw value of a continuous hat.
+
+        :param hat_id index of the hat
+        :param value raw hat value, -1 representing the center position
+        :return True if successful, False otherwise
+        """
+        report = self._report
+        if report is None:
+            return VJoyInterface.SetContPov(value, self.vjoy_id, hat_id)
+        report.set_hat(hat_id, value)
+        report_batcher.changed(self)
+        return True
+
+    def flush(self):
+        """Sends pending changes of the report to the driver."""
+        report = self._report
+        if report is None or self.vjoy_id is None:
+            return
+        position = report.take()
+        if position is not None and \
+                not report_batcher.backend.update(self.vjoy_id, position):
+            logging.getLogger("system").warning(
+                f"Failed updating vJoy device - vid: {self.vjoy_id}"
+            )
+
     @property
     def axis_count(self):
         """Returns the number of axes present in this device.
@@ -687,14 +1040,21 @@ class VJoy:
         # Perform reset using default vJoy functionality
         success = VJoyInterface.ResetVJD(self.vjoy_id)
 
-        # Restore input states based on what we recorded
+        # Restore input states based on what we recorded, sending them to
+        # the driver as a single report when batching
         if success:
-            for i in self._axis:
-                self._axis[i].set_absolute_value(axis_states[i])
-            for i in self._button:
-                self._button[i].is_pressed = button_states[i]
-            for i in self._hat:
-                self._hat[i].direction = hat_states[i]
+            if self._report is not None:
+                self._report.reset()
+            report_batcher.begin()
+            try:
+                for i in self._axis:
+                    self._axis[i].set_absolute_value(axis_states[i])
+                for i in self._button:
+                    self._button[i].is_pressed = button_states[i]
+                for i in self._hat:
+                    self._hat[i].direction = hat_states[i]
+            finally:
+                report_batcher.end()
         else:
             logging.getLogger("system").info(
                 "Could not reset vJoy device, are we using it?"
@@ -712,6 +1072,8 @@ class VJoy:
         """
         if self.vjoy_id:
             self.reset()
+            report_batcher.unregister(self)
+            self._report = None
             VJoyInterface.RelinquishVJD(self.vjoy_id)
             self.vjoy_id = None
             self._keep_alive_timer.cancel()
@@ -33,6 +33,44 @@ class VJoyState(enum.Enum):
     Unknown = 4     # Unknown type of error
 
 
+class JoystickPosition(ctypes.Structure):
+
+    """Complete state of a vJoy device as used by UpdateVJD.
+
+    Corresponds to the JOYSTICK_POSITION_V2 structure of the vJoy SDK.
+    """
+
+    _fields_ = [
+        ("bDevice", ctypes.c_ubyte),
+        ("wThrottle", ctypes.c_long),
+        ("wRudder", ctypes.c_long),
+        ("wAileron", ctypes.c_long),
+        ("wAxisX", ctypes.c_long),
+        ("wAxisY", ctypes.c_long),
+        ("wAxisZ", ctypes.c_long),
+        ("wAxisXRot", ctypes.c_long),
+        ("wAxisYRot", ctypes.c_long),
+        ("wAxisZRot", ctypes.c_long),
+        ("wSlider", ctypes.c_long),
+        ("wDial", ctypes.c_long),
+        ("wWheel", ctypes.c_long),
+        ("wAxisVX", ctypes.c_long),
+        ("wAxisVY", ctypes.c_long),
+        ("wAxisVZ", ctypes.c_long),
+        ("wAxisVBRX", ctypes.c_long),
+        ("wAxisVBRY", ctypes.c_long),
+        ("wAxisVBRZ", ctypes.c_long),
+        ("lButtons", ctypes.c_long),
+        ("bHats", ctypes.c_ulong),
+        ("bHatsEx1", ctypes.c_ulong),
+        ("bHatsEx2", ctypes.c_ulong),
+        ("bHatsEx3", ctypes.c_ulong),
+        ("lButtonsEx1", ctypes.c_long),
+        ("lButtonsEx2", ctypes.c_long),
+        ("lButtonsEx3", ctypes.c_long),
+    ]
+
+
 class VJoyInterface:
 
     """Allows low level interaction with VJoy devices via ctypes."""